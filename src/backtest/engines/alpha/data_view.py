@@ -34,7 +34,12 @@ class MinuteFeatureDataView(MarketDataView):
         self._ts_col = ts_col
         self._price_col = price_col
 
-        self._tables: Dict[str, pa.Table] = resolver.get_many(symbols)
+        # 只解码 ts / price / 模型特征列（其余 l0/l1 列不读）
+        columns = list(dict.fromkeys([ts_col, price_col, *self._feature_names]))
+        self._tables: Dict[str, pa.Table] = resolver.get_many(
+            symbols,
+            columns=columns,
+        )
         self._current_ts: Optional[int] = None
 
         self._validate_schema()
@@ -9,8 +9,11 @@ from src import PathManager
 from src.workflows.offline_l2_data import build_offline_l2_pipeline
 from src.workflows.offline_l1_backtest import build_offline_l1_backtest
 from src.workflows.offline_training import build_offline_training
+from src.workflows.training_sweep import build_training_sweep
+from src.workflows.feature_screen import build_feature_screen
 from src.utils.SourceMetaRepairTool import SourceMetaRepairTool
 from src.workflows.experiment_train_backtest import run_train_then_backtest
+from src.workflows.history_compaction import build_history_compaction
 
 app = typer.Typer(help="MinQuant Data Pipeline CLI")
 
@@ -48,6 +51,25 @@ def range(start: str, end: str):
         pipeline.run(d)
 
 
+@app.command()
+def compact(start: str, end: str):
+    """
+    将每日 stage 产物折叠进 history 长表（YYYY-MM-DD）
+    """
+    import pandas as pd
+
+    pipeline = build_history_compaction()
+    dates = pd.date_range(start, end)
+
+    print(f"[blue]Compacting history for range {start} -> {end}[/blue]")
+
+    for d in dates:
+        d = d.strftime("%Y-%m-%d")
+        if not PathManager.meta_dir(d).exists():
+            continue
+        pipeline.run(d)
+
+
 @app.command()
 def today():
     """
@@ -78,20 +100,54 @@ def backtest(run_id: str | None = None):
 
 
 @app.command()
-def train(run_id: str | None = None):
+def train(run_id: str | None = None, resume: bool = False):
     """
     Run Level-1 backtest (dates defined in YAML)
+
+    --resume: continue from the latest model checkpoint <= start_date
     """
     if run_id is None:
         from datetime import datetime
         run_id = datetime.now().strftime("%Y-%m-%d")
 
-    pipeline = build_offline_training()
+    pipeline = build_offline_training(resume=resume)
     print(f"[magenta]Running offline_training | run_id={run_id}[/magenta]")
 
     pipeline.run(run_id)
 
 
+@app.command()
+def sweep(run_id: str | None = None):
+    """
+    Run training sweep (param_grid × feature_sets defined in YAML)
+    """
+    if run_id is None:
+        from datetime import datetime
+        run_id = datetime.now().strftime("%Y-%m-%d") + "_sweep"
+
+    runner = build_training_sweep()
+    print(f"[magenta]Running training sweep | run_id={run_id}[/magenta]")
+
+    summary = runner.run(run_id)
+    print(summary.to_string(index=False))
+
+
+@app.command()
+def screen(run_id: str | None = None):
+    """
+    Screen feature × label rank IC over the training date range
+    """
+    if run_id is None:
+        from datetime import datetime
+        run_id = datetime.now().strftime("%Y-%m-%d") + "_screen"
+
+    runner = build_feature_screen()
+    print(f"[magenta]Running feature IC screening | run_id={run_id}[/magenta]")
+
+    summary = runner.run(run_id)
+    print(summary.head(30).to_string(index=False))
+
+
 @app.command()
 def repair(start_date: str, end_date: str):
     """
@@ -115,5 +171,9 @@ if __name__ == "__main__":
 # python -m src.cli run 2025-11-04
 # python -m src.cli backtest
 # python -m src.cli train
+# python -m src.cli train --resume
+# python -m src.cli sweep
+# python -m src.cli screen
 # python -m src.cli repair 2025-11-03 2025-12-30
+# python -m src.cli compact 2025-11-03 2025-12-30
 # python -m src.cli experiment
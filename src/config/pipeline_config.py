@@ -1,7 +1,7 @@
 # src/config/pipeline_config.py
 from pydantic import BaseModel
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 
 class DownloadBackend(str, Enum):
@@ -15,4 +15,42 @@ class PipelineConfig(BaseModel):
     horizon: int = 5 # = steps（row offset）不是分钟，不是时间
     price_col: str = "close"
     use_log_return: bool = False
+
+    # label 阶段：forward（回归）| triple_barrier（分类，max_holding = horizon）
+    #           | multi_horizon（label_horizons × label_sets 一次扫描）
+    label_kind: str = "forward"
+    tb_pt: float = 0.01
+    tb_sl: float = 0.005
+    label_horizons: List[int] = [1, 5, 10, 30]
+    label_sets: List[str] = ["ret"]  # ret | logret | mfe | mae | rvol
+    # label 阶段：forward 尾部用次一交易日开盘段补齐（overnight: include | exclude 跳空）
+    label_cross_day: bool = False
+    label_overnight: str = "include"
+    # label 阶段：整表批量执行（路径在 symbol 边界截断）
+    label_batched: bool = False
     max_worker: int = 4
+
+    # min 阶段：固定 session 网格（见 SessionGridConfig）
+    minute_grid: bool = False
+    open_auction: str = "fold"   # fold | bar | drop
+    close_auction: str = "fold"  # fold | bar | drop
+
+    # feature 阶段：整表批量执行（窗口在 symbol 边界重置）
+    feature_batched: bool = False
+    # feature 阶段：engine 输出列级缓存（新增 engine 只回填新列）
+    feature_cache: bool = False
+    # 非空 → FeatureGraphEngine 只计算这些 feature（如 artifact.feature_names）
+    #   空   → 全量 L0 / L1Stat / L1Norm
+    feature_columns: List[str] = []
+
+    # ob 阶段：盘口微观结构 feature（order + trade 事件流重放），并入 feature 阶段
+    orderbook_features: bool = False
+    ob_levels: List[int] = [1, 5, 10]
+
+    # xs 阶段：截面变换（rank | zscore | winsor | neutral），空 → 不启用
+    xs_ops: List[str] = []
+    xs_columns: List[str] = []          # 空 → 全部数值型 l0_/l1_/l2_ 列
+    industry_map: Optional[str] = None  # JSON 文件 {symbol: industry}（neutral 必需）
+
+    # bar 阶段：多分辨率 bar（BarSpec.parse），如 ["5s", "5m", "vol:100000"]
+    bars: List[str] = []
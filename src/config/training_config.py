@@ -13,6 +13,48 @@ class FeatureLabelConfig(BaseModel):
     drop_na: bool = True
 
 
+class SweepConfig(BaseModel):
+    """
+    参数 / 特征集扫描（`cli sweep`）
+
+    - param_grid   : {param: [values]}，与 model_params 合并后做笛卡尔积
+    - feature_sets : {name: [columns]}；为空 → 仅 dataset.feature_columns
+    """
+
+    param_grid: Dict[str, List[Any]] = Field(default_factory=dict)
+    feature_sets: Dict[str, List[str]] = Field(default_factory=dict)
+    max_workers: Optional[int] = None
+
+
+class StreamConfig(BaseModel):
+    """
+    流式 mini-batch 训练（StreamingModelTrainStep）
+
+    - 训练日不整体载入内存：按 batch_size 从 parquet 流式 partial_fit
+    - shuffle_buffer > 0 → 有界缓冲内打乱；epochs > 1 → 同一日多轮
+    """
+
+    enabled: bool = False
+    batch_size: int = 65536
+    shuffle_buffer: int = 0
+    epochs: int = 1
+    seed: int = 0
+
+
+class ScreenConfig(BaseModel):
+    """
+    单特征 IC 筛选（`cli screen`）
+
+    - feature_prefixes : 候选特征列前缀
+    - label_columns    : 为空 → 全部数值 label_* 列
+    """
+
+    feature_prefixes: List[str] = Field(default_factory=lambda: ["l0_", "l1_"])
+    label_columns: List[str] = Field(default_factory=list)
+    min_count: int = 3
+    max_workers: Optional[int] = None
+
+
 class TrainingConfig(BaseModel):
     """
     TrainingConfig（ONLINE / FINAL / FROZEN）
@@ -30,6 +72,12 @@ class TrainingConfig(BaseModel):
     # dataset
     dataset: FeatureLabelConfig
 
+    # dataset cache（每日 .npy memmap，位于 PathManager.cache_dir()/dataset）
+    dataset_cache_enabled: bool = False
+    dataset_cache_max_gb: float = 50.0
+    # 后台预取的后续 day 数（0 = 串行）
+    dataset_prefetch_days: int = 1
+
     # model spec (LEARNING DOMAIN)
     model_name: str  # "sgd"
     model_version: str  # "regressor_v1"
@@ -47,6 +95,17 @@ class TrainingConfig(BaseModel):
         default_factory=lambda: ["ic"]
     )
 
-    # snapshot
+    # streaming train
+    stream: StreamConfig = Field(default_factory=StreamConfig)
+
+    # sweep
+    sweep: SweepConfig = Field(default_factory=SweepConfig)
+
+    # feature screening
+    screen: ScreenConfig = Field(default_factory=ScreenConfig)
+
+    # snapshot（walk-forward 模型快照，PathManager.cache_dir()/checkpoints/{name}）
     snapshot_enabled: bool = False
     snapshot_every_n_steps: int = 1
+    # 从 asof_day ≤ start_date 的最新快照继续（需同一模型配置的快照）
+    resume: bool = False
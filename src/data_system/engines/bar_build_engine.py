@@ -0,0 +1,289 @@
+# src/data_system/engines/bar_build_engine.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+from src.data_system.engines.minute_trade_agg_engine import (
+    _EXCHANGE_OFFSET_US,
+    minute_time_columns,
+)
+
+US_PER_SECOND = 1_000_000
+
+_BAR_KINDS = ("time", "volume", "dollar")
+_TIME_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+# =============================================================================
+# Spec
+# =============================================================================
+@dataclass(frozen=True)
+class BarSpec:
+    """
+    BarSpec（冻结）
+
+    kind:
+      - "time"   : size = 秒（5 → 5s bar，300 → 5m bar）
+      - "volume" : size = 每根 bar 的累计成交量阈值
+      - "dollar" : size = 每根 bar 的累计成交额阈值
+
+    name:
+      - 输出 stage 名的一部分（bar_{name}），缺省由 kind / size 推导
+    """
+
+    kind: str
+    size: float
+    name: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in _BAR_KINDS:
+            raise ValueError(f"[BarSpec] kind must be one of {_BAR_KINDS}, got {self.kind!r}")
+        if self.size <= 0:
+            raise ValueError(f"[BarSpec] size must be > 0, got {self.size}")
+        if self.kind == "time" and int(self.size) != self.size:
+            raise ValueError(f"[BarSpec] time bar size must be whole seconds, got {self.size}")
+
+    # ------------------------------------------------------------------
+    @property
+    def label(self) -> str:
+        if self.name:
+            return self.name
+        if self.kind == "time":
+            secs = int(self.size)
+            for unit, mul in (("h", 3600), ("m", 60)):
+                if secs % mul == 0:
+                    return f"{secs // mul}{unit}"
+            return f"{secs}s"
+        size = int(self.size) if float(self.size).is_integer() else self.size
+        prefix = "vol" if self.kind == "volume" else "dollar"
+        return f"{prefix}{size}".replace(".", "p")
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def parse(cls, text: str) -> "BarSpec":
+        """
+        "5s" / "30s" / "5m" / "1h"      → time bar
+        "vol:100000" / "dollar:1e7"     → volume / dollar bar
+        """
+        text = text.strip()
+        m = re.fullmatch(r"(\d+)([smh])", text)
+        if m:
+            return cls("time", int(m.group(1)) * _TIME_UNITS[m.group(2)])
+
+        kind, _, size = text.partition(":")
+        kind = {"vol": "volume", "volume": "volume", "dollar": "dollar"}.get(kind)
+        if kind is None or not size:
+            raise ValueError(f"[BarSpec] cannot parse bar spec: {text!r}")
+        return cls(kind, float(size))
+
+
+# =============================================================================
+# internal bar arrays
+# =============================================================================
+@dataclass
+class _Bars:
+    key: np.ndarray        # time bucket start（本地钟面 us）/ information bar id
+    first_ts: np.ndarray   # bar 内首笔成交（本地钟面 us）
+    last_ts: np.ndarray    # bar 内末笔成交（本地钟面 us）
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    notional: np.ndarray
+    count: np.ndarray
+
+
+def _run_starts(key: np.ndarray) -> np.ndarray:
+    """
+    key 非降序 → 每个 run 的起点
+    """
+    return np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+class BarBuildEngine:
+    """
+    BarBuildEngine（多分辨率 · 一次扫描）
+
+    输入：
+      - enriched trade Arrow Table（单 symbol，已按 ts 升序）
+      - 至少包含列：ts, price, volume, notional
+
+    输出：
+      - Dict[spec.label, pa.Table]，每个 spec 一张 bar 表
+
+        Columns（与 min 阶段一致）：
+          - ts / trade_date / minute / minute_str
+          - open / high / low / close / volume / notional / trade_count
+        information bar（volume / dollar）额外：
+          - ts_close : bar 内末笔成交（本地钟面 us）；ts 为首笔成交
+
+    计算方式：
+      - 每个 symbol 只扫描一次：volume / notional 累计和（cumsum）被所有 spec 共享
+      - time bar 按 size 升序构建；size 是更细 bar 整数倍时由细 bar 上卷
+        （5s → 30s → 5m），不再回到逐笔
+      - information bar 由 cumsum // size 得到 bar id
+
+    冻结语义：
+      - ts 与 min 阶段相同：交易所本地钟面 epoch us
+      - 不补空 bar（只输出有成交的 bar）
+    """
+
+    def __init__(self, specs: Sequence[BarSpec], exchange: str = "CN") -> None:
+        if not specs:
+            raise ValueError("[BarBuildEngine] specs must not be empty")
+
+        labels = [s.label for s in specs]
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"[BarBuildEngine] duplicated bar names: {labels}")
+
+        try:
+            self._offset_us = _EXCHANGE_OFFSET_US[exchange]
+        except KeyError:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+
+        self.specs = list(specs)
+
+    # ------------------------------------------------------------------
+    def execute(self, table: pa.Table) -> Dict[str, pa.Table]:
+        if table.num_rows == 0:
+            return {spec.label: self._to_table(None, spec) for spec in self.specs}
+
+        ts = table["ts"].to_numpy().astype(np.int64) + self._offset_us
+        if len(ts) > 1 and (ts[1:] < ts[:-1]).any():
+            raise ValueError("BarBuildEngine requires input sorted by ts")
+
+        price = table["price"].to_numpy().astype(np.float64)
+        volume = table["volume"].to_numpy().astype(np.int64)
+        notional = table["notional"].to_numpy().astype(np.float64)
+
+        # 共享累计和：[0, c1, c1+c2, ...]，区间和 = cs[end] - cs[start]
+        cum_volume = np.r_[0, np.cumsum(volume)]
+        cum_notional = np.r_[0.0, np.cumsum(notional)]
+
+        out: Dict[str, pa.Table] = {}
+
+        # --------------------------------------------------
+        # time bars（细 → 粗，可上卷则上卷）
+        # --------------------------------------------------
+        built: List[tuple[int, _Bars]] = []
+        for spec in sorted((s for s in self.specs if s.kind == "time"), key=lambda s: s.size):
+            size_us = int(spec.size) * US_PER_SECOND
+
+            finer = next(
+                (b for s, b in reversed(built) if size_us % s == 0),
+                None,
+            )
+            if finer is not None:
+                bars = self._rollup(finer, size_us)
+            else:
+                key = (ts // size_us) * size_us
+                bars = self._from_trades(key, ts, price, cum_volume, cum_notional)
+
+            built.append((size_us, bars))
+            out[spec.label] = self._to_table(bars, spec)
+
+        # --------------------------------------------------
+        # information bars（volume / dollar clock）
+        # --------------------------------------------------
+        for spec in self.specs:
+            if spec.kind == "time":
+                continue
+
+            cum = cum_volume if spec.kind == "volume" else cum_notional
+            # 成交前累计量所在的区间：跨越阈值的那笔归入当前 bar
+            key = np.floor_divide(cum[:-1], spec.size).astype(np.int64)
+            bars = self._from_trades(key, ts, price, cum_volume, cum_notional)
+            out[spec.label] = self._to_table(bars, spec)
+
+        return {spec.label: out[spec.label] for spec in self.specs}
+
+    # ==================================================================
+    # internal
+    # ==================================================================
+    @staticmethod
+    def _from_trades(
+            key: np.ndarray,
+            ts: np.ndarray,
+            price: np.ndarray,
+            cum_volume: np.ndarray,
+            cum_notional: np.ndarray,
+    ) -> _Bars:
+        starts = _run_starts(key)
+        ends = np.r_[starts[1:], len(key)]
+
+        return _Bars(
+            key=key[starts],
+            first_ts=ts[starts],
+            last_ts=ts[ends - 1],
+            open=price[starts],
+            high=np.maximum.reduceat(price, starts),
+            low=np.minimum.reduceat(price, starts),
+            close=price[ends - 1],
+            volume=cum_volume[ends] - cum_volume[starts],
+            notional=cum_notional[ends] - cum_notional[starts],
+            count=(ends - starts).astype(np.int64),
+        )
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _rollup(fine: _Bars, size_us: int) -> _Bars:
+        key = (fine.key // size_us) * size_us
+        starts = _run_starts(key)
+        ends = np.r_[starts[1:], len(key)]
+
+        return _Bars(
+            key=key[starts],
+            first_ts=fine.first_ts[starts],
+            last_ts=fine.last_ts[ends - 1],
+            open=fine.open[starts],
+            high=np.maximum.reduceat(fine.high, starts),
+            low=np.minimum.reduceat(fine.low, starts),
+            close=fine.close[ends - 1],
+            volume=np.add.reduceat(fine.volume, starts),
+            notional=np.add.reduceat(fine.notional, starts),
+            count=np.add.reduceat(fine.count, starts),
+        )
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _to_table(bars: Optional[_Bars], spec: BarSpec) -> pa.Table:
+        if bars is None:
+            empty_i = np.empty(0, dtype=np.int64)
+            empty_f = np.empty(0, dtype=np.float64)
+            bars = _Bars(
+                empty_i, empty_i, empty_i,
+                empty_f, empty_f, empty_f, empty_f,
+                empty_i, empty_f, empty_i,
+            )
+
+        # time bar：bucket 起点；information bar：首笔成交时刻
+        ts = pa.array(bars.key if spec.kind == "time" else bars.first_ts, pa.int64())
+        time_cols = minute_time_columns(ts)
+
+        columns = {
+            "ts": ts,
+            "trade_date": time_cols["trade_date"],
+            "minute": time_cols["minute"],
+            "minute_str": time_cols["minute_str"],
+
+            "open": pa.array(bars.open, pa.float64()),
+            "high": pa.array(bars.high, pa.float64()),
+            "low": pa.array(bars.low, pa.float64()),
+            "close": pa.array(bars.close, pa.float64()),
+            "volume": pa.array(bars.volume, pa.int64()),
+            "notional": pa.array(bars.notional, pa.float64()),
+            "trade_count": pa.array(bars.count, pa.int64()),
+        }
+        if spec.kind != "time":
+            columns["ts_close"] = pa.array(bars.last_ts, pa.int64())
+
+        return pa.table(columns)
@@ -0,0 +1,155 @@
+# src/data_system/engines/cross_sectional_engine.py
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.data_system.engines.rolling_kernels import is_numeric, to_float
+from src.utils.segment_ops import Segments
+
+XS_OPS = ("rank", "zscore", "winsor", "neutral")
+
+_PREFIX = {
+    "rank": "xs_rank_",
+    "zscore": "xs_z_",
+    "winsor": "xs_win_",
+    "neutral": "xs_neu_",
+}
+
+UNKNOWN_INDUSTRY = "__unknown__"
+
+
+class CrossSectionalFeatureEngine:
+    """
+    CrossSectionalFeatureEngine（跨 symbol · 同一分钟截面）
+
+    输入：
+      - 一个交易日、多 symbol 的 feature 表（至少包含 symbol / ts）
+      - 行序任意（通常为 canonical (symbol, ts)）
+
+    输出：
+      - 行数、行序不变
+      - 仅 symbol / ts + 新增 xs_* 列：
+
+          xs_rank_{col}  : 截面百分位排名（average ties，∈ (0, 1]）
+          xs_z_{col}     : 截面 z-score（ddof=0；离散度为 0 → 0.0）
+          xs_win_{col}   : 截面分位数截尾（[lower, upper]）
+          xs_neu_{col}   : 行业中性残差 = x - 同分钟同行业均值
+                           （等价于截面对行业哑变量 OLS 的残差）
+
+    计算方式：
+      - 按 ts 一次排序得到分组布局（Segments），所有列 / 所有 op 共享
+      - 组内统计全部 reduceat / lexsort 向量化，无 Python 级 groupby
+
+    冻结语义：
+      - 同一分钟截面内计算，只使用 t 时刻已知的 feature → no-leak
+      - 缺失（null / NaN / inf）输入 → 对应输出为 null，不参与统计
+    """
+
+    def __init__(
+            self,
+            *,
+            columns: Optional[Sequence[str]] = None,
+            ops: Sequence[str] = ("rank", "zscore"),
+            winsor: tuple[float, float] = (0.01, 0.99),
+            industry: Optional[Mapping[str, str]] = None,
+            time_col: str = "ts",
+    ) -> None:
+        unknown = set(ops) - set(XS_OPS)
+        if unknown:
+            raise ValueError(f"[CrossSectional] unknown ops: {sorted(unknown)}")
+        if "neutral" in ops and industry is None:
+            raise ValueError("[CrossSectional] 'neutral' requires an industry mapping")
+
+        lower, upper = winsor
+        if not 0.0 <= lower < upper <= 1.0:
+            raise ValueError(f"[CrossSectional] invalid winsor bounds: {winsor}")
+
+        self.columns = None if columns is None else list(columns)
+        self.ops = list(ops)
+        self.winsor = (float(lower), float(upper))
+        self.industry = None if industry is None else dict(industry)
+        self.time_col = time_col
+
+    # ------------------------------------------------------------------
+    def spec(self) -> str:
+        """
+        稳定 spec（manifest attrs 用）：columns / ops / winsor / 行业映射 hash
+        """
+        industry = None
+        if self.industry is not None:
+            text = json.dumps(self.industry, sort_keys=True)
+            industry = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+        return (
+            f"{type(self).__name__}(columns={self.columns}, ops={self.ops}, "
+            f"winsor={list(self.winsor)}, industry={industry}, time_col={self.time_col})"
+        )
+
+    # ------------------------------------------------------------------
+    def input_columns(self, table: pa.Table) -> List[str]:
+        """
+        参与截面变换的列：显式 columns，或全部数值型 l0_ / l1_ / l2_ 列
+        """
+        if self.columns is not None:
+            missing = [c for c in self.columns if c not in table.column_names]
+            if missing:
+                raise ValueError(f"[CrossSectional] missing columns: {missing}")
+            return list(self.columns)
+
+        return [
+            f.name
+            for f in table.schema
+            if f.name.startswith(("l0_", "l1_", "l2_")) and is_numeric(f.type)
+        ]
+
+    # ------------------------------------------------------------------
+    def execute(self, table: pa.Table) -> pa.Table:
+        for c in ("symbol", self.time_col):
+            if c not in table.column_names:
+                raise ValueError(f"[CrossSectional] missing column: {c}")
+
+        out: Dict[str, pa.Array | pa.ChunkedArray] = {
+            "symbol": table["symbol"],
+            self.time_col: table[self.time_col],
+        }
+        columns = self.input_columns(table)
+        if table.num_rows == 0:
+            for col in columns:
+                for op in self.ops:
+                    out[_PREFIX[op] + col] = pa.array([], pa.float64())
+            return pa.table(out)
+
+        ts = table[self.time_col].to_numpy()
+        by_minute = Segments([ts])
+        by_industry = self._industry_segments(table, ts) if "neutral" in self.ops else None
+
+        for col in columns:
+            x = to_float(table[col])
+            for op in self.ops:
+                if op == "rank":
+                    v = by_minute.rank(x)
+                elif op == "zscore":
+                    v = by_minute.zscore(x)
+                elif op == "winsor":
+                    v = by_minute.winsorize(x, *self.winsor)
+                else:
+                    v = by_industry.demean(x)
+                out[_PREFIX[op] + col] = pa.array(v, pa.float64(), from_pandas=True)
+
+        return pa.table(out)
+
+    # ------------------------------------------------------------------
+    def _industry_segments(self, table: pa.Table, ts: np.ndarray) -> Segments:
+        # symbol → industry 只在唯一 symbol 上查表，再按 dictionary 下标展开
+        encoded = pc.dictionary_encode(table["symbol"].combine_chunks())
+        industries = np.array(
+            [self.industry.get(s, UNKNOWN_INDUSTRY) for s in encoded.dictionary.to_pylist()],
+            dtype=object,
+        )
+        _, codes = np.unique(industries, return_inverse=True)
+        return Segments([ts, codes[encoded.indices.to_numpy()]])
@@ -0,0 +1,474 @@
+# src/data_system/engines/feature_graph_engine.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from src.data_system.engines.rolling_kernels import (
+    RollingMoments,
+    fill_nan,
+    is_numeric,
+    shift1,
+    to_float,
+)
+
+
+# =============================================================================
+# Feature DAG（声明式 · 按需计算 · 公共子表达式复用）
+# =============================================================================
+#
+# 每个节点声明：name / inputs / window / compute
+#
+#   - inputs 可以是其他节点，也可以是输入表中的原始列（close / volume ...）
+#   - "_" 开头的节点是中间量（float cast、RollingMoments、rolling mean ...），
+#     只参与计算、不输出
+#   - 节点以 name 唯一标识：相同表达式（如 "_mean_w20:l0_range"）只注册一次，
+#     所有下游共享同一次计算（CSE）
+#
+# compute(segment_starts, *inputs) → np.ndarray | RollingMoments
+#
+#   - 原始列统一以 float64 ndarray（null → NaN）传入，每列只 cast 一次
+#   - segment_starts 语义同 rolling_kernels：窗口不跨段
+#
+# 输出列名与 FeatureL0 / FeatureL1Stat / FeatureL1Norm 完全一致，
+# 可以直接替换三者串联（见 FeatureRegistry.standard）。
+#
+# raw rule：依赖输入 schema 的节点（如 L1Norm 对输入表中每个数值原始列的
+# z-score）无法静态注册 → 注册为 rule，plan 时按输入的数值列展开。
+#
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., object] = field(compare=False, repr=False)
+    window: Optional[int] = None
+
+    @property
+    def is_intermediate(self) -> bool:
+        return self.name.startswith("_")
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    """
+    planner 输出（拓扑序）
+
+    raw     : 需要从输入表读取的原始列
+    steps   : 需要计算的节点（依赖在前）
+    outputs : 需要写回表中的 feature 列（请求顺序）
+    """
+
+    raw: Tuple[str, ...]
+    steps: Tuple[FeatureNode, ...]
+    outputs: Tuple[str, ...]
+
+
+# =============================================================================
+# Registry + planner
+# =============================================================================
+class FeatureRegistry:
+    """
+    FeatureRegistry
+
+    - register：声明一个节点（同名重复注册 → ValueError）
+    - add_raw_rule：按输入表数值原始列展开的节点族（plan 时展开，不改动本注册表）
+    - plan    ：从请求的 feature 集合反推最小计算子图
+    - standard：与现有 L0 / L1Stat / L1Norm 引擎等价的默认注册表
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, FeatureNode] = {}
+        self._raw_rules: List[Tuple[str, Callable[["FeatureRegistry", str], None]]] = []
+
+    # ------------------------------------------------------------------
+    def register(
+            self,
+            name: str,
+            inputs: Sequence[str],
+            compute: Callable[..., object],
+            *,
+            window: Optional[int] = None,
+    ) -> FeatureNode:
+        if name in self._nodes:
+            raise ValueError(f"[FeatureRegistry] duplicated feature: {name}")
+        node = FeatureNode(name=name, inputs=tuple(inputs), compute=compute, window=window)
+        self._nodes[name] = node
+        return node
+
+    def ensure(
+            self,
+            name: str,
+            inputs: Sequence[str],
+            compute: Callable[..., object],
+            *,
+            window: Optional[int] = None,
+    ) -> FeatureNode:
+        """
+        已注册则复用（中间量注册用；CSE 的注册期保证）
+        """
+        if name in self._nodes:
+            return self._nodes[name]
+        return self.register(name, inputs, compute, window=window)
+
+    def add_raw_rule(self, name: str, rule: Callable[["FeatureRegistry", str], None]) -> None:
+        """
+        rule(registry, col)：对每个未注册的数值原始列调用一次
+        """
+        self._raw_rules.append((name, rule))
+
+    def raw_rules(self) -> List[str]:
+        return [name for name, _ in self._raw_rules]
+
+    def expand(self, numeric: Sequence[str]) -> "FeatureRegistry":
+        """
+        按输入表数值列展开 raw rule → 新注册表（无 rule 时返回自身）
+        """
+        if not self._raw_rules:
+            return self
+
+        out = FeatureRegistry()
+        out._nodes = dict(self._nodes)
+        for col in numeric:
+            if col in self._nodes:
+                continue
+            for _, rule in self._raw_rules:
+                rule(out, col)
+        return out
+
+    # ------------------------------------------------------------------
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def get(self, name: str) -> FeatureNode:
+        return self._nodes[name]
+
+    def features(self) -> List[str]:
+        """
+        全部对外 feature（注册顺序，不含中间量）
+        """
+        return [n for n, node in self._nodes.items() if not node.is_intermediate]
+
+    # ------------------------------------------------------------------
+    def plan(
+            self,
+            requested: Optional[Sequence[str]] = None,
+            *,
+            available: Sequence[str],
+            numeric: Optional[Sequence[str]] = None,
+    ) -> FeaturePlan:
+        """
+        requested:
+          - None：全部可计算的 feature（缺原始列的静默跳过，与引擎行为一致）
+          - 显式列表：缺依赖 → KeyError；输入表已有的原始列直接透传
+
+        numeric:
+          - 输入表中的数值列；给出时先展开 raw rule（见 expand）
+        """
+        if numeric is not None and self._raw_rules:
+            return self.expand(numeric).plan(requested, available=available)
+
+        available = set(available)
+        order: List[FeatureNode] = []
+        raw: List[str] = []
+        state: Dict[str, bool] = {}  # name -> 是否可计算（已访问）
+
+        def visit(name: str, chain: Tuple[str, ...]) -> bool:
+            if name in state:
+                return state[name]
+            if name in chain:
+                raise ValueError(f"[FeatureRegistry] cycle: {' -> '.join(chain + (name,))}")
+
+            node = self._nodes.get(name)
+            if node is None:
+                ok = name in available
+                if ok:
+                    raw.append(name)
+                state[name] = ok
+                return ok
+
+            ok = all([visit(dep, chain + (name,)) for dep in node.inputs])
+            if ok:
+                order.append(node)
+            state[name] = ok
+            return ok
+
+        if requested is None:
+            targets = self.features()
+        else:
+            targets = list(dict.fromkeys(requested))
+
+        outputs: List[str] = []
+        for name in targets:
+            if name not in self._nodes and name in available:
+                continue  # 原始列透传
+            if not visit(name, ()):
+                if requested is not None:
+                    raise KeyError(
+                        f"[FeatureRegistry] cannot resolve {name!r}: "
+                        f"missing {sorted(self._missing(name, available))}"
+                    )
+                continue
+            outputs.append(name)
+
+        # 剪掉只服务于被跳过 feature 的节点 / 原始列
+        needed = self._closure(outputs)
+        return FeaturePlan(
+            raw=tuple(c for c in raw if c in needed),
+            steps=tuple(n for n in order if n.name in needed),
+            outputs=tuple(outputs),
+        )
+
+    # ------------------------------------------------------------------
+    def _closure(self, names: Sequence[str]) -> set:
+        seen: set = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            node = self._nodes.get(name)
+            if node is not None:
+                stack.extend(node.inputs)
+        return seen
+
+    def _missing(self, name: str, available: set) -> set:
+        return {
+            n for n in self._closure([name])
+            if n not in self._nodes and n not in available
+        }
+
+    # ==================================================================
+    # standard registry（= FeatureL0 → FeatureL1Stat(w) → FeatureL1Norm(w)）
+    # ==================================================================
+    @classmethod
+    def standard(
+            cls,
+            *,
+            stat_windows: Sequence[int] = (20,),
+            norm_windows: Sequence[int] = (20,),
+    ) -> "FeatureRegistry":
+        reg = cls()
+        _register_l0(reg)
+        for w in stat_windows:
+            _register_l1_stat(reg, w)
+        base = [n for n in reg.features() if n.startswith(("l0_", "l1_"))]
+        for w in norm_windows:
+            _register_l1_norm(reg, w, base)
+            # FeatureL1NormEngine 对输入表全部数值列做 z-score（含 open / volume ...）
+            reg.add_raw_rule(f"l1_z_w{w}", partial(_register_l1_norm_raw, w))
+        return reg
+
+
+# =============================================================================
+# shared intermediates
+# =============================================================================
+def _moments(reg: FeatureRegistry, col: str) -> str:
+    name = f"_moments:{col}"
+    reg.ensure(name, [col], lambda seg, x: RollingMoments(x, segment_starts=seg))
+    return name
+
+
+def _mean(reg: FeatureRegistry, col: str, window: int) -> str:
+    name = f"_mean_w{window}:{col}"
+    reg.ensure(name, [_moments(reg, col)], lambda seg, m: m.mean(window), window=window)
+    return name
+
+
+def _safe_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """
+    den > 0 → num / den，否则 0.0（NaN 输入保持 NaN）
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(den > 0, num / np.where(den > 0, den, 1.0), 0.0)
+    return np.where(np.isnan(den), np.nan, out)
+
+
+# =============================================================================
+# L0（逐行，与 FeatureL0Engine 一致）
+# =============================================================================
+def _register_l0(reg: FeatureRegistry) -> None:
+    reg.register("l0_amount", ["close", "volume"], lambda seg, c, v: c * v)
+    reg.register("l0_avg_trade_size", ["volume", "trade_count"], lambda seg, v, n: _safe_div(v, n))
+
+    reg.register("_buy_sell_total", ["buy_volume", "sell_volume"], lambda seg, b, s: b + s)
+    reg.register(
+        "l0_buy_ratio",
+        ["buy_volume", "_buy_sell_total"],
+        lambda seg, b, t: _safe_div(b, t),
+    )
+    reg.register(
+        "l0_imbalance",
+        ["buy_volume", "sell_volume", "_buy_sell_total"],
+        lambda seg, b, s, t: _safe_div(b - s, t),
+    )
+
+    reg.register("l0_range", ["high", "low"], lambda seg, h, lo: h - lo)
+    reg.register("l0_abs_move", ["close", "open"], lambda seg, c, o: np.abs(c - o))
+    reg.register("l0_log_volume", ["volume"], lambda seg, v: np.log1p(v))
+    reg.register("l0_log_trade_count", ["trade_count"], lambda seg, n: np.log1p(n))
+
+
+# =============================================================================
+# L1 stat（与 FeatureL1StatEngine(window) 一致）
+# =============================================================================
+def _register_l1_stat(reg: FeatureRegistry, w: int) -> None:
+    reg.register(
+        f"l1_mean_w{w}_volume",
+        [_mean(reg, "l0_volume", w)],
+        lambda seg, m: fill_nan(m),
+        window=w,
+    )
+    reg.register(
+        f"l1_sum_w{w}_trade_count",
+        [_moments(reg, "l0_trade_count")],
+        lambda seg, m: fill_nan(m.sum(w)),
+        window=w,
+    )
+    reg.register(
+        f"l1_std_w{w}_abs_move",
+        [_moments(reg, "l0_abs_move")],
+        lambda seg, m: fill_nan(m.std(w)),
+        window=w,
+    )
+    reg.ensure("_log_ret_1", ["close"], _log_return)
+    reg.register(f"l1_ret_w{w}_1", ["_log_ret_1"], lambda seg, r: r, window=w)
+
+    for col, tag in (("l0_volume", "volume"), ("l0_range", "range")):
+        reg.register(
+            f"l1_ratio_w{w}_{tag}",
+            [_moments(reg, col), _mean(reg, col, w)],
+            _ratio,
+            window=w,
+        )
+
+
+def _log_return(seg, close: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = close / shift1(close, seg)
+        return np.where(ratio > 0, np.log(np.where(ratio > 0, ratio, 1.0)), 0.0)
+
+
+def _ratio(seg, m: RollingMoments, mean: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = m.x / mean
+    return np.where(np.isfinite(ratio), ratio, 0.0)
+
+
+# =============================================================================
+# L1 norm（与 FeatureL1NormEngine(window) 一致）
+# =============================================================================
+def _register_l1_norm(reg: FeatureRegistry, w: int, base: Sequence[str]) -> None:
+    for col in base:
+        if col.startswith("l1_z_"):
+            continue
+        reg.register(
+            f"l1_z_w{w}_{col}",
+            [_moments(reg, col)],
+            lambda seg, m: fill_nan(m.zscore(w)),
+            window=w,
+        )
+
+
+def _register_l1_norm_raw(w: int, reg: FeatureRegistry, col: str) -> None:
+    if col.startswith("l1_z_") or f"l1_z_w{w}_{col}" in reg:
+        return
+    _register_l1_norm(reg, w, [col])
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+class FeatureGraphEngine:
+    """
+    FeatureGraphEngine
+
+    输入：
+      - min 表（单 symbol，或配合 segment_starts 的多 symbol 表）
+
+    输出：
+      - 行数不变，append / replace 请求的 feature 列
+
+    行为：
+      - features=None：计算注册表中全部可计算 feature
+      - features=[...]（如 artifact.feature_names）：只计算其传递闭包，
+        其余 feature 与中间量完全不计算；原始列直接透传
+      - 同一输入列的 cast / RollingMoments / rolling mean 在整个 DAG 内只算一次
+    """
+
+    segment_aware = True
+
+    def __init__(
+            self,
+            registry: Optional[FeatureRegistry] = None,
+            *,
+            features: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.registry = registry if registry is not None else FeatureRegistry.standard()
+        self.features = None if features is None else list(features)
+        self._plans: Dict[Tuple[str, ...], FeaturePlan] = {}
+
+    # ------------------------------------------------------------------
+    def spec(self) -> str:
+        """
+        稳定 spec（ColumnCache / manifest attrs 用）：请求集合 + 注册表 feature 集合 + raw rule
+        """
+        return (
+            f"{type(self).__name__}(features={self.features}, "
+            f"registry={self.registry.features()}, "
+            f"raw_rules={self.registry.raw_rules()})"
+        )
+
+    # ------------------------------------------------------------------
+    def plan(self, columns: Sequence[str], numeric: Optional[Sequence[str]] = None) -> FeaturePlan:
+        key = (tuple(columns), None if numeric is None else tuple(numeric))
+        if key not in self._plans:
+            self._plans[key] = self.registry.plan(self.features, available=columns, numeric=numeric)
+        return self._plans[key]
+
+    # ------------------------------------------------------------------
+    def execute(
+            self,
+            table: pa.Table,
+            *,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> pa.Table:
+        if table.num_rows == 0:
+            return table
+
+        plan = self.plan(
+            table.column_names,
+            numeric=[f.name for f in table.schema if is_numeric(f.type)],
+        )
+
+        values: Dict[str, object] = {c: to_float(table[c]) for c in plan.raw}
+        for node in plan.steps:
+            values[node.name] = node.compute(
+                segment_starts,
+                *(values[dep] for dep in node.inputs),
+            )
+
+        out = table
+        for name in plan.outputs:
+            out = _set(out, name, values[name])
+        return out
+
+
+# ======================================================
+# Utility
+# ======================================================
+def _set(table: pa.Table, name: str, values: np.ndarray) -> pa.Table:
+    """
+    append / replace（NaN → null，与 Arrow compute 版 L0 的 null 传播一致）
+    """
+    arr = pa.array(values, type=pa.float64(), from_pandas=True)
+    if name in table.column_names:
+        return table.set_column(table.column_names.index(name), name, arr)
+    return table.append_column(name, arr)
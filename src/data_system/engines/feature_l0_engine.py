@@ -19,8 +19,11 @@ class FeatureL0Engine:
       - 仅 append / replace L0 feature 列
     """
 
+    # 逐行计算、不跨时间 → 天然支持多 symbol 批量执行
+    segment_aware = True
+
     # --------------------------------------------------
-    def execute(self, table: pa.Table) -> pa.Table:
+    def execute(self, table: pa.Table, *, segment_starts=None) -> pa.Table:
         if table.num_rows == 0:
             return table
 
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-import pandas as pd
+from typing import Optional
+
+import numpy as np
 import pyarrow as pa
 
+from src.data_system.engines.rolling_kernels import (
+    RollingMoments,
+    fill_nan,
+    is_numeric,
+    to_float,
+)
+
 
 class FeatureL1NormEngine:
     """
@@ -103,22 +112,28 @@ class FeatureL1NormEngine:
         self.include_l0 = include_l0
         self.include_l1 = include_l1
 
+    # 支持多 symbol 批量执行（窗口在段边界重置）
+    segment_aware = True
+
     # --------------------------------------------------
-    def execute(self, table: pa.Table) -> pa.Table:
+    def execute(
+            self,
+            table: pa.Table,
+            *,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> pa.Table:
         if table.num_rows == 0:
             return table
 
         self._validate_input(table)
 
-        # Narrow, controlled Arrow -> pandas conversion
-        df = table.to_pandas()
+        out = table
 
-        # Normalize eligible columns
-        for col in self._candidate_columns(df):
-            self._add_zscore(df, col)
+        # Normalize eligible columns（列集合在追加前确定）
+        for col in self._candidate_columns(table):
+            out = self._add_zscore(table, out, col, segment_starts)
 
-        # pandas -> Arrow (schema evolves by column append)
-        return pa.Table.from_pandas(df, preserve_index=False)
+        return out
 
     # ==================================================
     # Validation
@@ -136,18 +151,20 @@ class FeatureL1NormEngine:
     # ==================================================
     # Column selection
     # ==================================================
-    def _candidate_columns(self, df: pd.DataFrame) -> list[str]:
+    def _candidate_columns(self, table: pa.Table) -> list[str]:
         """
         Select columns eligible for normalization.
 
         Rules (Frozen):
-        - Numeric only
+        - Numeric only (int / float / bool)
         - No existing l1_z_* columns
         - Respect include_l0 / include_l1 flags
         """
         cols: list[str] = []
 
-        for c in df.columns:
+        for field in table.schema:
+            c = field.name
+
             if c.startswith("l1_z_"):
                 continue
 
@@ -157,7 +174,7 @@ class FeatureL1NormEngine:
             if c.startswith("l1_") and not self.include_l1:
                 continue
 
-            if not pd.api.types.is_numeric_dtype(df[c]):
+            if not is_numeric(field.type):
                 continue
 
             cols.append(c)
@@ -167,37 +184,31 @@ class FeatureL1NormEngine:
     # ==================================================
     # Z-score logic (core)
     # ==================================================
-    def _add_zscore(self, df: pd.DataFrame, col: str) -> None:
+    def _add_zscore(
+            self,
+            table: pa.Table,
+            out: pa.Table,
+            col: str,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> pa.Table:
         """
         z_t = (x_t - mean(x[t-window : t-1])) / std(x[t-window : t-1])
 
-        - Strict no-leak (shift + rolling)
+        - Strict no-leak (shift-1 rolling kernel)
         - std == 0 → 0.0
         - NaN → 0.0
         """
-
-        x = df[col]
-
-        hist_mean = (
-            x.shift(1)
-            .rolling(self.window, min_periods=self.window)
-            .mean()
-        )
-
-        hist_std = (
-            x.shift(1)
-            .rolling(self.window, min_periods=self.window)
-            .std()
-        )
-
-        z = (x - hist_mean) / hist_std
+        z = RollingMoments(
+            to_float(table[col]),
+            segment_starts=segment_starts,
+        ).zscore(self.window)
 
         out_col = f"l1_z_{self._wtag}_{col}"
+        arr = pa.array(fill_nan(z), type=pa.float64())
 
-        df[out_col] = (
-            z.fillna(0.0)
-            .where(hist_std != 0, 0.0)
-        )
+        if out_col in out.column_names:
+            return out.set_column(out.column_names.index(out_col), out_col, arr)
+        return out.append_column(out_col, arr)
 
 
 # ======================================================
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-import math
-from typing import Iterable
+from typing import Dict, Optional
 
-import pandas as pd
+import numpy as np
 import pyarrow as pa
 
+from src.data_system.engines.rolling_kernels import (
+    RollingMoments,
+    fill_nan,
+    shift1,
+    to_float,
+)
+
 
 class FeatureL1StatEngine:
     """
@@ -39,6 +45,7 @@ class FeatureL1StatEngine:
     - Append / replace l1_* columns
     - All statistics use [t-window ... t-1]
     - No NaN in final output
+    - NumPy rolling kernels（O(n)，无 pandas round trip）
 
     ======================================
     Window Semantics (Frozen)
@@ -69,40 +76,56 @@ class FeatureL1StatEngine:
         self.enable_volume_ratio = enable_volume_ratio
         self.enable_range_ratio = enable_range_ratio
 
+    # 支持多 symbol 批量执行（窗口在段边界重置）
+    segment_aware = True
+
     # --------------------------------------------------
-    def execute(self, table: pa.Table) -> pa.Table:
+    def execute(
+            self,
+            table: pa.Table,
+            *,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> pa.Table:
+        """
+        segment_starts:
+          - None：单 symbol（原语义）
+          - 升序段起点（slice index start）：多 symbol 表，
+            所有窗口 / shift 不跨段，结果与逐段执行一致
+        """
         if table.num_rows == 0:
             return table
 
         self._validate_input(table)
+        self._segment_starts = segment_starts
 
-        # Arrow → pandas (controlled, single-symbol, small)
-        df = table.to_pandas()
+        # 每列只构建一次累计量（mean / ratio 共享）
+        self._moments: Dict[str, RollingMoments] = {}
+        out = table
 
         # ==================================================
         # 1. Rolling statistics
         # ==================================================
-        self._add_rolling_mean(df)
-        self._add_rolling_sum(df)
-        self._add_rolling_std(df)
+        out = self._add_rolling_mean(table, out)
+        out = self._add_rolling_sum(table, out)
+        out = self._add_rolling_std(table, out)
 
         # ==================================================
         # 2. Return-like features
         # ==================================================
         if self.enable_return:
-            self._add_log_return(df)
+            out = self._add_log_return(table, out)
 
         # ==================================================
         # 3. Ratio-like features
         # ==================================================
         if self.enable_volume_ratio:
-            self._add_volume_ratio(df)
+            out = self._add_ratio(table, out, "l0_volume", "volume")
 
         if self.enable_range_ratio:
-            self._add_range_ratio(df)
+            out = self._add_ratio(table, out, "l0_range", "range")
 
-        # pandas → Arrow
-        return pa.Table.from_pandas(df, preserve_index=False)
+        self._moments = {}
+        return out
 
     # ==================================================
     # Validation
@@ -112,89 +135,90 @@ class FeatureL1StatEngine:
         if not any(c.startswith("l0_") for c in table.column_names):
             raise ValueError("FeatureL1Stat requires L0 features (l0_*)")
 
+    # --------------------------------------------------
+    def _m(self, table: pa.Table, col: str) -> RollingMoments:
+        if col not in self._moments:
+            self._moments[col] = RollingMoments(
+                to_float(table[col]),
+                segment_starts=self._segment_starts,
+            )
+        return self._moments[col]
+
     # ==================================================
     # Rolling statistics
     # ==================================================
-    def _add_rolling_mean(self, df: pd.DataFrame) -> None:
-        if "l0_volume" in df:
-            m = (
-                df["l0_volume"]
-                .shift(1)
-                .rolling(self.window, min_periods=self.window)
-                .mean()
-            )
-            df[f"l1_mean_{self._wtag}_volume"] = m.fillna(0.0)
-
-    def _add_rolling_sum(self, df: pd.DataFrame) -> None:
-        if "l0_trade_count" in df:
-            s = (
-                df["l0_trade_count"]
-                .shift(1)
-                .rolling(self.window, min_periods=self.window)
-                .sum()
-            )
-            df[f"l1_sum_{self._wtag}_trade_count"] = s.fillna(0.0)
-
-    def _add_rolling_std(self, df: pd.DataFrame) -> None:
-        if "l0_abs_move" in df:
-            s = (
-                df["l0_abs_move"]
-                .shift(1)
-                .rolling(self.window, min_periods=self.window)
-                .std()
-            )
-            df[f"l1_std_{self._wtag}_abs_move"] = s.fillna(0.0)
+    def _add_rolling_mean(self, table: pa.Table, out: pa.Table) -> pa.Table:
+        if "l0_volume" not in table.column_names:
+            return out
+        m = self._m(table, "l0_volume").mean(self.window)
+        return _set(out, f"l1_mean_{self._wtag}_volume", fill_nan(m))
+
+    def _add_rolling_sum(self, table: pa.Table, out: pa.Table) -> pa.Table:
+        if "l0_trade_count" not in table.column_names:
+            return out
+        s = self._m(table, "l0_trade_count").sum(self.window)
+        return _set(out, f"l1_sum_{self._wtag}_trade_count", fill_nan(s))
+
+    def _add_rolling_std(self, table: pa.Table, out: pa.Table) -> pa.Table:
+        if "l0_abs_move" not in table.column_names:
+            return out
+        s = self._m(table, "l0_abs_move").std(self.window)
+        return _set(out, f"l1_std_{self._wtag}_abs_move", fill_nan(s))
 
     # ==================================================
     # Return-like
     # ==================================================
-    def _add_log_return(self, df: pd.DataFrame) -> None:
+    def _add_log_return(self, table: pa.Table, out: pa.Table) -> pa.Table:
         """
         log_ret_t = log(close_t / close_{t-1})
+
+        - ratio <= 0 / 缺失 → 0.0
         """
-        if "close" not in df:
-            return
+        if "close" not in table.column_names:
+            return out
 
-        prev = df["close"].shift(1)
-        ret = (df["close"] / prev).apply(
-            lambda x: math.log(x) if x > 0 else 0.0
-        )
+        close = to_float(table["close"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = close / shift1(close, self._segment_starts)
+            ret = np.where(ratio > 0, np.log(np.where(ratio > 0, ratio, 1.0)), 0.0)
 
-        df[f"l1_ret_{self._wtag}_1"] = ret.fillna(0.0)
+        return _set(out, f"l1_ret_{self._wtag}_1", ret)
 
     # ==================================================
     # Ratio-like
     # ==================================================
-    def _add_volume_ratio(self, df: pd.DataFrame) -> None:
-        if "l0_volume" not in df:
-            return
-
-        mean = (
-            df["l0_volume"]
-            .shift(1)
-            .rolling(self.window, min_periods=self.window)
-            .mean()
-        )
-
-        ratio = df["l0_volume"] / mean
-        df[f"l1_ratio_{self._wtag}_volume"] = (
-            ratio.replace([math.inf, -math.inf], 0.0)
-            .fillna(0.0)
-        )
+    def _add_ratio(
+            self,
+            table: pa.Table,
+            out: pa.Table,
+            col: str,
+            tag: str,
+    ) -> pa.Table:
+        """
+        ratio_t = x_t / mean(x[t-window : t-1])（±inf / NaN → 0.0）
+        """
+        if col not in table.column_names:
+            return out
 
-    def _add_range_ratio(self, df: pd.DataFrame) -> None:
-        if "l0_range" not in df:
-            return
+        m = self._m(table, col)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = m.x / m.mean(self.window)
 
-        mean = (
-            df["l0_range"]
-            .shift(1)
-            .rolling(self.window, min_periods=self.window)
-            .mean()
+        return _set(
+            out,
+            f"l1_ratio_{self._wtag}_{tag}",
+            np.where(np.isfinite(ratio), ratio, 0.0),
         )
 
-        ratio = df["l0_range"] / mean
-        df[f"l1_ratio_{self._wtag}_range"] = (
-            ratio.replace([math.inf, -math.inf], 0.0)
-            .fillna(0.0)
-        )
+
+# ======================================================
+# Utility
+# ======================================================
+def _set(table: pa.Table, name: str, values: np.ndarray) -> pa.Table:
+    """
+    append / replace（已存在的列原位替换，保持列序）
+    """
+    arr = pa.array(values, type=pa.float64())
+    if name in table.column_names:
+        return table.set_column(table.column_names.index(name), name, arr)
+    return table.append_column(name, arr)
@@ -1,14 +1,59 @@
 #!filepath: src/engines/labels/forward_return_label_engine.py
 from __future__ import annotations
 
-from typing import Sequence
+from dataclasses import dataclass
+from typing import Optional, Sequence
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.compute as pc
 
 from src.data_system.engines.labels.base import BaseLabelEngine, require_columns
+from src.data_system.engines.rolling_kernels import segment_end_of, to_float
 
 from src import logs
+
+OVERNIGHT_MODES = ("include", "exclude")
+
+
+@dataclass(frozen=True)
+class NextSession:
+    """
+    次一交易日开盘段（cross_day 用）
+
+    - open / close：每个 segment（symbol）次日前若干行，按 segment 顺序拼接
+    - starts / lengths：每个 segment 在 open / close 中的位置（无次日数据 → 长度 0）
+    """
+    open: np.ndarray
+    close: np.ndarray
+    starts: np.ndarray
+    lengths: np.ndarray
+
+    @classmethod
+    def from_tables(cls, tables: Sequence[Optional[pa.Table]], price_col: str = "close") -> "NextSession":
+        lengths = np.array([0 if t is None else t.num_rows for t in tables], dtype=np.int64)
+        present = [t for t in tables if t is not None and t.num_rows]
+        if present:
+            merged = pa.concat_tables(present)
+            open_, close = to_float(merged["open"]), to_float(merged[price_col])
+        else:
+            open_ = close = np.zeros(0)
+        starts = np.r_[0, np.cumsum(lengths)[:-1]].astype(np.int64)
+        return cls(open=open_, close=close, starts=starts, lengths=lengths)
+
+    def segment(self, i: int) -> "NextSession":
+        """
+        第 i 个 segment 的单段视图（逐 symbol 模式复用同一份 NextSession）
+        """
+        start, length = int(self.starts[i]), int(self.lengths[i])
+        return NextSession(
+            open=self.open[start:start + length],
+            close=self.close[start:start + length],
+            starts=np.zeros(1, dtype=np.int64),
+            lengths=np.array([length], dtype=np.int64),
+        )
+
+
 class ForwardReturnLabelEngine(BaseLabelEngine):
     """
     ForwardReturnLabelEngine（FINAL / FROZEN）
@@ -24,25 +69,44 @@ class ForwardReturnLabelEngine(BaseLabelEngine):
         - 不跨 symbol（由 LabelBuildStep + SymbolAccessor 保证）
         - 不改变行数
         - 不删除 NaN（尾部 steps 行自然为 null）
+        - segment_starts（批量多 symbol）：t + steps 越过段尾 → null
+
+    cross_day=True（尾部不截断）：
+        - t + steps 越过当日段尾的行，用次一交易日开盘后的行补齐 horizon
+          （next_session 由 LabelBuildStep 经次日 min 的 slice index 投影读取）
+        - overnight="include"：收益包含隔夜跳空
+              price_next[k] / price[t]
+        - overnight="exclude"：剔除隔夜跳空（当日收盘 → 次日首根 bar 开盘）
+              (price[last] / price[t]) * (price_next[k] / open_next[0])
+        - 无次日数据（尚未落地 / 停牌）→ 仍为 null
     """
 
+    segment_aware = True
+
     def __init__(
         self,
         *,
         steps: int,
         price_col: str = "close",
         use_log_return: bool = False,
+        cross_day: bool = False,
+        overnight: str = "include",
         output_col: str | None = None,
     ) -> None:
         if steps <= 0:
             raise ValueError("steps must be positive")
+        if overnight not in OVERNIGHT_MODES:
+            raise ValueError(f"overnight must be one of {OVERNIGHT_MODES}, got {overnight!r}")
 
         self.steps = steps
         self.price_col = price_col
         self.use_log_return = use_log_return
+        self.cross_day = cross_day
+        self.overnight = overnight
 
         base = "label_fwd_logret" if use_log_return else "label_fwd_ret"
-        self._label_col = output_col or f"{base}_s{steps}"
+        suffix = "" if not cross_day else ("_xday" if overnight == "include" else "_xday_nogap")
+        self._label_col = output_col or f"{base}_s{steps}{suffix}"
         logs.info(f'label col={self._label_col}')
 
     # ------------------------------------------------------------------
@@ -51,11 +115,18 @@ class ForwardReturnLabelEngine(BaseLabelEngine):
     def label_columns(self) -> Sequence[str]:
         return (self._label_col,)
 
-    def execute(self, table: pa.Table) -> pa.Table:
+    def execute(
+        self,
+        table: pa.Table,
+        *,
+        segment_starts: Optional[np.ndarray] = None,
+        next_session: Optional[NextSession] = None,
+    ) -> pa.Table:
         """
         输入：
-            - 单 symbol 子表
+            - 单 symbol 子表（或带 segment_starts 的多 symbol 整表）
             - 行顺序已按时间升序
+            - next_session：cross_day 时的次日开盘段（每个 segment 一段）
         输出：
             - append label 列
             - 行数不变
@@ -80,8 +151,59 @@ class ForwardReturnLabelEngine(BaseLabelEngine):
         else:
             label = pc.subtract(pc.divide(future_price, price), 1.0)
 
+        if segment_starts is not None:
+            n = table.num_rows
+            crosses = np.arange(n) + self.steps >= segment_end_of(n, segment_starts)
+            label = pc.if_else(pa.array(crosses), pa.scalar(None, label.type), label)
+
+        if self.cross_day and next_session is not None:
+            fill = self._cross_day_tail(to_float(price), segment_starts, next_session)
+            label = pc.if_else(
+                pa.array(np.isfinite(fill)),
+                pa.array(fill, pa.float64()),
+                pc.cast(label, pa.float64()),
+            )
+
         return table.append_column(self._label_col, label)
 
+    # ------------------------------------------------------------------
+    def _cross_day_tail(
+        self,
+        price: np.ndarray,
+        segment_starts: Optional[np.ndarray],
+        nxt: NextSession,
+    ) -> np.ndarray:
+        """
+        尾部行的跨日 label（非尾部 / 次日不足 → NaN）
+        """
+        n = len(price)
+        starts = np.array([0] if segment_starts is None else segment_starts, dtype=np.int64)
+        if len(starts) != len(nxt.lengths):
+            raise ValueError(
+                f"[{self.__class__.__name__}] next_session has {len(nxt.lengths)} segments, "
+                f"table has {len(starts)}"
+            )
+
+        t = np.arange(n)
+        end = segment_end_of(n, segment_starts)
+        seg = np.searchsorted(starts, t, side="right") - 1
+
+        k = t + self.steps - end                    # 次日第 k 行（0-based）
+        avail = (k >= 0) & (k < nxt.lengths[seg])
+        out = np.full(n, np.nan)
+        if not avail.any():
+            return out
+
+        t, seg, k = t[avail], seg[avail], k[avail]
+        future = nxt.close[nxt.starts[seg] + k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.overnight == "include":
+                ratio = future / price[t]
+            else:
+                ratio = (price[end[t] - 1] / price[t]) * (future / nxt.open[nxt.starts[seg]])
+            out[t] = np.log(ratio) if self.use_log_return else ratio - 1.0
+        return out
+
 def _shift_forward(arr: pa.Array, steps: int) -> pa.Array:
     """
     Forward shift (row-based):
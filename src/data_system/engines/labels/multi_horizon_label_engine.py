@@ -0,0 +1,162 @@
+#!filepath: src/data_system/engines/labels/multi_horizon_label_engine.py
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.data_system.engines.labels.base import BaseLabelEngine, require_columns
+from src.data_system.engines.rolling_kernels import (
+    forward_max,
+    forward_min,
+    segment_end_of,
+    to_float,
+)
+
+LABEL_SETS = ("ret", "logret", "mfe", "mae", "rvol")
+
+_NAMES = {
+    "ret": "label_fwd_ret_s{h}",
+    "logret": "label_fwd_logret_s{h}",
+    "mfe": "label_mfe_s{h}",
+    "mae": "label_mae_s{h}",
+    "rvol": "label_rvol_s{h}",
+}
+
+
+class MultiHorizonLabelEngine(BaseLabelEngine):
+    """
+    MultiHorizonLabelEngine（多 horizon · 多 label 集 · 单次扫描）
+
+    数学定义（row-based，h ∈ horizons）：
+        ret     = price[t+h] / price[t] - 1
+        logret  = log(price[t+h]) - log(price[t])
+        mfe     = max(price[t+1 .. t+h]) / price[t] - 1     （最大有利偏移）
+        mae     = min(price[t+1 .. t+h]) / price[t] - 1     （最大不利偏移）
+        rvol    = sqrt(Σ r_j^2), r_j = log(price[j] / price[j-1]), j ∈ t+1 .. t+h
+
+    架构约束（与 ForwardReturnLabelEngine 一致）：
+        - h 仅表示“向后多少行”
+        - 不跨 symbol（单 symbol 子表，或 segment_starts 给出段边界）
+        - 不改变行数；尾部不足 h 行 / 路径含缺失价格 → null
+        - 列名与 ForwardReturnLabelEngine 相同（label_fwd_ret_s{h} 等），可互换
+
+    计算方式：
+        - log price / 平方收益只算一次，所有 horizon 共享
+        - 每个 horizon 的极值为 O(n) 滑动窗口（与 h 无关）
+    """
+
+    segment_aware = True
+
+    def __init__(
+            self,
+            *,
+            horizons: Sequence[int],
+            label_sets: Sequence[str] = ("ret",),
+            price_col: str = "close",
+    ) -> None:
+        if not horizons or min(horizons) <= 0:
+            raise ValueError(f"horizons must be positive, got {list(horizons)}")
+        unknown = set(label_sets) - set(LABEL_SETS)
+        if unknown:
+            raise ValueError(f"unknown label sets: {sorted(unknown)}")
+        if not label_sets:
+            raise ValueError("label_sets must not be empty")
+
+        self.horizons = sorted(set(int(h) for h in horizons))
+        self.label_sets = [s for s in LABEL_SETS if s in label_sets]
+        self.price_col = price_col
+
+    # ------------------------------------------------------------------
+    # BaseLabelEngine API
+    # ------------------------------------------------------------------
+    def label_columns(self) -> Sequence[str]:
+        return tuple(
+            _NAMES[s].format(h=h)
+            for h in self.horizons
+            for s in self.label_sets
+        )
+
+    def execute(
+            self,
+            table: pa.Table,
+            *,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> pa.Table:
+        if table.num_rows == 0:
+            return table
+
+        require_columns(
+            table,
+            ["ts", "symbol", self.price_col],
+            who=self.__class__.__name__,
+        )
+
+        labels = multi_horizon_labels(
+            to_float(table[self.price_col]),
+            horizons=self.horizons,
+            label_sets=self.label_sets,
+            segment_starts=segment_starts,
+        )
+
+        out = table
+        for name, values in labels.items():
+            out = out.append_column(name, pa.array(values, pa.float64(), from_pandas=True))
+        return out
+
+
+# =============================================================================
+# kernel
+# =============================================================================
+def multi_horizon_labels(
+        price: np.ndarray,
+        *,
+        horizons: Sequence[int],
+        label_sets: Sequence[str],
+        segment_starts: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    返回 {列名: float64 ndarray}（NaN = 缺失），列序同 label_columns()
+    """
+    price = np.asarray(price, dtype=np.float64)
+    n = len(price)
+
+    ok = np.isfinite(price) & (price > 0)
+    p = np.where(ok, price, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lp = np.log(p)
+
+    end = segment_end_of(n, segment_starts)
+    t = np.arange(n)
+
+    # rvol：平方 log 收益（r2[j] = (lp[j] - lp[j-1])^2，缺失 → NaN）
+    #   不用整表前缀和：多 symbol 批量时累计量级远大于单窗口，相减会抵消出噪声
+    if "rvol" in label_sets:
+        r2 = np.r_[np.nan, np.diff(lp)] ** 2
+
+    out: Dict[str, np.ndarray] = {}
+    for h in horizons:
+        j = t + h
+        reach = j < end
+        jj = np.minimum(j, n - 1)
+
+        for s in label_sets:
+            name = _NAMES[s].format(h=h)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if s == "ret":
+                    v = p[jj] / p - 1.0
+                elif s == "logret":
+                    v = lp[jj] - lp
+                elif s == "mfe":
+                    v = forward_max(p, h, segment_starts=segment_starts) / p - 1.0
+                elif s == "mae":
+                    v = forward_min(p, h, segment_starts=segment_starts) / p - 1.0
+                else:
+                    # 窗口和 r2[t+1 .. t+h]：strided view，O(n·h) 但无 Python 循环
+                    padded = np.r_[r2, np.full(h, np.nan)]
+                    v = np.sqrt(sliding_window_view(padded, h).sum(axis=1)[1:n + 1])
+            out[name] = np.where(reach, v, np.nan)
+
+    return out
@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional, Sequence
 
+import numpy as np
 import pyarrow as pa
 
-from src.data_system.engines.labels.base import BaseLabelEngine, LabelSpec, require_columns
+from src.data_system.engines.labels.base import BaseLabelEngine, require_columns
+from src.data_system.engines.rolling_kernels import segment_end_of, to_float
 
 
 @dataclass(frozen=True)
@@ -20,7 +23,7 @@ class TripleBarrierLabelConfig:
 
     说明：
       - 这是“交易结果”风格 label，强依赖执行假设
-      - 你现在阶段建议只冻结接口，不启用
+      - barrier 以简单收益 price[j] / price[t] - 1 衡量
     """
     max_holding: int = 20
     pt: float = 0.01
@@ -31,36 +34,151 @@ class TripleBarrierLabelConfig:
 
 class TripleBarrierLabelEngine(BaseLabelEngine):
     """
-    TripleBarrierLabelEngine（接口冻结 / 实现占位）
+    TripleBarrierLabelEngine（向量化 · segment-aware）
 
     输入契约：
-      - 单日、单 symbol、有序
+      - 单 symbol 有序子表；或 segment_starts 给出段边界的多 symbol 整表
       - 至少包含 ts, symbol, price_col
 
-    输出：
-      - append 一列 int8 label：+1 / 0 / -1
-      - 行数不变，尾部 max_holding 行可能为 null/0（实现可选）
+    输出（行数不变，append 两列）：
+      - {col}          : int8，+1（先触止盈）/ -1（先触止损）/ 0（超时）
+      - {col}_touch_ts : 首次触及 barrier 的 ts；超时 → 第 max_holding 行的 ts
+
+    语义：
+      - 路径只看 t+1 .. t+max_holding，且不跨段（symbol）
+      - 尾部不足 max_holding 行：已触及 → 正常给出；未触及 → null
+      - price 缺失 / 非正 → null
+
+    计算方式：
+      - 倍增 sparse table：M_k[i] = max(x[i .. i + 2^k - 1])（滑动窗口极值）
+      - 对每行以二分跳跃在 O(log max_holding) 步内定位首次触及位置，
+        全部行同时推进 → O(n log max_holding) 向量化，无 Python 行级循环
     """
 
+    segment_aware = True
+
     def __init__(self, cfg: TripleBarrierLabelConfig):
         if cfg.max_holding <= 0:
             raise ValueError("max_holding must be positive")
         if cfg.pt <= 0 or cfg.sl <= 0:
             raise ValueError("pt/sl must be positive")
+        if cfg.sl >= 1:
+            raise ValueError("sl must be < 1")
         self._cfg = cfg
-        col = cfg.col_name or f"label_tb_m{cfg.max_holding}_pt{cfg.pt}_sl{cfg.sl}"
-        self._spec = LabelSpec(name="triple_barrier_v1", columns=(col,))
+        self._label_col = cfg.col_name or f"label_tb_m{cfg.max_holding}_pt{cfg.pt}_sl{cfg.sl}"
 
-    @property
-    def spec(self) -> LabelSpec:
-        return self._spec
+    # ------------------------------------------------------------------
+    # BaseLabelEngine API
+    # ------------------------------------------------------------------
+    def label_columns(self) -> Sequence[str]:
+        return (self._label_col, f"{self._label_col}_touch_ts")
 
-    def execute(self, table: pa.Table) -> pa.Table:
-        require_columns(table, ["ts", "symbol", self._cfg.price_col], who=self.__class__.__name__)
+    def execute(
+            self,
+            table: pa.Table,
+            *,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> pa.Table:
+        cfg = self._cfg
+        require_columns(table, ["ts", "symbol", cfg.price_col], who=self.__class__.__name__)
 
-        # 这里先冻结接口，不在当前阶段实现复杂逻辑，避免引入执行假设与研究噪声。
-        # 未来：你可以在此用 Arrow / numpy 实现路径扫描（单日内），并输出 +1/0/-1。
-        raise NotImplementedError(
-            "TripleBarrierLabelEngine is intentionally not implemented at current stage. "
-            "Interface is frozen; implement when Level-3 execution semantics are ready."
+        label, touch_ts = triple_barrier(
+            to_float(table[cfg.price_col]),
+            table["ts"].to_numpy(),
+            max_holding=cfg.max_holding,
+            pt=cfg.pt,
+            sl=cfg.sl,
+            segment_starts=segment_starts,
         )
+
+        valid = label != _MISSING
+        label_col, touch_col = self.label_columns()
+        return table.append_column(
+            label_col,
+            pa.array(label.astype(np.int8), pa.int8(), mask=~valid),
+        ).append_column(
+            touch_col,
+            pa.array(touch_ts, table.schema.field("ts").type, mask=~valid),
+        )
+
+
+# =============================================================================
+# kernels
+# =============================================================================
+_MISSING = np.int64(-128)
+
+
+def _first_touch(
+        x: np.ndarray,
+        thr: np.ndarray,
+        start: np.ndarray,
+        limit: np.ndarray,
+        span: int,
+) -> np.ndarray:
+    """
+    每行 i：在 [start[i], limit[i]] 内第一个 x[j] >= thr[i] 的 j；不存在 → len(x)
+
+    倍增表 table[k][j] = max(x[j .. j + 2^k - 1])；从高位到低位跳过“整块未触及”的
+    区间，最终位置即首次触及点（等价于对偏移量逐位二分）。
+    """
+    n = len(x)
+    levels = max(int(span).bit_length(), 1)
+    xp = np.r_[x, np.full(1 << levels, -np.inf)]
+
+    tables = [xp]
+    for k in range(1, levels):
+        prev, w = tables[-1], 1 << (k - 1)
+        cur = prev.copy()
+        np.maximum(prev[:-w], prev[w:], out=cur[:-w])
+        tables.append(cur)
+
+    pos = start.copy()
+    for k in reversed(range(levels)):
+        step = 1 << k
+        jump = (pos + step - 1 <= limit) & (tables[k][pos] < thr)
+        pos = np.where(jump, pos + step, pos)
+
+    hit = (pos <= limit) & (xp[pos] >= thr)
+    return np.where(hit, pos, n)
+
+
+def triple_barrier(
+        price: np.ndarray,
+        ts: np.ndarray,
+        *,
+        max_holding: int,
+        pt: float,
+        sl: float,
+        segment_starts: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    返回 (label, touch_ts)；label 为 int64，缺失行为 _MISSING
+    """
+    price = np.asarray(price, dtype=np.float64)
+    n = len(price)
+    label = np.full(n, _MISSING, dtype=np.int64)
+    touch_ts = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return label, touch_ts
+
+    end = segment_end_of(n, segment_starts)
+    t = np.arange(n, dtype=np.int64)
+    limit = np.minimum(t + max_holding, end - 1)
+    complete = t + max_holding <= end - 1
+
+    ok = np.isfinite(price) & (price > 0)
+    hi = np.where(ok, price, -np.inf)
+    lo = np.where(ok, -price, -np.inf)  # 下穿 ⇔ -p >= -barrier
+
+    with np.errstate(invalid="ignore"):
+        up = _first_touch(hi, price * (1.0 + pt), t + 1, limit, max_holding)
+        dn = _first_touch(lo, -price * (1.0 - sl), t + 1, limit, max_holding)
+
+    first = np.minimum(up, dn)
+    touched = first < n
+    valid = ok & (touched | complete)
+
+    label[valid] = np.where(up < dn, 1, np.where(dn < up, -1, 0))[valid]
+    idx = np.where(touched, first, np.minimum(t + max_holding, n - 1))
+    touch_ts[valid] = np.asarray(ts)[idx[valid]]
+    return label, touch_ts
@@ -1,11 +1,16 @@
 # #!filepath: src/data_system/engines/minute_trade_agg_engine.py
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.compute as pc
 
+from src.session.a_share_session import ASharesSessionResolver
+
 US_PER_MINUTE = 60 * 1_000_000
 US_PER_HOUR = 3600 * 1_000_000
 US_PER_DAY = 24 * 3600 * 1_000_000
@@ -45,6 +50,16 @@ def _mod(a: pa.Array, b: int) -> pa.Array:
     )
 
 
+def _floordiv(a: pa.Array, b: int) -> pa.Array:
+    """
+    Arrow-safe floor division → int64
+    """
+    return pc.cast(
+        pc.floor(pc.divide(a, pa.scalar(b, pa.int64()))),
+        pa.int64(),
+    )
+
+
 def _epoch_days_to_yyyymmdd(days: int) -> int:
     """
     Convert days since Unix epoch to YYYYMMDD (UTC-based, deterministic).
@@ -55,6 +70,135 @@ def _epoch_days_to_yyyymmdd(days: int) -> int:
     return dt.year * 10000 + dt.month * 100 + dt.day
 
 
+# minute-of-day → "HH:MM"（全天 1440 项，覆盖集合竞价 / 盘后分钟）
+_MINUTE_STR_LUT = pa.array(
+    [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)],
+    type=pa.string(),
+)
+
+
+def minute_time_columns(minute_local_us: pa.Array) -> dict[str, pa.Array]:
+    """
+    minute_local_us → 研究友好时间维度（全向量化）
+
+    - trade_date : 每个 distinct day 只做一次 Python 换算，再 take 回填
+    - minute     : HHMM（int16）
+    - minute_str : 1440 项查表
+    """
+    t = minute_local_us
+
+    # minute of local day
+    minute_of_day = _floordiv(_mod(t, US_PER_DAY), US_PER_MINUTE)
+
+    hour = _floordiv(minute_of_day, 60)
+    minute_hhmm = pc.add(
+        pc.multiply(hour, pa.scalar(100, pa.int64())),
+        pc.subtract(minute_of_day, pc.multiply(hour, pa.scalar(60, pa.int64()))),
+    )
+
+    # trade_date: derive from local wall-clock epoch (days since epoch)
+    days = _floordiv(t, US_PER_DAY)
+    uniq = pc.unique(days)
+    dates = pa.array(
+        [_epoch_days_to_yyyymmdd(d) for d in uniq.to_pylist()],
+        type=pa.int32(),
+    )
+    trade_date = dates.take(pc.index_in(days, value_set=uniq))
+
+    return {
+        "trade_date": trade_date,
+        "minute": pc.cast(minute_hhmm, pa.int16()),
+        "minute_str": _MINUTE_STR_LUT.take(minute_of_day),
+    }
+
+
+# =============================================================================
+# Session grid
+# =============================================================================
+_AUCTION_MODES = ("fold", "bar", "drop")
+_MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True)
+class SessionGridConfig:
+    """
+    固定交易时段分钟网格（由 SessionResolver 的连续时段生成）
+
+    open_auction / close_auction:
+      - "fold" : 并入相邻连续时段 bar（开盘 → 09:30，收盘 → 14:59）
+      - "bar"  : 独立 bar（开盘撮合 09:25，收盘撮合 15:00）
+      - "drop" : 丢弃
+
+    固定规则：
+      - 午间收盘时刻（11:30:00 成交）并入该时段最后一个 bar（11:29）
+      - 时段外其余成交（盘后固定价格等）丢弃
+    """
+
+    open_auction: str = "fold"
+    close_auction: str = "fold"
+    resolver: ASharesSessionResolver = field(default_factory=ASharesSessionResolver)
+
+    def __post_init__(self) -> None:
+        for name in ("open_auction", "close_auction"):
+            if getattr(self, name) not in _AUCTION_MODES:
+                raise ValueError(
+                    f"[SessionGridConfig] {name} must be one of {_AUCTION_MODES}, "
+                    f"got {getattr(self, name)!r}"
+                )
+
+    # ------------------------------------------------------------------
+    def slots(self) -> np.ndarray:
+        """
+        网格 bar 的起点（minute-of-day），升序
+        """
+        minutes = list(self.resolver.session_minutes())
+        if self.open_auction == "bar":
+            minutes.insert(0, _mod_minute(self.resolver.OPEN_AUCTION[1]))
+        if self.close_auction == "bar":
+            minutes.append(_mod_minute(self.resolver.CLOSE_AUCTION[1]))
+        return np.asarray(minutes, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    def slot_lut(self) -> np.ndarray:
+        """
+        minute-of-day（0..1439）→ slot 下标；-1 表示丢弃
+        """
+        slots = self.slots()
+        pos = {int(m): i for i, m in enumerate(slots)}
+        lut = np.full(_MINUTES_PER_DAY, -1, dtype=np.int64)
+
+        sessions = self.resolver.SESSIONS
+        for k, (start, end) in enumerate(sessions):
+            s, e = _mod_minute(start), _mod_minute(end)
+            for m in range(s, e):
+                lut[m] = pos[m]
+            if k < len(sessions) - 1:
+                lut[e] = pos[e - 1]
+
+        # 开盘集合竞价：[auction_start, first_session_start)
+        first = _mod_minute(sessions[0][0])
+        a_start = _mod_minute(self.resolver.OPEN_AUCTION[0])
+        if self.open_auction != "drop":
+            target = (
+                pos[first] if self.open_auction == "fold"
+                else pos[_mod_minute(self.resolver.OPEN_AUCTION[1])]
+            )
+            lut[a_start:first] = target
+
+        # 收盘集合竞价撮合 minute（15:00）
+        match = _mod_minute(self.resolver.CLOSE_AUCTION[1])
+        if self.close_auction == "fold":
+            lut[match] = pos[_mod_minute(sessions[-1][1]) - 1]
+        elif self.close_auction == "bar":
+            lut[match] = pos[match]
+
+        return lut
+
+
+def _mod_minute(t) -> int:
+    return t.hour * 60 + t.minute
+
+
 # =============================================================================
 # Engine
 # =============================================================================
@@ -94,6 +238,18 @@ class MinuteTradeAggEngine:
       - trade_date / minute / minute_str 仅用于研究与 debug
       - 本 Engine 不输出 timestamp
       - China 市场假设 UTC+8，无 DST
+
+    两种入口：
+      - execute(table)      : 单 symbol（逐 symbol 调用）
+      - execute_many(table) : 全交易所一次 group_by(symbol, minute_local_us)，
+                              输出末尾附带 symbol 列
+
+    grid（可选，SessionGridConfig）：
+      - 输出固定为 n_symbols × n_days × N 行（N = 网格 bar 数，A 股默认 240）
+      - 行在 symbol 间对齐 → 截面运算即 reshape(n_symbols, N)
+      - 无成交 minute：volume / notional / trade_count = 0，
+        close 前向填充，open / high / low = 前一 close
+      - 当日首笔成交之前的 minute：价格为 null
     """
 
     # ------------------------------------------------------------------
@@ -102,12 +258,31 @@ class MinuteTradeAggEngine:
 
     _US_PER_MINUTE = 60 * 1_000_000
 
-    def __init__(self, exchange: str = "CN") -> None:
+    _AGGREGATIONS = [
+        ("price", "first"),  # open
+        ("price", "max"),  # high
+        ("price", "min"),  # low
+        ("price", "last"),  # close
+        ("volume", "sum"),
+        ("notional", "sum"),
+        ("price", "count"),  # trade_count
+    ]
+
+    def __init__(
+            self,
+            exchange: str = "CN",
+            grid: Optional[SessionGridConfig] = None,
+    ) -> None:
         try:
             self._offset_us = _EXCHANGE_OFFSET_US[exchange]
         except KeyError:
             raise ValueError(f"Unsupported exchange: {exchange}")
 
+        self.grid = grid
+        if grid is not None:
+            self._grid_slots = grid.slots()
+            self._grid_lut = grid.slot_lut()
+
     # ------------------------------------------------------------------
     def execute(self, table: pa.Table) -> pa.Table:
         if table.num_rows == 0:
@@ -115,116 +290,211 @@ class MinuteTradeAggEngine:
 
         self._assert_sorted_ts(table["ts"])
 
-        ts = table["ts"]  # int64 epoch us
-
-        # --------------------------------------------------
-        # 1. absolute time → local wall-clock time axis
-        # --------------------------------------------------
-        ts_local_us = pc.add(
-            ts,
-            pa.scalar(self._offset_us, pa.int64()),
-        )
+        if self.grid is not None:
+            return self._execute_grid(table, with_symbol=False)
 
-        # --------------------------------------------------
-        # 2. local minute alignment (core truth)
-        # --------------------------------------------------
-        minute_local_us = pc.multiply(
-            pc.cast(
-                pc.floor(pc.divide(ts_local_us, pa.scalar(US_PER_MINUTE))),
-                pa.int64(),
-            ),
-            pa.scalar(US_PER_MINUTE),
+        table = table.append_column(
+            "minute_local_us", self._minute_local_us(table["ts"])
         )
 
-        table = table.append_column("minute_local_us", minute_local_us)
-
         # --------------------------------------------------
-        # 3. group by minute_local_us
+        # group by minute_local_us
         # --------------------------------------------------
         grouped = (
             table
             .group_by("minute_local_us", use_threads=False)
-            .aggregate(
-                [
-                    ("price", "first"),  # open
-                    ("price", "max"),  # high
-                    ("price", "min"),  # low
-                    ("price", "last"),  # close
-                    ("volume", "sum"),
-                    ("notional", "sum"),
-                    ("price", "count"),  # trade_count
-                ]
-            )
+            .aggregate(self._AGGREGATIONS)
         )
 
-        # --------------------------------------------------
-        # 4. derive research-friendly time dimensions
-        # --------------------------------------------------
-        t = grouped["minute_local_us"]
+        return self._build_output(grouped)
 
-        # seconds since local midnight
-        t_day = _mod(t, US_PER_DAY)
+    # ------------------------------------------------------------------
+    def execute_many(self, table: pa.Table) -> pa.Table:
+        """
+        全交易所一次性聚合（multi-symbol）
 
-        # hour = (t % day) // hour
-        hour = pc.cast(
-            pc.floor(
-                pc.divide(
-                    t_day,
-                    pa.scalar(US_PER_HOUR, pa.int64()),
-                )
-            ),
-            pa.int64(),
-        )
+        输入：
+          - enriched trade Arrow Table（多 symbol，canonical：symbol 分块、块内 ts 升序）
+          - 额外要求列：symbol
 
-        # minute = (t % hour) // minute
-        t_hour = _mod(t, US_PER_HOUR)
+        输出：
+          - 与逐 symbol execute + Step 追加 symbol 列完全一致的 schema
+          - 行序：(symbol, minute) 升序（group 按首次出现顺序，输入已 canonical）
+        """
+        if table.num_rows == 0:
+            return table
 
-        minute = pc.cast(
-            pc.floor(
-                pc.divide(
-                    t_hour,
-                    pa.scalar(US_PER_MINUTE, pa.int64()),
-                )
-            ),
-            pa.int64(),
+        if "symbol" not in table.column_names:
+            raise KeyError("MinuteTradeAggEngine.execute_many requires 'symbol'")
+
+        self._assert_sorted_symbol_ts(table["symbol"], table["ts"])
+
+        if self.grid is not None:
+            return self._execute_grid(table, with_symbol=True)
+
+        table = table.append_column(
+            "minute_local_us", self._minute_local_us(table["ts"])
         )
 
-        # HHMM
-        minute_hhmm = pc.add(
-            pc.multiply(hour, pa.scalar(100, pa.int64())),
-            minute,
+        # use_threads=False：保证 first / last 的有序语义与 group 出现顺序
+        grouped = (
+            table
+            .group_by(["symbol", "minute_local_us"], use_threads=False)
+            .aggregate(self._AGGREGATIONS)
         )
 
-        # trade_date: derive from local wall-clock epoch (days since epoch)
-        days = pc.cast(
-            pc.floor(
-                pc.divide(
-                    t,
-                    pa.scalar(US_PER_DAY, pa.int64()),
-                )
-            ),
-            pa.int64(),
+        symbol = grouped["symbol"]
+        if pa.types.is_dictionary(symbol.type):
+            symbol = pc.cast(symbol, pa.string())
+
+        out = self._build_output(grouped)
+        return out.append_column("symbol", symbol)
+
+    # ------------------------------------------------------------------
+    def _minute_local_us(self, ts: pa.ChunkedArray) -> pa.Array:
+        # 1. absolute time → local wall-clock time axis
+        ts_local_us = pc.add(
+            ts,
+            pa.scalar(self._offset_us, pa.int64()),
         )
 
-        trade_date = pa.array(
-            [_epoch_days_to_yyyymmdd(d) for d in days.to_pylist()],
-            type=pa.int32(),
+        # 2. local minute alignment (core truth)
+        return pc.multiply(
+            _floordiv(ts_local_us, US_PER_MINUTE),
+            pa.scalar(US_PER_MINUTE),
         )
 
-        minute_str = pa.array(
-            [f"{h:02d}:{m:02d}" for h, m in zip(hour.to_pylist(), minute.to_pylist())],
-            type=pa.string(),
+    # ------------------------------------------------------------------
+    def _execute_grid(self, table: pa.Table, *, with_symbol: bool) -> pa.Table:
+        """
+        聚合到固定 session 网格（numpy 一次排序 + reduceat）
+
+        cell = (symbol, day, slot)；stable argsort 保证 cell 内成交保持 ts 顺序
+        """
+        minute_abs = np.floor_divide(
+            table["ts"].to_numpy() + self._offset_us, US_PER_MINUTE
+        ).astype(np.int64)
+        day = np.floor_divide(minute_abs, _MINUTES_PER_DAY)
+        slot = self._grid_lut[minute_abs - day * _MINUTES_PER_DAY]
+
+        keep = slot >= 0
+        if not keep.all():
+            table = table.filter(pa.array(keep))
+            day, slot = day[keep], slot[keep]
+
+        # symbol → 有序编码（输出按 symbol 升序）
+        if with_symbol:
+            enc = pc.dictionary_encode(table["symbol"]).combine_chunks()
+            names = np.asarray(enc.dictionary.to_pylist(), dtype=object)
+            order = np.argsort(names, kind="stable")
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            sym_code = rank[enc.indices.to_numpy(zero_copy_only=False)]
+            symbols = names[order]
+        else:
+            sym_code = np.zeros(len(day), dtype=np.int64)
+            symbols = np.asarray([None], dtype=object)
+
+        days, day_code = np.unique(day, return_inverse=True)
+        n_slots = len(self._grid_slots)
+        n_block = len(days) * n_slots
+        n_cells = (len(symbols) if len(day) else 0) * n_block
+
+        cell = (sym_code * len(days) + day_code) * n_slots + slot
+        order = np.argsort(cell, kind="stable")
+        cell_s = cell[order]
+
+        price = table["price"].to_numpy()[order].astype(np.float64)
+        volume = table["volume"].to_numpy()[order].astype(np.int64)
+        notional = table["notional"].to_numpy()[order].astype(np.float64)
+
+        # ------------------------------------------------------------------
+        # per-cell OHLCV
+        # ------------------------------------------------------------------
+        open_ = np.full(n_cells, np.nan)
+        high = np.full(n_cells, np.nan)
+        low = np.full(n_cells, np.nan)
+        close = np.full(n_cells, np.nan)
+        vol_out = np.zeros(n_cells, dtype=np.int64)
+        notional_out = np.zeros(n_cells, dtype=np.float64)
+        count = np.zeros(n_cells, dtype=np.int64)
+
+        if len(cell_s):
+            starts = np.flatnonzero(np.r_[True, cell_s[1:] != cell_s[:-1]])
+            ends = np.r_[starts[1:], len(cell_s)]
+            cells = cell_s[starts]
+
+            open_[cells] = price[starts]
+            close[cells] = price[ends - 1]
+            high[cells] = np.maximum.reduceat(price, starts)
+            low[cells] = np.minimum.reduceat(price, starts)
+            vol_out[cells] = np.add.reduceat(volume, starts)
+            notional_out[cells] = np.add.reduceat(notional, starts)
+            count[cells] = ends - starts
+
+        # ------------------------------------------------------------------
+        # forward fill within (symbol, day)
+        # ------------------------------------------------------------------
+        pos = np.arange(n_cells)
+        last = np.maximum.accumulate(np.where(count > 0, pos, -1)) if n_cells else pos
+        filled = last >= (pos // n_slots) * n_slots
+        prev_close = close[np.where(filled, last, 0)] if n_cells else close
+
+        traded = count > 0
+        stale = ~traded & filled
+        open_ = np.where(stale, prev_close, open_)
+        high = np.where(stale, prev_close, high)
+        low = np.where(stale, prev_close, low)
+        close = np.where(filled, prev_close, close)
+
+        # ------------------------------------------------------------------
+        # grid time axis
+        # ------------------------------------------------------------------
+        minute_of_block = np.add.outer(days * _MINUTES_PER_DAY, self._grid_slots).ravel()
+        ts = np.tile(minute_of_block, len(symbols) if n_cells else 0) * US_PER_MINUTE
+        ts = pa.array(ts.astype(np.int64), pa.int64())
+        time_cols = minute_time_columns(ts)
+
+        def _price(values: np.ndarray) -> pa.Array:
+            return pa.array(values, pa.float64(), mask=~filled)
+
+        out = pa.table(
+            {
+                "ts": ts,
+                "trade_date": time_cols["trade_date"],
+                "minute": time_cols["minute"],
+                "minute_str": time_cols["minute_str"],
+
+                "open": _price(open_),
+                "high": _price(high),
+                "low": _price(low),
+                "close": _price(close),
+                "volume": pa.array(vol_out, pa.int64()),
+                "notional": pa.array(notional_out, pa.float64()),
+                "trade_count": pa.array(count, pa.int64()),
+            }
         )
 
-        # --------------------------------------------------
-        # 5. final output schema (frozen)
-        # --------------------------------------------------
+        if with_symbol:
+            out = out.append_column(
+                "symbol",
+                pa.array(np.repeat(symbols, n_block) if n_cells else [], pa.string()),
+            )
+        return out
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _build_output(grouped: pa.Table) -> pa.Table:
+        t = grouped["minute_local_us"]
+        time_cols = minute_time_columns(t)
+
+        # final output schema (frozen)
         return pa.table(
             {
-                "ts": grouped["minute_local_us"],
-                "trade_date": trade_date,
-                "minute": pc.cast(minute_hhmm, pa.int16()),
-                "minute_str": minute_str,
+                "ts": t,
+                "trade_date": time_cols["trade_date"],
+                "minute": time_cols["minute"],
+                "minute_str": time_cols["minute_str"],
 
                 "open": grouped["price_first"],
                 "high": grouped["price_max"],
@@ -236,6 +506,23 @@ class MinuteTradeAggEngine:
             }
         )
 
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _assert_sorted_symbol_ts(symbol: pa.ChunkedArray, ts: pa.ChunkedArray) -> None:
+        """
+        Require ts non-decreasing within each contiguous symbol block.
+        """
+        n = len(ts)
+        if n <= 1:
+            return
+
+        same = pc.equal(symbol.slice(1), symbol.slice(0, n - 1))
+        desc = pc.less(ts.slice(1), ts.slice(0, n - 1))
+        if pc.any(pc.and_(same, desc)).as_py():
+            raise ValueError(
+                "MinuteTradeAggEngine requires input sorted by ts within symbol"
+            )
+
     # ------------------------------------------------------------------
     @staticmethod
     def _assert_sorted_ts(ts: pa.Array) -> None:
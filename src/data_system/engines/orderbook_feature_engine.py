@@ -0,0 +1,322 @@
+# src/data_system/engines/orderbook_feature_engine.py
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.data_system.engines.minute_trade_agg_engine import (
+    US_PER_MINUTE,
+    _EXCHANGE_OFFSET_US,
+)
+from src.data_system.engines.orderbook_rebuild_engine import OrderBook
+
+EVENT_COLUMNS = ["ts", "event", "order_id", "side", "price", "volume", "buy_no", "sell_no"]
+
+# 分钟内累计的流量类 feature（无事件 → 0）；其余为盘口状态（无事件 → 沿用上一快照）
+FLOW_FEATURES = ("ob_ofi", "ob_cancel_ratio", "ob_queue_depletion")
+
+
+class _BestLevels:
+    """
+    最优价追踪（堆 + lazy deletion），O(log P) 摊还
+
+    OrderBook 只维护 price -> qty 字典；这里额外维护两个堆，
+    失效价位（qty 已移除）在查询时弹出。
+    """
+
+    def __init__(self, book: OrderBook) -> None:
+        self.book = book
+        self._bids: List[float] = []  # -price
+        self._asks: List[float] = []
+
+    def push(self, side: str, price: float) -> None:
+        if side == "B":
+            heapq.heappush(self._bids, -price)
+        else:
+            heapq.heappush(self._asks, price)
+
+    def bid(self) -> tuple[float, int]:
+        h, qty = self._bids, self.book.bid_qty
+        while h and -h[0] not in qty:
+            heapq.heappop(h)
+        return (-h[0], qty[-h[0]]) if h else (np.nan, 0)
+
+    def ask(self) -> tuple[float, int]:
+        h, qty = self._asks, self.book.ask_qty
+        while h and h[0] not in qty:
+            heapq.heappop(h)
+        return (h[0], qty[h[0]]) if h else (np.nan, 0)
+
+
+class OrderBookFeatureEngine:
+    """
+    OrderBookFeatureEngine（单 symbol · 单次流式扫描）
+
+    输入：
+      - 单 symbol 的 L2 事件流（ADD / CANCEL / TRADE，INTERNAL_SCHEMA 列）
+        * order 流：ADD / CANCEL（order_id 即委托号）
+        * trade 流：TRADE（以 buy_no / sell_no 定位被成交委托）；
+                    深交所撤单回报（CANCEL + buy_no / sell_no）同样支持
+      - 可乱序输入：engine 内部按 (ts, ADD 优先) 稳定排序
+
+    输出（每个有事件的分钟一行，ts 与 min 阶段同轴：本地钟面分钟 epoch us）：
+      - ob_spread          : 分钟末 ask1 - bid1
+      - ob_rel_spread      : spread / mid
+      - ob_microprice      : (bid1 * askq1 + ask1 * bidq1) / (bidq1 + askq1)
+      - ob_depth_imb_{k}   : 分钟末前 k 档 (Σbid - Σask) / (Σbid + Σask)
+      - ob_ofi             : 分钟内 Cont-Kukanov-Stoikov order-flow imbalance 累计
+      - ob_cancel_ratio    : 撤单量 / 新增委托量
+      - ob_queue_depletion : 最优档被成交 + 撤单消耗的量 / 分钟初最优档深度
+
+    语义：
+      - 分钟末快照只依赖该分钟及之前的事件 → no-leak
+      - 只有一侧盘口时价差类 feature 为 null
+    """
+
+    def __init__(
+            self,
+            *,
+            levels: Sequence[int] = (1, 5, 10),
+            exchange: str = "CN",
+    ) -> None:
+        if not levels or min(levels) <= 0:
+            raise ValueError(f"[OrderBookFeature] invalid levels: {levels}")
+        try:
+            self._offset_us = _EXCHANGE_OFFSET_US[exchange]
+        except KeyError:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+
+        self.levels = sorted(set(int(k) for k in levels))
+
+    # ------------------------------------------------------------------
+    def feature_names(self) -> List[str]:
+        return [
+            "ob_spread",
+            "ob_rel_spread",
+            "ob_microprice",
+            *(f"ob_depth_imb_{k}" for k in self.levels),
+            "ob_ofi",
+            "ob_cancel_ratio",
+            "ob_queue_depletion",
+        ]
+
+    # ------------------------------------------------------------------
+    def execute(self, events: pa.Table) -> pa.Table:
+        rows: Dict[str, list] = {"ts": []}
+        for name in self.feature_names():
+            rows[name] = []
+
+        if events.num_rows == 0:
+            return self._to_table(rows)
+
+        events = self._ordered(events)
+        cols = {c: events[c].to_pylist() for c in EVENT_COLUMNS}
+        ts_list = cols["ts"]
+        minute_list = (
+            (np.asarray(ts_list, dtype=np.int64) + self._offset_us) // US_PER_MINUTE * US_PER_MINUTE
+        ).tolist()
+
+        book = OrderBook()
+        best = _BestLevels(book)
+
+        cur_minute: Optional[int] = None
+        pb, qb = best.bid()
+        pa_, qa = best.ask()
+        acc = self._new_acc(qb + qa)
+
+        for i in range(len(ts_list)):
+            minute = minute_list[i]
+            if minute != cur_minute:
+                if cur_minute is not None:
+                    self._emit(rows, cur_minute, book, best, acc)
+                cur_minute = minute
+                acc = self._new_acc(qb + qa)
+
+            self._apply(
+                book,
+                best,
+                acc,
+                pb,
+                pa_,
+                ts=ts_list[i],
+                event=cols["event"][i],
+                order_id=cols["order_id"][i],
+                side=cols["side"][i],
+                price=cols["price"][i],
+                volume=cols["volume"][i],
+                buy_no=cols["buy_no"][i],
+                sell_no=cols["sell_no"][i],
+            )
+
+            # OFI（以事件为单位的最优档变化）
+            nb, nqb = best.bid()
+            na, nqa = best.ask()
+            acc["ofi"] += _ofi(pb, qb, nb, nqb, pa_, qa, na, nqa)
+            pb, qb, pa_, qa = nb, nqb, na, nqa
+
+        self._emit(rows, cur_minute, book, best, acc)
+        return self._to_table(rows)
+
+    # ==================================================================
+    # event application
+    # ==================================================================
+    @staticmethod
+    def _new_acc(depth_at_open: int) -> Dict[str, float]:
+        return {
+            "ofi": 0.0,
+            "add": 0.0,
+            "cancel": 0.0,
+            "depleted": 0.0,
+            "depth_open": float(depth_at_open),
+        }
+
+    @staticmethod
+    def _ordered(events: pa.Table) -> pa.Table:
+        """
+        (ts, ADD 优先) 稳定排序：同一时刻的成交 / 撤单不能早于其委托
+        """
+        rank = pc.if_else(pc.equal(events["event"], "ADD"), 0, 1)
+        events = events.append_column("_rank", rank)
+        order = pc.sort_indices(
+            events,
+            sort_keys=[("ts", "ascending"), ("_rank", "ascending")],
+        )
+        return events.take(order).drop_columns(["_rank"])
+
+    def _apply(
+            self,
+            book: OrderBook,
+            best: _BestLevels,
+            acc: Dict[str, float],
+            bid1: float,
+            ask1: float,
+            *,
+            ts: int,
+            event: str,
+            order_id: Optional[int],
+            side: Optional[str],
+            price: Optional[float],
+            volume: Optional[int],
+            buy_no: Optional[int],
+            sell_no: Optional[int],
+    ) -> None:
+        vol = int(volume or 0)
+
+        if event == "ADD":
+            if side in ("B", "S") and price is not None and order_id not in book.orders:
+                best.push(side, float(price))
+                acc["add"] += vol
+            book.add_order(ts=ts, order_id=order_id, side=side, price=price, volume=volume)
+            return
+
+        if event == "CANCEL":
+            targets = [order_id] if order_id in book.orders else [buy_no, sell_no]
+        elif event == "TRADE":
+            targets = [buy_no, sell_no]
+        else:
+            raise ValueError(f"Unknown event={event}")
+
+        for oid in targets:
+            o = book.orders.get(oid) if oid else None
+            if o is None:
+                continue
+
+            # 撤单未给出量 → 整单撤
+            removed = min(vol, o.volume) if vol > 0 else o.volume
+            if event == "CANCEL":
+                acc["cancel"] += removed
+            if o.price == (bid1 if o.side == "B" else ask1):
+                acc["depleted"] += removed
+
+            book.trade(ts=ts, order_id=oid, volume=removed)
+
+    # ==================================================================
+    # minute snapshot
+    # ==================================================================
+    def _emit(
+            self,
+            rows: Dict[str, list],
+            minute: int,
+            book: OrderBook,
+            best: _BestLevels,
+            acc: Dict[str, float],
+    ) -> None:
+        bid, bq = best.bid()
+        ask, aq = best.ask()
+
+        spread = ask - bid
+        mid = (ask + bid) / 2.0
+        rows["ts"].append(minute)
+        rows["ob_spread"].append(spread)
+        rows["ob_rel_spread"].append(spread / mid if mid > 0 else np.nan)
+        rows["ob_microprice"].append(
+            (bid * aq + ask * bq) / (bq + aq) if bq + aq > 0 else np.nan
+        )
+
+        depth = max(self.levels)
+        bid_q = [book.bid_qty[p] for p in heapq.nlargest(depth, book.bid_qty)]
+        ask_q = [book.ask_qty[p] for p in heapq.nsmallest(depth, book.ask_qty)]
+        for k in self.levels:
+            b, a = sum(bid_q[:k]), sum(ask_q[:k])
+            rows[f"ob_depth_imb_{k}"].append((b - a) / (b + a) if b + a > 0 else 0.0)
+
+        rows["ob_ofi"].append(acc["ofi"])
+        rows["ob_cancel_ratio"].append(acc["cancel"] / acc["add"] if acc["add"] > 0 else 0.0)
+        rows["ob_queue_depletion"].append(
+            acc["depleted"] / acc["depth_open"] if acc["depth_open"] > 0 else 0.0
+        )
+
+    @staticmethod
+    def _to_table(rows: Dict[str, list]) -> pa.Table:
+        columns = {"ts": pa.array(rows["ts"], pa.int64())}
+        for name, values in rows.items():
+            if name == "ts":
+                continue
+            columns[name] = pa.array(np.asarray(values, dtype=np.float64), pa.float64(), from_pandas=True)
+        return pa.table(columns)
+
+
+def _ofi(
+        pb: float, qb: int, nb: float, nqb: int,
+        pa_: float, qa: int, na: float, nqa: int,
+) -> float:
+    """
+    e_n = 1{Pb_n >= Pb_{n-1}} qb_n - 1{Pb_n <= Pb_{n-1}} qb_{n-1}
+        - 1{Pa_n <= Pa_{n-1}} qa_n + 1{Pa_n >= Pa_{n-1}} qa_{n-1}
+
+    空盘口一侧视为价格缺失：该侧贡献为 0
+    """
+    e = 0.0
+    if not (np.isnan(pb) or np.isnan(nb)):
+        e += (nqb if nb >= pb else 0) - (qb if nb <= pb else 0)
+    if not (np.isnan(pa_) or np.isnan(na)):
+        e += -(nqa if na <= pa_ else 0) + (qa if na >= pa_ else 0)
+    return e
+
+
+def align_to_minutes(features: pa.Table, minutes: pa.Array | pa.ChunkedArray) -> pa.Table:
+    """
+    按 min 表的 ts 对齐（单 symbol，逐行 take）
+
+    min 中无事件的分钟：
+      - 盘口状态（spread / microprice / depth_imb ...）：盘口未变 → 沿用最近一个
+        有事件分钟的快照（含其 null，如单边盘口）
+      - 流量类（FLOW_FEATURES）：无事件 → 0.0
+      - 首个有事件分钟之前（盘口未知）→ 全部 null
+    """
+    idx = pc.index_in(minutes, value_set=features["ts"])
+    last = pc.fill_null_forward(idx)
+    columns = {"ts": minutes}
+    for name in features.column_names:
+        if name == "ts":
+            continue
+        if name in FLOW_FEATURES:
+            flow = pc.take(features[name], idx)
+            columns[name] = pc.if_else(pc.and_(pc.is_null(idx), pc.is_valid(last)), 0.0, flow)
+        else:
+            columns[name] = pc.take(features[name], last)
+    return pa.table(columns)
@@ -0,0 +1,388 @@
+# src/data_system/engines/rolling_kernels.py
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from scipy.signal import lfilter
+
+
+# =============================================================================
+# Rolling kernels（NumPy-native · strict shift-1）
+# =============================================================================
+#
+# 统一语义（冻结，与 pandas `x.shift(1).rolling(w, min_periods=w)` 一致）：
+#
+#   out[t] = stat(x[t-w], ..., x[t-1])
+#
+#   - 窗口只包含历史（不含 t）→ no-leak
+#   - 历史不足 w 行，或窗口内含 NaN / ±inf → NaN（由调用方决定填充）
+#   - O(n)：cumsum / run-length / block prefix-suffix，不随 w 增长
+#
+# segment_starts（可选，多 symbol 批量计算）：
+#
+#   - 升序的段起点行号（如 slice index 的 start），第一个必须为 0
+#   - 窗口不跨段：跨越段起点的窗口 → NaN，等价于逐段独立计算
+#
+# =============================================================================
+
+
+def to_float(col: pa.Array | pa.ChunkedArray) -> np.ndarray:
+    """
+    Arrow 数值列 → float64 ndarray（null → NaN）
+    """
+    return pc.cast(col, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def is_numeric(t: pa.DataType) -> bool:
+    """
+    与 pandas is_numeric_dtype 对齐：int / float / bool
+    """
+    return pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t)
+
+
+def fill_nan(x: np.ndarray, value: float = 0.0) -> np.ndarray:
+    return np.where(np.isnan(x), value, x)
+
+
+def segment_start_of(n: int, segment_starts: Optional[np.ndarray]) -> np.ndarray:
+    """
+    每一行所属段的起点行号（无分段 → 全 0）
+    """
+    out = np.zeros(n, dtype=np.int64)
+    if segment_starts is not None and n:
+        starts = np.asarray(segment_starts, dtype=np.int64)
+        starts = starts[starts < n]
+        out[starts] = starts
+        np.maximum.accumulate(out, out=out)
+    return out
+
+
+def segment_end_of(n: int, segment_starts: Optional[np.ndarray]) -> np.ndarray:
+    """
+    每一行所属段的终点行号（exclusive；无分段 → 全 n）
+    """
+    if segment_starts is None or not n:
+        return np.full(n, n, dtype=np.int64)
+    starts = np.asarray(segment_starts, dtype=np.int64)
+    starts = starts[starts < n]
+    ends = np.r_[starts[1:], n]
+    return ends[np.searchsorted(starts, np.arange(n), side="right") - 1]
+
+
+def shift1(x: np.ndarray, segment_starts: Optional[np.ndarray] = None) -> np.ndarray:
+    out = np.empty(len(x), dtype=np.float64)
+    if len(x):
+        out[0] = np.nan
+        out[1:] = x[:-1]
+        if segment_starts is not None:
+            starts = np.asarray(segment_starts, dtype=np.int64)
+            out[starts[starts < len(x)]] = np.nan
+    return out
+
+
+# =============================================================================
+# RollingMoments：同一列、多窗口共享累计量
+# =============================================================================
+class RollingMoments:
+    """
+    单列 shift-1 滚动矩（sum / mean / std / zscore）
+
+    - 构造时一次性计算：中心化累计和、累计平方和、NaN 计数、等值 run 长度
+    - 任意 window 查询均为 O(n) 的数组差分，多窗口 / 多统计量共享
+
+    数值稳定：
+      - 先减段内均值再累计（centered cumsum），降低平方和抵消误差
+      - 窗口内全部等值 → mean / sum 取精确值，std 精确为 0（与 pandas 一致）
+    """
+
+    def __init__(
+            self,
+            x: np.ndarray,
+            *,
+            segment_starts: Optional[np.ndarray] = None,
+    ) -> None:
+        x = np.asarray(x, dtype=np.float64)
+        n = len(x)
+        self.x = x
+        self.n = n
+        self._seg = segment_start_of(n, segment_starts)
+
+        nan = ~np.isfinite(x)
+        self._mu = self._segment_means(x, nan)
+
+        y = np.where(nan, 0.0, x - self._mu)
+
+        self._c1 = np.zeros(n + 1)
+        self._c2 = np.zeros(n + 1)
+        self._cn = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(y, out=self._c1[1:])
+        np.cumsum(y * y, out=self._c2[1:])
+        np.cumsum(nan, out=self._cn[1:])
+
+        # run[i]：以 i 结尾的连续等值长度（NaN 打断）
+        if n:
+            same = np.r_[False, (x[1:] == x[:-1])]
+            idx = np.arange(n)
+            run_start = np.maximum.accumulate(np.where(same, 0, idx))
+            self._run = idx - run_start + 1
+        else:
+            self._run = np.zeros(0, dtype=np.int64)
+
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    def _segment_means(self, x: np.ndarray, nan: np.ndarray) -> np.ndarray:
+        """
+        每行所属段的有限值均值（中心化基准；段内一致 → 批量与逐段数值同构）
+        """
+        if self.n == 0:
+            return np.zeros(0)
+        starts = np.unique(self._seg)
+        total = np.add.reduceat(np.where(nan, 0.0, x), starts)
+        count = np.add.reduceat((~nan).astype(np.int64), starts)
+        mu = np.divide(total, count, out=np.zeros(len(starts)), where=count > 0)
+        return mu[np.searchsorted(starts, self._seg)]
+
+    # ------------------------------------------------------------------
+    def _valid(self, window: int) -> np.ndarray:
+        """
+        out[t] 合法：窗口 x[t-window .. t-1] 完全落在 t 所属段内且无 NaN
+        """
+        key = ("valid", window)
+        if key not in self._cache:
+            t = np.arange(self.n)
+            ok = (t - window) >= self._seg
+            lo = np.clip(t - window, 0, None)
+            ok &= (self._cn[t] - self._cn[lo]) == 0
+            self._cache[key] = ok
+        return self._cache[key]
+
+    def _const(self, window: int) -> np.ndarray:
+        """
+        窗口 [t-window, t-1] 全部等值（run 长度覆盖整个窗口）
+        """
+        key = ("const", window)
+        if key not in self._cache:
+            const = np.zeros(self.n, dtype=bool)
+            if self.n > 1:
+                const[1:] = self._run[:-1] >= window
+            self._cache[key] = const
+        return self._cache[key]
+
+    def _prev(self) -> np.ndarray:
+        # 仅用于常数窗口取值；段边界由 _valid 屏蔽
+        return shift1(self.x)
+
+    def _window_sums(self, window: int) -> tuple[np.ndarray, np.ndarray]:
+        t = np.arange(self.n)
+        lo = np.clip(t - window, 0, None)
+        return self._c1[t] - self._c1[lo], self._c2[t] - self._c2[lo]
+
+    # ------------------------------------------------------------------
+    def sum(self, window: int) -> np.ndarray:
+        s1, _ = self._window_sums(window)
+        s = s1 + window * self._mu
+        # 常数窗口：精确值（避免中心化引入的舍入，如全 0 窗口）
+        s = np.where(self._const(window), window * self._prev(), s)
+        return np.where(self._valid(window), s, np.nan)
+
+    def mean(self, window: int) -> np.ndarray:
+        key = ("mean", window)
+        if key not in self._cache:
+            s1, _ = self._window_sums(window)
+            m = np.where(self._const(window), self._prev(), s1 / window + self._mu)
+            self._cache[key] = np.where(self._valid(window), m, np.nan)
+        return self._cache[key]
+
+    def std(self, window: int, ddof: int = 1) -> np.ndarray:
+        key = ("std", window, ddof)
+        if key in self._cache:
+            return self._cache[key]
+
+        if window - ddof <= 0:
+            out = np.full(self.n, np.nan)
+        else:
+            s1, s2 = self._window_sums(window)
+            var = (s2 - s1 * s1 / window) / (window - ddof)
+            var = np.maximum(var, 0.0)
+
+            # 窗口 [t-window, t-1] 全部等值 → 精确 0
+            var[self._const(window)] = 0.0
+
+            out = np.where(self._valid(window), np.sqrt(var), np.nan)
+
+        self._cache[key] = out
+        return out
+
+    def zscore(self, window: int) -> np.ndarray:
+        """
+        z_t = (x_t - mean) / std（std == 0 或不足窗口 → NaN）
+        """
+        std = self.std(window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (self.x - self.mean(window)) / std
+        return np.where(std == 0, np.nan, z)
+
+
+# =============================================================================
+# functional kernels
+# =============================================================================
+def rolling_sum(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return RollingMoments(x, segment_starts=segment_starts).sum(window)
+
+
+def rolling_mean(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return RollingMoments(x, segment_starts=segment_starts).mean(window)
+
+
+def rolling_std(
+        x: np.ndarray,
+        window: int,
+        ddof: int = 1,
+        *,
+        segment_starts=None,
+) -> np.ndarray:
+    return RollingMoments(x, segment_starts=segment_starts).std(window, ddof=ddof)
+
+
+def rolling_zscore(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return RollingMoments(x, segment_starts=segment_starts).zscore(window)
+
+
+# -----------------------------------------------------------------------------
+def _sliding_extreme(x: np.ndarray, window: int, op) -> np.ndarray:
+    """
+    van Herk / Gil-Werman：块内前缀 + 后缀极值，O(n) 与 window 无关
+
+    返回 r[i] = op(x[i-window+1 .. i])，i < window-1 处为 NaN
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+
+    pad = (-n) % window
+    fill = -np.inf if op is np.maximum else np.inf
+    xp = np.r_[x, np.full(pad, fill)].reshape(-1, window)
+
+    prefix = op.accumulate(xp, axis=1).ravel()[:n]
+    suffix = op.accumulate(xp[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+
+    i = np.arange(window - 1, n)
+    out[i] = op(suffix[i - window + 1], prefix[i])
+    return out
+
+
+def _rolling_extreme(x: np.ndarray, window: int, op, segment_starts=None) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n <= window:
+        return out
+
+    nan = ~np.isfinite(x)
+    fill = -np.inf if op is np.maximum else np.inf
+    ext = _sliding_extreme(np.where(nan, fill, x), window, op)
+
+    cn = np.r_[0, np.cumsum(nan)]
+    t = np.arange(window, n)
+    ok = (cn[t] - cn[t - window]) == 0
+    if segment_starts is not None:
+        ok &= (t - window) >= segment_start_of(n, segment_starts)[t]
+
+    # shift-1：out[t] = ext[t-1]
+    out[t] = np.where(ok, ext[t - 1], np.nan)
+    return out
+
+
+def rolling_max(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return _rolling_extreme(x, window, np.maximum, segment_starts)
+
+
+def rolling_min(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return _rolling_extreme(x, window, np.minimum, segment_starts)
+
+
+# -----------------------------------------------------------------------------
+# forward（label 专用 · 前视）：out[t] = stat(x[t+1], ..., x[t+w])
+# -----------------------------------------------------------------------------
+def _forward_extreme(x: np.ndarray, window: int, op, segment_starts=None) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n <= window:
+        return out
+
+    # np.maximum / np.minimum 传播 NaN → 窗口含缺失即 NaN
+    ext = _sliding_extreme(np.where(np.isfinite(x), x, np.nan), window, op)
+
+    t = np.arange(n - window)
+    ok = t + window < segment_end_of(n, segment_starts)[t]
+    out[t] = np.where(ok, ext[t + window], np.nan)
+    return out
+
+
+def forward_max(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return _forward_extreme(x, window, np.maximum, segment_starts)
+
+
+def forward_min(x: np.ndarray, window: int, *, segment_starts=None) -> np.ndarray:
+    return _forward_extreme(x, window, np.minimum, segment_starts)
+
+
+# -----------------------------------------------------------------------------
+def ewma(
+        x: np.ndarray,
+        *,
+        span: Optional[float] = None,
+        alpha: Optional[float] = None,
+        segment_starts: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    shift-1 指数加权均值（pandas ewm(adjust=False, ignore_na=True) 语义）
+
+        y_t   = (1 - a) * y_{t-1} + a * x_t,   y_0 = 首个非 NaN 值
+        out_t = y_{t-1}
+
+    - 无 NaN：scipy.signal.lfilter 一阶 IIR，O(n) C 实现
+    - 含 NaN：NaN 处 y 保持不变（压缩非 NaN 序列后回填）
+    - segment_starts：每段独立重启递推（逐段 lfilter）
+    """
+    if (span is None) == (alpha is None):
+        raise ValueError("exactly one of span / alpha is required")
+    a = 2.0 / (span + 1.0) if span is not None else float(alpha)
+    if not 0.0 < a <= 1.0:
+        raise ValueError(f"alpha must be in (0, 1], got {a}")
+
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return x.copy()
+
+    if segment_starts is None:
+        return shift1(_ewma(x, a))
+
+    bounds = np.r_[np.asarray(segment_starts, dtype=np.int64), n]
+    y = np.empty(n)
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        y[lo:hi] = _ewma(x[lo:hi], a)
+    return shift1(y, segment_starts)
+
+
+def _ewma(x: np.ndarray, a: float) -> np.ndarray:
+    n = len(x)
+    nan = np.isnan(x)
+    pos = np.flatnonzero(~nan)
+    y = np.full(n, np.nan)
+    if len(pos):
+        v = x[pos]
+        yv, _ = lfilter([a], [1.0, -(1.0 - a)], v, zi=[(1.0 - a) * v[0]])
+        y[pos] = yv
+        # NaN 处沿用上一个 y
+        last = np.maximum.accumulate(np.where(~nan, np.arange(n), -1))
+        has = last >= 0
+        y[has] = y[last[has]]
+    return y
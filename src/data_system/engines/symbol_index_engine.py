@@ -1,7 +1,7 @@
 #!filepath: src/engines/symbol_index_engine.py
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 import pyarrow as pa
 import pyarrow.compute as pc
@@ -17,6 +17,12 @@ class SymbolIndexEngine:
         1) 全局 sort（symbol asc, ts asc）
         2) 构建 symbol slice index
 
+    快速路径（index-aware）：
+      - 先做向量化相邻比较（symbol / 同 symbol 内 ts）判断是否已 canonical
+      - 已有序 → 跳过 sort_indices + take（不复制整表）
+      - 调用方给出 segments=[(symbol, length), ...]（按拼接顺序）时，
+        直接由累计长度构建 index，仅在段首/段尾行做一致性校验
+
     输入：
       - pa.Table（全量）
 
@@ -35,6 +41,8 @@ class SymbolIndexEngine:
     @logs.catch()
     def execute(
             table: pa.Table,
+            *,
+            segments: Optional[Sequence[Tuple[str, int]]] = None,
     ) -> tuple[pa.Table, Dict[str, Tuple[int, int]]]:
 
         if table is None or table.num_rows == 0:
@@ -59,22 +67,93 @@ class SymbolIndexEngine:
             )
 
         # --------------------------------------------------
-        # 1) global sort（明确且显式）
+        # 1) global sort（明确且显式；已有序则跳过）
         # --------------------------------------------------
-        sort_indices = pc.sort_indices(
-            table,
-            sort_keys=[
-                ("symbol", "ascending"),
-                ("ts", "ascending"),
-            ],
-        )
-        table = table.take(sort_indices)
+        if SymbolIndexEngine.is_sorted(table):
+            index = SymbolIndexEngine._index_from_segments(table, segments)
+            if index is not None:
+                return table, index
+        else:
+            sort_indices = pc.sort_indices(
+                table,
+                sort_keys=[
+                    ("symbol", "ascending"),
+                    ("ts", "ascending"),
+                ],
+            )
+            table = table.take(sort_indices)
 
         # --------------------------------------------------
         # 2) build symbol slice index
         # --------------------------------------------------
+        return table, SymbolIndexEngine._index_from_runs(table["symbol"])
+
+    # --------------------------------------------------
+    @staticmethod
+    def is_sorted(table: pa.Table) -> bool:
+        """
+        canonical 顺序判定（向量化，O(n)）：
+          - symbol 非降
+          - symbol 相同的相邻行 ts 非降
+          - 含 null → 视为无序（交给 sort 处理 null 位置）
+        """
+        n = table.num_rows
+        if n <= 1:
+            return True
+
         sym = table["symbol"]
+        ts = table["ts"]
+        if sym.null_count or ts.null_count:
+            return False
+
+        sym_prev, sym_next = sym.slice(0, n - 1), sym.slice(1)
+        if pc.any(pc.less(sym_next, sym_prev)).as_py():
+            return False
+
+        ts_desc = pc.less(ts.slice(1), ts.slice(0, n - 1))
+        return not pc.any(pc.and_(pc.equal(sym_next, sym_prev), ts_desc)).as_py()
+
+    # --------------------------------------------------
+    @staticmethod
+    def _index_from_segments(
+            table: pa.Table,
+            segments: Optional[Sequence[Tuple[str, int]]],
+    ) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        由已知段长度构建 index（table 已 canonical）
+
+        校验失败（长度不符 / 段首尾 symbol 不符 / 段间 symbol 非严格递增）→ None，
+        由调用方回退到 run_end_encode。
+        """
+        if segments is None:
+            return None
+
+        segments = [(str(s), int(n)) for s, n in segments if n > 0]
+        if sum(n for _, n in segments) != table.num_rows:
+            return None
 
+        symbols = [s for s, _ in segments]
+        if any(a >= b for a, b in zip(symbols, symbols[1:])):
+            return None
+
+        index: Dict[str, Tuple[int, int]] = {}
+        bounds = []
+        start = 0
+        for symbol, length in segments:
+            index[symbol] = (start, length)
+            bounds.extend((start, start + length - 1))
+            start += length
+
+        # 已有序 + 段首/段尾 symbol 一致 + 段间 symbol 严格递增 → 段即 run
+        edges = table["symbol"].take(pa.array(bounds, pa.int64())).to_pylist()
+        if edges != [s for s in symbols for _ in range(2)]:
+            return None
+
+        return index
+
+    # --------------------------------------------------
+    @staticmethod
+    def _index_from_runs(sym: pa.ChunkedArray) -> Dict[str, Tuple[int, int]]:
         if pa.types.is_dictionary(sym.type):
             sym = pc.cast(sym, pa.string())
         elif not pa.types.is_string(sym.type):
@@ -94,4 +173,4 @@ class SymbolIndexEngine:
             index[str(symbol)] = (start, end_exclusive - start)
             start = end_exclusive
 
-        return table, index
+        return index
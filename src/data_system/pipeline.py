@@ -1,6 +1,9 @@
 #!filepath: src/data_system/pipeline.py
 from __future__ import annotations
 
+import re
+from typing import Optional
+
 from src.data_system.context import DataContext
 from src.pipeline.step import PipelineStep
 from src.utils.path import PathManager
@@ -10,6 +13,9 @@ from src.observability.instrumentation import Instrumentation
 from src.pipeline.pipeline import PipelineAbort
 
 
+_DATE_DIR = re.compile(r"^\d{4}-?\d{2}-?\d{2}$")
+
+
 class DataPipeline:
     """
     DataPipeline = 调度器（Scheduler）
@@ -18,6 +24,18 @@ class DataPipeline:
     - Pipeline 负责 orchestration（顺序 / 上下文）
     - Pipeline 不负责任何 Step 级计时
     - Step 自己定义时间语义边界（via BasePipelineStep.timed）
+
+    并发语义：
+    - 锁文件统一放在 {meta_root}/.locks/，不在任何会被清理的 date 目录内
+    - 每个 (date, stage) 持有 {date}.{stage}.lock 进程间排他锁
+      → 同一 date 的并发 run 串行执行同一 stage；不同 date 互不阻塞
+    - run 全程持有 {date}.lock 共享锁；PipelineAbort 的清理持有其排他锁
+      → 清理不会与同 date 的任何在途 run 交错
+
+    跨日回补：
+    - cross_day=True 的 Step（如跨日 label）依赖次一交易日的 min
+    - date 成功后，对紧邻的上一个日期目录重跑这些 Step（持有该 date 的锁）
+      → 上一日的尾部 horizon 在次日落地时补齐；次日未变时 Step 自身 meta hit → skip
     """
 
     def __init__(
@@ -33,47 +51,91 @@ class DataPipeline:
     def run(self, date: str):
         logs.info(f"[Pipeline] ====== START {date} ======")
 
-        raw_dir = self.pm.raw_dir(date)
-        fact_dir = self.pm.fact_dir(date)
-        meta_dir = self.pm.meta_dir(date)
-        feature_l0_dir = self.pm.feature_dir(date)
-        label_dir = self.pm.label_dir(date)
-        normalized_dir = self.pm.l2_normalized_dir(date)
-
-        FileSystem.ensure_dir(raw_dir)
-        FileSystem.ensure_dir(fact_dir)
-        FileSystem.ensure_dir(meta_dir)
-        FileSystem.ensure_dir(feature_l0_dir)
-        FileSystem.ensure_dir(label_dir)
-        FileSystem.ensure_dir(normalized_dir)
+        ctx = self._context(date)
 
-
-        ctx = DataContext(
-            today=date,
-            raw_dir=raw_dir,
-            fact_dir=fact_dir,
-            meta_dir=meta_dir,
-            feature_dir=feature_l0_dir,
-            label_dir=label_dir,
-            normalized_dir=normalized_dir
-        )
+        FileSystem.ensure_dir(ctx.raw_dir)
+        FileSystem.ensure_dir(ctx.fact_dir)
+        FileSystem.ensure_dir(ctx.meta_dir)
+        FileSystem.ensure_dir(ctx.feature_dir)
+        FileSystem.ensure_dir(ctx.label_dir)
+        FileSystem.ensure_dir(ctx.normalized_dir)
 
         # --------------------------------------------------
         # 核心循环：Pipeline 不打 timer
         # --------------------------------------------------
         try:
-            for step in self.steps:
-                ctx = step.run(ctx)
+            with FileSystem.lock(self._date_lock_path(date), shared=True):
+                for step in self.steps:
+                    with FileSystem.lock(self._lock_path(date, step)):
+                        ctx = step.run(ctx)
         except PipelineAbort as e:
             logs.info(f"[Pipeline][SKIP] {e}")
-            self._cleanup_date_dirs(ctx)
+            with FileSystem.lock(self._date_lock_path(date)):
+                self._cleanup_date_dirs(ctx)
             return ctx
 
         # Timeline 只包含 leaf（由 Step / Adapter 写入）
         self.inst.generate_timeline_report(date)
 
+        self._refresh_previous(date)
+
         return ctx
 
+    def _context(self, date: str) -> DataContext:
+        return DataContext(
+            today=date,
+            raw_dir=self.pm.raw_dir(date),
+            fact_dir=self.pm.fact_dir(date),
+            meta_dir=self.pm.meta_dir(date),
+            feature_dir=self.pm.feature_dir(date),
+            label_dir=self.pm.label_dir(date),
+            normalized_dir=self.pm.l2_normalized_dir(date),
+        )
+
+    # --------------------------------------------------
+    # cross-day refresh
+    # --------------------------------------------------
+    def _previous_date(self, date: str) -> Optional[str]:
+        """meta 根目录下紧邻的上一个日期目录（无 → None）"""
+        today = date.replace("-", "")
+        earlier = [
+            d.name for d in self.pm.meta_dir().iterdir()
+            if d.is_dir() and _DATE_DIR.match(d.name) and d.name.replace("-", "") < today
+        ]
+        return max(earlier, key=lambda n: n.replace("-", "")) if earlier else None
+
+    def _refresh_previous(self, date: str) -> None:
+        steps = [s for s in self.steps if getattr(s, "cross_day", False)]
+        if not steps:
+            return
+
+        prev = self._previous_date(date)
+        if prev is None:
+            return
+
+        ctx = self._context(prev)
+        with FileSystem.lock(self._date_lock_path(prev), shared=True):
+            # 上一日可能已被其自身的 abort 清理
+            if not ctx.meta_dir.is_dir():
+                return
+            logs.info(f"[Pipeline] refresh cross-day steps of {prev}")
+            try:
+                for step in steps:
+                    with FileSystem.lock(self._lock_path(prev, step)):
+                        ctx = step.run(ctx)
+            except PipelineAbort as e:
+                # 上一日已完成，回补失败不回滚其产物
+                logs.warning(f"[Pipeline][REFRESH][SKIP] {prev} | {e}")
+
+    def _lock_dir(self):
+        return self.pm.meta_dir() / ".locks"
+
+    def _date_lock_path(self, date: str):
+        return self._lock_dir() / f"{date}.lock"
+
+    def _lock_path(self, date: str, step: PipelineStep):
+        return self._lock_dir() / f"{date}.{step.stage or step.step_name}.lock"
+
     def _cleanup_date_dirs(self, ctx: DataContext):
         """
         删除该 date 下所有可能被创建的目录
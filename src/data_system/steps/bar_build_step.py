@@ -0,0 +1,141 @@
+#!filepath: src/data_system/steps/bar_build_step.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+import pyarrow as pa
+
+from src.pipeline.step import PipelineStep
+from src.data_system.context import DataContext
+from src.data_system.engines.bar_build_engine import BarBuildEngine
+from src.data_system.engines.symbol_index_engine import SymbolIndexEngine
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+from src.utils.logger import logs
+from src.utils.parquet_writer import ParquetAppendWriter
+
+
+class BarBuildStep(PipelineStep):
+    """
+    BarBuildStep（OPTIONAL）
+
+    输入：
+      fact/enriched.*trade.parquet          （multi-symbol, event-level）
+
+    输出（每个 BarSpec 一份，与 min 阶段同构）：
+      fact/bar_{name}.*trade.parquet        （multi-symbol, bar-level）
+      meta/bar_{name}.*trade.manifest.json  （带 symbol slice index）
+
+    冻结原则：
+      - orchestration only
+      - engine 只处理单 symbol，一次扫描产出所有 spec
+      - 任一 spec 的 meta 失效 → 整个 slot 重建（单次扫描的代价与 spec 数无关）
+    """
+
+    stage = "bar"
+    upstream_stage = "enriched"
+
+    def __init__(
+            self,
+            engine: BarBuildEngine,
+            inst=None,
+    ) -> None:
+        super().__init__(inst)
+        self.engine = engine
+
+    # ------------------------------------------------------------------
+    def stage_of(self, label: str) -> str:
+        return f"{self.stage}_{label}"
+
+    # ------------------------------------------------------------------
+    def run(self, ctx: DataContext) -> DataContext:
+        input_dir: Path = ctx.fact_dir
+        meta_dir: Path = ctx.meta_dir
+        output_dir: Path = ctx.fact_dir
+
+        labels = [spec.label for spec in self.engine.specs]
+
+        for input_file in input_dir.glob(f"{self.upstream_stage}.*trade.parquet"):
+            name = input_file.stem.split(".")[1]
+
+            metas = {
+                label: BaseMeta(
+                    meta_dir=meta_dir,
+                    stage=self.stage_of(label),
+                    output_slot=name,
+                )
+                for label in labels
+            }
+
+            # --------------------------------------------------
+            # 1. upstream check
+            # --------------------------------------------------
+            if not any(meta.upstream_changed() for meta in metas.values()):
+                logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
+                continue
+
+            # --------------------------------------------------
+            # 2. SliceSource（来自 enriched 的 slice capability）
+            # --------------------------------------------------
+            source = SliceSource(
+                meta_dir=meta_dir,
+                stage=self.upstream_stage,
+                output_slot=name,
+            )
+
+            bar_tables: Dict[str, List[pa.Table]] = {label: [] for label in labels}
+            segments: Dict[str, List[tuple[str, int]]] = {label: [] for label in labels}
+
+            # --------------------------------------------------
+            # 3. per-symbol bar build（engine 纯计算，一次扫描全部 spec）
+            # --------------------------------------------------
+            with self.inst.timer(f"[{self.stage}] {name}"):
+                for symbol, sub in source.iter_tables(
+                        columns=["ts", "price", "volume", "notional"]
+                ):
+                    for label, bars in self.engine.execute(sub).items():
+                        if bars.num_rows == 0:
+                            continue
+
+                        # engine 不负责 symbol，Step 补齐
+                        bars = bars.append_column(
+                            "symbol",
+                            pa.array([symbol] * bars.num_rows),
+                        )
+                        bar_tables[label].append(bars)
+                        segments[label].append((symbol, bars.num_rows))
+
+            # --------------------------------------------------
+            # 4. per-spec write + commit（slice index 与 min 阶段同构）
+            # --------------------------------------------------
+            for label in labels:
+                if not bar_tables[label]:
+                    logs.warning(f"[{self.stage}] {name} no bars for {label}")
+                    continue
+
+                tables, index = SymbolIndexEngine.execute(
+                    pa.concat_tables(bar_tables[label]),
+                    segments=segments[label],
+                )
+
+                output_file = output_dir / f"{self.stage_of(label)}.{name}.parquet"
+                writer = ParquetAppendWriter(output_file=output_file)
+                writer.write(tables)
+                writer.close()
+
+                metas[label].commit(
+                    MetaOutput(
+                        input_file=input_file,
+                        output_file=output_file,
+                        rows=tables.num_rows,
+                        index=index,
+                    )
+                )
+
+                logs.info(
+                    f"[{self.stage}] written {output_file.name} "
+                    f"symbols={len(index)} rows={tables.num_rows}"
+                )
+
+        return ctx
@@ -0,0 +1,124 @@
+#!filepath: src/data_system/steps/cross_sectional_step.py
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.pipeline.step import PipelineStep
+from src.data_system.context import DataContext
+from src.data_system.engines.cross_sectional_engine import CrossSectionalFeatureEngine
+from src.data_system.engines.symbol_index_engine import SymbolIndexEngine
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+from src.utils.logger import logs
+from src.utils.parquet_writer import ParquetAppendWriter
+
+
+class CrossSectionalStep(PipelineStep):
+    """
+    CrossSectionalStep（OPTIONAL）
+
+    输入：
+      feature/feature.*.parquet     （multi-symbol, minute-level, canonical）
+
+    输出：
+      feature/xs.*.parquet          （symbol / ts + xs_* 列）
+      meta/xs.*.manifest.json       （带 symbol slice index）
+
+    冻结原则：
+      - orchestration only
+      - 整张 feature 表一次性交给 engine（截面计算天然跨 symbol）
+      - 输出与 feature 表逐行对齐（同一 canonical 顺序、同一 slice index）
+      - engine spec（ops / columns / winsor / 行业映射 hash）记录在
+        manifest attrs["xs_spec"]；上游未变但 spec 变化 → 重建
+    """
+
+    stage = "xs"
+    upstream_stage = "feature"
+
+    def __init__(
+            self,
+            *,
+            engine: CrossSectionalFeatureEngine,
+            inst=None,
+    ) -> None:
+        super().__init__(inst)
+        self.engine = engine
+
+    # ------------------------------------------------------------------
+    def run(self, ctx: DataContext) -> DataContext:
+        feature_dir: Path = ctx.feature_dir
+        meta_dir: Path = ctx.meta_dir
+
+        spec = self.engine.spec()
+
+        for input_file in feature_dir.glob(f"{self.upstream_stage}.*.parquet"):
+            name = input_file.stem.split(".")[1]
+            output_file = feature_dir / f"{self.stage}.{name}.parquet"
+
+            meta = BaseMeta(
+                meta_dir=meta_dir,
+                stage=self.stage,
+                output_slot=name,
+            )
+
+            # --------------------------------------------------
+            # 1. upstream / spec check
+            # --------------------------------------------------
+            if not meta.upstream_changed():
+                if meta.attrs().get("xs_spec") == spec:
+                    logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
+                    continue
+                logs.info(f"[{self.stage}] xs spec changed → rebuild {input_file.name}")
+
+            # --------------------------------------------------
+            # 2. SliceSource（来自 feature stage）
+            # --------------------------------------------------
+            source = SliceSource(
+                meta_dir=meta_dir,
+                stage=self.upstream_stage,
+                output_slot=name,
+            )
+            segments = [
+                (symbol, length)
+                for symbol, _, length in source.segments()
+                if length > 0
+            ]
+            if not segments:
+                logs.warning(f"[{self.stage}] {name} empty feature table")
+                continue
+
+            # --------------------------------------------------
+            # 3. cross-sectional transform（engine 纯计算，整表一次）
+            # --------------------------------------------------
+            with self.inst.timer(f"[{self.stage}] {name}"):
+                out = self.engine.execute(source.table())
+
+            # --------------------------------------------------
+            # 4. slice index（行序未变 → 直接复用 feature 段）
+            # --------------------------------------------------
+            tables, index = SymbolIndexEngine.execute(out, segments=segments)
+
+            writer = ParquetAppendWriter(output_file=output_file)
+            writer.write(tables)
+            writer.close()
+
+            # --------------------------------------------------
+            # 5. commit meta
+            # --------------------------------------------------
+            meta.commit(
+                MetaOutput(
+                    input_file=input_file,
+                    output_file=output_file,
+                    rows=tables.num_rows,
+                    index=index,
+                    attrs={"xs_spec": spec},
+                )
+            )
+
+            logs.info(
+                f"[{self.stage}] written {output_file.name} "
+                f"symbols={len(index)} "
+                f"(rows={tables.num_rows}, cols={len(tables.column_names)})"
+            )
+
+        return ctx
@@ -4,11 +4,13 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Optional, Sequence
 
+import numpy as np
 import pyarrow as pa
 
 from src.pipeline.step import PipelineStep
 from src.data_system.context import DataContext
 from src.meta.base import BaseMeta, MetaOutput
+from src.meta.column_cache import ColumnCache, spec_of
 from src.meta.slice_source import SliceSource
 from src.utils.logger import logs
 
@@ -16,6 +18,9 @@ from src.data_system.engines.symbol_index_engine import SymbolIndexEngine
 from src.utils.parquet_writer import ParquetAppendWriter
 
 
+FEATURE_PREFIXES = ("l0_", "l1_", "l2_")
+
+
 # -----------------------------------------------------------------------------
 # Utility: merge append / replace columns
 # -----------------------------------------------------------------------------
@@ -39,11 +44,7 @@ def merge_append_replace(
 
     out = base
     for name in delta.column_names:
-        if only_feature_columns and not (
-                name.startswith("l0_")
-                or name.startswith("l1_")
-                or name.startswith("l2_")
-        ):
+        if only_feature_columns and not name.startswith(FEATURE_PREFIXES):
             continue
 
         col = delta[name]
@@ -71,7 +72,16 @@ class FeatureBuildStep(PipelineStep):
 
     冻结原则：
       - orchestration only
-      - per-symbol execution only
+      - per-symbol execution（默认）
+      - batched=True：整张 min 表一次性执行，engine 以 segment_starts
+        保证窗口不跨 symbol（要求所有 engine 声明 segment_aware）
+      - graph_engine（FeatureGraphEngine）：声明式 DAG，只计算请求的 feature，
+        在 L0 / L1 / L2 之后执行
+      - cache_columns=True：engine 输出按 (spec 链, 上游 fingerprint) 列级缓存
+        于 feature/_columns/，新增 engine 只计算新列
+      - engine 配置变化（spec）与上游变化同等对待 → 重建
+      - join_stages（如 ["ob"]）：与 min 同 slot、同 slice index 的旁路阶段，
+        其非 key 列在 engine 之前按列追加（0-copy），上游变化同样触发重建
       - slice discovery 由 SliceSource 驱动
       - engine 纯函数、无副作用
       - feature 阶段统一 canonicalize + slice index
@@ -86,14 +96,197 @@ class FeatureBuildStep(PipelineStep):
             l0_engine: Optional[object] = None,
             l1_engines: Optional[Sequence[object]] = None,
             l2_engine: Optional[object] = None,
+            graph_engine: Optional[object] = None,
             only_feature_columns: bool = False,
+            batched: bool = False,
+            cache_columns: bool = False,
+            join_stages: Sequence[str] = (),
             inst=None,
     ) -> None:
         super().__init__(inst)
         self.l0 = l0_engine
         self.l1s = list(l1_engines) if l1_engines is not None else []
         self.l2 = l2_engine
+        self.graph = graph_engine
         self.only_feature_columns = only_feature_columns
+        self.batched = batched
+        self.cache_columns = cache_columns
+        self.join_stages = list(join_stages)
+
+        if batched:
+            for eng in self._engines():
+                if not getattr(eng, "segment_aware", False):
+                    raise ValueError(
+                        f"[FeatureBuild] batched mode requires segment-aware engines, "
+                        f"got {type(eng).__name__}"
+                    )
+
+    # ------------------------------------------------------------------
+    def _engines(self) -> List[object]:
+        return [
+            eng
+            for eng in (self.l0, *self.l1s, self.l2, self.graph)
+            if eng is not None
+        ]
+
+    # ------------------------------------------------------------------
+    def spec_keys(self) -> List[str]:
+        """
+        每个 engine 的链式 spec key（engine_i 的输入依赖 engine_0..i-1）
+
+        最后一个 key 即整个 feature 阶段的 spec（写入 manifest attrs）
+        """
+        key = ColumnCache.chain("", f"only_feature_columns={self.only_feature_columns}")
+        keys: List[str] = []
+        for eng in self._engines():
+            key = ColumnCache.chain(key, spec_of(eng))
+            keys.append(key)
+        return keys
+
+    # ------------------------------------------------------------------
+    def _joins(self, meta_dir: Path, slot: str) -> List[SliceSource]:
+        return [
+            SliceSource(meta_dir=meta_dir, stage=stage, output_slot=slot)
+            for stage in self.join_stages
+        ]
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _join(base: pa.Table, other: pa.Table, stage: str) -> pa.Table:
+        """
+        旁路阶段按列追加（行对齐由 slice index 保证，ts 逐行校验）
+        """
+        if other.num_rows != base.num_rows or not other["ts"].equals(base["ts"]):
+            raise RuntimeError(f"[FeatureBuild] join stage '{stage}' not row-aligned with min")
+
+        out = base
+        for name in other.column_names:
+            if name in ("symbol", "ts"):
+                continue
+            if name in out.column_names:
+                out = out.set_column(out.column_names.index(name), name, other[name])
+            else:
+                out = out.append_column(name, other[name])
+        return out
+
+    # ------------------------------------------------------------------
+    def _inputs(
+            self,
+            source: SliceSource,
+            joins: Sequence[SliceSource] = (),
+    ) -> tuple[List[pa.Table], List[tuple[str, int]], dict]:
+        """
+        engine 输入（slice index 物理顺序）
+
+        - per-symbol：每个 symbol 一张 0-copy slice
+        - batched   ：整表一张 + segment_starts
+        - joins     ：旁路阶段列追加（slice index 必须与 min 完全一致）
+        """
+        slices = [(s, start, length) for s, start, length in source.segments() if length > 0]
+        segments = [(symbol, length) for symbol, _, length in slices]
+        if not slices:
+            return [], [], {}
+
+        for stage, join in zip(self.join_stages, joins):
+            if [s for s in join.segments() if s[2] > 0] != slices:
+                raise RuntimeError(
+                    f"[FeatureBuild] join stage '{stage}' slice index differs from min"
+                )
+
+        if not self.batched:
+            tables = []
+            for symbol, _, _ in slices:
+                t = source.get(symbol)
+                for stage, join in zip(self.join_stages, joins):
+                    t = self._join(t, join.get(symbol), stage)
+                tables.append(t)
+            return tables, segments, {}
+
+        table = source.table()
+        for stage, join in zip(self.join_stages, joins):
+            table = self._join(table, join.table(), stage)
+
+        # index 必须无缝覆盖整表（min 阶段由 SymbolIndexEngine 保证）
+        expected = 0
+        for symbol, start, length in slices:
+            if start != expected:
+                raise RuntimeError(
+                    f"[FeatureBuild] slice index not contiguous at {symbol}: "
+                    f"start={start}, expected={expected}"
+                )
+            expected += length
+        if expected != table.num_rows:
+            raise RuntimeError(
+                f"[FeatureBuild] slice index covers {expected} rows, table has {table.num_rows}"
+            )
+
+        starts = np.array([start for _, start, _ in slices], dtype=np.int64)
+        return [table], segments, {"segment_starts": starts}
+
+    # ------------------------------------------------------------------
+    def _build(
+            self,
+            source: SliceSource,
+            *,
+            joins: Sequence[SliceSource] = (),
+            cache: Optional[ColumnCache] = None,
+            slot: str = "",
+            fingerprint: str = "",
+    ) -> tuple[List[pa.Table], List[tuple[str, int]]]:
+        """
+        L0 → L1 chain → L2 → graph（engine-major：每个 engine 跑完所有输入再进入下一个）
+
+        cache 命中的 engine 不执行，直接按行偏移拼接缓存列
+        """
+        tables, segments, kwargs = self._inputs(source, joins)
+        if not tables:
+            return [], []
+
+        rows = sum(t.num_rows for t in tables)
+
+        for eng, key in zip(self._engines(), self.spec_keys()):
+            cached = cache.get(slot, fingerprint, key, rows=rows) if cache is not None else None
+
+            if cached is not None:
+                deltas, offset = [], 0
+                for t in tables:
+                    deltas.append(cached.slice(offset, t.num_rows))
+                    offset += t.num_rows
+            else:
+                deltas = [eng.execute(t, **kwargs) for t in tables]
+                if cache is not None:
+                    cache.put(slot, fingerprint, key, self._produced(tables, deltas))
+
+            tables = [
+                merge_append_replace(
+                    t,
+                    d,
+                    only_feature_columns=self.only_feature_columns,
+                )
+                for t, d in zip(tables, deltas)
+            ]
+
+        return tables, segments
+
+    # ------------------------------------------------------------------
+    def _produced(self, tables: List[pa.Table], deltas: List[pa.Table]) -> pa.Table:
+        """
+        engine 实际写入的列（新增 / 被替换且值变化），按输入顺序拼接
+        """
+        names: List[str] = []
+        for t, d in zip(tables, deltas):
+            for c in d.column_names:
+                if c in names:
+                    continue
+                if self.only_feature_columns and not c.startswith(FEATURE_PREFIXES):
+                    continue
+                if c not in t.column_names or not d[c].equals(t[c]):
+                    names.append(c)
+
+        return pa.concat_tables(
+            [d.select(names) for d in deltas],
+            promote_options="default",
+        )
 
     # ------------------------------------------------------------------
     def run(self, ctx: DataContext) -> DataContext:
@@ -114,11 +307,19 @@ class FeatureBuildStep(PipelineStep):
             )
 
             # --------------------------------------------------
-            # 1. upstream check
+            # 1. upstream / spec check
             # --------------------------------------------------
+            joins = self._joins(meta_dir, name)
+            join_fps = [ColumnCache.fingerprint(j.manifest()) for j in joins]
+
+            spec = self.spec_keys()[-1] if self._engines() else ""
+            if joins:
+                spec = ColumnCache.chain(spec, "|".join([*self.join_stages, *join_fps]))
             if not meta.upstream_changed():
-                logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
-                continue
+                if meta.attrs().get("feature_spec") == spec:
+                    logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
+                    continue
+                logs.info(f"[{self.stage}] feature spec changed → rebuild {input_file.name}")
 
             # --------------------------------------------------
             # 2. SliceSource（来自 min stage）
@@ -129,47 +330,25 @@ class FeatureBuildStep(PipelineStep):
                 output_slot=name,
             )
 
-            feature_tables: List[pa.Table] = []
-
             # --------------------------------------------------
-            # 3. per-symbol feature build（engine 纯计算）
+            # 3. feature build（engine 纯计算）
             # --------------------------------------------------
+            cache = ColumnCache(feature_dir / "_columns") if self.cache_columns else None
+            fingerprint = ColumnCache.fingerprint(source.manifest())
+            for fp in join_fps:
+                fingerprint = ColumnCache.chain(fingerprint, fp)
+
             with self.inst.timer(f"[{self.stage}] {name}"):
+                feature_tables, segments = self._build(
+                    source,
+                    joins=joins,
+                    cache=cache,
+                    slot=name,
+                    fingerprint=fingerprint,
+                )
 
-                for symbol, sub in source:
-                    if sub.num_rows == 0:
-                        continue
-
-                    out = sub
-
-                    # L0
-                    if self.l0 is not None:
-                        delta0 = self.l0.execute(out)
-                        out = merge_append_replace(
-                            out,
-                            delta0,
-                            only_feature_columns=self.only_feature_columns,
-                        )
-
-                    # L1 chain
-                    for eng in self.l1s:
-                        delta1 = eng.execute(out)
-                        out = merge_append_replace(
-                            out,
-                            delta1,
-                            only_feature_columns=self.only_feature_columns,
-                        )
-
-                    # L2
-                    if self.l2 is not None:
-                        delta2 = self.l2.execute(out)
-                        out = merge_append_replace(
-                            out,
-                            delta2,
-                            only_feature_columns=self.only_feature_columns,
-                        )
-
-                    feature_tables.append(out)
+            if cache is not None:
+                cache.prune(name, keep=fingerprint)
 
             if not feature_tables:
                 logs.warning(f"[{self.stage}] {name} no features produced")
@@ -178,8 +357,10 @@ class FeatureBuildStep(PipelineStep):
             # --------------------------------------------------
             # 4. concat + canonicalize + rebuild slice index
             # --------------------------------------------------
+            # SliceSource 顺序即 canonical 顺序 → 通常命中快速路径
             tables, index = SymbolIndexEngine.execute(
-                pa.concat_tables(feature_tables)
+                pa.concat_tables(feature_tables),
+                segments=segments,
             )
 
             writer = ParquetAppendWriter(output_file=output_file)
@@ -195,12 +376,13 @@ class FeatureBuildStep(PipelineStep):
                     output_file=output_file,
                     rows=tables.num_rows,
                     index=index,
+                    attrs={"feature_spec": spec},
                 )
             )
 
             logs.info(
                 f"[{self.stage}] written {output_file.name} "
-                f"symbols={len(feature_tables)} "
+                f"symbols={len(index)} "
                 f"(rows={tables.num_rows}, cols={len(tables.column_names)})"
             )
 
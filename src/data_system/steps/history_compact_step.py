@@ -0,0 +1,91 @@
+#!filepath: src/data_system/steps/history_compact_step.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+from src.pipeline.step import PipelineStep
+from src.data_system.context import DataContext
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.history_store import HistoryStore
+from src.utils.logger import logs
+
+
+class HistoryCompactStep(PipelineStep):
+    """
+    HistoryCompactStep（OPTIONAL）
+
+    输入：
+      meta/{stage}.*.manifest.json   → 对应的每日 stage 产物
+
+    输出：
+      history/stage={stage}/slot={slot}/ym={YYYYMM}/part-{k}.parquet（整月重写）
+
+    冻结原则：
+      - orchestration only（读写语义由 HistoryStore 负责）
+      - 以每日 manifest 为唯一输入发现方式
+      - 每个 (stage, slot) 独立 meta：history_{stage}.{slot}
+      - 上游未变化 → 跳过（幂等、可重复执行）
+    """
+
+    stage = "history"
+
+    def __init__(
+            self,
+            *,
+            store: HistoryStore,
+            stages: Sequence[str] = ("min", "feature", "label"),
+            inst=None,
+    ) -> None:
+        super().__init__(inst)
+        self.store = store
+        self.stages = list(stages)
+
+    # ------------------------------------------------------------------
+    def run(self, ctx: DataContext) -> DataContext:
+        meta_dir: Path = ctx.meta_dir
+
+        for upstream in self.stages:
+            for manifest in sorted(meta_dir.glob(f"{upstream}.*.manifest.json")):
+                slot = manifest.name.split(".")[1]
+                upstream_meta = BaseMeta(
+                    meta_dir=meta_dir,
+                    stage=upstream,
+                    output_slot=slot,
+                )
+                input_file = Path(upstream_meta.load()["outputs"]["file"])
+
+                meta = BaseMeta(
+                    meta_dir=meta_dir,
+                    stage=f"{self.stage}_{upstream}",
+                    output_slot=slot,
+                )
+
+                if not meta.upstream_changed():
+                    logs.warning(
+                        f"[{self.stage}] meta hit → skip {upstream}.{slot}"
+                    )
+                    continue
+
+                with self.inst.timer(f"[{self.stage}] {upstream}.{slot}"):
+                    output_file, rows = self.store.compact_day(
+                        stage=upstream,
+                        slot=slot,
+                        date=ctx.today,
+                        parquet_file=input_file,
+                    )
+
+                meta.commit(
+                    MetaOutput(
+                        input_file=input_file,
+                        output_file=output_file,
+                        rows=rows,
+                    )
+                )
+
+                logs.info(
+                    f"[{self.stage}] compacted {upstream}.{slot} "
+                    f"→ {output_file} rows={rows}"
+                )
+
+        return ctx
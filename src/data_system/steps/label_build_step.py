@@ -1,22 +1,30 @@
 #!filepath: src/pipeline/steps/label_build_step.py
 from __future__ import annotations
 
+import re
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.pipeline.step import PipelineStep
 from src.data_system.context import DataContext
 from src.meta.base import BaseMeta, MetaOutput
 from src.meta.slice_source import SliceSource
 from src.data_system.engines.labels.base import BaseLabelEngine
+from src.data_system.engines.labels.forward_return_label_engine import NextSession
+from src.meta.column_cache import ColumnCache
 from src.utils.logger import logs
 
 from src.data_system.engines.symbol_index_engine import SymbolIndexEngine
 from src.utils.parquet_writer import ParquetAppendWriter
 
 
+_DATE_DIR = re.compile(r"^\d{4}-?\d{2}-?\d{2}$")
+
+
 # -----------------------------------------------------------------------------
 # LabelBuildStep (FINAL / FROZEN)
 # -----------------------------------------------------------------------------
@@ -33,9 +41,19 @@ class LabelBuildStep(PipelineStep):
     冻结原则：
       - orchestration only
       - label 是派生数据资产
-      - engine 只处理单 symbol
+      - engine 只处理单 symbol（默认）
+      - batched=True：整张 min 表一次性交给 engine，segment_starts 来自
+        slice index，engine 保证路径不跨 symbol（要求 segment_aware）
       - slice discovery 完全由 SliceSource 驱动
       - 统一 canonicalize + writer + meta
+      - label schema 累积：manifest attrs["label_schema"] 记录文件中全部 label 列；
+        上游未变时，新 engine（如新增 horizon）的列追加到既有 label 列之后，
+        已有列原样保留；engine 的列全部已在 schema 中 → skip
+      - cross_day engine：次一交易日 min 每个 slot 只投影读取一次 open / price 列，
+        经 slice index 每个 symbol 取前 steps 行补齐尾部 horizon（一份 NextSession，
+        逐 symbol 模式按段取视图）；所用次日记录在
+        attrs["next_session"]，次日落地或变化 → 重建；
+        次日 run 成功后由 DataPipeline 对上一日重跑本 Step（cross_day 属性）
     """
 
     stage = "label"
@@ -45,10 +63,23 @@ class LabelBuildStep(PipelineStep):
             self,
             *,
             engine: BaseLabelEngine,
+            batched: bool = False,
             inst=None,
     ) -> None:
         super().__init__(inst)
         self.engine = engine
+        self.batched = batched
+
+        if batched and not getattr(engine, "segment_aware", False):
+            raise ValueError(
+                f"[LabelBuild] batched mode requires a segment-aware engine, "
+                f"got {type(engine).__name__}"
+            )
+
+    @property
+    def cross_day(self) -> bool:
+        """DataPipeline 据此在次日成功后回补上一日"""
+        return bool(getattr(self.engine, "cross_day", False))
 
     # ------------------------------------------------------------------
     def run(self, ctx: DataContext) -> DataContext:
@@ -69,11 +100,18 @@ class LabelBuildStep(PipelineStep):
             )
 
             # --------------------------------------------------
-            # 1. upstream check
+            # 1. upstream / label schema check
             # --------------------------------------------------
+            label_cols = list(self.engine.label_columns())
+            next_source, next_info = self._next_session(ctx, name)
+
+            schema: List[str] = []
             if not meta.upstream_changed():
-                logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
-                continue
+                attrs = meta.attrs()
+                schema = list(attrs.get("label_schema", []))
+                if set(label_cols) <= set(schema) and attrs.get("next_session") == next_info:
+                    logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
+                    continue
 
             # --------------------------------------------------
             # 2. SliceSource（来自 min stage）
@@ -84,22 +122,14 @@ class LabelBuildStep(PipelineStep):
                 output_slot=name,
             )
 
-            label_tables: List[pa.Table] = []
-
             # --------------------------------------------------
-            # 3. per-symbol label computation（engine 纯计算）
+            # 3. label computation（engine 纯计算）
             # --------------------------------------------------
             with self.inst.timer(f"[{self.stage}] {name}"):
-
-                for symbol, sub in source:
-                    if sub.num_rows == 0:
-                        continue
-
-                    out = self.engine.execute(sub)
-                    if out.num_rows == 0:
-                        continue
-
-                    label_tables.append(out)
+                if self.batched:
+                    label_tables, segments = self._label_batched(source, next_source)
+                else:
+                    label_tables, segments = self._label_per_symbol(source, next_source)
 
             if not label_tables:
                 logs.warning(f"[{self.stage}] {name} no labels produced")
@@ -108,10 +138,14 @@ class LabelBuildStep(PipelineStep):
             # --------------------------------------------------
             # 4. concat + canonicalize + rebuild slice index
             # --------------------------------------------------
+            # SliceSource 顺序即 canonical 顺序 → 通常命中快速路径
             tables, index = SymbolIndexEngine.execute(
-                pa.concat_tables(label_tables)
+                pa.concat_tables(label_tables),
+                segments=segments,
             )
 
+            tables, schema = self._carry_over(tables, output_file, schema, label_cols)
+
             writer = ParquetAppendWriter(output_file=output_file)
             writer.write(tables)
             writer.close()
@@ -125,13 +159,157 @@ class LabelBuildStep(PipelineStep):
                     output_file=output_file,
                     rows=tables.num_rows,
                     index=index,  # label 默认可 slice（即使暂时不用）
+                    attrs={"label_schema": schema, "next_session": next_info},
                 )
             )
 
             logs.info(
                 f"[{self.stage}] written {output_file.name} "
-                f"symbols={len(label_tables)} "
+                f"symbols={len(index)} "
                 f"(rows={tables.num_rows}, cols={len(tables.column_names)})"
             )
 
         return ctx
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _carry_over(
+            tables: pa.Table,
+            output_file: Path,
+            schema: List[str],
+            label_cols: List[str],
+    ) -> tuple[pa.Table, List[str]]:
+        """
+        保留既有 label 列（上游未变 → 行序与本次输出一致），返回 (表, 累积 schema)
+        """
+        carried = [c for c in schema if c not in label_cols]
+        if carried and output_file.exists():
+            prev = pq.read_table(output_file, columns=carried)
+            if prev.num_rows == tables.num_rows:
+                for name in carried:
+                    tables = tables.append_column(name, prev[name])
+            else:
+                logs.warning(
+                    f"[LabelBuild] {output_file.name} row mismatch "
+                    f"(prev={prev.num_rows}, now={tables.num_rows}) → drop {carried}"
+                )
+                carried = []
+        else:
+            carried = []
+
+        return tables, [*(c for c in schema if c in carried), *label_cols]
+
+    # ------------------------------------------------------------------
+    def _next_session(
+            self,
+            ctx: DataContext,
+            slot: str,
+    ) -> tuple[Optional[SliceSource], Optional[dict]]:
+        """
+        次一交易日（meta 目录下紧邻的下一个日期目录）的 min SliceSource
+
+        - 非 cross_day engine / 次日尚未落地 → (None, None)
+        - 只看紧邻的下一个日期：其 min 未完成时绝不跳到更后的日期
+        """
+        if not self.cross_day:
+            return None, None
+
+        today = ctx.today.replace("-", "")
+        later = sorted(
+            (d for d in ctx.meta_dir.parent.iterdir()
+             if d.is_dir() and _DATE_DIR.match(d.name) and d.name.replace("-", "") > today),
+            key=lambda d: d.name.replace("-", ""),
+        )
+        if not later:
+            return None, None
+
+        next_meta = BaseMeta(meta_dir=later[0], stage=self.upstream_stage, output_slot=slot)
+        if not next_meta.exists():
+            return None, None
+
+        source = SliceSource(meta_dir=later[0], stage=self.upstream_stage, output_slot=slot)
+        return source, {
+            "date": later[0].name,
+            "fingerprint": ColumnCache.fingerprint(source.manifest()),
+        }
+
+    # ------------------------------------------------------------------
+    def _next_session_of(
+            self,
+            next_source: Optional[SliceSource],
+            symbols: List[str],
+    ) -> Optional[NextSession]:
+        """
+        次日开盘段：open / price 两列整表投影读一次，每个 symbol 只取前 steps 行
+        （segment 顺序 = symbols 顺序）
+        """
+        if next_source is None:
+            return None
+
+        table = next_source.table(columns=["open", self.engine.price_col])
+        bounds = {symbol: (start, length) for symbol, start, length in next_source.segments()}
+        tables = [
+            table.slice(bounds[symbol][0], min(bounds[symbol][1], self.engine.steps))
+            if symbol in bounds
+            else None
+            for symbol in symbols
+        ]
+        return NextSession.from_tables(tables, self.engine.price_col)
+
+    # ------------------------------------------------------------------
+    def _label_per_symbol(self, source: SliceSource, next_source: Optional[SliceSource] = None):
+        label_tables: List[pa.Table] = []
+        segments: List[tuple[str, int]] = []
+
+        symbols = source.symbols()
+        position = {symbol: i for i, symbol in enumerate(symbols)}
+        next_session = self._next_session_of(next_source, symbols)
+
+        for symbol, sub in source:
+            if sub.num_rows == 0:
+                continue
+
+            kwargs = {}
+            if next_session is not None:
+                kwargs["next_session"] = next_session.segment(position[symbol])
+
+            out = self.engine.execute(sub, **kwargs)
+            if out.num_rows == 0:
+                continue
+
+            label_tables.append(out)
+            segments.append((symbol, out.num_rows))
+
+        return label_tables, segments
+
+    # ------------------------------------------------------------------
+    def _label_batched(self, source: SliceSource, next_source: Optional[SliceSource] = None):
+        """
+        整表一次（slice index 必须无缝覆盖整表，min 阶段由 SymbolIndexEngine 保证）
+        """
+        slices = [(s, start, length) for s, start, length in source.segments() if length > 0]
+        if not slices:
+            return [], []
+
+        table = source.table()
+        expected = 0
+        for symbol, start, length in slices:
+            if start != expected:
+                raise RuntimeError(
+                    f"[LabelBuild] slice index not contiguous at {symbol}: "
+                    f"start={start}, expected={expected}"
+                )
+            expected += length
+        if expected != table.num_rows:
+            raise RuntimeError(
+                f"[LabelBuild] slice index covers {expected} rows, table has {table.num_rows}"
+            )
+
+        starts = np.array([start for _, start, _ in slices], dtype=np.int64)
+        next_session = self._next_session_of(next_source, [symbol for symbol, _, _ in slices])
+        out = self.engine.execute(
+            table,
+            segment_starts=starts,
+            **({} if next_session is None else {"next_session": next_session}),
+        )
+        return [out], [(symbol, length) for symbol, _, length in slices]
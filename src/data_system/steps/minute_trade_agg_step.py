@@ -33,7 +33,7 @@ class MinuteTradeAggStep(PipelineStep):
 
     冻结原则：
       - orchestration only
-      - engine 只处理单 symbol
+      - engine 只处理单 symbol（multi_symbol=True 时一次处理全交易所）
       - min 阶段重新生成 slice index
       - 统一 writer / index engine
     """
@@ -45,9 +45,11 @@ class MinuteTradeAggStep(PipelineStep):
         self,
         engine: MinuteTradeAggEngine,
         inst=None,
+        multi_symbol: bool = False,
     ) -> None:
         super().__init__(inst)
         self.engine = engine
+        self.multi_symbol = multi_symbol
 
     # ------------------------------------------------------------------
     def run(self, ctx: DataContext) -> DataContext:
@@ -84,41 +86,24 @@ class MinuteTradeAggStep(PipelineStep):
                 output_slot=name,
             )
 
-            minute_tables: List[pa.Table] = []
-
             # --------------------------------------------------
-            # 3. per-symbol minute aggregation（engine 纯计算）
+            # 3. minute aggregation（engine 纯计算）+ canonical slice index
             # --------------------------------------------------
             with self.inst.timer(f"[{self.stage}] {name}"):
-                symbol_count = 0
-
-                for symbol, sub in source:
-                    if sub.num_rows == 0:
-                        continue
-
-                    minute = self.engine.execute(sub)
-                    if minute.num_rows == 0:
-                        continue
-
-                    # engine 不负责 symbol，Step 补齐
-                    minute = minute.append_column(
-                        "symbol",
-                        pa.array([symbol] * minute.num_rows),
-                    )
-
-                    minute_tables.append(minute)
-                    symbol_count += 1
+                if self.multi_symbol:
+                    minute = self._aggregate_exchange(source)
+                else:
+                    minute = self._aggregate_per_symbol(source)
 
-            if not minute_tables:
+            if minute is None:
                 logs.warning(f"[{self.stage}] {name} no minute data")
                 continue
 
             # --------------------------------------------------
-            # 4. concat + canonical sort + rebuild slice index
+            # 4. write
             # --------------------------------------------------
-            tables, index = SymbolIndexEngine.execute(
-                pa.concat_tables(minute_tables)
-            )
+            tables, index = minute
+            symbol_count = len(index)
 
             writer = ParquetAppendWriter(output_file=output_file)
             writer.write(tables)
@@ -142,3 +127,44 @@ class MinuteTradeAggStep(PipelineStep):
             )
 
         return ctx
+
+    # ------------------------------------------------------------------
+    def _aggregate_exchange(self, source: SliceSource):
+        """
+        全交易所一次 group_by（输入即 canonical 顺序 → 输出命中 index 快速路径）
+        """
+        minute = self.engine.execute_many(source.table())
+        if minute.num_rows == 0:
+            return None
+        return SymbolIndexEngine.execute(minute)
+
+    # ------------------------------------------------------------------
+    def _aggregate_per_symbol(self, source: SliceSource):
+        minute_tables: List[pa.Table] = []
+        segments: List[tuple[str, int]] = []
+
+        for symbol, sub in source:
+            if sub.num_rows == 0:
+                continue
+
+            minute = self.engine.execute(sub)
+            if minute.num_rows == 0:
+                continue
+
+            # engine 不负责 symbol，Step 补齐
+            minute = minute.append_column(
+                "symbol",
+                pa.array([symbol] * minute.num_rows),
+            )
+
+            minute_tables.append(minute)
+            segments.append((symbol, minute.num_rows))
+
+        if not minute_tables:
+            return None
+
+        # SliceSource 顺序即 canonical 顺序 → 通常命中快速路径
+        return SymbolIndexEngine.execute(
+            pa.concat_tables(minute_tables),
+            segments=segments,
+        )
@@ -0,0 +1,185 @@
+#!filepath: src/data_system/steps/orderbook_feature_step.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pyarrow as pa
+
+from src.pipeline.step import PipelineStep
+from src.data_system.context import DataContext
+from src.data_system.engines.orderbook_feature_engine import (
+    EVENT_COLUMNS,
+    OrderBookFeatureEngine,
+    align_to_minutes,
+)
+from src.data_system.engines.symbol_index_engine import SymbolIndexEngine
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+from src.utils.logger import logs
+from src.utils.parquet_writer import ParquetAppendWriter
+
+
+class OrderBookFeatureStep(PipelineStep):
+    """
+    OrderBookFeatureStep（OPTIONAL · 盘口侧线）
+
+    输入：
+      fact/min.{ex}_trade.parquet          （对齐基准：分钟 bar 的 symbol / ts）
+      normalized/convert.{ex}_order.parquet（ADD / CANCEL）
+      normalized/convert.{ex}_trade.parquet（TRADE / 深交所撤单回报）
+
+    输出：
+      fact/ob.{ex}_trade.parquet           （symbol / ts + ob_* 列）
+      meta/ob.{ex}_trade.manifest.json     （带 symbol slice index）
+
+    冻结原则：
+      - orchestration only
+      - engine 只处理单 symbol（order + trade 合并后的事件流，单次扫描）
+      - 输出与 min 表逐行对齐（同一 canonical 顺序、同一 slice index），
+        FeatureBuildStep(join_stages=["ob"]) 直接按列追加
+      - slot 与 min 同名，便于下游按 slot 定位
+    """
+
+    stage = "ob"
+    upstream_stage = "min"
+
+    def __init__(
+            self,
+            *,
+            engine: OrderBookFeatureEngine,
+            inst=None,
+    ) -> None:
+        super().__init__(inst)
+        self.engine = engine
+
+    # ------------------------------------------------------------------
+    def run(self, ctx: DataContext) -> DataContext:
+        fact_dir: Path = ctx.fact_dir
+        meta_dir: Path = ctx.meta_dir
+
+        for input_file in fact_dir.glob(f"{self.upstream_stage}.*trade.parquet"):
+            name = input_file.stem.split(".")[1]
+            output_file = fact_dir / f"{self.stage}.{name}.parquet"
+
+            meta = BaseMeta(
+                meta_dir=meta_dir,
+                stage=self.stage,
+                output_slot=name,
+            )
+
+            # --------------------------------------------------
+            # 1. upstream check
+            # --------------------------------------------------
+            if not meta.upstream_changed():
+                logs.warning(f"[{self.stage}] meta hit → skip {input_file.name}")
+                continue
+
+            # --------------------------------------------------
+            # 2. SliceSource（min 为对齐基准；事件流来自 convert）
+            # --------------------------------------------------
+            exchange = name.split("_")[0]
+            minutes = SliceSource(
+                meta_dir=meta_dir,
+                stage=self.upstream_stage,
+                output_slot=name,
+            )
+            events = [
+                SliceSource(meta_dir=meta_dir, stage="convert", output_slot=slot)
+                for slot in (f"{exchange}_order", f"{exchange}_trade")
+                if BaseMeta(meta_dir=meta_dir, stage="convert", output_slot=slot).exists()
+            ]
+            if not events:
+                logs.warning(f"[{self.stage}] {name} no convert event stream")
+                continue
+
+            segments = [
+                (symbol, length)
+                for symbol, _, length in minutes.segments()
+                if length > 0
+            ]
+            if not segments:
+                logs.warning(f"[{self.stage}] {name} empty min table")
+                continue
+
+            # --------------------------------------------------
+            # 3. per-symbol streaming replay（engine 纯计算）
+            #    投影列整表读入一次，逐 symbol 0-copy slice
+            # --------------------------------------------------
+            with self.inst.timer(f"[{self.stage}] {name}"):
+                for src in events:
+                    src.warm(EVENT_COLUMNS)
+                minutes.warm(["ts"])
+
+                parts: List[pa.Table] = []
+                for symbol, _ in segments:
+                    feats = self.engine.execute(self._events(events, symbol))
+                    aligned = align_to_minutes(
+                        feats,
+                        minutes.get(symbol, columns=["ts"])["ts"],
+                    )
+                    parts.append(
+                        aligned.add_column(0, "symbol", pa.array([symbol] * aligned.num_rows))
+                    )
+
+            # --------------------------------------------------
+            # 4. slice index（行序与 min 一致 → 直接复用 min 段）
+            # --------------------------------------------------
+            tables, index = SymbolIndexEngine.execute(
+                pa.concat_tables(parts),
+                segments=segments,
+            )
+
+            writer = ParquetAppendWriter(output_file=output_file)
+            writer.write(tables)
+            writer.close()
+
+            # --------------------------------------------------
+            # 5. commit meta
+            # --------------------------------------------------
+            meta.commit(
+                MetaOutput(
+                    input_file=input_file,
+                    output_file=output_file,
+                    rows=tables.num_rows,
+                    index=index,
+                )
+            )
+
+            logs.info(
+                f"[{self.stage}] written {output_file.name} "
+                f"symbols={len(index)} rows={tables.num_rows}"
+            )
+
+        return ctx
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _events(sources: List[SliceSource], symbol: str) -> pa.Table:
+        """
+        order + trade 事件合并（只取 engine 需要的列；排序交给 engine）
+        """
+        tables = [
+            src.get(symbol, columns=EVENT_COLUMNS)
+            for src in sources
+            if symbol in src
+        ]
+        tables = [t for t in tables if t.num_rows > 0]
+        if not tables:
+            return _empty_events()
+        return pa.concat_tables(tables, promote_options="permissive")
+
+
+def _empty_events() -> pa.Table:
+    return pa.table(
+        {
+            "ts": pa.array([], pa.int64()),
+            "event": pa.array([], pa.string()),
+            "order_id": pa.array([], pa.int64()),
+            "side": pa.array([], pa.string()),
+            "price": pa.array([], pa.float64()),
+            "volume": pa.array([], pa.int64()),
+            "buy_no": pa.array([], pa.int64()),
+            "sell_no": pa.array([], pa.int64()),
+        }
+    )
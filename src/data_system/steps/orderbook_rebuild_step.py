@@ -14,6 +14,7 @@ from src.data_system.context import DataContext
 from src.data_system.engines.context import  EngineContext
 from src.pipeline.step import PipelineStep
 from src.data_system.engines.orderbook_rebuild_engine import OrderBookRebuildEngine
+from src.utils.filesystem import FileSystem
 
 
 # ============================================================
@@ -76,7 +77,7 @@ def _rebuild_one(job: _Job) -> _JobResult:
         job.output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write to tmp and atomically replace to avoid partial files
-        tmp_out = job.output_path.with_suffix(job.output_path.suffix + ".tmp")
+        tmp_out = FileSystem.tmp_path(job.output_path)
 
         engine = OrderBookRebuildEngine(record_events=False)
         engine_ctx = EngineContext(
@@ -88,7 +89,8 @@ def _rebuild_one(job: _Job) -> _JobResult:
         )
         engine.execute(engine_ctx)
 
-        tmp_out.replace(job.output_path)
+        FileSystem.fsync_file(tmp_out)
+        FileSystem.replace(tmp_out, job.output_path)
 
         return _JobResult(
             symbol=job.symbol,
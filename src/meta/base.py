@@ -35,6 +35,9 @@ class MetaOutput:
     # 可选结构性能力（如 symbol slice）
     index: Optional[Dict[str, Tuple[int, int]]] = None
 
+    # 可选产物属性（JSON-able，如 feature spec），原样写入 manifest["attrs"]
+    attrs: Optional[Dict[str, Any]] = None
+
 
 import json
 from pathlib import Path
@@ -45,7 +48,15 @@ from typing import List, Optional
 # BaseMeta v2（冻结）
 # ----------------------------------------------------------------------
 class BaseMeta:
+    """
+    写入语义（crash-consistent）：
+      - manifest 经 FileSystem.safe_write 原子落盘（唯一 tmp + fsync）
+      - 每次 commit 追加一行到 meta_dir/_journal.jsonl（append-only 审计）
+      - 空 / 损坏的 manifest 一律视为 upstream_changed（绝不当作 hit）
+    """
+
     META_VERSION = 1.2
+    JOURNAL_NAME = "_journal.jsonl"
 
     def __init__(
             self,
@@ -72,6 +83,11 @@ class BaseMeta:
     def path(self) -> Path:
         return self.meta_dir / self.name
 
+    # --------------------------------------------------
+    @property
+    def journal_path(self) -> Path:
+        return self.meta_dir / self.JOURNAL_NAME
+
     # --------------------------------------------------
     def exists(self) -> bool:
         return self.path.exists()
@@ -81,6 +97,19 @@ class BaseMeta:
         with self.path.open("r", encoding="utf-8") as f:
             return json.load(f)
 
+    # --------------------------------------------------
+    def attrs(self) -> dict:
+        """
+        manifest["attrs"]（不存在 / 不可读 → 空 dict）
+        """
+        try:
+            manifest = self.load()
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict):
+            return {}
+        return manifest.get("attrs") or {}
+
     # --------------------------------------------------
     def commit(self, result: MetaOutput | dict) -> None:
         if isinstance(result, dict):
@@ -114,6 +143,9 @@ class BaseMeta:
                 },
             }
 
+        if result.attrs is not None:
+            payload["attrs"] = dict(result.attrs)
+
         data = json.dumps(payload, indent=2, sort_keys=True).encode("utf-8")
 
         FileSystem.safe_write(
@@ -121,6 +153,20 @@ class BaseMeta:
             data,
         )
 
+        FileSystem.append_line(
+            self.journal_path,
+            json.dumps(
+                {
+                    "created_at": payload["created_at"],
+                    "manifest": self.name,
+                    "output": payload["outputs"]["file"],
+                    "rows": result.rows,
+                    "size": payload["outputs"]["size"],
+                },
+                sort_keys=True,
+            ),
+        )
+
     def upstream_changed(self) -> bool:
         """
         判断上游是否发生变化：
@@ -133,7 +179,16 @@ class BaseMeta:
             logs.debug(f'[meta] manifest not exist: {self.path.name}')
             return True
 
-        manifest = self.load()
+        try:
+            manifest = self.load()
+        except (OSError, ValueError) as e:
+            # 掉电 / 并发残留的空文件或半文件：必须重跑
+            logs.warning(f'[meta] manifest unreadable: {self.path.name} | {e}')
+            return True
+
+        if not isinstance(manifest, dict) or "outputs" not in manifest:
+            logs.warning(f'[meta] manifest incomplete: {self.path.name}')
+            return True
 
         recorded = (
             manifest
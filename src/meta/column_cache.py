@@ -0,0 +1,149 @@
+# src/meta/column_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.logger import logs
+from src.utils.parquet_utils import ParquetAtomicWriter
+
+
+_SCALAR_TYPES = (int, float, str, bool, type(None), list, tuple)
+
+
+def spec_of(engine: object) -> str:
+    """
+    engine 的稳定 spec 字符串（类名 + 公开标量参数）
+
+    - engine 可自行定义 spec() 覆盖（如 FeatureGraphEngine）
+    - "_" 开头的属性视为运行期状态，不参与 spec
+    """
+    spec = getattr(engine, "spec", None)
+    if callable(spec):
+        return spec()
+
+    cls = type(engine)
+    params = {
+        k: v
+        for k, v in sorted(vars(engine).items())
+        if not k.startswith("_") and isinstance(v, _SCALAR_TYPES)
+    }
+    return f"{cls.__module__}.{cls.__qualname__}{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ColumnCache:
+    """
+    ColumnCache（feature 列级缓存）
+
+    语义：
+      - 以 (engine spec 链, 上游 fingerprint) 为键，按列存储 engine 的增量输出
+      - 上游不变 + spec 不变 → 直接取列，不再计算
+      - 新增 engine（如 FeatureL1StatEngine(window=60)）只计算新列，
+        既有列从缓存拼接
+
+    物理布局：
+        {root}/{slot}/{fingerprint}/{key}.parquet
+
+      - fingerprint：上游 manifest 的产物身份（file / size / rows / created_at）
+      - key       ：spec 链哈希（engine 的输入依赖其前序 engine，故逐级链式）
+      - 每个文件与上游表行对齐（slice index 物理顺序）
+
+    冻结约束：
+      - 不理解 feature 语义，只存取列
+      - 损坏 / 行数不符的缓存视为 miss（绝不返回错位数据）
+    """
+
+    # --------------------------------------------------
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    # ==================================================
+    # keys
+    # ==================================================
+    @staticmethod
+    def fingerprint(manifest: dict) -> str:
+        outputs = manifest.get("outputs", {})
+        return _digest(
+            json.dumps(
+                {
+                    "file": outputs.get("file"),
+                    "size": outputs.get("size"),
+                    "rows": outputs.get("rows"),
+                    "created_at": manifest.get("created_at"),
+                },
+                sort_keys=True,
+            )
+        )
+
+    @staticmethod
+    def chain(parent: str, spec: str) -> str:
+        """
+        key_i = H(key_{i-1} | spec_i)
+        """
+        return _digest(f"{parent}|{spec}")
+
+    # ==================================================
+    # layout
+    # ==================================================
+    def path(self, slot: str, fingerprint: str, key: str) -> Path:
+        return self.root / slot / fingerprint / f"{key}.parquet"
+
+    # ==================================================
+    # read / write
+    # ==================================================
+    def get(
+            self,
+            slot: str,
+            fingerprint: str,
+            key: str,
+            *,
+            rows: int,
+    ) -> Optional[pa.Table]:
+        path = self.path(slot, fingerprint, key)
+        if not path.exists():
+            return None
+
+        try:
+            table = pq.read_table(path)
+        except (OSError, pa.ArrowInvalid) as e:
+            logs.warning(f"[ColumnCache] unreadable {path} | {e}")
+            return None
+
+        if table.num_rows != rows:
+            logs.warning(
+                f"[ColumnCache] row mismatch {path}: cached={table.num_rows}, expected={rows}"
+            )
+            return None
+
+        return table
+
+    def put(self, slot: str, fingerprint: str, key: str, table: pa.Table) -> Path:
+        path = self.path(slot, fingerprint, key)
+        ParquetAtomicWriter.write_table(table, path, compression="zstd")
+        return path
+
+    # --------------------------------------------------
+    def prune(self, slot: str, *, keep: str) -> int:
+        """
+        删除 slot 下除 keep 以外的 fingerprint（上游已变化的旧缓存）
+        """
+        slot_dir = self.root / slot
+        if not slot_dir.exists():
+            return 0
+
+        removed = 0
+        for d in slot_dir.iterdir():
+            if d.is_dir() and d.name != keep:
+                shutil.rmtree(d, ignore_errors=True)
+                removed += 1
+        return removed
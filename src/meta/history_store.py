@@ -0,0 +1,256 @@
+# src/meta/history_store.py
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.meta.slice_accessor import TsRange
+from src.utils.filesystem import FileSystem
+
+
+class HistoryStore:
+    """
+    HistoryStore（OPTIONAL · LONG-FORMAT CONSOLIDATED STORE）
+
+    语义：
+      - 每日 stage 产物（dated 目录、一日一文件）的“长表”合并视图
+      - 面向 symbol × 多年时间区间扫描，避免逐日打开 manifest / 文件
+
+    物理布局（hive partitioning）：
+        {root}/stage={stage}/slot={slot}/ym={YYYYMM}/part-{k}.parquet
+
+      - slot = output_slot（exchange_kind，如 sh_trade）
+      - 每个 ym 分区折叠成少量文件（每个约 file_rows 行，按 symbol 边界切分）
+      - 分区内按 (symbol, date, ts) 排序，小 row group
+        → 文件 / row group 的 symbol、date、ts 统计量足够窄，可被 dataset filter 剪枝
+      - date 列由 store 写入（= compaction 的 date），用于按日替换与区间过滤
+
+    compaction：
+      - 一次 compact_day = 重写整个 ym 分区（旧分区去掉同日行 + 新一日）
+        → 幂等、可按日覆盖
+      - 新分区写到隐藏临时目录，整目录 rename 替换；同一 ym 的并发 compaction
+        由 {root}/.locks/ 下的分区锁串行
+
+    冻结约束：
+      - 不理解业务列（只依赖 symbol / ts）
+      - 不替代每日 stage 产物（daily 仍是唯一事实来源）
+    """
+
+    ROW_GROUP_SIZE = 64 * 1024
+    FILE_ROWS = 4 * 1024 * 1024
+    DATE_COLUMN = "date"
+
+    # --------------------------------------------------
+    def __init__(
+            self,
+            root: Path,
+            *,
+            row_group_size: int = ROW_GROUP_SIZE,
+            file_rows: int = FILE_ROWS,
+    ) -> None:
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+        self.file_rows = file_rows
+
+    # ==================================================
+    # layout
+    # ==================================================
+    @staticmethod
+    def _ym(date: str) -> str:
+        return date[:4] + date[5:7] if "-" in date else date[:6]
+
+    def slot_dir(self, stage: str, slot: str) -> Path:
+        return self.root / f"stage={stage}" / f"slot={slot}"
+
+    def partition_dir(self, stage: str, slot: str, date: str) -> Path:
+        return self.slot_dir(stage, slot) / f"ym={self._ym(date)}"
+
+    def _lock_path(self, stage: str, slot: str, date: str) -> Path:
+        return self.root / ".locks" / f"{stage}.{slot}.{self._ym(date)}.lock"
+
+    # ==================================================
+    # compaction（写）
+    # ==================================================
+    def compact_day(
+            self,
+            *,
+            stage: str,
+            slot: str,
+            date: str,
+            parquet_file: Path,
+    ) -> tuple[Path, int]:
+        """
+        将一个 day 的 stage 产物折叠进其 ym 分区（覆盖同日旧行）
+
+        Returns:
+            (分区目录, 该日行数)
+        """
+        day = pq.read_table(parquet_file)
+        if self.DATE_COLUMN in day.column_names:
+            day = day.drop_columns([self.DATE_COLUMN])
+        day = day.append_column(
+            self.DATE_COLUMN, pa.array([date] * day.num_rows, pa.string())
+        )
+
+        part_dir = self.partition_dir(stage, slot, date)
+
+        with FileSystem.lock(self._lock_path(stage, slot, date)):
+            tables = [day]
+            if part_dir.is_dir():
+                month = ds.dataset(part_dir, format="parquet").to_table(
+                    filter=pc.field(self.DATE_COLUMN) != date,
+                )
+                tables.insert(0, month)
+
+            table = pa.concat_tables(tables, promote_options="default").sort_by(
+                [("symbol", "ascending"), (self.DATE_COLUMN, "ascending"), ("ts", "ascending")]
+            )
+            self._replace_partition(part_dir, table)
+
+        return part_dir, day.num_rows
+
+    # --------------------------------------------------
+    def _split_points(self, table: pa.Table) -> List[int]:
+        """按 symbol 边界切分：每个文件至少 file_rows 行（最后一个除外）"""
+        run_ends = pc.run_end_encode(table["symbol"].combine_chunks()).run_ends.to_pylist()
+
+        points, begin = [], 0
+        for end in run_ends:
+            if end - begin >= self.file_rows:
+                points.append(end)
+                begin = end
+        if not points or points[-1] != table.num_rows:
+            points.append(table.num_rows)
+        return points
+
+    def _replace_partition(self, part_dir: Path, table: pa.Table) -> None:
+        tmp = part_dir.with_name(f".{part_dir.name}.tmp")
+        old = part_dir.with_name(f".{part_dir.name}.old")
+        for stale in (tmp, old):
+            if stale.exists():
+                shutil.rmtree(stale)
+
+        FileSystem.ensure_dir(tmp)
+        try:
+            begin = 0
+            for k, end in enumerate(self._split_points(table)):
+                path = tmp / f"part-{k:05d}.parquet"
+                pq.write_table(
+                    table.slice(begin, end - begin),
+                    path,
+                    row_group_size=self.row_group_size,
+                    compression="zstd",
+                    write_statistics=True,
+                )
+                FileSystem.fsync_file(path)
+                begin = end
+
+            if part_dir.exists():
+                os.replace(part_dir, old)
+            os.replace(tmp, part_dir)
+            FileSystem.fsync_dir(part_dir.parent)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        shutil.rmtree(old, ignore_errors=True)
+
+    # ==================================================
+    # query（读）
+    # ==================================================
+    def dataset(self, stage: str, slot: str) -> ds.Dataset:
+        """
+        原生 pyarrow dataset（含 hive 分区列 ym），供 ad-hoc 查询
+
+        隐藏目录（compaction 临时分区）不参与 discovery
+        """
+        return ds.dataset(
+            self.slot_dir(stage, slot),
+            format="parquet",
+            partitioning="hive",
+        )
+
+    # --------------------------------------------------
+    def files(
+            self,
+            stage: str,
+            slot: str,
+            *,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+    ) -> List[Path]:
+        """
+        与 [start, end] 相交的 ym 分区下的全部文件（分区级剪枝）
+        """
+        base = self.slot_dir(stage, slot)
+        if not base.exists():
+            return []
+
+        ym_lo = None if start is None else self._ym(start)
+        ym_hi = None if end is None else self._ym(end)
+
+        out: List[Path] = []
+        for part in sorted(base.glob("ym=*")):
+            ym = part.name[len("ym="):]
+            if (ym_lo is not None and ym < ym_lo) or (ym_hi is not None and ym > ym_hi):
+                continue
+            out.extend(sorted(part.glob("*.parquet")))
+
+        return out
+
+    # --------------------------------------------------
+    def scan(
+            self,
+            stage: str,
+            slot: str,
+            *,
+            symbols: Optional[Sequence[str]] = None,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            columns: Optional[Sequence[str]] = None,
+            ts_range: Optional[TsRange] = None,
+    ) -> pa.Table:
+        """
+        symbol × 时间区间扫描
+
+        - 分区剪枝：ym 分区谓词（start / end）
+        - 文件 / row-group 剪枝：symbol / date / ts 谓词下推给 dataset scanner
+        - 输出按 ym 升序；ym 内保持 (symbol, date, ts) 顺序
+        """
+        if not self.files(stage, slot, start=start, end=end):
+            raise FileNotFoundError(
+                f"[HistoryStore] no data for stage={stage} slot={slot} "
+                f"range=[{start}, {end}]"
+            )
+
+        expr = None
+        if start is not None:
+            expr = _and(expr, pc.field("ym") >= int(self._ym(start)))
+            expr = _and(expr, pc.field(self.DATE_COLUMN) >= start)
+        if end is not None:
+            expr = _and(expr, pc.field("ym") <= int(self._ym(end)))
+            expr = _and(expr, pc.field(self.DATE_COLUMN) <= end)
+        if symbols is not None:
+            expr = _and(expr, pc.field("symbol").isin(list(symbols)))
+        if ts_range is not None:
+            lo, hi = ts_range
+            if lo is not None:
+                expr = _and(expr, pc.field("ts") >= lo)
+            if hi is not None:
+                expr = _and(expr, pc.field("ts") <= hi)
+
+        return self.dataset(stage, slot).to_table(
+            columns=None if columns is None else list(columns),
+            filter=expr,
+        )
+
+
+def _and(a: Optional[pc.Expression], b: pc.Expression) -> pc.Expression:
+    return b if a is None else (a & b)
@@ -0,0 +1,220 @@
+# src/meta/multi_day_slice_source.py
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import pyarrow as pa
+
+from src.meta.slice_accessor import TsRange
+from src.meta.slice_source import SliceSource
+
+
+class MultiDaySliceSource:
+    """
+    MultiDaySliceSource（USER-FACING · READ-ONLY）
+
+    语义：
+      - 一个 symbol 跨多个交易日的连续历史视图
+      - 每个 day 仍由独立的 SliceSource（manifest + slice index）提供
+      - get(symbol) = 按日期顺序拼接各日 slice（chunked table，0-copy）
+      - columns / ts_range 逐日下推到 parquet reader
+
+    设计原则：
+      - 不理解 PathManager：调用方显式给出 {date: meta_dir}
+      - 缺失的 day（无 manifest）或 day 内缺失 symbol（停牌）直接跳过
+      - 后台线程预读后续 day，隐藏 parquet I/O
+      - 已打开的 day 以 LRU 方式保留，内存有界
+    """
+
+    # --------------------------------------------------
+    def __init__(
+            self,
+            *,
+            day_meta_dirs: Mapping[str, Path],
+            stage: str,
+            output_slot: str,
+            prefetch_days: int = 2,
+            max_cached_days: int = 8,
+    ) -> None:
+        if prefetch_days < 0:
+            raise ValueError("prefetch_days must be >= 0")
+        if max_cached_days <= prefetch_days:
+            raise ValueError("max_cached_days must be > prefetch_days")
+
+        self._stage = stage
+        self._output_slot = output_slot
+        self._prefetch_days = prefetch_days
+        self._max_cached_days = max_cached_days
+
+        # date 字符串（YYYY-MM-DD）天然可排序
+        self._day_meta_dirs: Dict[str, Path] = {
+            d: Path(day_meta_dirs[d]) for d in sorted(day_meta_dirs)
+        }
+
+        self._cache: "OrderedDict[str, Optional[SliceSource]]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="slice-prefetch")
+            if prefetch_days > 0
+            else None
+        )
+
+    # --------------------------------------------------
+    def dates(self) -> List[str]:
+        return list(self._day_meta_dirs.keys())
+
+    # --------------------------------------------------
+    def symbols(self) -> List[str]:
+        """
+        所有 day 的 symbol 并集（按首次出现顺序）
+        """
+        seen: Dict[str, None] = {}
+        for day, meta_dir in self._day_meta_dirs.items():
+            # 只读 manifest，不触发 parquet 读入
+            try:
+                source = SliceSource(
+                    meta_dir=meta_dir,
+                    stage=self._stage,
+                    output_slot=self._output_slot,
+                )
+            except FileNotFoundError:
+                continue
+            for symbol in source.symbols():
+                seen.setdefault(symbol, None)
+        return list(seen.keys())
+
+    # --------------------------------------------------
+    def get(
+            self,
+            symbol: str,
+            *,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            columns: Optional[Sequence[str]] = None,
+            ts_range: Optional[TsRange] = None,
+    ) -> pa.Table:
+        """
+        Contract:
+        - 返回 [start, end]（含端点）内该 symbol 的全部行，按日期升序拼接
+        - 结果为 chunked table（每个 day 至少一个 chunk），不做 combine
+        - 所有 day 都不存在该 symbol → KeyError（与 SliceSource 一致）
+        """
+        pieces = [table for _, table in self.iter_days(
+            symbol, start=start, end=end, columns=columns, ts_range=ts_range,
+        )]
+
+        if not pieces:
+            raise KeyError(
+                f"[MultiDaySliceSource] symbol not found in any day: {symbol}"
+            )
+
+        return pa.concat_tables(pieces)
+
+    # --------------------------------------------------
+    def iter_days(
+            self,
+            symbol: str,
+            *,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            columns: Optional[Sequence[str]] = None,
+            ts_range: Optional[TsRange] = None,
+    ) -> Iterator[Tuple[str, pa.Table]]:
+        """
+        逐日产出 (date, slice)，供 walk-forward 循环直接消费。
+
+        columns / ts_range 下推到每个 day 的 SliceSource.get
+        """
+        days = self._select_days(start, end)
+
+        for i, day in enumerate(days):
+            # 先预读后续 day，再阻塞当前 day
+            self._prefetch(days[i + 1: i + 1 + self._prefetch_days], columns)
+
+            source = self._source(day, columns)
+            if source is None or symbol not in source:
+                continue
+
+            table = source.get(symbol, columns=columns, ts_range=ts_range)
+
+            if table.num_rows > 0:
+                yield day, table
+
+    # --------------------------------------------------
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._pending.clear()
+        self._cache.clear()
+
+    def __enter__(self) -> "MultiDaySliceSource":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ==================================================
+    # internal
+    # ==================================================
+    def _select_days(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        return [
+            d for d in self._day_meta_dirs
+            if (start is None or d >= start) and (end is None or d <= end)
+        ]
+
+    # --------------------------------------------------
+    def _open(
+            self,
+            day: str,
+            columns: Optional[Sequence[str]] = None,
+    ) -> Optional[SliceSource]:
+        """
+        打开并“热身”一个 day：manifest + 投影列整表读入（SliceAccessor 内缓存）
+        """
+        try:
+            source = SliceSource(
+                meta_dir=self._day_meta_dirs[day],
+                stage=self._stage,
+                output_slot=self._output_slot,
+            )
+        except FileNotFoundError:
+            return None
+
+        source.warm(columns)
+        return source
+
+    # --------------------------------------------------
+    def _prefetch(
+            self,
+            days: Sequence[str],
+            columns: Optional[Sequence[str]],
+    ) -> None:
+        if self._pool is None:
+            return
+        for day in days:
+            if day in self._cache or day in self._pending:
+                continue
+            self._pending[day] = self._pool.submit(self._open, day, columns)
+
+    # --------------------------------------------------
+    def _source(
+            self,
+            day: str,
+            columns: Optional[Sequence[str]] = None,
+    ) -> Optional[SliceSource]:
+        if day in self._cache:
+            self._cache.move_to_end(day)
+            return self._cache[day]
+
+        future = self._pending.pop(day, None)
+        source = future.result() if future is not None else self._open(day, columns)
+
+        self._cache[day] = source
+        while len(self._cache) > self._max_cached_days:
+            self._cache.popitem(last=False)
+
+        return source
@@ -2,13 +2,17 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.parquet as pq
 
 from src.meta.slice_capability import SliceCapability
 
+# (lo, hi) 闭区间；任一端为 None 表示不限
+TsRange = Tuple[Optional[int], Optional[int]]
+
 
 class SliceAccessor:
     """
@@ -20,6 +24,15 @@ class SliceAccessor:
       - 不写文件
       - 不做业务
       - 不理解 pipeline
+
+    读取路径：
+      - 无 columns / ts_range：整表读入一次并缓存，slice 0-copy（原语义）
+      - 有 columns / ts_range：下推到 parquet reader
+          * 只解码所需列（projection）
+          * 只读与 slice 行区间重叠的 row group
+          * 利用 ts 列的 row-group 统计量跳过不相交的 row group
+          * 已解码的 row group 按 (row group, columns) 缓存：逐 symbol 读取同一
+            文件时每个 row group 只解码一次（label / min 常为 1~2 个大 row group）
     """
 
     # --------------------------------------------------
@@ -28,11 +41,17 @@ class SliceAccessor:
         *,
         parquet_file: Path,
         capability: SliceCapability,
+        ts_col: str = "ts",
     ) -> None:
         self._parquet_file = parquet_file
         self._cap = capability
+        self._ts_col = ts_col
 
-        self._table: pa.Table | None = None
+        # columns(None=全部列) -> 已读入的整表
+        self._tables: Dict[Optional[Tuple[str, ...]], pa.Table] = {}
+        # (row group, columns) -> 已解码的 row group
+        self._row_groups: Dict[Tuple[int, Optional[Tuple[str, ...]]], pa.Table] = {}
+        self._pf: pq.ParquetFile | None = None
 
     # --------------------------------------------------
     @classmethod
@@ -52,17 +71,170 @@ class SliceAccessor:
         )
 
     # --------------------------------------------------
-    def _load_table(self) -> pa.Table:
-        if self._table is None:
-            self._table = pq.read_table(self._parquet_file)
-        return self._table
+    def _load_table(self, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        cached = self._cached_table(columns)
+        if cached is not None:
+            return cached
+
+        key = None if columns is None else tuple(columns)
+        self._tables[key] = pq.read_table(
+            self._parquet_file,
+            columns=None if columns is None else list(columns),
+        )
+        return self._tables[key]
+
+    # --------------------------------------------------
+    def _cached_table(self, columns: Optional[Sequence[str]]) -> Optional[pa.Table]:
+        if columns is None:
+            return self._tables.get(None)
+
+        key = tuple(columns)
+        if key in self._tables:
+            return self._tables[key]
+
+        full = self._tables.get(None)
+        if full is not None:
+            return full.select(list(columns))
+
+        return None
+
+    # --------------------------------------------------
+    def warm(self, columns: Optional[Sequence[str]] = None) -> None:
+        self._load_table(columns)
+
+    # --------------------------------------------------
+    def table(self, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """
+        整表（所有 slice 按 index 顺序连续存放），共享缓存
+        """
+        return self._load_table(columns)
 
     # --------------------------------------------------
     def keys(self) -> list[str]:
         return self._cap.keys()
 
     # --------------------------------------------------
-    def get(self, key: str) -> pa.Table:
+    def get(
+        self,
+        key: str,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        ts_range: Optional[TsRange] = None,
+    ) -> pa.Table:
         start, length = self._cap.bounds(key)
-        table = self._load_table()
-        return table.slice(start, length)
+
+        if columns is None and ts_range is None:
+            return self._load_table().slice(start, length)
+
+        # ts 过滤需要 ts 列，即使调用方未投影它
+        read_cols = None if columns is None else list(columns)
+        if ts_range is not None and read_cols is not None and self._ts_col not in read_cols:
+            read_cols.append(self._ts_col)
+
+        cached = self._cached_table(read_cols)
+        if cached is not None:
+            table = cached.slice(start, length)
+        else:
+            table = self._read_range(start, length, read_cols, ts_range)
+
+        if ts_range is not None:
+            table = self._clip_ts(table, ts_range)
+
+        if columns is not None and table.column_names != list(columns):
+            table = table.select(list(columns))
+
+        return table
+
+    # ==================================================
+    # pushdown helpers
+    # ==================================================
+    def _parquet(self) -> pq.ParquetFile:
+        if self._pf is None:
+            self._pf = pq.ParquetFile(self._parquet_file)
+        return self._pf
+
+    # --------------------------------------------------
+    def _read_range(
+        self,
+        start: int,
+        length: int,
+        columns: Optional[List[str]],
+        ts_range: Optional[TsRange],
+    ) -> pa.Table:
+        """
+        只读与 [start, start + length) 重叠、且 ts 统计量可能命中的 row group
+        """
+        pf = self._parquet()
+        md = pf.metadata
+        end = start + length
+
+        ts_idx = (
+            pf.schema_arrow.get_field_index(self._ts_col)
+            if ts_range is not None
+            else -1
+        )
+
+        pieces: List[pa.Table] = []
+        rg_start = 0
+
+        for i in range(md.num_row_groups):
+            rg_rows = md.row_group(i).num_rows
+            rg_end = rg_start + rg_rows
+
+            if rg_end > start and rg_start < end:
+                if ts_idx < 0 or self._row_group_may_match(md.row_group(i), ts_idx, ts_range):
+                    rg = self._row_group(i, columns)
+                    lo = max(start, rg_start) - rg_start
+                    hi = min(end, rg_end) - rg_start
+                    pieces.append(rg.slice(lo, hi - lo))
+
+            if rg_end >= end:
+                break
+            rg_start = rg_end
+
+        if not pieces:
+            schema = pf.schema_arrow
+            if columns is not None:
+                schema = pa.schema([schema.field(c) for c in columns])
+            return schema.empty_table()
+
+        return pa.concat_tables(pieces)
+
+    # --------------------------------------------------
+    def _row_group(self, i: int, columns: Optional[List[str]]) -> pa.Table:
+        key = (i, None if columns is None else tuple(columns))
+        rg = self._row_groups.get(key)
+        if rg is None:
+            rg = self._parquet().read_row_group(i, columns=columns)
+            self._row_groups[key] = rg
+        return rg
+
+    # --------------------------------------------------
+    @staticmethod
+    def _row_group_may_match(rg_meta, ts_idx: int, ts_range: TsRange) -> bool:
+        stats = rg_meta.column(ts_idx).statistics
+        if stats is None or not stats.has_min_max:
+            return True
+
+        lo, hi = ts_range
+        if lo is not None and stats.max < lo:
+            return False
+        if hi is not None and stats.min > hi:
+            return False
+        return True
+
+    # --------------------------------------------------
+    def _clip_ts(self, table: pa.Table, ts_range: TsRange) -> pa.Table:
+        """
+        slice 内 ts 升序（canonical 约束）→ 二分定位，结果仍是 0-copy slice
+        """
+        if table.num_rows == 0:
+            return table
+
+        ts = table[self._ts_col].to_numpy()
+        lo, hi = ts_range
+
+        i = 0 if lo is None else int(np.searchsorted(ts, lo, side="left"))
+        j = len(ts) if hi is None else int(np.searchsorted(ts, hi, side="right"))
+
+        return table.slice(i, max(j - i, 0))
@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterator, Tuple
+from typing import Iterator, Optional, Sequence, Tuple
 
 import pyarrow as pa
 
 from src.meta.base import BaseMeta
-from src.meta.slice_accessor import SliceAccessor
+from src.meta.slice_accessor import SliceAccessor, TsRange
 
 
 class SliceSource:
@@ -36,6 +36,7 @@ class SliceSource:
         )
 
         manifest = self._meta.load()
+        self._manifest = manifest
 
         outputs = manifest["outputs"]
         index_meta = outputs.get("index")
@@ -60,12 +61,36 @@ class SliceSource:
             index=self._index,
         )
 
+    # --------------------------------------------------
+    def manifest(self) -> dict:
+        """
+        上游 manifest（只读；用于 fingerprint 等派生键）
+        """
+        return self._manifest
+
     # --------------------------------------------------
     def symbols(self) -> list[str]:
         return self._accessor.keys()
 
     # --------------------------------------------------
-    def get(self, symbol: str) -> pa.Table:
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    # --------------------------------------------------
+    def warm(self, columns: Optional[Sequence[str]] = None) -> None:
+        """
+        预读底层 parquet（供后台预取线程调用）
+        """
+        self._accessor.warm(columns)
+
+    # --------------------------------------------------
+    def get(
+            self,
+            symbol: str,
+            *,
+            columns: Optional[Sequence[str]] = None,
+            ts_range: Optional[TsRange] = None,
+    ) -> pa.Table:
         """
             Contract:
             - Return a 0-copy Arrow Table for exactly one symbol.
@@ -73,13 +98,43 @@ class SliceSource:
             - Missing symbol raises KeyError (no empty fallback).
             - No business logic, no data_handler mutation.
             - Meta and slice semantics are strictly enforced.
+
+            Pushdown (optional):
+            - columns : only these columns are decoded (in this order)
+            - ts_range: inclusive (lo, hi) on ts; either end may be None
         """
-        return self._accessor.get(symbol)
+        return self._accessor.get(symbol, columns=columns, ts_range=ts_range)
 
     # --------------------------------------------------
-    def iter_tables(self) -> Iterator[Tuple[str, pa.Table]]:
+    def table(self, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """
+        全量视图（canonical 顺序），供全交易所向量化 engine 一次性消费
+        """
+        return self._accessor.table(columns)
+
+    # --------------------------------------------------
+    def segments(self) -> list[Tuple[str, int, int]]:
+        """
+        [(symbol, start, length)]，按行号升序（即 table() 中的物理顺序）
+
+        供跨 symbol 批量 engine 构造段边界（segment_starts）
+        """
+        return sorted(
+            ((k, start, length) for k, (start, length) in self._index.items()),
+            key=lambda x: x[1],
+        )
+
+    # --------------------------------------------------
+    def iter_tables(
+            self,
+            columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[str, pa.Table]]:
+        # 全量遍历：按投影列整表读入一次，再逐 symbol 0-copy slice
+        if columns is not None:
+            self._accessor.warm(columns)
+
         for symbol in self.symbols():
-            sub = self.get(symbol)
+            sub = self.get(symbol, columns=columns)
             if sub.num_rows > 0:
                 yield symbol, sub
 
@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional, Sequence
 
+from src.meta.slice_accessor import TsRange
 from src.meta.slice_source import SliceSource
 
 """
@@ -61,22 +62,36 @@ class SymbolSliceResolver:
             raise RuntimeError(f"No SliceSource found for resolver meta={meta_dir}, stage={stage}, output={exchange}")
 
     # --------------------------------------------------
-    def get(self, symbol: str):
+    def get(
+        self,
+        symbol: str,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        ts_range: Optional[TsRange] = None,
+    ):
         """
         返回：pa.Table（唯一）
 
         约束：
           - symbol 必须恰好存在于一个 source
         """
-        result = self.get_many([symbol])
+        result = self.get_many([symbol], columns=columns, ts_range=ts_range)
         return result[symbol]
 
     # --------------------------------------------------
-    def get_many(self, symbols: Iterable[str]):
+    def get_many(
+        self,
+        symbols: Iterable[str],
+        *,
+        columns: Optional[Sequence[str]] = None,
+        ts_range: Optional[TsRange] = None,
+    ):
         """
         返回：
           Dict[symbol, pa.Table]
 
+        columns / ts_range 原样下推到 SliceSource.get
+
         冻结约束：
           - 每个 symbol 必须恰好命中一个 source
           - 0 个 or >1 个 都是错误
@@ -107,7 +122,11 @@ class SymbolSliceResolver:
                     f"Symbol {symbol} found in multiple slice sources"
                 )
 
-            result[symbol] = found[0].get(symbol)
+            result[symbol] = found[0].get(
+                symbol,
+                columns=columns,
+                ts_range=ts_range,
+            )
 
         return result
     def symbols(self) -> list[str]:
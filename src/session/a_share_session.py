@@ -1,5 +1,6 @@
 # src/session/a_share_session.py
 from datetime import datetime, date, time, timedelta, timezone
+from typing import List, Tuple
 
 from src.session.session_resolver import TradingDayKey
 
@@ -14,10 +15,22 @@ class ASharesSessionResolver:
           09:30–11:30
           13:00–15:00
       - 非交易时间 → ValueError
+
+    集合竞价（仅用于分钟网格，不属于连续交易时段）：
+      - 开盘：09:15–09:25（09:25 撮合）
+      - 收盘：14:57–15:00（15:00 撮合）
     """
 
     TZ = timezone(timedelta(hours=8))
 
+    # 连续交易时段（左闭右开，本地钟面）
+    SESSIONS: Tuple[Tuple[time, time], ...] = (
+        (time(9, 30), time(11, 30)),
+        (time(13, 0), time(15, 0)),
+    )
+    OPEN_AUCTION: Tuple[time, time] = (time(9, 15), time(9, 25))
+    CLOSE_AUCTION: Tuple[time, time] = (time(14, 57), time(15, 0))
+
     def trading_day_of(self, minute: datetime) -> TradingDayKey:
         if minute.tzinfo is not None:
             raise ValueError("minute must be naive datetime (UTC semantics)")
@@ -32,9 +45,22 @@ class ASharesSessionResolver:
         trading_date = local.date()
         return TradingDayKey(exchange="SSE", trading_date=trading_date)
 
-    @staticmethod
-    def _is_trading_time(t: time) -> bool:
-        return (
-            time(9, 30) <= t < time(11, 30)
-            or time(13, 0) <= t < time(15, 0)
-        )
+    @classmethod
+    def session_minutes(cls) -> List[int]:
+        """
+        连续交易时段内每个 minute 的起点（minute-of-day，本地钟面），升序
+
+        A 股：09:30..11:29 + 13:00..14:59，共 240 个
+        """
+        out: List[int] = []
+        for start, end in cls.SESSIONS:
+            out.extend(range(_minute_of_day(start), _minute_of_day(end)))
+        return out
+
+    @classmethod
+    def _is_trading_time(cls, t: time) -> bool:
+        return any(start <= t < end for start, end in cls.SESSIONS)
+
+
+def _minute_of_day(t: time) -> int:
+    return t.hour * 60 + t.minute
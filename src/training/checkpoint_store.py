@@ -0,0 +1,136 @@
+# src/training/checkpoint_store.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import joblib
+
+from src.training.context import ModelState
+from src.utils.filesystem import FileSystem
+from src.utils.logger import logs
+
+
+class CheckpointStore:
+    """
+    CheckpointStore（walk-forward 模型快照）
+
+    语义：
+      - 每个 update_day 训练后的 ModelState 一份快照（asof_day = update_day）
+      - 快照与“模型语义”绑定：fingerprint = (feature 列, label 列, drop_na,
+        model name / version / task / params, stream 训练参数)
+        配置变化 → 落到另一个 fingerprint 目录，旧快照不会被误用
+      - 附带截至该日的 IC 序列 → resume 后报告仍覆盖完整区间
+
+    物理布局：
+        {root}/{fingerprint}/{asof_day}/model.joblib | state.json
+
+    冻结约束：
+      - 写入先落到临时目录，rename 后才可见（与 DatasetCache 一致）
+      - 同一 asof_day 重写 → 覆盖
+      - 损坏条目视为不存在
+    """
+
+    def __init__(self, root: Path, *, fingerprint: str) -> None:
+        self.root = Path(root)
+        self.fingerprint = fingerprint
+
+    # ==================================================
+    # keys
+    # ==================================================
+    @staticmethod
+    def fingerprint_of(cfg) -> str:
+        payload = {
+            "features": list(cfg.dataset.feature_columns),
+            "label": cfg.dataset.label_column,
+            "drop_na": cfg.dataset.drop_na,
+            "model": [cfg.model_name, cfg.model_version, cfg.task_type],
+            "params": cfg.model_params,
+            "stream": cfg.stream.model_dump() if cfg.stream.enabled else None,
+        }
+        text = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def dir(self) -> Path:
+        return self.root / self.fingerprint
+
+    def path(self, day: str) -> Path:
+        return self.dir / day
+
+    # ==================================================
+    # read
+    # ==================================================
+    def days(self) -> List[str]:
+        """已完成快照的 asof_day（升序）"""
+        if not self.dir.is_dir():
+            return []
+        return sorted(
+            d.name for d in self.dir.iterdir()
+            if d.is_dir() and not d.name.startswith(".") and (d / "state.json").exists()
+        )
+
+    def latest(self, *, at_or_before: str) -> Optional[str]:
+        candidates = [d for d in self.days() if d <= at_or_before]
+        return candidates[-1] if candidates else None
+
+    def load(self, day: str) -> Optional[Tuple[ModelState, dict]]:
+        """
+        Returns:
+            (ModelState, state.json) 或 None（不存在 / 损坏）
+        """
+        entry = self.path(day)
+        try:
+            state = json.loads((entry / "state.json").read_text(encoding="utf-8"))
+            model = joblib.load(entry / "model.joblib")
+        except (OSError, ValueError, EOFError) as e:
+            logs.warning(f"[Checkpoint] unreadable {entry} | {e}")
+            return None
+
+        return ModelState(model=model, asof_day=state["asof_day"]), state
+
+    # ==================================================
+    # write
+    # ==================================================
+    def save(
+            self,
+            state: ModelState,
+            *,
+            step: int,
+            run_id: str,
+            ic_series: Optional[list] = None,
+    ) -> Path:
+        FileSystem.ensure_dir(self.dir)
+        day = str(state.asof_day)
+        entry = self.path(day)
+        tmp = Path(tempfile.mkdtemp(dir=self.dir, prefix=f".{day}.", suffix=".tmp"))
+
+        try:
+            joblib.dump(state.model, tmp / "model.joblib")
+            (tmp / "state.json").write_text(
+                json.dumps(
+                    {
+                        "asof_day": day,
+                        "step": step,
+                        "run_id": run_id,
+                        "fingerprint": self.fingerprint,
+                        "ic_series": list(ic_series or []),
+                    },
+                    indent=2,
+                    default=str,
+                ),
+                encoding="utf-8",
+            )
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(tmp, entry)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        return entry
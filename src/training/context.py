@@ -3,9 +3,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-import pandas as pd
+import numpy as np
 
 
 @dataclass
@@ -42,11 +42,16 @@ class TrainingContext:
     update_day: str = ""
     eval_day: str = ""
 
-    train_X: Optional[pd.DataFrame] = None
-    train_y: Optional[pd.Series] = None
+    # eval_day 之后的交易日（供 DatasetBuildStep 后台预取）
+    upcoming_days: List[str] = field(default_factory=list)
 
-    eval_X: Optional[pd.DataFrame] = None
-    eval_y: Optional[pd.Series] = None
+    train_X: Optional[np.ndarray] = None    # float32 (rows, features)
+    train_y: Optional[np.ndarray] = None
+
+    eval_X: Optional[np.ndarray] = None
+    eval_y: Optional[np.ndarray] = None
+    eval_ts: Optional[np.ndarray] = None    # 截面键（minute），行对齐 eval_X
+    eval_pred: Optional[np.ndarray] = None  # ICEvaluateStep 写入，行对齐 eval_y
 
     model_state: Optional[ModelState] = None
     metrics: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,207 @@
+# src/training/dataset_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from src.utils.filesystem import FileSystem
+from src.utils.logger import logs
+
+# 清洗语义变化时递增（旧缓存自动失效）
+SANITIZE_VERSION = 1
+
+_ARRAYS = ("X", "y", "symbol", "ts")
+
+
+class DatasetCache:
+    """
+    DatasetCache（训练数据集 .npy 缓存）
+
+    语义：
+      - 每个交易日的 (X, y, symbol, ts) 只从 parquet 物化一次
+      - 键 = (date, feature 列表, label 列, drop_na, 清洗版本, 源文件身份)
+        源文件身份为 feature / label parquet 的 (name, size, mtime_ns)，
+        上游重建 → 键变化 → 自然 miss
+      - 命中时以 np.load(mmap_mode="r") 返回只读 memmap，跨 day / 跨 run 复用
+
+    物理布局：
+        {root}/{key}/X.npy | y.npy | symbol.npy | ts.npy | meta.json
+
+    LRU：
+      - 命中 / 写入时 touch 条目目录 mtime
+      - put 后按 mtime 从旧到新淘汰，直到总大小 ≤ max_bytes
+      - pinned() 作用域内命中 / 写入的条目不淘汰（sweep 子进程仍在按路径读取），
+        退出作用域后统一 prune
+
+    冻结约束：
+      - 写入先落到同目录临时目录，rename 后才可见（并发 run 不会读到半成品）
+      - 损坏 / 行数不符的条目视为 miss 并删除
+    """
+
+    def __init__(self, root: Path, *, max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+        self._pinning = False
+        self._pinned: set[str] = set()
+
+    # ==================================================
+    # keys
+    # ==================================================
+    @staticmethod
+    def key(
+            *,
+            date: str,
+            feature_columns: Optional[Sequence[str]],
+            label_column: str,
+            drop_na: bool,
+            sources: Sequence[Path],
+    ) -> str:
+        def _identity(p: Path) -> list:
+            st = p.stat()
+            return [p.name, st.st_size, st.st_mtime_ns]
+
+        payload = {
+            "date": date,
+            "features": list(feature_columns) if feature_columns is not None else None,
+            "label": label_column,
+            "drop_na": drop_na,
+            "sanitize": SANITIZE_VERSION,
+            "sources": [_identity(Path(p)) for p in sources],
+        }
+        text = json.dumps(payload, sort_keys=True)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    # ==================================================
+    # read / write
+    # ==================================================
+    def get(self, key: str) -> Optional[dict]:
+        """
+        命中 → {"X", "y", "symbol", "ts"} memmap；否则 None
+        """
+        entry = self.path(key)
+        if not entry.is_dir():
+            return None
+
+        try:
+            arrays = self.open(entry)
+        except (OSError, ValueError) as e:
+            logs.warning(f"[DatasetCache] unreadable {entry} | {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        rows = {len(a) for a in arrays.values()}
+        if len(rows) != 1:
+            logs.warning(f"[DatasetCache] row mismatch {entry}: {rows}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        self._touch(entry)
+        if self._pinning:
+            self._pinned.add(key)
+        return arrays
+
+    @staticmethod
+    def open(entry: Path) -> dict:
+        """
+        按条目目录打开 memmap（无校验 / 不 touch；供子进程直接读取）
+        """
+        return {
+            name: np.load(Path(entry) / f"{name}.npy", mmap_mode="r")
+            for name in _ARRAYS
+        }
+
+    def put(self, key: str, arrays: dict, *, meta: Optional[dict] = None) -> dict:
+        """
+        写入并返回 memmap 视图（调用方随后只持有 mmap，不再持有源数组）
+        """
+        FileSystem.ensure_dir(self.root)
+        if self._pinning:
+            self._pinned.add(key)
+        entry = self.path(key)
+        tmp = Path(tempfile.mkdtemp(dir=self.root, prefix=f".{key}.", suffix=".tmp"))
+
+        try:
+            for name in _ARRAYS:
+                np.save(tmp / f"{name}.npy", np.ascontiguousarray(arrays[name]))
+            (tmp / "meta.json").write_text(
+                json.dumps(meta or {}, sort_keys=True, default=str),
+                encoding="utf-8",
+            )
+            try:
+                os.replace(tmp, entry)
+            except OSError:
+                # 并发 run 已写入同一键（内容等价）→ 丢弃本次
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        self.prune(keep=key)
+        return self.get(key) or arrays
+
+    @contextmanager
+    def pinned(self) -> Iterator["DatasetCache"]:
+        """
+        作用域内 get 命中 / put 的条目固定（prune 跳过）；退出时解除并 prune 一次
+        """
+        self._pinning = True
+        try:
+            yield self
+        finally:
+            self._pinning = False
+            self._pinned.clear()
+            self.prune()
+
+    # --------------------------------------------------
+    def prune(self, *, keep: Optional[str] = None) -> int:
+        """
+        LRU：按目录 mtime 从旧到新删除条目，直到总大小 ≤ max_bytes
+        """
+        if self.max_bytes is None or not self.root.exists():
+            return 0
+
+        entries = [
+            (d.stat().st_mtime_ns, d, FileSystem.get_dir_size(d))
+            for d in self.root.iterdir()
+            if d.is_dir() and not d.name.startswith(".")
+        ]
+        total = sum(size for _, _, size in entries)
+
+        removed = 0
+        for _, d, size in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if d.name == keep or d.name in self._pinned:
+                continue
+            shutil.rmtree(d, ignore_errors=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logs.info(f"[DatasetCache] evicted {removed} entries (size={total}B)")
+        if total > self.max_bytes and self._pinned:
+            logs.warning(
+                f"[DatasetCache] pinned entries exceed max_bytes "
+                f"(size={total}B > {self.max_bytes}B, pinned={len(self._pinned)})"
+            )
+        return removed
+
+    # --------------------------------------------------
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        try:
+            os.utime(entry)
+        except OSError:  # pragma: no cover（只读缓存目录）
+            pass
@@ -0,0 +1,290 @@
+# src/training/engines/cross_sectional_ic_engine.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class RankICResult:
+    """
+    逐 minute 截面 rank IC（k 个预测向量）
+
+    - minutes : (G,)   截面键（升序；pooled 时为 [0]）
+    - ic      : (G, k) 每个截面的 Spearman IC（有效样本不足 / 无方差 → NaN）
+    - mean / std / ir / t_stat / n : (k,) 跨截面统计（忽略 NaN）
+    """
+
+    minutes: np.ndarray
+    ic: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    ir: np.ndarray
+    t_stat: np.ndarray
+    n: np.ndarray
+
+
+class CrossSectionalRankICEngine:
+    """
+    CrossSectionalRankICEngine（FINAL）
+
+    数学定义：
+        IC_m = Pearson( rank(pred | m), rank(y | m) )      （同一 minute 截面内，平均秩处理并列）
+        mean = nanmean(IC_m)   std = nanstd(IC_m, ddof=1)
+        IR   = mean / std      t   = mean / std · sqrt(N_valid)
+
+    计算方式：
+        - 行按 minute 排入 (minute × symbol) 矩阵（布局只算一次），
+          行内 argsort 得到全部截面的秩（无逐 minute 循环，无 scipy）
+        - k 个预测向量共享同一份 label 秩与矩阵布局
+        - 预测缺失位置与 label 不同的列，label 在联合有效集上重新求秩
+
+    Contract:
+        - ts=None → 全部行视为一个截面（pooled Spearman）
+        - 截面有效样本 < min_count → 该截面 IC = NaN
+        - 纯计算：No IO, no ctx
+    """
+
+    def __init__(self, *, min_count: int = 3) -> None:
+        if min_count < 2:
+            raise ValueError(f"min_count must be >= 2, got {min_count}")
+        self.min_count = min_count
+
+    # ------------------------------------------------------------------
+    def evaluate(
+            self,
+            *,
+            preds: np.ndarray,
+            y_true: np.ndarray,
+            ts: Optional[np.ndarray] = None,
+    ) -> RankICResult:
+        """
+        preds : (n,) 或 (n, k)
+        """
+        P = np.asarray(preds, dtype=np.float64)
+        if P.ndim == 1:
+            P = P[:, None]
+        y = np.asarray(y_true, dtype=np.float64)
+        n = len(y)
+        if P.shape[0] != n:
+            raise ValueError(f"preds rows {P.shape[0]} != y rows {n}")
+
+        if ts is None:
+            minutes = np.zeros(1, dtype=np.int64)
+            group = np.zeros(n, dtype=np.int64)
+        else:
+            minutes, group = np.unique(np.asarray(ts), return_inverse=True)
+
+        layout = _Layout(group, len(minutes))
+        My = layout.matrix(y)
+        Ry = row_rank(My)
+        valid_y = ~np.isnan(My)
+
+        ic = np.full((len(minutes), P.shape[1]), np.nan)
+        for j in range(P.shape[1]):
+            Mp = layout.matrix(P[:, j])
+            valid = valid_y & ~np.isnan(Mp)
+            if np.array_equal(valid, valid_y):
+                Ry_j = Ry
+            else:
+                Ry_j = row_rank(np.where(valid, My, np.nan))
+            Rp = row_rank(np.where(valid, Mp, np.nan))
+            ic[:, j] = _row_pearson(Rp, Ry_j, valid, self.min_count)
+
+        return _summarize(minutes, ic)
+
+    # ------------------------------------------------------------------
+    def evaluate_matrix(
+            self,
+            *,
+            features: np.ndarray,
+            labels: np.ndarray,
+            ts: Optional[np.ndarray] = None,
+            feature_chunk: int = 16,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        K 个特征 × L 个 label 的逐 minute 截面 rank IC
+
+        - 每列只在自身有效集上求一次秩；IC 在两两联合有效行上计算
+          （缺失模式一致时即精确 Spearman）
+        - 组内矩统计为批量矩阵乘 (G, k, S) @ (G, S, L)，按 feature_chunk 分块控制内存
+
+        Returns:
+            minutes (G,), ic (G, K, L)
+        """
+        F = np.asarray(features, dtype=np.float64)
+        Y = np.asarray(labels, dtype=np.float64)
+        if F.ndim == 1:
+            F = F[:, None]
+        if Y.ndim == 1:
+            Y = Y[:, None]
+        if F.shape[0] != Y.shape[0]:
+            raise ValueError(f"features rows {F.shape[0]} != labels rows {Y.shape[0]}")
+
+        n = F.shape[0]
+        if ts is None:
+            minutes = np.zeros(1, dtype=np.int64)
+            group = np.zeros(n, dtype=np.int64)
+        else:
+            minutes, group = np.unique(np.asarray(ts), return_inverse=True)
+
+        layout = _Layout(group, len(minutes))
+        Ry, Vy = _ranked_stack(layout, Y)
+        Ry2 = Ry * Ry
+
+        K = F.shape[1]
+        ic = np.full((len(minutes), K, Y.shape[1]), np.nan)
+        for lo in range(0, K, feature_chunk):
+            hi = min(K, lo + feature_chunk)
+            Rx, Vx = _ranked_stack(layout, F[:, lo:hi])
+
+            # (G, S, k) → (G, k, S)，与 (G, S, L) 批量相乘
+            Rx_t, Vx_t = Rx.transpose(0, 2, 1), Vx.transpose(0, 2, 1)
+            cnt = Vx_t @ Vy
+            sx = Rx_t @ Vy
+            sy = Vx_t @ Ry
+            sxy = Rx_t @ Ry
+            sxx = (Rx_t * Rx_t) @ Vy
+            syy = Vx_t @ Ry2
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                vx = sxx - sx * sx / cnt
+                vy = syy - sy * sy / cnt
+                block = (sxy - sx * sy / cnt) / np.sqrt(vx * vy)
+
+            # 秩方差相对容差：常数列的 vx 只剩浮点噪声
+            degenerate = (cnt < self.min_count) | (vx <= 1e-9 * sxx) | (vy <= 1e-9 * syy)
+            block[degenerate] = np.nan
+            ic[:, lo:hi, :] = block
+
+        return minutes, ic
+
+    # ------------------------------------------------------------------
+    def mean_ic(
+            self,
+            *,
+            preds: np.ndarray,
+            y_true: np.ndarray,
+            ts: Optional[np.ndarray] = None,
+    ) -> float:
+        """单个预测向量的平均截面 IC（无有效截面 → NaN）"""
+        if len(y_true) == 0:
+            return float("nan")
+        return float(self.evaluate(preds=preds, y_true=y_true, ts=ts).mean[0])
+
+
+# =============================================================================
+# kernels（(minute × symbol) 矩阵，行内 argsort）
+# =============================================================================
+class _Layout:
+    """
+    行 → (minute, slot) 映射；一次计算，所有向量共享
+
+    矩阵宽度 = 单个 minute 的最大行数，不足处以 NaN 填充
+    """
+
+    def __init__(self, group: np.ndarray, G: int) -> None:
+        order = np.argsort(group, kind="stable")
+        counts = np.bincount(group, minlength=G)
+        starts = np.r_[0, np.cumsum(counts)[:-1]]
+
+        self.rows = group[order]
+        self.cols = np.arange(len(group)) - starts[self.rows]
+        self.order = order
+        self.shape = (G, int(counts.max()) if len(group) else 0)
+
+    def matrix(self, values: np.ndarray) -> np.ndarray:
+        M = np.full(self.shape, np.nan)
+        v = np.asarray(values, dtype=np.float64)[self.order]
+        M[self.rows, self.cols] = np.where(np.isfinite(v), v, np.nan)
+        return M
+
+    def flatten(self, M: np.ndarray) -> np.ndarray:
+        out = np.empty(len(self.order))
+        out[self.order] = M[self.rows, self.cols]
+        return out
+
+
+def row_rank(M: np.ndarray) -> np.ndarray:
+    """
+    行内平均秩（1-based，并列取平均），NaN 保持 NaN
+    """
+    G, S = M.shape
+    if S == 0:
+        return M.copy()
+
+    order = np.argsort(M, axis=1)  # NaN 排在行尾
+    sorted_ = np.take_along_axis(M, order, axis=1)
+    pos = np.broadcast_to(np.arange(S), (G, S))
+
+    new_run = np.ones((G, S), dtype=bool)
+    new_run[:, 1:] = sorted_[:, 1:] != sorted_[:, :-1]
+    is_last = np.ones((G, S), dtype=bool)
+    is_last[:, :-1] = new_run[:, 1:]
+
+    first = np.maximum.accumulate(np.where(new_run, pos, 0), axis=1)
+    last = np.minimum.accumulate(np.where(is_last, pos, S - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks_sorted = (first + last) / 2.0 + 1.0
+    ranks_sorted[np.isnan(sorted_)] = np.nan
+
+    R = np.empty_like(M)
+    np.put_along_axis(R, order, ranks_sorted, axis=1)
+    return R
+
+
+def _ranked_stack(layout: _Layout, columns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    每列 → 行内秩矩阵，堆叠为 (G, S, k)；返回 (秩（无效处为 0）, 有效掩码 float)
+    """
+    G, S = layout.shape
+    R = np.empty((G, S, columns.shape[1]))
+    for j in range(columns.shape[1]):
+        R[:, :, j] = row_rank(layout.matrix(columns[:, j]))
+    V = ~np.isnan(R)
+    R[~V] = 0.0
+    return R, V.astype(np.float64)
+
+
+def grouped_rank(values: np.ndarray, group: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    组内平均秩（按行返回；invalid → NaN）
+    """
+    group = np.asarray(group)
+    if len(group) == 0:
+        return np.empty(0)
+    layout = _Layout(group, int(group.max()) + 1)
+    return layout.flatten(row_rank(layout.matrix(np.where(valid, values, np.nan))))
+
+
+def _row_pearson(A: np.ndarray, B: np.ndarray, valid: np.ndarray, min_count: int) -> np.ndarray:
+    cnt = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.where(valid, A, 0.0)
+        b = np.where(valid, B, 0.0)
+        ma = a.sum(axis=1) / cnt
+        mb = b.sum(axis=1) / cnt
+        da = np.where(valid, A - ma[:, None], 0.0)
+        db = np.where(valid, B - mb[:, None], 0.0)
+        sab = (da * db).sum(axis=1)
+        saa = (da * da).sum(axis=1)
+        sbb = (db * db).sum(axis=1)
+        ic = sab / np.sqrt(saa * sbb)
+
+    ic[(cnt < min_count) | (saa <= 0) | (sbb <= 0)] = np.nan
+    return ic
+
+
+def _summarize(minutes: np.ndarray, ic: np.ndarray) -> RankICResult:
+    n = np.isfinite(ic).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(n > 0, np.nansum(ic, axis=0) / np.maximum(n, 1), np.nan)
+        dev = np.where(np.isfinite(ic), ic - mean, 0.0)
+        std = np.where(n > 1, np.sqrt((dev ** 2).sum(axis=0) / np.maximum(n - 1, 1)), np.nan)
+        ir = mean / std
+        t_stat = ir * np.sqrt(n)
+    ir = np.where(std > 0, ir, np.nan)
+    t_stat = np.where(std > 0, t_stat, np.nan)
+    return RankICResult(minutes=minutes, ic=ic, mean=mean, std=std, ir=ir, t_stat=t_stat, n=n)
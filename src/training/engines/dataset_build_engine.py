@@ -1,13 +1,59 @@
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
+from src.training.dataset_cache import DatasetCache
+from src.utils.logger import logs
 from src.utils.path import PathManager
 
+KEY_COLUMNS = ("symbol", "ts")
+
+_ROW = "__row"
+
+
+@dataclass(frozen=True)
+class DayDataset:
+    """
+    一个交易日的数据集（行对齐）
+
+    - X      : float32 (rows, features)
+    - y      : float32 (rows,)
+    - symbol : str    (rows,)
+    - ts     : int64  (rows,)
+    """
+
+    X: np.ndarray
+    y: np.ndarray
+    symbol: np.ndarray
+    ts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def arrays(self) -> dict:
+        return {"X": self.X, "y": self.y, "symbol": self.symbol, "ts": self.ts}
+
+    @classmethod
+    def concat(cls, parts: List["DayDataset"]) -> "DayDataset":
+        if len(parts) == 1:
+            return parts[0]
+        return cls(
+            X=np.concatenate([p.X for p in parts]),
+            y=np.concatenate([p.y for p in parts]),
+            symbol=np.concatenate([p.symbol for p in parts]),
+            ts=np.concatenate([p.ts for p in parts]),
+        )
+
 
 class DatasetBuildEngine:
     """
@@ -17,21 +63,59 @@ class DatasetBuildEngine:
     - Build day-level training / evaluation datasets
     - Own ALL dataset construction semantics:
         - file discovery
-        - feature / label alignment
+        - feature / label alignment on (symbol, ts)
         - numeric sanitization (inf / NaN)
         - row filtering (drop_na)
         - concatenation across symbols/files
 
     Contract (FROZEN):
-    - Step MUST NOT perform any pandas / IO / data cleaning logic
+    - Step MUST NOT perform any IO / data cleaning logic
     - Engine guarantees:
-        - X / y index-aligned
+        - X: C-contiguous float32 ndarray (rows, features)
+        - y: float32 ndarray (rows,), row-aligned with X
         - No inf values
         - drop_na behavior strictly follows cfg
+
+    Columnar path:
+    - parquet 只投影 keys + feature_columns / keys + label_column
+    - feature 行序为准；label 按 (symbol, ts) left join（keys 一致 → 直接按位置）
+    - 清洗为向量化 NumPy mask，不经过 pandas
+
+    Reuse:
+    - 进程内保留最近 `memo_days` 个 day（walk-forward 中 eval_day 即下一轮 update_day）
+    - cache 给定时，每个 day 物化为 .npy memmap，跨 run 复用（见 DatasetCache）
+
+    Prefetch（prefetch_days > 0）：
+    - prefetch(dates) 在单个后台线程中构建后续 day（parquet 读 / NumPy 清洗释放 GIL）
+    - 内存有界：最多 memo_days 个已完成 day + prefetch_days 个在途 day
+    - stats：load_s（后台构建耗时）/ wait_s（主线程阻塞耗时）/ overlap_s = 二者之差
     """
 
-    def __init__(self, pm: PathManager):
+    def __init__(
+            self,
+            pm: PathManager,
+            *,
+            cache: Optional[DatasetCache] = None,
+            memo_days: int = 2,
+            prefetch_days: int = 0,
+    ):
+        if prefetch_days < 0:
+            raise ValueError("prefetch_days must be >= 0")
+
         self.pm = pm
+        self.cache = cache
+        self.memo_days = memo_days
+        self.prefetch_days = prefetch_days
+        self._memo: OrderedDict[tuple, DayDataset] = OrderedDict()
+        self._pending: Dict[tuple, Future] = {}
+        self._pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset-prefetch")
+            if prefetch_days > 0
+            else None
+        )
+        self.stats: Dict[str, float] = {
+            "prefetched": 0, "prefetch_hits": 0, "load_s": 0.0, "wait_s": 0.0,
+        }
 
     # ======================================================================
     # Public API
@@ -45,44 +129,237 @@ class DatasetBuildEngine:
             label_column: str,
             drop_na: bool,
             evaluation_enabled: bool,
-    ) -> Tuple[pd.DataFrame, pd.Series, Optional[pd.DataFrame], Optional[pd.Series]]:
+            train_enabled: bool = True,
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]]:
         """
         Build train / eval datasets.
 
+        train_enabled=False：训练数据由 MiniBatchStream 流式提供，只构建 eval
+
         Returns:
             train_X, train_y, eval_X, eval_y
         """
+        train, evaluation = self.build_days(
+            update_day=update_day,
+            eval_day=eval_day,
+            feature_columns=feature_columns,
+            label_column=label_column,
+            drop_na=drop_na,
+            evaluation_enabled=evaluation_enabled,
+            train_enabled=train_enabled,
+        )
+        return (
+            train.X if train is not None else None,
+            train.y if train is not None else None,
+            evaluation.X if evaluation is not None else None,
+            evaluation.y if evaluation is not None else None,
+        )
 
-        train_X, train_y = self._build_one_day(
-            date=update_day,
+    def build_days(
+            self,
+            *,
+            update_day: str,
+            eval_day: Optional[str],
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+            evaluation_enabled: bool,
+            train_enabled: bool = True,
+    ) -> Tuple[Optional[DayDataset], Optional[DayDataset]]:
+        """
+        同 build，但返回完整 DayDataset（含 symbol / ts，供截面 IC 使用）
+        """
+        kwargs = dict(
             feature_columns=feature_columns,
             label_column=label_column,
             drop_na=drop_na,
         )
 
+        train = self.load_day(date=update_day, **kwargs) if train_enabled else None
+
         if evaluation_enabled and eval_day is not None:
-            eval_X, eval_y = self._build_one_day(
-                date=eval_day,
-                feature_columns=feature_columns,
-                label_column=label_column,
-                drop_na=drop_na,
-            )
+            evaluation = self.load_day(date=eval_day, **kwargs)
         else:
-            eval_X, eval_y = None, None
+            evaluation = None
+
+        return train, evaluation
+
+    def load_day(
+            self,
+            *,
+            date: str,
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+    ) -> DayDataset:
+        """
+        单日数据集：memo → 在途 prefetch → .npy cache → parquet
+        """
+        memo_key = self._memo_key(date, feature_columns, label_column, drop_na)
+        hit = self._memo.get(memo_key)
+        if hit is not None:
+            self._memo.move_to_end(memo_key)
+            return hit
+
+        future = self._pending.pop(memo_key, None)
+        if future is not None:
+            t0 = time.perf_counter()
+            day, elapsed = future.result()
+            self.stats["wait_s"] += time.perf_counter() - t0
+            self.stats["load_s"] += elapsed
+            self.stats["prefetch_hits"] += 1
+        else:
+            day = self._load(date, feature_columns, label_column, drop_na)
+
+        if self.memo_days > 0:
+            self._memo[memo_key] = day
+            while len(self._memo) > self.memo_days:
+                self._memo.popitem(last=False)
+
+        return day
+
+    def prefetch(
+            self,
+            dates: Sequence[str],
+            *,
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+    ) -> None:
+        """
+        后台构建 dates 中前 prefetch_days 个尚未就绪的 day（非阻塞）
+        """
+        if self._pool is None:
+            return
+
+        for date in dates[: self.prefetch_days]:
+            memo_key = self._memo_key(date, feature_columns, label_column, drop_na)
+            if memo_key in self._memo or memo_key in self._pending:
+                continue
+            if len(self._pending) >= self.prefetch_days:
+                break
+            self._pending[memo_key] = self._pool.submit(
+                self._timed_load, date, feature_columns, label_column, drop_na,
+            )
+            self.stats["prefetched"] += 1
+
+    def materialize(
+            self,
+            *,
+            date: str,
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+    ) -> Path:
+        """
+        确保 day 已落入 DatasetCache，返回条目目录（供子进程 np.load(mmap_mode="r")）
+        """
+        if self.cache is None:
+            raise RuntimeError("[DatasetBuild] materialize() requires a DatasetCache")
+
+        key, _ = self._cached(date, feature_columns, label_column, drop_na)
+        return self.cache.path(key)
 
-        return train_X, train_y, eval_X, eval_y
+    def overlap_s(self) -> float:
+        """后台构建中被训练 / 评估计算掩盖的时间"""
+        return max(0.0, self.stats["load_s"] - self.stats["wait_s"])
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._pending.clear()
+        self._memo.clear()
 
     # ======================================================================
     # Internal
     # ======================================================================
+    @staticmethod
+    def _memo_key(
+            date: str,
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+    ) -> tuple:
+        return (
+            date,
+            tuple(feature_columns) if feature_columns is not None else None,
+            label_column,
+            drop_na,
+        )
+
+    def _timed_load(self, *args) -> Tuple[DayDataset, float]:
+        t0 = time.perf_counter()
+        day = self._load(*args)
+        return day, time.perf_counter() - t0
+
+    def _load(
+            self,
+            date: str,
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+    ) -> DayDataset:
+        """
+        .npy cache → parquet（无共享可变状态，可在后台线程执行）
+        """
+        if self.cache is not None:
+            return self._cached(date, feature_columns, label_column, drop_na)[1]
+
+        return self._build_one_day(
+            date=date,
+            pairs=self._pairs(date),
+            feature_columns=feature_columns,
+            label_column=label_column,
+            drop_na=drop_na,
+        )
+
+    def _cached(
+            self,
+            date: str,
+            feature_columns: Optional[list[str]],
+            label_column: str,
+            drop_na: bool,
+    ) -> Tuple[str, DayDataset]:
+        pairs = self._pairs(date)
+        key = DatasetCache.key(
+            date=date,
+            feature_columns=feature_columns,
+            label_column=label_column,
+            drop_na=drop_na,
+            sources=[p for pair in pairs for p in pair],
+        )
+
+        arrays = self.cache.get(key)
+        if arrays is not None:
+            logs.debug(f"[DatasetBuild] cache hit date={date} key={key}")
+            return key, DayDataset(**arrays)
+
+        day = self._build_one_day(
+            date=date,
+            pairs=pairs,
+            feature_columns=feature_columns,
+            label_column=label_column,
+            drop_na=drop_na,
+        )
+        return key, DayDataset(**self.cache.put(
+            key,
+            day.arrays(),
+            meta={"date": date, "label": label_column, "rows": len(day)},
+        ))
+
+    def _pairs(self, date: str) -> List[Tuple[Path, Path]]:
+        return day_file_pairs(self.pm, date)
+
     def _build_one_day(
             self,
             *,
             date: str,
+            pairs: List[Tuple[Path, Path]],
             feature_columns: Optional[list[str]],
             label_column: str,
             drop_na: bool,
-    ) -> Tuple[pd.DataFrame, pd.Series]:
+    ) -> DayDataset:
         """
         Build dataset for a single physical day.
 
@@ -91,21 +368,10 @@ class DatasetBuildEngine:
         - Numeric sanitization is ALWAYS applied
         """
 
-        feat_dir = self.pm.feature_dir(date)
-        lab_dir = self.pm.label_dir(date)
-
-        frames_X: List[pd.DataFrame] = []
-        frames_y: List[pd.Series] = []
-
-        for feat_file in sorted(feat_dir.glob("feature.*.parquet")):
-            suffix = feat_file.name[len("feature."):]
-            lab_file = lab_dir / f"label.{suffix}"
-
-            if not lab_file.exists():
-                # Explicitly skip unmatched feature files
-                continue
+        parts: List[DayDataset] = []
 
-            X, y = self._load_and_align_one_pair(
+        for feat_file, lab_file in pairs:
+            part = self._load_and_align_one_pair(
                 feat_file=feat_file,
                 lab_file=lab_file,
                 feature_columns=feature_columns,
@@ -113,19 +379,21 @@ class DatasetBuildEngine:
                 drop_na=drop_na,
             )
 
-            if len(X) == 0:
+            if len(part) == 0:
                 continue
 
-            frames_X.append(X)
-            frames_y.append(y)
+            parts.append(part)
 
-        if not frames_X:
+        if not parts:
             raise RuntimeError(f"No valid dataset built for date={date}")
 
-        return (
-            pd.concat(frames_X, ignore_index=True),
-            pd.concat(frames_y, ignore_index=True),
-        )
+        widths = {p.X.shape[1] for p in parts}
+        if len(widths) != 1:
+            raise RuntimeError(
+                f"[DatasetBuild] feature width differs across files for date={date}: {sorted(widths)}"
+            )
+
+        return DayDataset.concat(parts)
 
     # ------------------------------------------------------------------
     # Pair-level logic (atomic & testable)
@@ -138,35 +406,131 @@ class DatasetBuildEngine:
             feature_columns: Optional[list[str]],
             label_column: str,
             drop_na: bool,
-    ) -> Tuple[pd.DataFrame, pd.Series]:
+    ) -> DayDataset:
         """
-        Load one (feature, label) file pair and return sanitized X / y.
+        Load one (feature, label) file pair and return sanitized X / y (+ keys).
         """
 
-        feat_df = pd.read_parquet(feat_file)
-        lab_df = pd.read_parquet(lab_file)
+        # ------------------------------
+        # Column projection
+        # ------------------------------
+        if feature_columns is None:
+            feature_columns = self._numeric_columns(feat_file)
+
+        feat = pq.read_table(feat_file, columns=[*KEY_COLUMNS, *feature_columns])
+        lab = pq.read_table(lab_file, columns=[*KEY_COLUMNS, label_column])
 
         # ------------------------------
-        # Column selection
+        # Alignment on (symbol, ts)
         # ------------------------------
-        if feature_columns is not None:
-            X = feat_df[feature_columns].copy()
-        else:
-            X = feat_df.copy()
+        label = align_labels(feat, lab, [label_column], feat_file.name)[label_column]
+
+        # Numeric sanitization（唯一实现见 to_day_dataset）
+        return to_day_dataset(feat, label, feature_columns, drop_na=drop_na)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _numeric_columns(feat_file: Path) -> List[str]:
+        schema = pq.read_schema(feat_file)
+        return [
+            f.name
+            for f in schema
+            if f.name not in KEY_COLUMNS
+            and (pa.types.is_floating(f.type) or pa.types.is_integer(f.type))
+        ]
+
+
+def align_labels(
+        feat: pa.Table,
+        lab: pa.Table,
+        label_columns: Sequence[str],
+        name: str,
+) -> pa.Table:
+    """
+    label 列按 feature 行序对齐（缺失 → null）
 
-        y = lab_df[label_column].copy()
+    - keys 完全一致（同一 min 切片的常规情形）→ 零拷贝按位置
+    - 否则 (symbol, ts) left join，按 feature 行号恢复顺序
+    """
+    if feat.num_rows == lab.num_rows and all(
+            feat[k].equals(lab[k]) for k in KEY_COLUMNS
+    ):
+        return lab.select(list(label_columns))
+
+    left = feat.select(list(KEY_COLUMNS)).append_column(
+        _ROW, pa.array(np.arange(feat.num_rows, dtype=np.int64))
+    )
+    joined = left.join(
+        lab.select([*KEY_COLUMNS, *label_columns]),
+        keys=list(KEY_COLUMNS),
+        join_type="left outer",
+    )
+
+    if joined.num_rows != feat.num_rows:
+        raise RuntimeError(
+            f"[DatasetBuild] {name}: duplicate (symbol, ts) keys in label "
+            f"(features={feat.num_rows}, joined={joined.num_rows})"
+        )
+
+    return joined.sort_by(_ROW).select(list(label_columns))
 
-        # ==============================================================
-        # Numeric sanitization 数值合法性保证(唯一合法位置)
-        # ==============================================================
-        # 1) inf → NaN
-        X.replace([np.inf, -np.inf], np.nan, inplace=True)
-        y.replace([np.inf, -np.inf], np.nan, inplace=True)
 
-        # 2) drop invalid rows
-        if drop_na:
-            mask = X.notna().all(axis=1) & y.notna()
-            X = X.loc[mask]
-            y = y.loc[mask]
+def day_file_pairs(pm: PathManager, date: str) -> List[Tuple[Path, Path]]:
+    """
+    (feature, label) 文件对，按 suffix 对齐；无 label 的 feature 文件显式跳过
+    """
+    feat_dir = pm.feature_dir(date)
+    lab_dir = pm.label_dir(date)
+
+    pairs: List[Tuple[Path, Path]] = []
+    for feat_file in sorted(feat_dir.glob("feature.*.parquet")):
+        suffix = feat_file.name[len("feature."):]
+        lab_file = lab_dir / f"label.{suffix}"
+        if lab_file.exists():
+            pairs.append((feat_file, lab_file))
+    return pairs
 
-        return X, y
+
+def to_day_dataset(
+        feat: pa.Table,
+        label: pa.ChunkedArray | pa.Array,
+        feature_columns: Sequence[str],
+        *,
+        drop_na: bool,
+) -> DayDataset:
+    """
+    行对齐的 feature 表 + label 列 → 清洗后的 DayDataset
+
+    数值合法性保证的唯一实现（DatasetBuildEngine / MiniBatchStream 共用）
+    """
+    X = np.empty((feat.num_rows, len(feature_columns)), dtype=np.float32)
+    for j, name in enumerate(feature_columns):
+        X[:, j] = _to_float32(feat[name])
+    y = _to_float32(label)
+    symbol = feat["symbol"].to_numpy(zero_copy_only=False).astype(str)
+    ts = feat["ts"].to_numpy().astype(np.int64, copy=False)
+
+    # 1) drop invalid rows（NaN / null / inf 一并剔除）
+    if drop_na:
+        mask = np.isfinite(X).all(axis=1) & np.isfinite(y)
+        if not mask.all():
+            X, y, symbol, ts = X[mask], y[mask], symbol[mask], ts[mask]
+        return DayDataset(X=X, y=y, symbol=symbol, ts=ts)
+
+    # 2) inf → NaN（y 可能是 Arrow 只读视图 → 仅在需要时复制）
+    X[np.isinf(X)] = np.nan
+    if np.isinf(y).any():
+        y = np.where(np.isinf(y), np.float32(np.nan), y)
+    return DayDataset(X=X, y=y, symbol=symbol, ts=ts)
+
+
+def _to_float32(col: pa.ChunkedArray | pa.Array) -> np.ndarray:
+    """
+    null → NaN 的 float32 视图（已是 float32 且无 null 时零拷贝）
+
+    unsafe cast：int64 > 2^24（volume / trade_count）按 float32 舍入，
+    与 numpy astype 一致；safe cast 会抛 ArrowInvalid
+    """
+    if col.type != pa.float32():
+        col = pc.cast(col, pa.float32(), safe=False)
+    return col.to_numpy(zero_copy_only=False).astype(np.float32, copy=False)
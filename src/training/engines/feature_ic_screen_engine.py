@@ -0,0 +1,175 @@
+# src/training/engines/feature_ic_screen_engine.py
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.training.engines.cross_sectional_ic_engine import CrossSectionalRankICEngine
+from src.training.engines.dataset_build_engine import (
+    KEY_COLUMNS,
+    align_labels,
+    day_file_pairs,
+)
+from src.utils.path import PathManager
+
+LABEL_PREFIX = "label_"
+
+
+class FeatureICScreenEngine:
+    """
+    FeatureICScreenEngine（单特征 IC 筛选）
+
+    Responsibility:
+    - 每个交易日只读一次 feature / label stage（列投影：keys + 候选特征 / keys + label 列）
+    - 全部 (特征 × label) 的逐 minute 截面 rank IC 一次批量计算
+      （CrossSectionalRankICEngine.evaluate_matrix）
+    - 日 IC = 当日各 minute 截面 IC 的均值；跨日统计见 summarize()
+
+    列发现（按日 schema）：
+    - 特征：数值列且名称以 feature_prefixes 之一开头
+    - label：label_columns 给定则取其与文件的交集；否则取全部数值 label_* 列
+      （triple barrier 的 *_touch_ts 不是收益类 label，排除）
+
+    Contract:
+    - 同一 day 的各 slot 文件合并为一个截面（sh / sz 同场比较）
+    - 纯计算 + 只读 IO，不写任何文件
+    """
+
+    def __init__(
+            self,
+            pm: PathManager,
+            *,
+            feature_prefixes: Sequence[str] = ("l0_", "l1_"),
+            label_columns: Optional[Sequence[str]] = None,
+            min_count: int = 3,
+            feature_chunk: int = 16,
+    ) -> None:
+        self.pm = pm
+        self.feature_prefixes = tuple(feature_prefixes)
+        self.label_columns = list(label_columns) if label_columns else None
+        self.feature_chunk = feature_chunk
+        self.ic_engine = CrossSectionalRankICEngine(min_count=min_count)
+
+    # ------------------------------------------------------------------
+    def screen_day(self, date: str) -> pd.DataFrame:
+        """
+        Returns:
+            long table: date / feature / label / ic / n_minutes
+        """
+        features: List[np.ndarray] = []
+        labels: List[np.ndarray] = []
+        ts: List[np.ndarray] = []
+        feature_cols: Optional[List[str]] = None
+        label_cols: Optional[List[str]] = None
+
+        for feat_file, lab_file in day_file_pairs(self.pm, date):
+            f_cols = self._feature_columns(pq.read_schema(feat_file))
+            l_cols = self._label_columns(pq.read_schema(lab_file))
+            if feature_cols is None:
+                feature_cols, label_cols = f_cols, l_cols
+            else:
+                # 各 slot 取共同列（schema 演进期间可能不一致）
+                feature_cols = [c for c in feature_cols if c in f_cols]
+                label_cols = [c for c in label_cols if c in l_cols]
+
+        if not feature_cols or not label_cols:
+            return _empty()
+
+        for feat_file, lab_file in day_file_pairs(self.pm, date):
+            feat = pq.read_table(feat_file, columns=[*KEY_COLUMNS, *feature_cols])
+            lab = pq.read_table(lab_file, columns=[*KEY_COLUMNS, *label_cols])
+            aligned = align_labels(feat, lab, label_cols, feat_file.name)
+
+            features.append(_matrix(feat, feature_cols))
+            labels.append(_matrix(aligned, label_cols))
+            ts.append(feat["ts"].to_numpy())
+
+        minutes, ic = self.ic_engine.evaluate_matrix(
+            features=np.concatenate(features),
+            labels=np.concatenate(labels),
+            ts=np.concatenate(ts),
+            feature_chunk=self.feature_chunk,
+        )
+
+        n_minutes = np.isfinite(ic).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            daily = np.where(n_minutes > 0, np.nansum(ic, axis=0) / np.maximum(n_minutes, 1), np.nan)
+
+        K, L = daily.shape
+        return pd.DataFrame({
+            "date": date,
+            "feature": np.repeat(feature_cols, L),
+            "label": np.tile(label_cols, K),
+            "ic": daily.ravel(),
+            "n_minutes": n_minutes.ravel(),
+        })
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def summarize(daily: pd.DataFrame) -> pd.DataFrame:
+        """
+        每个 (feature, label)：日 IC 均值 / 标准差 / IR / t / 胜率，按 |IR| 降序
+        """
+        if daily.empty:
+            return pd.DataFrame(
+                columns=["feature", "label", "n_days", "ic_mean", "ic_std",
+                         "ic_ir", "t_stat", "hit_rate"]
+            )
+
+        valid = daily.dropna(subset=["ic"])
+        grouped = valid.groupby(["feature", "label"], sort=False)["ic"]
+        out = grouped.agg(
+            n_days="count",
+            ic_mean="mean",
+            ic_std="std",
+            hit_rate=lambda s: float((np.sign(s) == np.sign(s.mean())).mean()),
+        ).reset_index()
+
+        std = out["ic_std"].replace(0.0, np.nan)
+        out["ic_ir"] = out["ic_mean"] / std
+        out["t_stat"] = out["ic_ir"] * np.sqrt(out["n_days"])
+        out = out[["feature", "label", "n_days", "ic_mean", "ic_std", "ic_ir", "t_stat", "hit_rate"]]
+        return out.reindex(out["ic_ir"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+    @staticmethod
+    def pivot(summary: pd.DataFrame) -> pd.DataFrame:
+        """feature × label 宽表：{label}.ic_mean / {label}.ic_ir"""
+        wide = summary.pivot(index="feature", columns="label", values=["ic_mean", "ic_ir"])
+        wide.columns = [f"{label}.{stat}" for stat, label in wide.columns]
+        return wide[sorted(wide.columns)].reset_index()
+
+    # ------------------------------------------------------------------
+    def _feature_columns(self, schema: pa.Schema) -> List[str]:
+        return [
+            f.name for f in schema
+            if f.name.startswith(self.feature_prefixes) and _is_numeric(f.type)
+        ]
+
+    def _label_columns(self, schema: pa.Schema) -> List[str]:
+        names = {f.name: f.type for f in schema}
+        if self.label_columns is not None:
+            return [c for c in self.label_columns if c in names]
+        return [
+            name for name, typ in names.items()
+            if name.startswith(LABEL_PREFIX) and not name.endswith("_touch_ts") and _is_numeric(typ)
+        ]
+
+
+def _is_numeric(typ: pa.DataType) -> bool:
+    return pa.types.is_floating(typ) or pa.types.is_integer(typ)
+
+
+def _matrix(table: pa.Table, columns: Sequence[str]) -> np.ndarray:
+    out = np.empty((table.num_rows, len(columns)), dtype=np.float64)
+    for j, name in enumerate(columns):
+        out[:, j] = pc.cast(table[name], pa.float64()).to_numpy(zero_copy_only=False)
+    return out
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(columns=["date", "feature", "label", "ic", "n_minutes"])
@@ -1,9 +1,11 @@
 # src/training/engines/ic_evaluate_engine.py
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
-import pandas as pd
-from scipy.stats import spearmanr
+
+from src.training.engines.cross_sectional_ic_engine import CrossSectionalRankICEngine
 
 
 class ICEvaluateEngine:
@@ -27,17 +29,18 @@ class ICEvaluateEngine:
         self,
         *,
         model,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: np.ndarray,
+        y: np.ndarray,
+        ts: Optional[np.ndarray] = None,
     ) -> tuple[np.ndarray, float]:
         """
         Returns:
-            preds, ic_value
+            preds, ic_value（ts 给定 → 逐 minute 截面 IC 的均值）
         """
 
-        preds = model.predict(X.values)
+        preds = model.predict(X)
 
-        ic = self._compute_rank_ic(preds, y.values)
+        ic = self._compute_rank_ic(preds, np.asarray(y), ts)
 
         return preds, ic
 
@@ -48,14 +51,10 @@ class ICEvaluateEngine:
     def _compute_rank_ic(
         preds: np.ndarray,
         y_true: np.ndarray,
+        ts: Optional[np.ndarray] = None,
     ) -> float:
         """
         Spearman Rank IC (frozen definition)
         """
 
-        if len(preds) == 0:
-            return float("nan")
-
-        ic, _ = spearmanr(preds, y_true)
-
-        return float(ic)
+        return CrossSectionalRankICEngine().mean_ic(preds=preds, y_true=y_true, ts=ts)
@@ -0,0 +1,167 @@
+# src/training/engines/minibatch_stream.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.training.engines.dataset_build_engine import (
+    KEY_COLUMNS,
+    DayDataset,
+    day_file_pairs,
+    to_day_dataset,
+)
+from src.utils.path import PathManager
+
+
+class MiniBatchStream:
+    """
+    MiniBatchStream（单日 mini-batch 流 · 常数内存）
+
+    语义：
+      - 按 slice 物理顺序（symbol 连续）流式读取 feature / label parquet，
+        每次只投影 keys + feature_columns / keys + label_column
+      - 两侧按相同行数重切块后逐块校验 (symbol, ts) 一致，再按
+        DatasetBuildEngine 的同一规则清洗（to_day_dataset）
+      - 输出固定 batch_size 的 DayDataset（最后一批可不足）
+
+    Shuffle（shuffle_buffer > 0）：
+      - 有界块内打乱：缓冲满 shuffle_buffer 行后整体置换并输出整批，余数留待下一轮
+      - 随机源 = (seed, epoch)，可复现；不同 epoch 顺序不同
+
+    内存上界：
+      - 约 max(batch_size, shuffle_buffer) + read_rows 行，与 symbol 数 / 日内行数无关
+
+    Contract:
+      - feature 与 label 文件来自同一 min 切片（行序一致）；
+        不一致 → RuntimeError（请改用 DatasetBuildEngine 的 key join）
+    """
+
+    def __init__(
+            self,
+            pm: PathManager,
+            *,
+            feature_columns: Sequence[str],
+            label_column: str,
+            drop_na: bool = True,
+            batch_size: int = 65536,
+            shuffle_buffer: int = 0,
+            seed: int = 0,
+            read_rows: Optional[int] = None,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        if shuffle_buffer < 0:
+            raise ValueError(f"shuffle_buffer must be >= 0, got {shuffle_buffer}")
+
+        self.pm = pm
+        self.feature_columns = list(feature_columns)
+        self.label_column = label_column
+        self.drop_na = drop_na
+        self.batch_size = batch_size
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.read_rows = read_rows or batch_size
+
+    # ------------------------------------------------------------------
+    def iter_day(self, date: str, *, epoch: int = 0) -> Iterator[DayDataset]:
+        pairs = day_file_pairs(self.pm, date)
+        if not pairs:
+            raise RuntimeError(f"No valid dataset built for date={date}")
+
+        rng = np.random.default_rng([self.seed, epoch]) if self.shuffle_buffer else None
+        threshold = max(self.batch_size, self.shuffle_buffer)
+
+        buffer: List[DayDataset] = []
+        buffered = 0
+
+        for feat_file, lab_file in pairs:
+            for part in self._iter_pair(feat_file, lab_file):
+                if len(part) == 0:
+                    continue
+                buffer.append(part)
+                buffered += len(part)
+
+                if buffered >= threshold:
+                    pending = self._shuffle(DayDataset.concat(buffer), rng)
+                    full = len(pending) // self.batch_size * self.batch_size
+                    yield from self._split(_take(pending, slice(0, full)))
+                    rest = _take(pending, slice(full, None))
+                    buffer, buffered = ([rest], len(rest)) if len(rest) else ([], 0)
+
+        if buffered:
+            yield from self._split(self._shuffle(DayDataset.concat(buffer), rng))
+
+    # ------------------------------------------------------------------
+    def _iter_pair(self, feat_file: Path, lab_file: Path) -> Iterator[DayDataset]:
+        feat_iter = _rechunk(
+            pq.ParquetFile(feat_file).iter_batches(
+                batch_size=self.read_rows,
+                columns=[*KEY_COLUMNS, *self.feature_columns],
+            ),
+            self.read_rows,
+        )
+        lab_iter = _rechunk(
+            pq.ParquetFile(lab_file).iter_batches(
+                batch_size=self.read_rows,
+                columns=[*KEY_COLUMNS, self.label_column],
+            ),
+            self.read_rows,
+        )
+
+        offset = 0
+        for feat in feat_iter:
+            lab = next(lab_iter, None)
+            if lab is None or not all(
+                    feat[k].equals(lab[k]) for k in KEY_COLUMNS
+            ):
+                raise RuntimeError(
+                    f"[MiniBatchStream] {feat_file.name}: feature/label rows not aligned "
+                    f"at row {offset}; use DatasetBuildEngine (key join) instead"
+                )
+            offset += feat.num_rows
+            yield to_day_dataset(
+                feat, lab[self.label_column], self.feature_columns, drop_na=self.drop_na,
+            )
+
+        if next(lab_iter, None) is not None:
+            raise RuntimeError(
+                f"[MiniBatchStream] {lab_file.name}: label has more rows than features"
+            )
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _shuffle(day: DayDataset, rng: Optional[np.random.Generator]) -> DayDataset:
+        if rng is None:
+            return day
+        return _take(day, rng.permutation(len(day)))
+
+    def _split(self, day: DayDataset) -> Iterator[DayDataset]:
+        for start in range(0, len(day), self.batch_size):
+            yield _take(day, slice(start, start + self.batch_size))
+
+
+def _take(day: DayDataset, index) -> DayDataset:
+    return DayDataset(X=day.X[index], y=day.y[index], symbol=day.symbol[index], ts=day.ts[index])
+
+
+def _rechunk(batches: Iterator[pa.RecordBatch], size: int) -> Iterator[pa.Table]:
+    """
+    parquet batch 不跨 row group → 重切为恰好 size 行的块（最后一块可不足）
+    """
+    pending: List[pa.RecordBatch] = []
+    rows = 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        while rows >= size:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, size)
+            rest = table.slice(size)
+            pending = rest.to_batches()
+            rows = rest.num_rows
+    if rows:
+        yield pa.Table.from_batches(pending)
@@ -1,7 +1,7 @@
 # src/training/engines/model/sgd_classifier_train_engine.py
 from __future__ import annotations
 
-import pandas as pd
+import numpy as np
 from sklearn.linear_model import SGDClassifier
 
 from src.training.engines.model_train_engine import ModelTrainEngine
@@ -9,8 +9,8 @@ class SGDClassifierTrainEngine(ModelTrainEngine):
     def train(
         self,
         *,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: np.ndarray,
+        y: np.ndarray,
         prev_model=None,
     ):
         if prev_model is None:
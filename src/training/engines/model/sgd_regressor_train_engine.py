@@ -1,6 +1,7 @@
 # src/training/engines/model/sgd_regressor_train_engine.py
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import SGDRegressor
 
@@ -18,16 +19,16 @@ class SklearnSGDRegressorTrainEngine:
     def train(
         self,
         *,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: np.ndarray,
+        y: np.ndarray,
         prev_state: ModelState | None,
         asof_day: pd.Timestamp,
     ) -> ModelState:
         if prev_state is None:
             model = SGDRegressor(**self.cfg.model_params)
-            model.partial_fit(X.values, y.values)
+            model.partial_fit(X, y)
         else:
             model = prev_state.model
-            model.partial_fit(X.values, y.values)
+            model.partial_fit(X, y)
 
         return ModelState(model=model, asof_day=asof_day)
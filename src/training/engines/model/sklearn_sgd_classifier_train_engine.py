@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import pandas as pd
+import numpy as np
 from sklearn.linear_model import SGDClassifier
 
 from src.training.engines.model_train_engine import ModelTrainEngine
@@ -14,8 +14,8 @@ class SklearnSGDClassifierTrainEngine(ModelTrainEngine):
     def train(
         self,
         *,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: np.ndarray,
+        y: np.ndarray,
         prev_model=None,
     ):
         if prev_model is None:
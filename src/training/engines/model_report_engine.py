@@ -4,7 +4,6 @@ from __future__ import annotations
 from typing import Any, Dict
 
 import numpy as np
-import pandas as pd
 from sklearn.metrics import (
     roc_auc_score,
     f1_score,
@@ -30,8 +29,8 @@ class ModelReportEngine:
         self,
         *,
         model: Any,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: np.ndarray,
+        y: np.ndarray,
     ) -> Dict[str, float]:
         """
         Evaluate classification model.
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import pandas as pd
+import numpy as np
 from typing import Any
 
 
@@ -17,8 +17,8 @@ class ModelTrainEngine(ABC):
     def train(
         self,
         *,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: np.ndarray,
+        y: np.ndarray,
         prev_model: Any | None,
     ) -> Any:
         """
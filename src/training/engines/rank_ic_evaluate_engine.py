@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
-import pandas as pd
-from scipy.stats import spearmanr
+
+from src.training.engines.cross_sectional_ic_engine import CrossSectionalRankICEngine
 
 
 class RankICEvaluateEngine:
@@ -14,17 +16,19 @@ class RankICEvaluateEngine:
 
     Contract:
     - preds / y_true must be 1D aligned arrays
+    - ts given → mean of per-minute cross-sectional IC
+      ts None  → pooled Spearman over all rows
     - No IO, no ctx, no plotting
     """
 
+    def __init__(self, engine: Optional[CrossSectionalRankICEngine] = None) -> None:
+        self.engine = engine or CrossSectionalRankICEngine()
+
     def evaluate(
         self,
         *,
         preds: np.ndarray,
         y_true: np.ndarray,
+        ts: Optional[np.ndarray] = None,
     ) -> float:
-        if len(preds) == 0:
-            return float("nan")
-
-        ic, _ = spearmanr(preds, y_true)
-        return float(ic)
+        return self.engine.mean_ic(preds=preds, y_true=y_true, ts=ts)
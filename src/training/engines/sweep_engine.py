@@ -0,0 +1,198 @@
+# src/training/engines/sweep_engine.py
+from __future__ import annotations
+
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import logs
+from src.training.dataset_cache import DatasetCache
+from src.training.engines.model.sgd_regressor_train_engine import (
+    SklearnSGDRegressorTrainEngine,
+)
+from src.training.engines.rank_ic_evaluate_engine import RankICEvaluateEngine
+
+
+@dataclass(frozen=True)
+class SweepCandidate:
+    """
+    一个扫描配置：模型参数 × 特征集
+    """
+
+    name: str
+    feature_set: str
+    feature_columns: Tuple[str, ...]
+    model_params: Dict[str, Any] = field(default_factory=dict)
+
+
+def expand_candidates(
+        *,
+        base_params: Mapping[str, Any],
+        param_grid: Mapping[str, Sequence[Any]],
+        feature_sets: Mapping[str, Sequence[str]],
+) -> List[SweepCandidate]:
+    """
+    (param_grid 笛卡尔积) × feature_sets → 候选列表（顺序确定）
+    """
+    keys = sorted(param_grid)
+    combos = list(itertools.product(*(param_grid[k] for k in keys))) or [()]
+
+    candidates: List[SweepCandidate] = []
+    for set_name, columns in feature_sets.items():
+        for combo in combos:
+            overrides = dict(zip(keys, combo))
+            tag = ",".join(f"{k}={v}" for k, v in overrides.items())
+            candidates.append(
+                SweepCandidate(
+                    name=f"{set_name}|{tag}" if tag else set_name,
+                    feature_set=set_name,
+                    feature_columns=tuple(columns),
+                    model_params={**base_params, **overrides},
+                )
+            )
+    return candidates
+
+
+def union_columns(candidates: Sequence[SweepCandidate]) -> List[str]:
+    """所有候选特征列的并集（按首次出现顺序）"""
+    return list(dict.fromkeys(c for cand in candidates for c in cand.feature_columns))
+
+
+class SweepEngine:
+    """
+    SweepEngine（参数 / 特征集并行扫描）
+
+    Responsibility:
+    - 在共享的每日数据矩阵上 walk-forward 训练 N 个候选模型
+    - 输出每个候选 × eval_day 的 rank IC
+
+    Data sharing:
+    - 每个 day 已由 DatasetBuildEngine.materialize 物化为 .npy（特征列 = 并集）
+    - 子进程 np.load(mmap_mode="r") 打开同一组文件 → OS page cache 共享，
+      I/O 与清洗只发生一次
+    - 一个候选的整个 walk-forward 在一个进程内完成，模型状态不跨进程传递
+
+    Contract:
+    - 与 ModelTrainStep 相同的在线回归引擎（SklearnSGDRegressorTrainEngine）
+    - drop_na 作用于并集矩阵（同一行对所有候选一致）
+    """
+
+    def __init__(self, *, cfg, max_workers: Optional[int] = None) -> None:
+        self.cfg = cfg
+        self.max_workers = max_workers
+
+    # ------------------------------------------------------------------
+    def run(
+            self,
+            *,
+            candidates: Sequence[SweepCandidate],
+            days: Sequence[Tuple[str, Path]],
+            columns: Sequence[str],
+    ) -> pd.DataFrame:
+        """
+        Returns:
+            long table: candidate / feature_set / params / eval_day / rank_ic
+        """
+        if len(days) < 2 or not candidates:
+            return pd.DataFrame(
+                columns=["candidate", "feature_set", "params", "eval_day", "rank_ic"]
+            )
+
+        index = {c: i for i, c in enumerate(columns)}
+        tasks = [
+            (cand, [index[c] for c in cand.feature_columns])
+            for cand in candidates
+        ]
+
+        workers = self._resolve_workers(len(tasks))
+        logs.info(
+            f"[Sweep] candidates={len(tasks)} days={len(days)} workers={workers}"
+        )
+
+        if workers == 1:
+            results = [_walk_forward(cand, cols, list(days), self.cfg) for cand, cols in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _walk_forward,
+                    [cand for cand, _ in tasks],
+                    [cols for _, cols in tasks],
+                    itertools.repeat(list(days)),
+                    itertools.repeat(self.cfg),
+                ))
+
+        return pd.DataFrame([r for records in results for r in records])
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def summarize(series: pd.DataFrame) -> pd.DataFrame:
+        """
+        每个候选：rank IC 均值 / 标准差 / IR / 天数，按 IR 降序
+        """
+        if series.empty:
+            return pd.DataFrame(
+                columns=["candidate", "feature_set", "params",
+                         "n_days", "ic_mean", "ic_std", "ic_ir"]
+            )
+
+        grouped = series.groupby(["candidate", "feature_set", "params"], sort=False)["rank_ic"]
+        out = grouped.agg(n_days="count", ic_mean="mean", ic_std="std").reset_index()
+        out["ic_ir"] = out["ic_mean"] / out["ic_std"].replace(0.0, np.nan)
+        return out.sort_values("ic_ir", ascending=False, na_position="last").reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    def _resolve_workers(self, n: int) -> int:
+        if self.max_workers is None:
+            return max(1, min(os.cpu_count() or 1, n))
+        return max(1, min(self.max_workers, n))
+
+
+# =============================================================================
+# worker（module-level：可被 ProcessPoolExecutor pickle）
+# =============================================================================
+def _walk_forward(
+        candidate: SweepCandidate,
+        cols: List[int],
+        days: List[Tuple[str, Path]],
+        cfg,
+) -> List[dict]:
+    engine = SklearnSGDRegressorTrainEngine(
+        cfg.model_copy(update={"model_params": dict(candidate.model_params)})
+    )
+    evaluator = RankICEvaluateEngine()
+    params = json.dumps(candidate.model_params, sort_keys=True, default=str)
+
+    def _load(entry: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        arrays = DatasetCache.open(entry)
+        X = arrays["X"]
+        if cols != list(range(X.shape[1])):
+            X = X[:, cols]
+        return X, arrays["y"], arrays["ts"]
+
+    records: List[dict] = []
+    state = None
+    for (update_day, train_entry), (eval_day, eval_entry) in zip(days[:-1], days[1:]):
+        X, y, _ = _load(train_entry)
+        state = engine.train(X=X, y=y, prev_state=state, asof_day=update_day)
+
+        X_eval, y_eval, ts_eval = _load(eval_entry)
+        records.append({
+            "candidate": candidate.name,
+            "feature_set": candidate.feature_set,
+            "params": params,
+            "eval_day": eval_day,
+            "rank_ic": evaluator.evaluate(
+                preds=state.model.predict(X_eval),
+                y_true=np.asarray(y_eval),
+                ts=np.asarray(ts_eval),
+            ),
+        })
+
+    return records
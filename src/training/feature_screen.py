@@ -0,0 +1,89 @@
+# src/training/feature_screen.py
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from src import logs
+from src.config.training_config import TrainingConfig
+from src.observability.instrumentation import Instrumentation
+from src.training.engines.feature_ic_screen_engine import FeatureICScreenEngine
+from src.training.pipeline import scan_physical_trading_days
+from src.utils.parallel import ParallelExecutor, ParallelKind
+from src.utils.path import PathManager
+
+
+def _screen_one_day(engine: FeatureICScreenEngine, date: str) -> pd.DataFrame:
+    # module-level：ProcessPoolExecutor 可 pickle
+    return engine.screen_day(date)
+
+
+class FeatureScreenRunner:
+    """
+    FeatureScreenRunner（单特征 IC 筛选 · orchestration only）
+
+    流程：
+      1. 扫描 [start_date, end_date] 内的物理交易日
+      2. 每个 day 一个任务（ParallelExecutor 进程池），FeatureICScreenEngine.screen_day
+      3. 汇总写出 reports/：
+           feature_ic_daily.csv    （date × feature × label 日 IC）
+           feature_ic_summary.csv  （feature × label：IC 均值 / IR / t / 胜率）
+           feature_ic_matrix.csv   （feature × label 宽表）
+    """
+
+    def __init__(
+            self,
+            *,
+            pm: PathManager,
+            inst: Instrumentation,
+            cfg: TrainingConfig,
+    ) -> None:
+        self.pm = pm
+        self.inst = inst
+        self.cfg = cfg
+
+    def run(self, run_id: str) -> pd.DataFrame:
+        cfg = self.cfg
+        screen = cfg.screen
+        logs.info(f"[FeatureScreen] START run_id={run_id}")
+
+        engine = FeatureICScreenEngine(
+            self.pm,
+            feature_prefixes=screen.feature_prefixes,
+            label_columns=screen.label_columns,
+            min_count=screen.min_count,
+        )
+        dates = scan_physical_trading_days(
+            self.pm, start_date=cfg.start_date, end_date=cfg.end_date,
+        )
+
+        with self.inst.timer("[screen] days"):
+            results = ParallelExecutor.run(
+                kind=ParallelKind.DAY,
+                items=dates,
+                handler=partial(_screen_one_day, engine),
+                max_worker=screen.max_workers,
+            ) or []
+
+        frames = [df for df in results if not df.empty]
+        daily = (
+            pd.concat(frames, ignore_index=True).sort_values(["date", "feature", "label"])
+            if frames
+            else pd.DataFrame(columns=["date", "feature", "label", "ic", "n_minutes"])
+        )
+        summary = FeatureICScreenEngine.summarize(daily)
+
+        out_dir = Path(self.pm.train_run_dir(run_id)) / "reports"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        daily.to_csv(out_dir / "feature_ic_daily.csv", index=False)
+        summary.to_csv(out_dir / "feature_ic_summary.csv", index=False)
+        if not summary.empty:
+            FeatureICScreenEngine.pivot(summary).to_csv(out_dir / "feature_ic_matrix.csv", index=False)
+
+        logs.info(
+            f"[FeatureScreen] DONE days={daily['date'].nunique()} "
+            f"pairs={len(summary)} → {out_dir}"
+        )
+        return summary
@@ -1,7 +1,7 @@
 # src/training/pipeline.py
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Tuple
 import pandas as pd
 
 from src import logs
@@ -9,6 +9,7 @@ from src.utils.path import PathManager
 from src.observability.instrumentation import Instrumentation
 from src.pipeline.step import PipelineStep
 from src.training.context import TrainingContext
+from src.training.checkpoint_store import CheckpointStore
 from src.config.training_config import TrainingConfig
 
 
@@ -20,6 +21,12 @@ class TrainingPipeline:
     - Pipeline owns date iteration
     - Steps execute semantics
     - Pipeline collects evaluation artifacts (IC series)
+
+    Checkpoints (optional, CheckpointStore):
+    - snapshot_enabled → 每 snapshot_every_n_steps 个 update_day（及最后一个）
+      保存 ModelState + 截至当日的 IC 序列
+    - resume → 取 asof_day ≤ start_date 的最新快照，恢复 model_state / IC 序列，
+      从快照次日继续（快照与 start_date 之间的交易日会被补训，不跳过）
     """
 
     def __init__(
@@ -30,12 +37,14 @@ class TrainingPipeline:
             pm: PathManager,
             inst: Instrumentation,
             cfg: TrainingConfig,
+            checkpoints: Optional[CheckpointStore] = None,
     ):
         self.daily_steps = daily_steps
         self.final_steps = final_steps
         self.pm = pm
         self.inst = inst
         self.cfg = cfg
+        self.checkpoints = checkpoints
 
         # ✅ 初始化 IC 序列（结构化）
         self.ic_series: list[dict] = []
@@ -52,6 +61,9 @@ class TrainingPipeline:
         )
 
         dates = self._scan_physical_trading_days()
+        n_steps = 0
+        if self.cfg.resume:
+            dates, n_steps = self._resume(ctx, dates)
 
         for i in range(len(dates) - 1):
             update_day = dates[i]
@@ -60,6 +72,7 @@ class TrainingPipeline:
 
             ctx.update_day = update_day
             ctx.eval_day = eval_day
+            ctx.upcoming_days = dates[i + 2:]
 
             # ------------------------------
             # Run daily steps
@@ -93,10 +106,19 @@ class TrainingPipeline:
             else:
                 logs.info(
                     f"[IC] update={update_day} "
-                    f"eval={eval_day.date()} "
+                    f"eval={eval_day} "
                     f"ic=SKIPPED"
                 )
 
+            n_steps += 1
+            self._snapshot(ctx, n_steps, last=i == len(dates) - 2)
+
+        # 释放后台预取资源（DatasetBuildStep 等）
+        for step in self.daily_steps:
+            close = getattr(step, "close", None)
+            if callable(close):
+                close()
+
         # Attach IC series to context (for report steps)
         ctx.ic_series = self.ic_series
 
@@ -109,18 +131,76 @@ class TrainingPipeline:
         logs.info("[TrainingPipeline] DONE")
         return ctx
 
-    def _scan_physical_trading_days(self) -> List[str]:
+    # ------------------------------------------------------------------
+    def _resume(self, ctx: TrainingContext, dates: List[str]) -> Tuple[List[str], int]:
         """
-        Trading day definition (PHYSICAL):
-
-        - pm.feature_dir(date) exists
-        - No exchange calendar assumption
-        - No business logic here
+        Returns:
+            (剩余交易日, 已完成 step 数)；无可用快照 → (dates, 0)
         """
-        calendar_days = pd.date_range(
-            self.cfg.start_date,
-            self.cfg.end_date,
-            freq="D",
-        ).strftime("%Y-%m-%d")
+        if self.checkpoints is None:
+            logs.warning("[TrainingPipeline] resume requested without checkpoint store → fresh start")
+            return dates, 0
+
+        start = str(self.cfg.start_date)
+        day = self.checkpoints.latest(at_or_before=start)
+        loaded = self.checkpoints.load(day) if day is not None else None
+        if loaded is None:
+            logs.warning(f"[TrainingPipeline] no checkpoint <= {start} → fresh start")
+            return dates, 0
+
+        state, meta = loaded
+        ctx.model_state = state
+        self.ic_series = list(meta.get("ic_series", []))
+
+        remaining = [
+            d for d in scan_physical_trading_days(
+                self.pm, start_date=day, end_date=self.cfg.end_date,
+            )
+            if d > day
+        ]
+        logs.info(
+            f"[TrainingPipeline] resume from checkpoint asof={day} "
+            f"step={meta.get('step', 0)} remaining_days={len(remaining)}"
+        )
+        return remaining, int(meta.get("step", 0))
+
+    def _snapshot(self, ctx: TrainingContext, step: int, *, last: bool) -> None:
+        if not self.cfg.snapshot_enabled or self.checkpoints is None:
+            return
+        if ctx.model_state is None:
+            return
+        if step % max(1, self.cfg.snapshot_every_n_steps) and not last:
+            return
+
+        with self.inst.timer("[train] checkpoint"):
+            entry = self.checkpoints.save(
+                ctx.model_state,
+                step=step,
+                run_id=ctx.run_id,
+                ic_series=self.ic_series,
+            )
+        logs.info(f"[Checkpoint] step={step} asof={ctx.model_state.asof_day} → {entry}")
+
+    def _scan_physical_trading_days(self) -> List[str]:
+        return scan_physical_trading_days(
+            self.pm,
+            start_date=self.cfg.start_date,
+            end_date=self.cfg.end_date,
+        )
+
+
+def scan_physical_trading_days(pm: PathManager, *, start_date, end_date) -> List[str]:
+    """
+    Trading day definition (PHYSICAL):
+
+    - pm.feature_dir(date) exists
+    - No exchange calendar assumption
+    - No business logic here
+    """
+    calendar_days = pd.date_range(
+        start_date,
+        end_date,
+        freq="D",
+    ).strftime("%Y-%m-%d")
 
-        return [d for d in calendar_days if self.pm.feature_dir(d).exists()]
+    return [d for d in calendar_days if pm.feature_dir(d).exists()]
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from src.pipeline.step import PipelineStep
 from src.training.context import TrainingContext
+from src.training.dataset_cache import DatasetCache
 from src.training.engines.dataset_build_engine import DatasetBuildEngine
 from src.utils.path import PathManager
 
@@ -20,25 +23,60 @@ class DatasetBuildStep(PipelineStep):
     - data cleaning logic
     """
 
-    def __init__(self, pm: PathManager, inst):
+    def __init__(
+            self,
+            pm: PathManager,
+            inst,
+            cache: Optional[DatasetCache] = None,
+            prefetch_days: int = 0,
+            train_enabled: bool = True,
+    ):
         super().__init__(inst)
-        self.engine = DatasetBuildEngine(pm)
+        self.engine = DatasetBuildEngine(pm, cache=cache, prefetch_days=prefetch_days)
+        # False：训练集由 StreamingModelTrainStep 流式读取，此处只构建 eval
+        self.train_enabled = train_enabled
 
     def run(self, ctx: TrainingContext) -> TrainingContext:
         cfg = ctx.cfg.dataset
 
-        train_X, train_y, eval_X, eval_y = self.engine.build(
-            update_day=ctx.update_day,
-            eval_day=ctx.eval_day,
+        with self.inst.timer(f"[dataset] build {ctx.update_day}"):
+            train, evaluation = self.engine.build_days(
+                update_day=ctx.update_day,
+                eval_day=ctx.eval_day,
+                feature_columns=cfg.feature_columns,
+                label_column=cfg.label_column,
+                drop_na=cfg.drop_na,
+                evaluation_enabled=ctx.cfg.evaluation_enabled,
+                train_enabled=self.train_enabled,
+            )
+
+        # 当前 day 训练 / 评估期间，后台构建后续 day
+        self.engine.prefetch(
+            ctx.upcoming_days,
             feature_columns=cfg.feature_columns,
             label_column=cfg.label_column,
             drop_na=cfg.drop_na,
-            evaluation_enabled=ctx.cfg.evaluation_enabled,
         )
 
-        ctx.train_X = train_X
-        ctx.train_y = train_y
-        ctx.eval_X = eval_X
-        ctx.eval_y = eval_y
+        if self.engine.prefetch_days > 0:
+            stats = self.engine.stats
+            self.inst.metrics.record(
+                "dataset.prefetch",
+                {
+                    "hits": stats["prefetch_hits"],
+                    "load_s": round(stats["load_s"], 3),
+                    "wait_s": round(stats["wait_s"], 3),
+                    "overlap_s": round(self.engine.overlap_s(), 3),
+                },
+            )
+
+        ctx.train_X = train.X if train is not None else None
+        ctx.train_y = train.y if train is not None else None
+        ctx.eval_X = evaluation.X if evaluation is not None else None
+        ctx.eval_y = evaluation.y if evaluation is not None else None
+        ctx.eval_ts = evaluation.ts if evaluation is not None else None
 
         return ctx
+
+    def close(self) -> None:
+        self.engine.close()
@@ -26,6 +26,7 @@ class ICEvaluateStep(PipelineStep):
             model=ctx.model_state.model,
             X=ctx.eval_X,
             y=ctx.eval_y,
+            ts=getattr(ctx, "eval_ts", None),
         )
 
         date = ctx.eval_day
@@ -32,7 +32,8 @@ class RankICStep(PipelineStep):
 
         rank_ic = self.engine.evaluate(
             preds=ctx.eval_pred,
-            y_true=ctx.eval_y.values,
+            y_true=ctx.eval_y,
+            ts=getattr(ctx, "eval_ts", None),
         )
 
         record = {
@@ -0,0 +1,61 @@
+# src/training/steps/streaming_model_train_step.py
+from __future__ import annotations
+
+from src import logs
+from src.pipeline.step import PipelineStep
+from src.training.context import TrainingContext
+from src.training.engines.minibatch_stream import MiniBatchStream
+from src.training.engines.model.sgd_regressor_train_engine import (
+    SklearnSGDRegressorTrainEngine,
+)
+from src.utils.path import PathManager
+
+
+class StreamingModelTrainStep(PipelineStep):
+    """
+    StreamingModelTrainStep（ONLINE / mini-batch）
+
+    Contract:
+    - 不消费 ctx.train_X / ctx.train_y（DatasetBuildStep 以 train_enabled=False 运行）
+    - update_day 的数据由 MiniBatchStream 按 cfg.stream 流式读取
+    - 每个 mini-batch 一次 partial_fit，epochs 轮
+    - consumes / produces ctx.model_state（与 ModelTrainStep 一致）
+    """
+
+    def __init__(self, cfg, pm: PathManager, inst=None):
+        super().__init__(inst)
+        self.engine = SklearnSGDRegressorTrainEngine(cfg)
+        self.epochs = cfg.stream.epochs
+        self.stream = MiniBatchStream(
+            pm,
+            feature_columns=cfg.dataset.feature_columns,
+            label_column=cfg.dataset.label_column,
+            drop_na=cfg.dataset.drop_na,
+            batch_size=cfg.stream.batch_size,
+            shuffle_buffer=cfg.stream.shuffle_buffer,
+            seed=cfg.stream.seed,
+        )
+
+    def run(self, ctx: TrainingContext) -> TrainingContext:
+        state = ctx.model_state
+        batches = rows = 0
+
+        with self.inst.timer(f"[train] stream {ctx.update_day}"):
+            for epoch in range(self.epochs):
+                for batch in self.stream.iter_day(ctx.update_day, epoch=epoch):
+                    state = self.engine.train(
+                        X=batch.X,
+                        y=batch.y,
+                        prev_state=state,
+                        asof_day=ctx.update_day,
+                    )
+                    batches += 1
+                    rows += len(batch)
+
+        logs.info(
+            f"[StreamingTrain] day={ctx.update_day} epochs={self.epochs} "
+            f"batches={batches} rows={rows}"
+        )
+
+        ctx.model_state = state
+        return ctx
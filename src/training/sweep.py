@@ -0,0 +1,121 @@
+# src/training/sweep.py
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from src import logs
+from src.config.training_config import TrainingConfig
+from src.observability.instrumentation import Instrumentation
+from src.training.dataset_cache import DatasetCache
+from src.training.engines.dataset_build_engine import DatasetBuildEngine
+from src.training.engines.sweep_engine import (
+    SweepEngine,
+    expand_candidates,
+    union_columns,
+)
+from src.training.pipeline import scan_physical_trading_days
+from src.utils.path import PathManager
+
+
+class SweepRunner:
+    """
+    SweepRunner（参数 / 特征集扫描 · orchestration only）
+
+    流程：
+      1. 展开候选：sweep.param_grid × sweep.feature_sets
+      2. 每个交易日按特征并集物化一次（DatasetCache .npy）
+      3. SweepEngine 在进程池中为每个候选做 walk-forward
+      4. 写出 reports/sweep_rank_ic.csv（逐日）与 sweep_summary.csv（按 IR 排序）
+
+    缓存：
+      - dataset_cache_enabled → 共享 cache_dir()/dataset（跨 run 复用）；
+        本次区间的条目在 sweep 期间固定，不受 max_gb 淘汰
+      - 否则使用 run 目录下的临时缓存，结束后删除
+    """
+
+    def __init__(
+            self,
+            *,
+            pm: PathManager,
+            inst: Instrumentation,
+            cfg: TrainingConfig,
+    ) -> None:
+        self.pm = pm
+        self.inst = inst
+        self.cfg = cfg
+
+    def run(self, run_id: str) -> pd.DataFrame:
+        logs.info(f"[Sweep] START run_id={run_id}")
+
+        run_dir = Path(self.pm.train_run_dir(run_id))
+        cache, scratch = self._cache(run_dir)
+
+        try:
+            summary = self._run(run_dir, cache)
+        finally:
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+        logs.info("[Sweep] DONE")
+        return summary
+
+    # ------------------------------------------------------------------
+    def _run(self, run_dir: Path, cache: DatasetCache) -> pd.DataFrame:
+        cfg = self.cfg
+        sweep = cfg.sweep
+
+        candidates = expand_candidates(
+            base_params=cfg.model_params,
+            param_grid=sweep.param_grid,
+            feature_sets=sweep.feature_sets or {"default": cfg.dataset.feature_columns},
+        )
+        columns = union_columns(candidates)
+
+        dates = scan_physical_trading_days(
+            self.pm, start_date=cfg.start_date, end_date=cfg.end_date,
+        )
+
+        builder = DatasetBuildEngine(self.pm, cache=cache, memo_days=0)
+        days: List[Tuple[str, Path]] = []
+
+        # 子进程按路径 np.load → 本次区间的条目在训练结束前不得被 LRU 淘汰
+        with cache.pinned():
+            with self.inst.timer("[sweep] materialize"):
+                for date in dates:
+                    days.append((date, builder.materialize(
+                        date=date,
+                        feature_columns=columns,
+                        label_column=cfg.dataset.label_column,
+                        drop_na=cfg.dataset.drop_na,
+                    )))
+
+            with self.inst.timer("[sweep] train"):
+                series = SweepEngine(cfg=cfg, max_workers=sweep.max_workers).run(
+                    candidates=candidates,
+                    days=days,
+                    columns=columns,
+                )
+        summary = SweepEngine.summarize(series)
+
+        out_dir = run_dir / "reports"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        series.to_csv(out_dir / "sweep_rank_ic.csv", index=False)
+        summary.to_csv(out_dir / "sweep_summary.csv", index=False)
+        logs.info(f"[Sweep] saved {out_dir / 'sweep_summary.csv'} candidates={len(summary)}")
+
+        return summary
+
+    # ------------------------------------------------------------------
+    def _cache(self, run_dir: Path) -> Tuple[DatasetCache, Optional[Path]]:
+        if self.cfg.dataset_cache_enabled:
+            return DatasetCache(
+                self.pm.cache_dir() / "dataset",
+                max_bytes=int(self.cfg.dataset_cache_max_gb * 1024 ** 3),
+            ), None
+
+        scratch = run_dir / "_sweep_cache"
+        return DatasetCache(scratch), scratch
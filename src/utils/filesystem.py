@@ -1,17 +1,36 @@
 #!filepath: src/utils/filesystem.py
 import os
 import shutil
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from src import logs
 
+try:  # POSIX advisory lock；Windows 上降级为 no-op
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+def _current_umask() -> int:
+    # umask 只能“设置并返回旧值”；import 时单线程，读后立即恢复
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp 固定 0600；replace 后的正式文件应与 open() 新建文件一致（0666 & ~umask）
+_FILE_MODE = 0o666 & ~_current_umask()
+
 
 class FileSystem:
     """
     统一文件系统工具
     - 自动创建目录
-    - 安全写入文件（临时文件 → rename）
+    - 安全写入文件（唯一临时文件 → fsync → rename → fsync 目录）
+    - 进程间 advisory 文件锁
     - 删除文件/目录
     - 扫描目录
     - 获取文件大小等
@@ -62,23 +81,120 @@ class FileSystem:
     @staticmethod
     def safe_write(path: str | Path, data: bytes) -> None:
         """
-        原子写入（避免部分写入导致文件损坏）
+        原子写入（crash-consistent · 并发安全）
         写入步骤：
-            1) 先写入 tmp 文件
-            2) rename → 正式文件
+            1) 写入同目录下唯一 tmp 文件（并发写互不覆盖）
+            2) fsync tmp 文件（掉电后内容已落盘）
+            3) os.replace → 正式文件（原子）
+            4) fsync 父目录（rename 本身已落盘）
         """
         path = Path(path)
         FileSystem.ensure_dir(path.parent)
 
-        tmp_path = path.with_suffix(path.suffix + ".tmp")  # 保留原后缀
+        tmp_path = FileSystem.tmp_path(path)
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                logs.debug(f"[FS] 写入临时文件: {tmp_path}")
 
-        with open(tmp_path, "wb") as f:
-            f.write(data)
-            logs.debug(f"[FS] 写入临时文件: {tmp_path}")
+            FileSystem.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
-        tmp_path.rename(path)
         logs.debug(f"[FS] 原子写入完成: {path}")
 
+    @staticmethod
+    def tmp_path(path: str | Path) -> Path:
+        """
+        为 path 分配同目录下的唯一临时文件（*.tmp）
+
+        - 同目录：保证 os.replace 不跨文件系统
+        - 唯一名：同一 date 的并发 run 不会互相覆盖 tmp
+        - 权限：0666 & ~umask（mkstemp 默认 0600，replace 后会变成 owner-only）
+        """
+        path = Path(path)
+        FileSystem.ensure_dir(path.parent)
+        fd, name = tempfile.mkstemp(
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            suffix=".tmp",
+        )
+        try:
+            os.chmod(name, _FILE_MODE)
+        finally:
+            os.close(fd)
+        return Path(name)
+
+    @staticmethod
+    def replace(tmp_path: str | Path, path: str | Path) -> None:
+        """
+        原子替换 tmp → path，并 fsync 父目录
+        """
+        os.replace(tmp_path, path)
+        FileSystem.fsync_dir(Path(path).parent)
+
+    @staticmethod
+    def fsync_file(path: str | Path) -> None:
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def fsync_dir(path: str | Path) -> None:
+        """
+        fsync 目录项（使 rename / create 在掉电后可见）
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:  # pragma: no cover（Windows 无法打开目录）
+            return
+        try:
+            os.fsync(fd)
+        except OSError:  # pragma: no cover
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def append_line(path: str | Path, line: str) -> None:
+        """
+        追加一行并 fsync（journal 语义：单次 write，O_APPEND 保证多进程不交错）
+        """
+        path = Path(path)
+        FileSystem.ensure_dir(path.parent)
+        data = (line.rstrip("\n") + "\n").encode("utf-8")
+
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    @contextmanager
+    def lock(path: str | Path, *, shared: bool = False) -> Iterator[Path]:
+        """
+        进程间 advisory 锁（阻塞等待）
+
+        - shared=False → 排他锁；shared=True → 共享锁（读写锁语义）
+        - 锁文件本身不承载数据，不删除（避免 unlink 竞态）
+        - 进程退出 / 崩溃时由内核自动释放
+        """
+        path = Path(path)
+        FileSystem.ensure_dir(path.parent)
+
+        with open(path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield path
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
     @staticmethod
     def remove(path: str | Path) -> None:
         """
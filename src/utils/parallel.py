@@ -13,6 +13,7 @@ from enum import Enum
 class ParallelKind(str, Enum):
     FILE = "file"
     SYMBOL = "symbol"
+    DAY = "day"
 
 
 class ParallelExecutor:
@@ -1,6 +1,5 @@
 # src/utils/parquet_utils.py
 from pathlib import Path
-import os
 import pyarrow.parquet as pq
 import pyarrow as pa
 
@@ -12,8 +11,8 @@ class ParquetAtomicWriter:
     Parquet 原子写工具（冻结版）
 
     语义：
-      - 永远写到 *.tmp
-      - 成功后 rename → 正式 parquet
+      - 永远写到同目录唯一 *.tmp（并发写互不覆盖）
+      - fsync 后 rename → 正式 parquet，并 fsync 目录
     """
 
     @staticmethod
@@ -21,14 +20,17 @@ class ParquetAtomicWriter:
         output_path = Path(output_path)
         FileSystem.ensure_dir(output_path.parent)
 
-        tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+        tmp_path = FileSystem.tmp_path(output_path)
 
-        # 1. 写入临时文件
-        pq.write_table(table, tmp_path, **kwargs)
+        try:
+            # 1. 写入临时文件
+            pq.write_table(table, tmp_path, **kwargs)
 
-        # 2. fsync（可选但强烈建议）
-        with open(tmp_path, "rb") as f:
-            os.fsync(f.fileno())
+            # 2. fsync
+            FileSystem.fsync_file(tmp_path)
 
-        # 3. 原子替换
-        tmp_path.replace(output_path)
+            # 3. 原子替换（+ fsync 目录）
+            FileSystem.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
@@ -6,6 +6,7 @@ from typing import Optional
 
 import pyarrow as pa
 import pyarrow.parquet as pq
+from src.utils.filesystem import FileSystem
 from src.utils.logger import logs
 
 
@@ -24,7 +25,7 @@ class ParquetAppendWriter:
       - Writer 不 sort / concat / index
       - chunk 仅是 I/O 优化，不改变语义
       - schema 在首个写入时冻结
-      - 永远 tmp → rename，避免半文件
+      - 永远 唯一 tmp → fsync → rename，避免半文件 / 并发 run 互相覆盖
 
     使用方式（唯一合法）：
       writer = ParquetAppendWriter(output_file=...)
@@ -41,7 +42,7 @@ class ParquetAppendWriter:
             schema: Optional[pa.Schema] = None,
     ):
         self._final_path = output_file
-        self._tmp_path = self._final_path.with_suffix(".parquet.tmp")
+        self._tmp_path: Optional[Path] = None
 
         self._schema: Optional[pa.Schema] = schema
         self._writer: Optional[pq.ParquetWriter] = None
@@ -123,8 +124,9 @@ class ParquetAppendWriter:
             self._writer.close()
             self._writer = None
 
-        if self._tmp_path.exists():
-            self._tmp_path.replace(self._final_path)
+        if self._tmp_path is not None and self._tmp_path.exists():
+            FileSystem.fsync_file(self._tmp_path)
+            FileSystem.replace(self._tmp_path, self._final_path)
 
         self._closed = True
         return self._final_path
@@ -151,6 +153,7 @@ class ParquetAppendWriter:
                     f"got={schema}"
                 )
 
+        self._tmp_path = FileSystem.tmp_path(self._final_path)
         self._writer = pq.ParquetWriter(
             self._tmp_path,
             self._schema,
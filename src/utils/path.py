@@ -44,6 +44,7 @@ class PathManager:
      │    ├── training/            ← train run outputs (EXPERIMENTS)
      │    │    └── {run_id}/
      │    ├── backtest/
+     │    ├── history/             ← consolidated store (optional)
      │    └── fact/
      │
      ├── shared/                  ← STABLE / CONSUMABLE
@@ -188,6 +189,16 @@ class PathManager:
         p = cls.ssd_root() / "fact"
         return p / date if date else p
 
+    @classmethod
+    def history_dir(cls) -> Path:
+        """
+        Consolidated long-format store (multi-year scans).
+
+        Layout:
+            history/stage={stage}/slot={slot}/ym={YYYYMM}/{date}.parquet
+        """
+        return cls.ssd_root() / "history"
+
     # ============================================================
     # shared (STABLE / CONSUMABLE)
     # ============================================================
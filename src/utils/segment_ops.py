@@ -0,0 +1,183 @@
+# src/utils/segment_ops.py
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+# =============================================================================
+# Segment ops（分组向量化 · sorted / segmented layout）
+# =============================================================================
+#
+# 把“按 key 分组后逐组计算”改写为一次排序 + reduceat：
+#
+#   - Segments(keys)：按 keys 稳定排序，得到每组在排序空间内的 [start, end)
+#   - 组内统计量（count / sum / mean / std）→ np.add.reduceat，O(n)
+#   - 组内排序类统计（rank / quantile）→ 一次 lexsort((x, group))
+#   - 所有返回值都已映射回原始行序（broadcast 到行）
+#
+# NaN / ±inf 视为缺失：不参与统计，对应输出为 NaN。
+#
+# =============================================================================
+
+
+class Segments:
+    """
+    Segments：一组 key（lexsort 语义：最后一个 key 为主键）定义的分组
+    """
+
+    def __init__(self, keys: Sequence[np.ndarray]) -> None:
+        keys = [np.asarray(k) for k in keys]
+        if not keys:
+            raise ValueError("[Segments] at least one key is required")
+
+        n = len(keys[0])
+        if any(len(k) != n for k in keys):
+            raise ValueError("[Segments] keys must have equal length")
+
+        self.n = n
+        self.order = np.lexsort(keys[::-1]) if len(keys) > 1 else np.argsort(keys[0], kind="stable")
+
+        # 排序空间内的组边界
+        change = np.zeros(n, dtype=bool)
+        if n:
+            change[0] = True
+            for k in keys:
+                ks = k[self.order]
+                change[1:] |= ks[1:] != ks[:-1]
+
+        self.starts = np.flatnonzero(change)
+        self.n_groups = len(self.starts)
+
+        # 每行（原始行序）的组号
+        gid_sorted = np.cumsum(change) - 1
+        self.group = np.empty(n, dtype=np.int64)
+        self.group[self.order] = gid_sorted
+
+    # ------------------------------------------------------------------
+    def _reduce(self, values: np.ndarray) -> np.ndarray:
+        if self.n == 0:
+            return np.zeros(0, dtype=values.dtype)
+        return np.add.reduceat(values[self.order], self.starts)
+
+    def _broadcast(self, per_group: np.ndarray) -> np.ndarray:
+        return per_group[self.group]
+
+    # ------------------------------------------------------------------
+    def count(self, x: np.ndarray) -> np.ndarray:
+        return self._broadcast(self._reduce(np.isfinite(x).astype(np.int64)))
+
+    def mean(self, x: np.ndarray) -> np.ndarray:
+        valid = np.isfinite(x)
+        s = self._reduce(np.where(valid, x, 0.0))
+        c = self._reduce(valid.astype(np.int64))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            m = np.where(c > 0, s / np.maximum(c, 1), np.nan)
+        return self._broadcast(m)
+
+    def std(self, x: np.ndarray, ddof: int = 0) -> np.ndarray:
+        """
+        两遍法：先组均值，再组内离差平方和（避免 E[x^2] - E[x]^2 抵消）
+        """
+        valid = np.isfinite(x)
+        m = self.mean(x)
+        d = np.where(valid, x - m, 0.0)
+        ss = self._reduce(d * d)
+        c = self._reduce(valid.astype(np.int64))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = np.where(c - ddof > 0, ss / np.maximum(c - ddof, 1), np.nan)
+        return self._broadcast(np.sqrt(var))
+
+    def demean(self, x: np.ndarray) -> np.ndarray:
+        return np.where(np.isfinite(x), x - self.mean(x), np.nan)
+
+    # ------------------------------------------------------------------
+    def _sorted_within(self, x: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        组内按 x 升序（缺失值排在组尾）
+
+        返回：(行号序列, 每行在组内的位置, 每组有效值个数, 每组起点)
+        """
+        valid = np.isfinite(x)
+        # 主键 group，次键 valid（有效在前），再按 x
+        order = np.lexsort((np.where(valid, x, 0.0), ~valid, self.group))
+
+        g = self.group[order]
+        group_start = np.zeros(self.n_groups, dtype=np.int64)
+        if self.n:
+            first = np.r_[True, g[1:] != g[:-1]]
+            group_start[g[first]] = np.flatnonzero(first)
+        pos = np.arange(self.n) - group_start[g]
+
+        counts = np.bincount(self.group[valid], minlength=self.n_groups)
+        return order, pos, counts, group_start
+
+    def rank(self, x: np.ndarray, *, pct: bool = True) -> np.ndarray:
+        """
+        组内排名（并列取平均名次，与 pandas rank(method="average") 一致）
+
+        pct=True → rank / count（∈ (0, 1]）
+        """
+        x = np.asarray(x, dtype=np.float64)
+        out = np.full(self.n, np.nan)
+        if self.n == 0:
+            return out
+
+        order, pos, counts, _ = self._sorted_within(x)
+        xs = x[order]
+        g = self.group[order]
+        valid = np.isfinite(xs)
+
+        # 并列 run：同组且同值
+        new_run = np.r_[True, (g[1:] != g[:-1]) | (xs[1:] != xs[:-1])]
+        run_id = np.cumsum(new_run) - 1
+        run_first = pos[new_run]
+        run_last = np.r_[pos[np.flatnonzero(new_run)[1:] - 1], pos[-1]]
+        avg = (run_first + run_last) / 2.0 + 1.0
+
+        r = avg[run_id]
+        if pct:
+            r = r / counts[g]
+
+        out[order[valid]] = r[valid]
+        return out
+
+    def quantile(self, x: np.ndarray, q: float) -> np.ndarray:
+        """
+        组内分位数（线性插值，与 np.nanquantile 默认一致），broadcast 到行
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.n == 0:
+            return np.zeros(0)
+
+        order, _, counts, group_start = self._sorted_within(x)
+        xs = x[order]
+
+        h = q * np.maximum(counts - 1, 0)
+        lo = np.floor(h).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(counts - 1, 0))
+        frac = h - lo
+
+        has = counts > 0
+        v_lo = np.where(has, xs[np.where(has, group_start + lo, 0)], np.nan)
+        v_hi = np.where(has, xs[np.where(has, group_start + hi, 0)], np.nan)
+        return self._broadcast(v_lo + (v_hi - v_lo) * frac)
+
+    # ------------------------------------------------------------------
+    def zscore(self, x: np.ndarray) -> np.ndarray:
+        """
+        (x - mean) / std（ddof=0）；组内离散度为 0 → 0.0；缺失 → NaN
+        """
+        x = np.asarray(x, dtype=np.float64)
+        sd = self.std(x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (x - self.mean(x)) / sd
+        z = np.where(sd > 0, z, 0.0)
+        return np.where(np.isfinite(x), z, np.nan)
+
+    def winsorize(self, x: np.ndarray, lower: float = 0.01, upper: float = 0.99) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        lo = self.quantile(x, lower)
+        hi = self.quantile(x, upper)
+        return np.where(np.isfinite(x), np.clip(x, lo, hi), np.nan)
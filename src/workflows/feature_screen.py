@@ -0,0 +1,26 @@
+# src/workflows/feature_screen.py
+from __future__ import annotations
+
+from src.config.app_config import AppConfig
+from src.observability.instrumentation import Instrumentation
+from src.training.feature_screen import FeatureScreenRunner
+from src.utils.path import PathManager
+
+
+def build_feature_screen() -> FeatureScreenRunner:
+    """
+    Feature IC Screening Workflow (OPTIONAL)
+
+    Semantic Order:
+        feature / label stages (per day, read once)
+        → feature × label per-minute rank IC (batched)
+        → process pool across days
+        → reports/feature_ic_summary.csv
+    """
+    cfg = AppConfig.load().training
+
+    return FeatureScreenRunner(
+        pm=PathManager(),
+        inst=Instrumentation(),
+        cfg=cfg,
+    )
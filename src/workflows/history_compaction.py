@@ -0,0 +1,35 @@
+#!filepath: src/workflows/history_compaction.py
+from __future__ import annotations
+
+from src.data_system.pipeline import DataPipeline
+from src.data_system.steps.history_compact_step import HistoryCompactStep
+from src.meta.history_store import HistoryStore
+from src.observability.instrumentation import Instrumentation
+from src.utils.path import PathManager
+
+
+def build_history_compaction() -> DataPipeline:
+    """
+    History Compaction Workflow (OPTIONAL)
+
+    Semantic Order:
+        daily stage outputs (min / feature / label)
+        → HistoryCompact (hive-partitioned long-format store)
+
+    Contract:
+    - Runs per date, after the daily L2 pipeline
+    - Never modifies daily artifacts
+    """
+    pm = PathManager()
+    inst = Instrumentation()
+
+    return DataPipeline(
+        steps=[
+            HistoryCompactStep(
+                store=HistoryStore(pm.history_dir()),
+                inst=inst,
+            ),
+        ],
+        pm=pm,
+        inst=inst,
+    )
@@ -1,6 +1,9 @@
 #!filepath: src/workflows/offline_l2_data.py
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 from src.data_system.pipeline import DataPipeline
 from src.utils.path import PathManager
 from src.config.app_config import AppConfig
@@ -10,20 +13,38 @@ from src.data_system.steps.download_step import DownloadStep
 
 from src.data_system.steps.trade_enrich_step import TradeEnrichStep
 
-from src.data_system.engines.minute_trade_agg_engine import MinuteTradeAggEngine
+from src.data_system.engines.minute_trade_agg_engine import (
+    MinuteTradeAggEngine,
+    SessionGridConfig,
+)
 from src.data_system.steps.minute_trade_agg_step import MinuteTradeAggStep
 
+from src.data_system.engines.bar_build_engine import BarBuildEngine, BarSpec
+from src.data_system.steps.bar_build_step import BarBuildStep
+
 from src.data_system.engines.ftp_download_engine import FtpDownloadEngine
 from src.data_system.engines.trade_enrich_engine import TradeEnrichEngine
 
 from src.data_system.engines.feature_l0_engine import FeatureL0Engine
 from src.data_system.engines.feature_l1_norm_engine import FeatureL1NormEngine
 from src.data_system.engines.feature_l1_stat_engine import FeatureL1StatEngine
+from src.data_system.engines.feature_graph_engine import FeatureGraphEngine, FeatureRegistry
 
 from src.data_system.steps.feature_build_step import FeatureBuildStep
 
+from src.data_system.engines.orderbook_feature_engine import OrderBookFeatureEngine
+from src.data_system.steps.orderbook_feature_step import OrderBookFeatureStep
+
+from src.data_system.engines.cross_sectional_engine import CrossSectionalFeatureEngine
+from src.data_system.steps.cross_sectional_step import CrossSectionalStep
+
 from src.data_system.steps.label_build_step import LabelBuildStep
 from src.data_system.engines.labels.forward_return_label_engine import ForwardReturnLabelEngine
+from src.data_system.engines.labels.multi_horizon_label_engine import MultiHorizonLabelEngine
+from src.data_system.engines.labels.triple_barrier_label_engine import (
+    TripleBarrierLabelConfig,
+    TripleBarrierLabelEngine,
+)
 
 from src.data_system.steps.convert_step import ConvertStep
 
@@ -67,51 +88,150 @@ def build_offline_l2_pipeline() -> DataPipeline:
 
     trade_step = TradeEnrichStep(inst=inst, engine=TradeEnrichEngine())
     #
-    min_trade_step = MinuteTradeAggStep(inst=inst, engine=MinuteTradeAggEngine())
+    grid = (
+        SessionGridConfig(
+            open_auction=cfg.pipeline.open_auction,
+            close_auction=cfg.pipeline.close_auction,
+        )
+        if cfg.pipeline.minute_grid
+        else None
+    )
+    min_trade_step = MinuteTradeAggStep(
+        inst=inst,
+        engine=MinuteTradeAggEngine(grid=grid),
+        multi_symbol=True,
+    )
     #
     # min_order_step = MinuteOrderAggStep(inst=inst)
     #
 
-    feature_step = FeatureBuildStep(
-        l0_engine=FeatureL0Engine(),
-        l1_engines=[
-            FeatureL1StatEngine(window=20),
-            FeatureL1NormEngine(window=20),
-            # FeatureL1StatEngine(window=60),
-            # FeatureL1NormEngine(window=60),
-        ],
-        l2_engine=None,
-        only_feature_columns=True,  # 强烈建议打开，防止覆盖 open/high/low/close
-        inst=inst
+    pipeline_cfg = cfg.pipeline
+
+    # 盘口侧线：与 min 逐行对齐，由 feature 阶段按列并入
+    ob_steps = (
+        [
+            OrderBookFeatureStep(
+                engine=OrderBookFeatureEngine(levels=pipeline_cfg.ob_levels),
+                inst=inst,
+            )
+        ]
+        if pipeline_cfg.orderbook_features
+        else []
     )
+    join_stages = [s.stage for s in ob_steps]
+
+    if pipeline_cfg.feature_columns:
+        # 按需计算：只构建请求 feature 的传递闭包（共享中间量）
+        feature_step = FeatureBuildStep(
+            graph_engine=FeatureGraphEngine(
+                FeatureRegistry.standard(stat_windows=(20,), norm_windows=(20,)),
+                features=pipeline_cfg.feature_columns,
+            ),
+            only_feature_columns=True,
+            batched=pipeline_cfg.feature_batched,
+            cache_columns=pipeline_cfg.feature_cache,
+            join_stages=join_stages,
+            inst=inst,
+        )
+    else:
+        feature_step = FeatureBuildStep(
+            l0_engine=FeatureL0Engine(),
+            l1_engines=[
+                FeatureL1StatEngine(window=20),
+                FeatureL1NormEngine(window=20),
+                # FeatureL1StatEngine(window=60),
+                # FeatureL1NormEngine(window=60),
+            ],
+            l2_engine=None,
+            only_feature_columns=True,  # 强烈建议打开，防止覆盖 open/high/low/close
+            batched=pipeline_cfg.feature_batched,
+            cache_columns=pipeline_cfg.feature_cache,
+            join_stages=join_stages,
+            inst=inst
+        )
 
     # ❗ 注意：steps 是“行位移”，不是分钟
-    pipeline_cfg = cfg.pipeline
 
-    label_engine = ForwardReturnLabelEngine(
-        steps=pipeline_cfg.horizon,
-        price_col=pipeline_cfg.price_col,
-        use_log_return=pipeline_cfg.use_log_return,
-    )
+    if pipeline_cfg.label_kind == "triple_barrier":
+        label_engine = TripleBarrierLabelEngine(
+            TripleBarrierLabelConfig(
+                max_holding=pipeline_cfg.horizon,
+                pt=pipeline_cfg.tb_pt,
+                sl=pipeline_cfg.tb_sl,
+                price_col=pipeline_cfg.price_col,
+            )
+        )
+    elif pipeline_cfg.label_kind == "multi_horizon":
+        label_engine = MultiHorizonLabelEngine(
+            horizons=pipeline_cfg.label_horizons,
+            label_sets=pipeline_cfg.label_sets,
+            price_col=pipeline_cfg.price_col,
+        )
+    elif pipeline_cfg.label_kind == "forward":
+        label_engine = ForwardReturnLabelEngine(
+            steps=pipeline_cfg.horizon,
+            price_col=pipeline_cfg.price_col,
+            use_log_return=pipeline_cfg.use_log_return,
+            cross_day=pipeline_cfg.label_cross_day,
+            overnight=pipeline_cfg.label_overnight,
+        )
+    else:
+        raise ValueError(f"Unknown label_kind: {pipeline_cfg.label_kind}")
 
     label_step = LabelBuildStep(
         engine=label_engine,
+        batched=pipeline_cfg.label_batched,
         inst=inst,
     )
 
+    xs_steps = (
+        [
+            CrossSectionalStep(
+                engine=CrossSectionalFeatureEngine(
+                    columns=pipeline_cfg.xs_columns or None,
+                    ops=pipeline_cfg.xs_ops,
+                    industry=(
+                        json.loads(Path(pipeline_cfg.industry_map).read_text(encoding="utf-8"))
+                        if pipeline_cfg.industry_map
+                        else None
+                    ),
+                ),
+                inst=inst,
+            )
+        ]
+        if pipeline_cfg.xs_ops
+        else []
+    )
+
+    bar_steps = (
+        [
+            BarBuildStep(
+                engine=BarBuildEngine([BarSpec.parse(b) for b in pipeline_cfg.bars]),
+                inst=inst,
+            )
+        ]
+        if pipeline_cfg.bars
+        else []
+    )
+
     steps = [
         download_step,
         extractor_steps,
         # # # 成交主线（稳定、低成本）
         trade_step,
         min_trade_step,
+        # 盘口微观结构（按配置启用，须在 feature 之前）
+        *ob_steps,
         feature_step,
-        label_step
+        # 截面变换（按配置启用）
+        *xs_steps,
+        label_step,
+        # 多分辨率 bar（研究侧线，按配置启用）
+        *bar_steps,
         # 盘口侧线（按需启用）
         # order_step,
         # ordertrade_step,
         # orderbook_rebuild_step,
-        # ob_feature_step,
     ]
 
     return DataPipeline(
@@ -6,8 +6,11 @@ from src.observability.instrumentation import Instrumentation
 from src.utils.path import PathManager
 from src.training.pipeline import TrainingPipeline
 
+from src.training.checkpoint_store import CheckpointStore
+from src.training.dataset_cache import DatasetCache
 from src.training.steps.dataset_build_step import DatasetBuildStep
 from src.training.steps.model_train_step import ModelTrainStep
+from src.training.steps.streaming_model_train_step import StreamingModelTrainStep
 from src.training.steps.model_evaluate_step import ICEvaluateStep
 from src.training.steps.rank_ic_step import RankICStep
 from src.training.engines.ic_evaluate_engine import ICEvaluateEngine
@@ -17,19 +20,49 @@ from src.training.engines.rank_ic_evaluate_engine import RankICEvaluateEngine
 from src.training.steps.artifact_persist_step import ArtifactPersistStep
 
 
-def build_offline_training() -> TrainingPipeline:
+def build_offline_training(*, resume: bool = False) -> TrainingPipeline:
     """
     Offline Training Workflow (FINAL / FROZEN)
     """
 
     cfg = AppConfig.load().training
+    if resume:
+        cfg = cfg.model_copy(update={"resume": True})
     pm = PathManager()
     inst = Instrumentation()
 
+    cache = (
+        DatasetCache(
+            pm.cache_dir() / "dataset",
+            max_bytes=int(cfg.dataset_cache_max_gb * 1024 ** 3),
+        )
+        if cfg.dataset_cache_enabled
+        else None
+    )
+
+    checkpoints = (
+        CheckpointStore(
+            pm.cache_dir() / "checkpoints" / cfg.name,
+            fingerprint=CheckpointStore.fingerprint_of(cfg),
+        )
+        if cfg.snapshot_enabled or cfg.resume
+        else None
+    )
+
     return TrainingPipeline(
         daily_steps=[
-            DatasetBuildStep(pm=pm, inst=inst),
-            ModelTrainStep(cfg),
+            DatasetBuildStep(
+                pm=pm,
+                inst=inst,
+                cache=cache,
+                prefetch_days=cfg.dataset_prefetch_days,
+                train_enabled=not cfg.stream.enabled,
+            ),
+            (
+                StreamingModelTrainStep(cfg, pm=pm, inst=inst)
+                if cfg.stream.enabled
+                else ModelTrainStep(cfg)
+            ),
             ICEvaluateStep(ICEvaluateEngine()),
         ],
         final_steps=[
@@ -40,4 +73,5 @@ def build_offline_training() -> TrainingPipeline:
         pm=pm,
         inst=inst,
         cfg=cfg,
+        checkpoints=checkpoints,
     )
@@ -0,0 +1,26 @@
+# src/workflows/training_sweep.py
+from __future__ import annotations
+
+from src.config.app_config import AppConfig
+from src.observability.instrumentation import Instrumentation
+from src.training.sweep import SweepRunner
+from src.utils.path import PathManager
+
+
+def build_training_sweep() -> SweepRunner:
+    """
+    Training Sweep Workflow (OPTIONAL)
+
+    Semantic Order:
+        training.sweep (param_grid × feature_sets)
+        → per-day dataset materialized once (feature union)
+        → walk-forward per candidate in a process pool
+        → reports/sweep_summary.csv
+    """
+    cfg = AppConfig.load().training
+
+    return SweepRunner(
+        pm=PathManager(),
+        inst=Instrumentation(),
+        cfg=cfg,
+    )
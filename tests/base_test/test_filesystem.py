@@ -111,3 +111,67 @@ def test_remove_directory(tmp_path):
 
     FileSystem.remove(d)
     assert not d.exists()
+
+
+def test_tmp_path_is_unique_and_same_dir(tmp_path):
+    """并发写同一目标：tmp 名唯一、同目录、以 .tmp 结尾"""
+    target = tmp_path / "x.manifest.json"
+
+    a = FileSystem.tmp_path(target)
+    b = FileSystem.tmp_path(target)
+
+    assert a != b
+    assert a.parent == b.parent == tmp_path
+    assert a.suffix == b.suffix == ".tmp"
+    assert FileSystem.clean_temp_files(tmp_path) == 2
+
+
+def test_safe_write_overwrite_leaves_no_tmp(tmp_path):
+    target = tmp_path / "m.json"
+    FileSystem.safe_write(target, b"old")
+    FileSystem.safe_write(target, b"new")
+
+    assert target.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["m.json"]
+
+
+def test_safe_write_mode_follows_umask(tmp_path):
+    """与普通 open() 新建文件权限一致（而非 mkstemp 的 0600）"""
+    plain = tmp_path / "plain.json"
+    plain.write_bytes(b"x")
+    target = tmp_path / "atomic.json"
+    FileSystem.safe_write(target, b"x")
+
+    assert (target.stat().st_mode & 0o777) == (plain.stat().st_mode & 0o777)
+
+
+def test_append_line(tmp_path):
+    journal = tmp_path / "meta" / "_journal.jsonl"
+    FileSystem.append_line(journal, "a")
+    FileSystem.append_line(journal, "b\n")
+
+    assert journal.read_text() == "a\nb\n"
+
+
+def test_lock_is_exclusive_across_threads(tmp_path):
+    import threading
+    import time
+
+    lock_file = tmp_path / ".min.lock"
+    order: list[str] = []
+
+    def worker(name: str):
+        with FileSystem.lock(lock_file):
+            order.append(f"{name}+")
+            time.sleep(0.05)
+            order.append(f"{name}-")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in "ab"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 临界区不交错
+    assert order[0][0] == order[1][0]
+    assert order[2][0] == order[3][0]
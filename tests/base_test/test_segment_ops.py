@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.segment_ops import Segments
+
+
+def frame(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 20, n).astype(float)  # 大量并列
+    x[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({"g": rng.integers(0, 50, n), "h": rng.integers(0, 3, n), "x": x})
+
+
+def test_rank_matches_pandas_average_pct():
+    df = frame()
+    seg = Segments([df["g"].to_numpy()])
+    ref = df.groupby("g")["x"].rank(method="average", pct=True)
+    np.testing.assert_allclose(seg.rank(df["x"].to_numpy()), ref, equal_nan=True)
+
+
+@pytest.mark.parametrize("q", [0.0, 0.05, 0.5, 0.99, 1.0])
+def test_quantile_matches_numpy(q: float):
+    df = frame()
+    seg = Segments([df["g"].to_numpy()])
+    ref = df.groupby("g")["x"].transform(lambda v: np.nanquantile(v, q))
+    np.testing.assert_allclose(seg.quantile(df["x"].to_numpy(), q), ref, equal_nan=True)
+
+
+def test_moments_and_multi_key_demean():
+    df = frame()
+    x = df["x"].to_numpy()
+
+    seg = Segments([df["g"].to_numpy()])
+    np.testing.assert_allclose(seg.mean(x), df.groupby("g")["x"].transform("mean"))
+    np.testing.assert_allclose(
+        seg.std(x), df.groupby("g")["x"].transform(lambda v: v.std(ddof=0))
+    )
+
+    seg2 = Segments([df["g"].to_numpy(), df["h"].to_numpy()])
+    ref = df["x"] - df.groupby(["g", "h"])["x"].transform("mean")
+    np.testing.assert_allclose(seg2.demean(x), ref, equal_nan=True)
+
+
+def test_zscore_degenerate_group_is_zero():
+    seg = Segments([np.array([1, 1, 2, 2, 2])])
+    z = seg.zscore(np.array([3.0, 3.0, 1.0, 2.0, np.nan]))
+    np.testing.assert_allclose(z[:4], [0.0, 0.0, -1.0, 1.0])
+    assert np.isnan(z[4])
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import math
+
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines.orderbook_feature_engine import (
+    OrderBookFeatureEngine,
+    align_to_minutes,
+)
+
+S = 1_000_000
+LOCAL = 8 * 3600 * S          # CN：UTC + 8h
+M0, M1, M2, M3 = (LOCAL + i * 60 * S for i in range(4))
+
+
+def _events() -> pa.Table:
+    rows = [
+        # ts,     event,    oid, side,  price, vol, buy_no, sell_no
+        (1 * S,   "ADD",    1,   "B",   10.0,  100, None, None),
+        (2 * S,   "ADD",    2,   "B",   9.9,   200, None, None),
+        (3 * S,   "ADD",    3,   "S",   10.1,  50,  None, None),
+        (4 * S,   "ADD",    4,   "S",   10.2,  150, None, None),
+        # minute 1：卖方主动成交吃掉 bid1 40，撤掉 ask1，新买单改善 bid
+        (61 * S,  "TRADE",  10,  None,  10.0,  40,  1,    99),
+        (62 * S,  "CANCEL", 3,   "S",   10.1,  50,  None, None),
+        (63 * S,  "ADD",    5,   "B",   10.05, 30,  None, None),
+        # minute 3：卖盘撤空
+        (181 * S, "CANCEL", 4,   "S",   10.2,  150, None, None),
+    ]
+    names = ["ts", "event", "order_id", "side", "price", "volume", "buy_no", "sell_no"]
+    return pa.table(
+        {name: [r[i] for r in rows] for i, name in enumerate(names)},
+        schema=pa.schema(
+            [
+                ("ts", pa.int64()),
+                ("event", pa.string()),
+                ("order_id", pa.int64()),
+                ("side", pa.string()),
+                ("price", pa.float64()),
+                ("volume", pa.int64()),
+                ("buy_no", pa.int64()),
+                ("sell_no", pa.int64()),
+            ]
+        ),
+    )
+
+
+def test_orderbook_features_per_minute_snapshot_and_flows():
+    out = OrderBookFeatureEngine(levels=(1, 5)).execute(_events())
+    rows = out.to_pylist()
+
+    assert out["ts"].to_pylist() == [M0, M1, M3]
+
+    m0, m1, m3 = rows
+    assert m0["ob_spread"] == pytest.approx(0.1)
+    assert m0["ob_microprice"] == pytest.approx((10.0 * 50 + 10.1 * 100) / 150)
+    assert m0["ob_depth_imb_1"] == pytest.approx((100 - 50) / 150)
+    assert m0["ob_depth_imb_5"] == pytest.approx((300 - 200) / 500)
+    assert m0["ob_cancel_ratio"] == 0.0
+
+    # OFI：bid 量 -40，ask1 撤空后上移 +50，bid 改善 +30
+    assert m1["ob_ofi"] == pytest.approx(40.0)
+    assert m1["ob_spread"] == pytest.approx(0.15)
+    assert m1["ob_cancel_ratio"] == pytest.approx(50 / 30)
+    # 分钟初最优档深度 100 + 50，被消耗 40 + 50
+    assert m1["ob_queue_depletion"] == pytest.approx(90 / 150)
+
+    # 卖盘为空：价差类为 null，深度失衡退化为 1
+    assert m3["ob_spread"] is None
+    assert m3["ob_microprice"] is None
+    assert m3["ob_depth_imb_1"] == 1.0
+
+
+def test_orderbook_features_independent_of_input_order():
+    engine = OrderBookFeatureEngine()
+    events = _events()
+    shuffled = events.take(pa.array([7, 4, 0, 6, 2, 5, 1, 3]))
+
+    assert engine.execute(shuffled).equals(engine.execute(events))
+
+
+def test_orderbook_features_align_to_minutes_carries_book_state():
+    feats = OrderBookFeatureEngine().execute(_events())
+    before = M0 - 60 * 1_000_000
+    aligned = align_to_minutes(feats, pa.array([before, M0, M1, M2, M3], pa.int64()))
+
+    assert aligned["ts"].to_pylist() == [before, M0, M1, M2, M3]
+    # 首个事件分钟之前：盘口未知 → null
+    assert aligned["ob_spread"][0].as_py() is None and aligned["ob_ofi"][0].as_py() is None
+
+    # M2 无事件：盘口状态沿用 M1 快照，流量类为 0
+    spread = aligned["ob_spread"].to_pylist()
+    assert math.isclose(spread[2], 0.15) and math.isclose(spread[3], 0.15)
+    assert aligned["ob_depth_imb_1"][3].as_py() == aligned["ob_depth_imb_1"][2].as_py()
+    assert aligned["ob_ofi"][3].as_py() == 0.0
+    assert aligned["ob_queue_depletion"][3].as_py() == 0.0
+
+    # M3 有事件但卖盘为空：null 保留，不被前值覆盖
+    assert spread[4] is None
+
+
+def test_orderbook_features_empty_stream():
+    engine = OrderBookFeatureEngine()
+    out = engine.execute(_events().slice(0, 0))
+
+    assert out.num_rows == 0
+    assert out.column_names == ["ts", *engine.feature_names()]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from src.data_system.engines.bar_build_engine import BarBuildEngine, BarSpec
+from src.data_system.engines.minute_trade_agg_engine import MinuteTradeAggEngine
+
+
+# -----------------------------------------------------------------------------
+# helpers
+# -----------------------------------------------------------------------------
+# 2025-12-01 09:30:00 CST == 01:30:00 UTC
+T0 = 1764552600 * 1_000_000
+
+
+def make_trades(n: int = 2000, seed: int = 7) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    # ~3 小时内随机成交，ts 升序（含同 ts）
+    ts = T0 + np.sort(rng.integers(0, 3 * 3600 * 1_000_000, n))
+    price = 10 + np.cumsum(rng.normal(0, 0.01, n))
+    volume = rng.integers(1, 50, n) * 100
+    return pa.table(
+        {
+            "ts": pa.array(ts, pa.int64()),
+            "price": price,
+            "volume": pa.array(volume, pa.int64()),
+            "notional": price * volume,
+        }
+    )
+
+
+# -----------------------------------------------------------------------------
+# spec
+# -----------------------------------------------------------------------------
+def test_bar_spec_parse_and_label():
+    assert BarSpec.parse("5s") == BarSpec("time", 5)
+    assert BarSpec.parse("5m") == BarSpec("time", 300)
+    assert BarSpec.parse("5m").label == "5m"
+    assert BarSpec.parse("90s").label == "90s"
+    assert BarSpec.parse("vol:100000").label == "vol100000"
+    assert BarSpec.parse("dollar:1e7").label == "dollar10000000"
+    assert BarSpec("time", 60, name="one").label == "one"
+
+    with pytest.raises(ValueError):
+        BarSpec.parse("5x")
+    with pytest.raises(ValueError):
+        BarSpec("tick", 1)
+    with pytest.raises(ValueError):
+        BarBuildEngine([BarSpec.parse("60s"), BarSpec.parse("1m")])
+
+
+# -----------------------------------------------------------------------------
+# time bars
+# -----------------------------------------------------------------------------
+def test_one_minute_bar_matches_minute_engine():
+    trades = make_trades()
+
+    bars = BarBuildEngine([BarSpec.parse("1m")]).execute(trades)["1m"]
+    minute = MinuteTradeAggEngine().execute(trades)
+
+    assert bars.column_names == minute.column_names
+    for col in ("ts", "trade_date", "minute", "minute_str", "open", "high",
+                "low", "close", "volume", "trade_count"):
+        assert bars[col].to_pylist() == minute[col].to_pylist(), col
+    np.testing.assert_allclose(
+        bars["notional"].to_numpy(), minute["notional"].to_numpy(), rtol=1e-9
+    )
+
+
+def test_rollup_matches_direct_build():
+    trades = make_trades()
+
+    rolled = BarBuildEngine(
+        [BarSpec.parse("5s"), BarSpec.parse("30s"), BarSpec.parse("5m")]
+    ).execute(trades)
+    direct = BarBuildEngine([BarSpec.parse("5m")]).execute(trades)
+
+    assert list(rolled) == ["5s", "30s", "5m"]
+    a, b = rolled["5m"], direct["5m"]
+    for col in ("ts", "open", "high", "low", "close", "volume", "trade_count"):
+        assert a[col].to_pylist() == b[col].to_pylist(), col
+
+    # 5m bucket 对齐本地钟面
+    assert all(m % 5 == 0 for m in a["minute"].to_pylist())
+    assert pc.sum(rolled["5s"]["volume"]).as_py() == pc.sum(trades["volume"]).as_py()
+
+
+# -----------------------------------------------------------------------------
+# information bars
+# -----------------------------------------------------------------------------
+def test_volume_bars_close_on_threshold():
+    trades = pa.table(
+        {
+            "ts": pa.array([T0 + i for i in range(6)], pa.int64()),
+            "price": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "volume": pa.array([40, 40, 40, 40, 150, 10], pa.int64()),
+            "notional": [40.0, 80.0, 120.0, 160.0, 750.0, 60.0],
+        }
+    )
+
+    bars = BarBuildEngine([BarSpec("volume", 100)]).execute(trades)["vol100"]
+
+    # 累计前量: 0,40,80 | 120,160 | 310 → 跨阈值那笔归入当前 bar
+    assert bars["volume"].to_pylist() == [120, 190, 10]
+    assert bars["open"].to_pylist() == [1.0, 4.0, 6.0]
+    assert bars["close"].to_pylist() == [3.0, 5.0, 6.0]
+    assert bars["ts"][1].as_py() < bars["ts_close"][1].as_py()
+
+
+def test_dollar_bars_cover_all_trades():
+    trades = make_trades()
+    size = float(pc.sum(trades["notional"]).as_py()) / 50
+
+    bars = BarBuildEngine([BarSpec("dollar", size)]).execute(trades)
+    (t,) = bars.values()
+
+    assert 45 <= t.num_rows <= 55
+    assert pc.sum(t["trade_count"]).as_py() == trades.num_rows
+    assert "ts_close" in t.column_names
+
+
+def test_empty_and_unsorted_input():
+    engine = BarBuildEngine([BarSpec.parse("5s"), BarSpec.parse("vol:100")])
+
+    out = engine.execute(make_trades().slice(0, 0))
+    assert [t.num_rows for t in out.values()] == [0, 0]
+    assert "ts_close" in out["vol100"].column_names
+
+    with pytest.raises(ValueError):
+        engine.execute(make_trades().take(pa.array([1, 0])))
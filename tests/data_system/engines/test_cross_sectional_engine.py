@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines.cross_sectional_engine import CrossSectionalFeatureEngine
+
+
+def feature_table(seed: int = 0) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    symbols = ["A", "B", "C", "D", "E"]
+    n_min = 30
+    rows = {
+        "symbol": np.repeat(symbols, n_min),
+        "ts": np.tile(np.arange(n_min) * 60_000_000, len(symbols)),
+        "l0_x": rng.standard_normal(len(symbols) * n_min),
+        "close": rng.standard_normal(len(symbols) * n_min),
+    }
+    rows["l0_x"][7] = np.nan
+    return pa.table(rows)
+
+
+def test_cross_sectional_matches_pandas_groupby():
+    table = feature_table()
+    industry = {"A": "bank", "B": "bank", "C": "tech", "D": "tech"}  # E → unknown
+    eng = CrossSectionalFeatureEngine(
+        ops=("rank", "zscore", "winsor", "neutral"),
+        winsor=(0.1, 0.9),
+        industry=industry,
+    )
+    out = eng.execute(table)
+
+    assert out.num_rows == table.num_rows
+    assert out["symbol"].equals(table["symbol"])
+    assert out.column_names == [
+        "symbol", "ts", "xs_rank_l0_x", "xs_z_l0_x", "xs_win_l0_x", "xs_neu_l0_x",
+    ]  # close 不是 feature 列
+
+    df = table.to_pandas()
+    g = df.groupby("ts")["l0_x"]
+    ind = df["symbol"].map(industry).fillna("?")
+
+    ref_rank = g.rank(pct=True)
+    ref_z = (df["l0_x"] - g.transform("mean")) / g.transform(lambda v: v.std(ddof=0))
+    lo = g.transform(lambda v: np.nanquantile(v, 0.1))
+    hi = g.transform(lambda v: np.nanquantile(v, 0.9))
+    ref_win = df["l0_x"].clip(lo, hi)
+    ref_neu = df["l0_x"] - df.groupby(["ts", ind])["l0_x"].transform("mean")
+
+    for name, ref in (
+        ("xs_rank_l0_x", ref_rank),
+        ("xs_z_l0_x", ref_z),
+        ("xs_win_l0_x", ref_win),
+        ("xs_neu_l0_x", ref_neu),
+    ):
+        got = out[name].to_numpy(zero_copy_only=False)
+        np.testing.assert_allclose(got, ref.to_numpy(), rtol=1e-12, atol=1e-12, equal_nan=True, err_msg=name)
+
+    # 缺失输入 → null
+    assert out["xs_rank_l0_x"][7].as_py() is None
+
+
+def test_cross_sectional_rejects_neutral_without_industry():
+    with pytest.raises(ValueError):
+        CrossSectionalFeatureEngine(ops=("neutral",))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines.feature_graph_engine import (
+    FeatureGraphEngine,
+    FeatureRegistry,
+)
+from src.data_system.engines.feature_l0_engine import FeatureL0Engine
+from src.data_system.engines.feature_l1_norm_engine import FeatureL1NormEngine
+from src.data_system.engines.feature_l1_stat_engine import FeatureL1StatEngine
+
+
+def minute_table(n: int = 200, seed: int = 0) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    close = 10.0 + rng.standard_normal(n).cumsum() * 0.1
+    return pa.table(
+        {
+            "open": close + rng.normal(0, 0.05, n),
+            "high": close + rng.uniform(0.01, 0.2, n),
+            "low": close - rng.uniform(0.01, 0.2, n),
+            "close": close,
+            "volume": rng.integers(0, 1000, n),
+            "trade_count": rng.integers(0, 30, n),
+            "buy_volume": rng.integers(0, 500, n),
+            "sell_volume": rng.integers(0, 500, n),
+        }
+    )
+
+
+def legacy(table: pa.Table, w: int) -> pa.Table:
+    out = FeatureL0Engine().execute(table)
+    out = FeatureL1StatEngine(window=w).execute(out)
+    return FeatureL1NormEngine(window=w).execute(out)
+
+
+def test_standard_graph_matches_legacy_engines():
+    table = minute_table()
+    ref = legacy(table, 5)
+
+    reg = FeatureRegistry.standard(stat_windows=(5,), norm_windows=(5,))
+    out = FeatureGraphEngine(reg).execute(table)
+
+    produced = [c for c in out.column_names if c not in table.column_names]
+    assert produced
+    assert set(produced) <= set(ref.column_names)
+    for name in produced:
+        np.testing.assert_allclose(
+            out[name].to_numpy(), ref[name].to_numpy(), rtol=1e-9, atol=1e-12,
+            err_msg=name,
+        )
+
+
+def test_standard_graph_full_column_parity_with_legacy_chain():
+    table = minute_table()
+    # 非数值列不参与 z-score；数值原始列（含 ts）与 L1Norm 相同规则
+    table = table.append_column("symbol", pa.array(["X"] * table.num_rows))
+    table = table.append_column("ts", pa.array(range(table.num_rows), pa.int64()))
+    ref = legacy(table, 5)
+
+    reg = FeatureRegistry.standard(stat_windows=(5,), norm_windows=(5,))
+    out = FeatureGraphEngine(reg).execute(table)
+
+    assert set(out.column_names) == set(ref.column_names)
+    assert "l1_z_w5_volume" in out.column_names and "l1_z_w5_symbol" not in out.column_names
+    for name in ref.column_names:
+        if name == "symbol":
+            continue
+        np.testing.assert_allclose(
+            out[name].to_numpy(), ref[name].to_numpy(), rtol=1e-9, atol=1e-12,
+            err_msg=name,
+        )
+
+    # raw rule 只在 plan 时展开，不改变注册表 / spec
+    assert "l1_z_w5_volume" not in reg.features()
+
+
+def test_explicit_request_for_raw_column_zscore():
+    table = minute_table()
+    ref = legacy(table, 20)
+
+    out = FeatureGraphEngine(features=["l1_z_w20_volume"]).execute(table)
+
+    assert out.column_names == [*table.column_names, "l1_z_w20_volume"]
+    np.testing.assert_allclose(out["l1_z_w20_volume"].to_numpy(), ref["l1_z_w20_volume"].to_numpy())
+
+
+def test_plan_prunes_to_requested_closure():
+    reg = FeatureRegistry.standard(stat_windows=(20,), norm_windows=(20,))
+    cols = minute_table().column_names
+
+    plan = reg.plan(["l1_z_w20_l1_std_w20_abs_move", "close"], available=cols)
+
+    assert plan.outputs == ("l1_z_w20_l1_std_w20_abs_move",)
+    assert set(plan.raw) == {"close", "open"}
+    assert [n.name for n in plan.steps] == [
+        "l0_abs_move",
+        "_moments:l0_abs_move",
+        "l1_std_w20_abs_move",
+        "_moments:l1_std_w20_abs_move",
+        "l1_z_w20_l1_std_w20_abs_move",
+    ]
+
+
+def test_shared_intermediates_computed_once():
+    reg = FeatureRegistry.standard(stat_windows=(20,), norm_windows=(20,))
+    cols = minute_table().column_names
+
+    plan = reg.plan(
+        ["l1_ratio_w20_range", "l1_z_w20_l0_range", "l0_range"],
+        available=cols,
+    )
+    names = [n.name for n in plan.steps]
+
+    assert len(names) == len(set(names))
+    assert names.count("_moments:l0_range") == 1
+    assert names.index("l0_range") < names.index("_moments:l0_range")
+
+
+def test_explicit_request_with_missing_input_raises():
+    reg = FeatureRegistry.standard()
+    cols = [c for c in minute_table().column_names if c != "buy_volume"]
+
+    with pytest.raises(KeyError):
+        reg.plan(["l0_imbalance"], available=cols)
+
+    # 全量模式：缺原始列的 feature 静默跳过
+    plan = reg.plan(None, available=cols)
+    assert "l0_imbalance" not in plan.outputs
+    assert "l0_range" in plan.outputs
+
+
+def test_graph_engine_segmented_matches_per_segment():
+    parts = [minute_table(n, seed=i) for i, n in enumerate((30, 4, 50))]
+    starts = np.r_[0, np.cumsum([p.num_rows for p in parts])[:-1]]
+
+    eng = FeatureGraphEngine(FeatureRegistry.standard(stat_windows=(5,), norm_windows=(5,)))
+    batched = eng.execute(pa.concat_tables(parts), segment_starts=starts)
+    ref = pa.concat_tables([eng.execute(p) for p in parts])
+
+    for name in ref.column_names:
+        np.testing.assert_allclose(
+            batched[name].to_numpy(), ref[name].to_numpy(), rtol=1e-7, atol=1e-9,
+            err_msg=name,
+        )
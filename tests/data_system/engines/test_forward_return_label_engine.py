@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines.labels.forward_return_label_engine import (
+    ForwardReturnLabelEngine,
+    NextSession,
+)
+
+
+def _table(close):
+    n = len(close)
+    return pa.table({"symbol": ["X"] * n, "ts": pa.array(np.arange(n), pa.int64()), "close": close})
+
+
+def _next(open_, close):
+    return pa.table({"open": open_, "close": close})
+
+
+def test_cross_day_include_overnight_gap():
+    engine = ForwardReturnLabelEngine(steps=2, cross_day=True)
+    out = engine.execute(
+        _table([10.0, 11.0, 12.0]),
+        next_session=NextSession.from_tables([_next([13.0, 14.0], [13.5, 15.0])]),
+    )
+
+    assert engine.label_columns() == ("label_fwd_ret_s2_xday",)
+    # t0 当日内；t1 → 次日第 0 行；t2 → 次日第 1 行
+    assert out["label_fwd_ret_s2_xday"].to_pylist() == pytest.approx(
+        [12.0 / 10 - 1, 13.5 / 11 - 1, 15.0 / 12 - 1]
+    )
+
+
+def test_cross_day_exclude_overnight_gap():
+    engine = ForwardReturnLabelEngine(steps=2, cross_day=True, overnight="exclude", use_log_return=True)
+    out = engine.execute(
+        _table([10.0, 11.0, 12.0]),
+        next_session=NextSession.from_tables([_next([13.0, 14.0], [13.5, 15.0])]),
+    )
+
+    # 当日收盘 12 → 次日开盘 13 的跳空被剔除
+    expected = [np.log(1.2), np.log(12 / 11 * 13.5 / 13), np.log(15.0 / 13)]
+    assert out["label_fwd_logret_s2_xday_nogap"].to_pylist() == pytest.approx(expected)
+
+
+def test_cross_day_batched_segments_and_missing_next_day():
+    engine = ForwardReturnLabelEngine(steps=1, cross_day=True)
+    nxt = NextSession.from_tables([_next([21.0], [22.0]), None])
+    out = engine.execute(
+        _table([10.0, 20.0, 30.0, 40.0]),
+        segment_starts=np.array([0, 2]),
+        next_session=nxt,
+    )
+
+    # 第二段次日无数据（停牌）→ 尾部仍为 null
+    assert out[engine.label_columns()[0]].to_pylist() == pytest.approx([1.0, 0.1, 1 / 3, None])
+
+
+def test_without_next_session_tail_stays_null():
+    engine = ForwardReturnLabelEngine(steps=2, cross_day=True)
+    out = engine.execute(_table([10.0, 11.0, 12.0]))
+    assert out[engine.label_columns()[0]].to_pylist()[1:] == [None, None]
@@ -6,7 +6,10 @@ import pyarrow as pa
 import pyarrow.compute as pc
 import pytest
 
-from src.data_system.engines.minute_trade_agg_engine import MinuteTradeAggEngine
+from src.data_system.engines.minute_trade_agg_engine import (
+    MinuteTradeAggEngine,
+    SessionGridConfig,
+)
 
 
 # -----------------------------------------------------------------------------
@@ -397,3 +400,156 @@ def test_minute_trade_agg_same_minute_different_symbols_isolated():
 
     assert out_a["open"].to_pylist() == [10.0]
     assert out_b["open"].to_pylist() == [20.0]
+
+
+# -----------------------------------------------------------------------------
+# multi-symbol（全交易所一次聚合）
+# -----------------------------------------------------------------------------
+def _exchange_table() -> pa.Table:
+    base = us(datetime(2025, 12, 1, 1, 29, 30, tzinfo=timezone.utc))  # 09:29:30 CST
+    rows = []
+    for symbol, offsets in (
+            ("000001", [0, 20, 40, 95]),
+            ("600000", [10, 70, 71, 3 * 3600]),
+    ):
+        for i, sec in enumerate(offsets):
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "ts": base + sec * 1_000_000,
+                    "price": 10.0 + i,
+                    "volume": 100 * (i + 1),
+                    "notional": 1000.0 * (i + 1),
+                }
+            )
+    return table_from_rows(rows)
+
+
+def test_minute_trade_agg_execute_many_matches_per_symbol():
+    engine = MinuteTradeAggEngine()
+    table = _exchange_table()
+
+    expected = []
+    for symbol in ("000001", "600000"):
+        sub = table.filter(pc.equal(table["symbol"], symbol))
+        out = engine.execute(sub)
+        expected.append(
+            out.append_column("symbol", pa.array([symbol] * out.num_rows))
+        )
+    expected = pa.concat_tables(expected)
+
+    got = engine.execute_many(table)
+
+    assert got.schema == expected.schema
+    assert got.to_pydict() == expected.to_pydict()
+    assert got["minute_str"].to_pylist()[:2] == ["09:29", "09:30"]
+    assert set(got["trade_date"].to_pylist()) == {20251201}
+
+
+def test_minute_trade_agg_execute_many_requires_ts_sorted_within_symbol():
+    engine = MinuteTradeAggEngine()
+    table = _exchange_table()
+    shuffled = table.take(pa.array([1, 0, 2, 3, 4, 5, 6, 7]))
+
+    with pytest.raises(ValueError):
+        engine.execute_many(shuffled)
+
+
+# -----------------------------------------------------------------------------
+# session grid
+# -----------------------------------------------------------------------------
+def _cst(h: int, m: int, s: int = 0) -> int:
+    return us(datetime(2025, 12, 1, h - 8, m, s, tzinfo=timezone.utc))
+
+
+def _grid_trades() -> pa.Table:
+    return table_from_rows(
+        [
+            {"symbol": "A", "ts": _cst(9, 25), "price": 10.0, "volume": 1, "notional": 10.0},
+            {"symbol": "A", "ts": _cst(9, 31, 5), "price": 11.0, "volume": 2, "notional": 22.0},
+            {"symbol": "A", "ts": _cst(11, 30), "price": 12.0, "volume": 3, "notional": 36.0},
+            {"symbol": "A", "ts": _cst(15, 0), "price": 13.0, "volume": 4, "notional": 52.0},
+            {"symbol": "A", "ts": _cst(15, 10), "price": 13.0, "volume": 9, "notional": 117.0},
+            {"symbol": "B", "ts": _cst(9, 35), "price": 5.0, "volume": 5, "notional": 25.0},
+        ]
+    )
+
+
+def test_session_grid_aligned_across_symbols():
+    engine = MinuteTradeAggEngine(grid=SessionGridConfig())
+    out = engine.execute_many(_grid_trades())
+
+    assert out.num_rows == 2 * 240
+    a = out.slice(0, 240)
+    b = out.slice(240, 240)
+
+    assert a["ts"].to_pylist() == b["ts"].to_pylist()
+    assert a["minute_str"][0].as_py() == "09:30"
+    assert a["minute_str"][119].as_py() == "11:29"
+    assert a["minute_str"][120].as_py() == "13:00"
+    assert a["minute_str"][239].as_py() == "14:59"
+    assert set(b["symbol"].to_pylist()) == {"B"}
+
+    # 盘后成交丢弃
+    assert pc.sum(out["volume"]).as_py() == 1 + 2 + 3 + 4 + 5
+
+
+def test_session_grid_fold_auctions_and_lunch_close():
+    out = MinuteTradeAggEngine(grid=SessionGridConfig()).execute_many(_grid_trades())
+    a = out.slice(0, 240)
+
+    # 开盘竞价并入 09:30
+    assert a["volume"][0].as_py() == 1
+    # 11:30:00 成交并入 11:29
+    assert a["volume"][119].as_py() == 3
+    assert a["close"][119].as_py() == 12.0
+    # 收盘竞价并入 14:59
+    assert a["volume"][239].as_py() == 4
+    assert a["close"][239].as_py() == 13.0
+
+
+def test_session_grid_auction_bars():
+    grid = SessionGridConfig(open_auction="bar", close_auction="bar")
+    out = MinuteTradeAggEngine(grid=grid).execute_many(_grid_trades())
+    a = out.slice(0, 242)
+
+    assert out.num_rows == 2 * 242
+    assert a["minute_str"][0].as_py() == "09:25"
+    assert a["minute_str"][241].as_py() == "15:00"
+    assert a["volume"][0].as_py() == 1
+    assert a["volume"][1].as_py() == 0
+    assert a["volume"][241].as_py() == 4
+
+
+def test_session_grid_forward_fill():
+    out = MinuteTradeAggEngine(grid=SessionGridConfig(open_auction="drop")).execute_many(
+        _grid_trades()
+    )
+    a = out.slice(0, 240)
+    b = out.slice(240, 240)
+
+    # 首笔成交前：null
+    assert a["close"][0].as_py() is None
+    assert b["close"].to_pylist()[:5] == [None] * 5
+
+    # 无成交 minute：close 前向填充，O/H/L = 前一 close，量为 0
+    row = a.slice(2, 1).to_pylist()[0]
+    assert (row["open"], row["high"], row["low"], row["close"]) == (11.0,) * 4
+    assert (row["volume"], row["notional"], row["trade_count"]) == (0, 0.0, 0)
+    assert b["close"][239].as_py() == 5.0
+
+
+def test_session_grid_single_symbol_execute():
+    table = _grid_trades()
+    sub = table.filter(pc.equal(table["symbol"], "B"))
+
+    out = MinuteTradeAggEngine(grid=SessionGridConfig()).execute(sub)
+
+    assert out.num_rows == 240
+    assert "symbol" not in out.column_names
+    assert out["trade_count"][5].as_py() == 1
+
+
+def test_session_grid_rejects_unknown_auction_mode():
+    with pytest.raises(ValueError):
+        SessionGridConfig(open_auction="merge")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines.labels.forward_return_label_engine import ForwardReturnLabelEngine
+from src.data_system.engines.labels.multi_horizon_label_engine import MultiHorizonLabelEngine
+
+
+def _table(price):
+    n = len(price)
+    return pa.table({"symbol": ["X"] * n, "ts": pa.array(np.arange(n), pa.int64()), "close": price})
+
+
+def _reference(price: np.ndarray, h: int) -> dict:
+    s = pd.Series(price)
+    fwd = s.shift(-h)
+    path_max = s[::-1].rolling(h).max()[::-1].shift(-1)
+    path_min = s[::-1].rolling(h).min()[::-1].shift(-1)
+    r2 = np.log(s).diff() ** 2
+    rv = np.sqrt(r2[::-1].rolling(h).sum()[::-1].shift(-1))
+    return {
+        f"label_fwd_ret_s{h}": fwd / s - 1,
+        f"label_fwd_logret_s{h}": np.log(fwd) - np.log(s),
+        f"label_mfe_s{h}": path_max / s - 1,
+        f"label_mae_s{h}": path_min / s - 1,
+        f"label_rvol_s{h}": rv,
+    }
+
+
+def test_multi_horizon_matches_pandas_reference():
+    rng = np.random.default_rng(0)
+    price = 10.0 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))
+    engine = MultiHorizonLabelEngine(horizons=[10, 1, 5], label_sets=["mae", "ret", "rvol", "logret", "mfe"])
+
+    out = engine.execute(_table(price))
+
+    assert list(engine.label_columns()) == out.column_names[3:]
+    for h in (1, 5, 10):
+        for name, ref in _reference(price, h).items():
+            got = out[name].to_numpy(zero_copy_only=False).astype(float)
+            np.testing.assert_allclose(got, ref.to_numpy(), rtol=1e-10, err_msg=name)
+
+
+def test_multi_horizon_ret_equals_forward_return_engine():
+    price = [10.0, 10.2, 10.1, 10.5, 10.4, 10.6]
+    multi = MultiHorizonLabelEngine(horizons=[2]).execute(_table(price))
+    single = ForwardReturnLabelEngine(steps=2).execute(_table(price))
+
+    assert multi["label_fwd_ret_s2"].to_pylist() == pytest.approx(
+        single["label_fwd_ret_s2"].to_pylist(), nan_ok=True
+    )
+
+
+def test_multi_horizon_segments_match_per_symbol():
+    rng = np.random.default_rng(1)
+    price = 10.0 * np.exp(np.cumsum(rng.normal(0, 0.01, 90)))
+    starts = np.array([0, 30, 33])
+    engine = MultiHorizonLabelEngine(horizons=[1, 4], label_sets=list(("ret", "mfe", "mae", "rvol")))
+
+    batched = engine.execute(_table(price), segment_starts=starts)
+    parts = [engine.execute(_table(price[a:b])) for a, b in zip(starts, [30, 33, 90])]
+
+    for name in engine.label_columns():
+        ref = np.concatenate([p[name].to_numpy(zero_copy_only=False).astype(float) for p in parts])
+        np.testing.assert_array_equal(batched[name].to_numpy(zero_copy_only=False).astype(float), ref)
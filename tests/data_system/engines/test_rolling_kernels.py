@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines import rolling_kernels as rk
+from src.data_system.engines.feature_l1_norm_engine import FeatureL1NormEngine
+from src.data_system.engines.feature_l1_stat_engine import FeatureL1StatEngine
+
+
+# -----------------------------------------------------------------------------
+# helpers
+# -----------------------------------------------------------------------------
+def series(n: int = 500, seed: int = 0, nan_at=(37, 38, 200)) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    x = rng.lognormal(8, 1, n)
+    x[100:130] = 42.0  # 常数段：std 必须精确为 0
+    for i in nan_at:
+        x[i] = np.nan
+    return x
+
+
+def hist(x: np.ndarray, w: int) -> pd.core.window.Rolling:
+    return pd.Series(x).shift(1).rolling(w, min_periods=w)
+
+
+# -----------------------------------------------------------------------------
+# kernels vs pandas
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize("w", [1, 2, 5, 20, 60])
+def test_moments_match_pandas(w: int):
+    x = series()
+    m = rk.RollingMoments(x)
+
+    np.testing.assert_allclose(m.mean(w), hist(x, w).mean(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(m.sum(w), hist(x, w).sum(), rtol=1e-9, equal_nan=True)
+
+    ref_std = hist(x, w).std().to_numpy()
+    np.testing.assert_allclose(m.std(w), ref_std, rtol=1e-7, atol=1e-9, equal_nan=True)
+
+    # 常数窗口：精确 0（与 pandas 一致）
+    assert np.array_equal(m.std(w) == 0, ref_std == 0)
+
+
+@pytest.mark.parametrize("w", [1, 3, 20, 64])
+def test_min_max_match_pandas(w: int):
+    x = series(n=301)
+    np.testing.assert_array_equal(rk.rolling_max(x, w), hist(x, w).max().to_numpy())
+    np.testing.assert_array_equal(rk.rolling_min(x, w), hist(x, w).min().to_numpy())
+
+
+def test_ewma_matches_pandas():
+    x = series(nan_at=())
+    ref = pd.Series(x).ewm(span=10, adjust=False).mean().shift(1)
+    np.testing.assert_allclose(rk.ewma(x, span=10), ref, rtol=1e-12, equal_nan=True)
+
+    x[[5, 6, 50]] = np.nan
+    ref = pd.Series(x).ewm(alpha=0.2, adjust=False, ignore_na=True).mean().ffill().shift(1)
+    np.testing.assert_allclose(rk.ewma(x, alpha=0.2), ref, rtol=1e-12, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        rk.ewma(x)
+
+
+def test_kernels_are_strictly_causal():
+    x = series(nan_at=())
+    y = x.copy()
+    y[300:] *= 10  # 改变未来
+
+    m, mm = rk.RollingMoments(x), rk.RollingMoments(y)
+    for a, b in (
+            (m.mean(20), mm.mean(20)),
+            (m.std(20), mm.std(20)),
+            (rk.rolling_max(x, 20), rk.rolling_max(y, 20)),
+            (rk.ewma(x, span=5), rk.ewma(y, span=5)),
+    ):
+        np.testing.assert_allclose(a[:301], b[:301], rtol=1e-9, equal_nan=True)
+
+
+# -----------------------------------------------------------------------------
+# engines vs frozen pandas definitions
+# -----------------------------------------------------------------------------
+def _pandas_l1_stat(df: pd.DataFrame, w: int) -> pd.DataFrame:
+    df = df.copy()
+    tag = f"w{w}"
+    roll = lambda c: df[c].shift(1).rolling(w, min_periods=w)
+    df[f"l1_mean_{tag}_volume"] = roll("l0_volume").mean().fillna(0.0)
+    df[f"l1_sum_{tag}_trade_count"] = roll("l0_trade_count").sum().fillna(0.0)
+    df[f"l1_std_{tag}_abs_move"] = roll("l0_abs_move").std().fillna(0.0)
+    ret = (df["close"] / df["close"].shift(1)).apply(
+        lambda x: math.log(x) if x > 0 else 0.0
+    )
+    df[f"l1_ret_{tag}_1"] = ret.fillna(0.0)
+    for c, name in (("l0_volume", "volume"), ("l0_range", "range")):
+        r = df[c] / roll(c).mean()
+        df[f"l1_ratio_{tag}_{name}"] = r.replace([math.inf, -math.inf], 0.0).fillna(0.0)
+    return df
+
+
+def _pandas_l1_norm(df: pd.DataFrame, w: int) -> pd.DataFrame:
+    df = df.copy()
+    cols = [
+        c for c in df.columns
+        if not c.startswith("l1_z_") and pd.api.types.is_numeric_dtype(df[c])
+    ]
+    for c in cols:
+        h = df[c].shift(1).rolling(w, min_periods=w)
+        std = h.std()
+        z = (df[c] - h.mean()) / std
+        df[f"l1_z_w{w}_{c}"] = z.fillna(0.0).where(std != 0, 0.0)
+    return df
+
+
+def _l0_table(n: int = 400, seed: int = 1) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    close = 10 + np.cumsum(rng.normal(0, 0.02, n))
+    close[50] = 0.0
+    volume = rng.integers(0, 5000, n).astype(float)
+    volume[60:90] = 0.0
+    return pa.table(
+        {
+            "ts": pa.array(np.arange(n) * 60_000_000, pa.int64()),
+            "minute_str": ["09:30"] * n,
+            "close": close,
+            "l0_volume": volume,
+            "l0_trade_count": pa.array(rng.integers(0, 30, n), pa.int64()),
+            "l0_abs_move": np.abs(rng.normal(0, 0.01, n)),
+            "l0_range": np.abs(rng.normal(0, 0.02, n)),
+            "flag": rng.integers(0, 2, n).astype(bool),
+        }
+    )
+
+
+@pytest.mark.parametrize("w", [5, 20])
+def test_l1_stat_engine_matches_pandas(w: int):
+    table = _l0_table()
+    ref = _pandas_l1_stat(table.to_pandas(), w)
+
+    out = FeatureL1StatEngine(window=w).execute(table)
+
+    assert out.column_names == list(ref.columns)
+    for c in ref.columns:
+        if c.startswith("l1_"):
+            np.testing.assert_allclose(
+                out[c].to_numpy(), ref[c].to_numpy(), rtol=1e-8, atol=1e-10, err_msg=c
+            )
+
+
+@pytest.mark.parametrize("w", [5, 20])
+def test_l1_norm_engine_matches_pandas(w: int):
+    table = FeatureL1StatEngine(window=w).execute(_l0_table())
+    ref = _pandas_l1_norm(table.to_pandas(), w)
+
+    out = FeatureL1NormEngine(window=w).execute(table)
+
+    assert out.column_names == list(ref.columns)
+    for c in ref.columns:
+        if c.startswith("l1_z_"):
+            np.testing.assert_allclose(
+                out[c].to_numpy(), ref[c].to_numpy(), rtol=1e-6, atol=1e-8, err_msg=c
+            )
+    # 原有列保持 Arrow 类型（无 pandas round trip）
+    assert out.schema.field("l0_trade_count").type == pa.int64()
+
+
+# -----------------------------------------------------------------------------
+# segment_starts：批量计算 == 逐段独立计算
+# -----------------------------------------------------------------------------
+def _segmented(n_seg: int = 4, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(5, 120, n_seg)
+    parts = [series(n=int(k), seed=seed + i, nan_at=()) for i, k in enumerate(lengths)]
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    return parts, np.concatenate(parts), starts
+
+
+@pytest.mark.parametrize("w", [1, 5, 20])
+def test_segmented_kernels_match_per_segment(w: int):
+    parts, x, starts = _segmented()
+
+    for fn in (rk.rolling_mean, rk.rolling_sum, rk.rolling_std, rk.rolling_max, rk.rolling_min):
+        ref = np.concatenate([fn(p, w) for p in parts])
+        np.testing.assert_allclose(
+            fn(x, w, segment_starts=starts), ref, rtol=1e-7, atol=1e-9, equal_nan=True
+        )
+
+    ref = np.concatenate([rk.ewma(p, span=w + 1) for p in parts])
+    np.testing.assert_allclose(
+        rk.ewma(x, span=w + 1, segment_starts=starts), ref, rtol=1e-12, equal_nan=True
+    )
+
+    ref = np.concatenate([rk.shift1(p) for p in parts])
+    np.testing.assert_array_equal(rk.shift1(x, starts), ref)
+
+
+def test_segmented_stat_engine_matches_per_segment():
+    parts, x, starts = _segmented()
+    eng = FeatureL1StatEngine(window=10)
+
+    def tbl(v):
+        return pa.table({"close": v, "l0_amount": v * 3.0})
+
+    batched = eng.execute(tbl(x), segment_starts=starts)
+    ref = pa.concat_tables([eng.execute(tbl(p)) for p in parts])
+
+    assert batched.column_names == ref.column_names
+    for name in ref.column_names:
+        np.testing.assert_allclose(
+            batched[name].to_numpy(), ref[name].to_numpy(), rtol=1e-7, atol=1e-9
+        )
@@ -114,3 +114,58 @@ def test_symbol_index_invalid_symbol_type():
 
     with pytest.raises(TypeError):
         SymbolIndexEngine.execute(table)
+
+
+# -----------------------------------------------------------------------------
+# fast path（已有序输入）
+# -----------------------------------------------------------------------------
+def test_symbol_index_is_sorted():
+    assert SymbolIndexEngine.is_sorted(
+        pa.table({"symbol": ["A", "A", "B"], "ts": [1, 1, 0]})
+    )
+    assert not SymbolIndexEngine.is_sorted(
+        pa.table({"symbol": ["A", "B", "A"], "ts": [1, 2, 3]})
+    )
+    assert not SymbolIndexEngine.is_sorted(
+        pa.table({"symbol": ["A", "A", "B"], "ts": [2, 1, 3]})
+    )
+    assert not SymbolIndexEngine.is_sorted(
+        pa.table({"symbol": ["A", "A"], "ts": [1, None]})
+    )
+
+
+def test_symbol_index_sorted_input_is_not_copied():
+    """
+    已 canonical 的多 chunk 输入：不做 take，原 buffer 原样返回
+    """
+    table = pa.concat_tables(
+        [
+            pa.table({"symbol": ["A", "A"], "ts": [1, 2]}),
+            pa.table({"symbol": ["B"], "ts": [0]}),
+        ]
+    )
+
+    out, index = SymbolIndexEngine.execute(
+        table, segments=[("A", 2), ("B", 1)]
+    )
+
+    assert out is table
+    assert index == {"A": (0, 2), "B": (2, 1)}
+
+
+def test_symbol_index_segments_mismatch_falls_back():
+    table = pa.table({"symbol": ["A", "B", "B"], "ts": [1, 1, 2]})
+
+    # 长度与表不一致 / 段首 symbol 不一致 → 回退到 run-length 构建
+    for segments in ([("A", 2), ("B", 2)], [("A", 2), ("B", 1)]):
+        _, index = SymbolIndexEngine.execute(table, segments=segments)
+        assert index == {"A": (0, 1), "B": (1, 2)}
+
+
+def test_symbol_index_segments_ignored_when_unsorted():
+    table = pa.table({"symbol": ["B", "A"], "ts": [1, 1]})
+
+    out, index = SymbolIndexEngine.execute(table, segments=[("B", 1), ("A", 1)])
+
+    assert out["symbol"].to_pylist() == ["A", "B"]
+    assert index == {"A": (0, 1), "B": (1, 1)}
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from src.data_system.engines.labels.triple_barrier_label_engine import (
+    TripleBarrierLabelConfig,
+    TripleBarrierLabelEngine,
+)
+
+
+def _reference(price, ts, starts, h, pt, sl):
+    """逐行路径扫描（O(n·h) Python 参考实现）"""
+    n = len(price)
+    ends = list(starts[1:]) + [n]
+    label, touch = [None] * n, [None] * n
+    for s, e in zip(starts, ends):
+        for t in range(s, e):
+            p0 = price[t]
+            if not np.isfinite(p0) or p0 <= 0:
+                continue
+            for j in range(t + 1, min(t + h, e - 1) + 1):
+                r = price[j] / p0 - 1
+                if r >= pt:
+                    label[t], touch[t] = 1, ts[j]
+                    break
+                if r <= -sl:
+                    label[t], touch[t] = -1, ts[j]
+                    break
+            else:
+                if t + h <= e - 1:
+                    label[t], touch[t] = 0, ts[t + h]
+    return label, touch
+
+
+def _table(price, ts):
+    return pa.table({"symbol": ["X"] * len(price), "ts": pa.array(ts, pa.int64()), "close": price})
+
+
+def test_triple_barrier_first_touch_and_timeout():
+    engine = TripleBarrierLabelEngine(TripleBarrierLabelConfig(max_holding=3, pt=0.02, sl=0.01))
+    price = [100.0, 100.5, 102.5, 98.0, 98.5, 98.6, 98.7]
+    out = engine.execute(_table(price, [0, 1, 2, 3, 4, 5, 6]))
+
+    label_col, touch_col = engine.label_columns()
+    # t0：t2 先触止盈；t1：t3 止损；t2：t3 止损；t3：超时（t6）；尾部未触及 → null
+    assert out[label_col].to_pylist() == [1, -1, -1, 0, None, None, None]
+    assert out[touch_col].to_pylist() == [2, 3, 3, 6, None, None, None]
+    assert out[label_col].type == pa.int8()
+
+
+@pytest.mark.parametrize("h", [1, 5, 16, 23])
+def test_triple_barrier_batched_matches_path_scan(h):
+    rng = np.random.default_rng(h)
+    n = 600
+    price = 10.0 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    price[[17, 250]] = np.nan
+    ts = np.arange(n) * 60
+    starts = np.array([0, 120, 121, 400])
+
+    engine = TripleBarrierLabelEngine(TripleBarrierLabelConfig(max_holding=h, pt=0.006, sl=0.004))
+    out = engine.execute(_table(price, ts), segment_starts=starts)
+
+    label, touch = _reference(price, ts, list(starts), h, 0.006, 0.004)
+    label_col, touch_col = engine.label_columns()
+    assert out[label_col].to_pylist() == label
+    assert out[touch_col].to_pylist() == touch
+
+
+def test_triple_barrier_does_not_cross_segments():
+    engine = TripleBarrierLabelEngine(TripleBarrierLabelConfig(max_holding=2, pt=0.01, sl=0.01))
+    price = [10.0, 10.0, 10.0, 20.0, 20.0, 20.0]
+    out = engine.execute(_table(price, list(range(6))), segment_starts=np.array([0, 3]))
+
+    # 第一段的跳变属于下一 symbol → 不触及
+    assert out[engine.label_columns()[0]].to_pylist() == [0, None, None, 0, None, None]
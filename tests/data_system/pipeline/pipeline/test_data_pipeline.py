@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.data_system.engines.labels.forward_return_label_engine import ForwardReturnLabelEngine
+from src.data_system.pipeline import DataPipeline
+from src.data_system.steps.label_build_step import LabelBuildStep
+from src.meta.base import BaseMeta, MetaOutput
+from src.observability.instrumentation import Instrumentation, NoOpInstrumentation
+from src.pipeline.pipeline import PipelineAbort
+from src.pipeline.step import PipelineStep
+from src.utils.filesystem import FileSystem
+
+
+class _PM:
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _dir(self, name: str, date: str | None) -> Path:
+        p = self.root / name
+        return p / date if date else p
+
+    def raw_dir(self, date=None):
+        return self._dir("raw", date)
+
+    def fact_dir(self, date=None):
+        return self._dir("fact", date)
+
+    def meta_dir(self, date=None):
+        return self._dir("meta", date)
+
+    def feature_dir(self, date=None):
+        return self._dir("feature", date)
+
+    def label_dir(self, date=None):
+        return self._dir("label", date)
+
+    def l2_normalized_dir(self, date=None):
+        return self._dir("normalized", date)
+
+
+class _AbortStep(PipelineStep):
+    stage = "min"
+
+    def run(self, ctx):
+        raise PipelineAbort("no raw")
+
+
+def test_abort_cleanup_keeps_lock_files(tmp_path):
+    pm = _PM(tmp_path)
+    DataPipeline([_AbortStep()], pm=pm, inst=NoOpInstrumentation()).run("20250102")
+
+    assert not pm.meta_dir("20250102").exists()
+    assert (pm.meta_dir() / ".locks" / "20250102.min.lock").exists()
+    assert (pm.meta_dir() / ".locks" / "20250102.lock").exists()
+
+
+def test_abort_cleanup_waits_for_inflight_run(tmp_path):
+    pm = _PM(tmp_path)
+    date = "20250102"
+    held = threading.Event()
+    release = threading.Event()
+
+    def inflight():
+        # 模拟同一 date 的另一个在途 run
+        with FileSystem.lock(pm.meta_dir() / ".locks" / f"{date}.lock", shared=True):
+            FileSystem.ensure_dir(pm.meta_dir(date))
+            held.set()
+            release.wait(timeout=5)
+
+    t = threading.Thread(target=inflight)
+    t.start()
+    held.wait(timeout=5)
+
+    pipeline = DataPipeline([_AbortStep()], pm=pm, inst=NoOpInstrumentation())
+    runner = threading.Thread(target=pipeline.run, args=(date,))
+    runner.start()
+
+    time.sleep(0.1)
+    assert pm.meta_dir(date).exists()
+
+    release.set()
+    t.join()
+    runner.join(timeout=5)
+    assert not pm.meta_dir(date).exists()
+
+
+class _MinStep(PipelineStep):
+    """按 date 落地固定的 min 表（open = close - 0.5）"""
+
+    stage = "min"
+
+    def __init__(self, days: dict):
+        super().__init__()
+        self.days = days
+
+    def run(self, ctx):
+        parts, index, start = [], {}, 0
+        for sym, close in self.days[ctx.today].items():
+            n = len(close)
+            parts.append(pa.table({
+                "symbol": [sym] * n,
+                "ts": pa.array([i * 60 for i in range(n)], pa.int64()),
+                "open": [v - 0.5 for v in close],
+                "close": close,
+            }))
+            index[sym] = (start, n)
+            start += n
+        table = pa.concat_tables(parts)
+        path = ctx.fact_dir / "min.sh_trade.parquet"
+        pq.write_table(table, path)
+        BaseMeta(meta_dir=ctx.meta_dir, stage="min", output_slot="sh_trade").commit(
+            MetaOutput(input_file=path, output_file=path, rows=table.num_rows, index=index)
+        )
+        return ctx
+
+
+def test_next_day_run_refills_previous_cross_day_labels(tmp_path):
+    pm = _PM(tmp_path)
+    pipeline = DataPipeline(
+        [
+            _MinStep({
+                "2025-01-02": {"A": [10.0, 11.0, 12.0]},
+                "2025-01-03": {"A": [13.0, 14.0, 15.0]},
+            }),
+            LabelBuildStep(engine=ForwardReturnLabelEngine(steps=2, cross_day=True)),
+        ],
+        pm=pm,
+        inst=Instrumentation(enabled=False),
+    )
+    out_path = pm.label_dir("2025-01-02") / "label.sh_trade.parquet"
+
+    pipeline.run("2025-01-02")
+    assert pq.read_table(out_path)["label_fwd_ret_s2_xday"].to_pylist()[1:] == [None, None]
+
+    # D+1 成功 → D 的尾部 horizon 补齐
+    pipeline.run("2025-01-03")
+    labels = pq.read_table(out_path)["label_fwd_ret_s2_xday"].to_pylist()
+    assert labels == pytest.approx([0.2, 13.0 / 11 - 1, 14.0 / 12 - 1])
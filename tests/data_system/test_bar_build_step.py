@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data_system.context import DataContext
+from src.data_system.engines.bar_build_engine import BarBuildEngine, BarSpec
+from src.data_system.steps.bar_build_step import BarBuildStep
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+
+T0 = 1764552600 * 1_000_000  # 2025-12-01 09:30:00 CST
+
+
+def _write_enriched(ctx: DataContext) -> None:
+    rows = {"000001": [0, 3, 7, 61], "600000": [1, 2, 130]}
+
+    symbols, ts = [], []
+    index = {}
+    for symbol in sorted(rows):
+        index[symbol] = (len(symbols), len(rows[symbol]))
+        symbols.extend([symbol] * len(rows[symbol]))
+        ts.extend(T0 + s * 1_000_000 for s in rows[symbol])
+
+    n = len(ts)
+    table = pa.table(
+        {
+            "symbol": symbols,
+            "ts": pa.array(ts, pa.int64()),
+            "price": [10.0 + i for i in range(n)],
+            "volume": pa.array([100] * n, pa.int64()),
+            "notional": [1000.0 + 100 * i for i in range(n)],
+        }
+    )
+    path = ctx.fact_dir / "enriched.sh_trade.parquet"
+    pq.write_table(table, path)
+
+    BaseMeta(meta_dir=ctx.meta_dir, stage="enriched", output_slot="sh_trade").commit(
+        MetaOutput(input_file=path, output_file=path, rows=n, index=index)
+    )
+
+
+def test_bar_build_step_writes_sliceable_stage_per_spec(data_ctx: DataContext):
+    _write_enriched(data_ctx)
+
+    step = BarBuildStep(
+        engine=BarBuildEngine([BarSpec.parse("5s"), BarSpec.parse("1m"), BarSpec.parse("vol:200")])
+    )
+    step.run(data_ctx)
+
+    for label, rows in (("5s", {"000001": 3, "600000": 2}),
+                        ("1m", {"000001": 2, "600000": 2}),
+                        ("vol200", {"000001": 2, "600000": 2})):
+        assert (data_ctx.fact_dir / f"bar_{label}.sh_trade.parquet").exists()
+
+        source = SliceSource(
+            meta_dir=data_ctx.meta_dir,
+            stage=f"bar_{label}",
+            output_slot="sh_trade",
+        )
+        assert source.symbols() == ["000001", "600000"]
+        for symbol, n in rows.items():
+            assert source.get(symbol).num_rows == n, (label, symbol)
+
+    # 第二次运行：全部 meta hit
+    mtime = (data_ctx.fact_dir / "bar_5s.sh_trade.parquet").stat().st_mtime_ns
+    step.run(data_ctx)
+    assert (data_ctx.fact_dir / "bar_5s.sh_trade.parquet").stat().st_mtime_ns == mtime
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data_system.context import DataContext
+from src.data_system.engines.cross_sectional_engine import CrossSectionalFeatureEngine
+from src.data_system.steps.cross_sectional_step import CrossSectionalStep
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+
+
+def _write_feature(ctx: DataContext) -> pa.Table:
+    table = pa.table(
+        {
+            "symbol": ["A", "A", "B", "B", "C", "C"],
+            "ts": pa.array([0, 60, 0, 60, 0, 60], pa.int64()),
+            "l0_x": [1.0, 5.0, 2.0, 4.0, 3.0, 6.0],
+        }
+    )
+    path = ctx.feature_dir / "feature.sh_trade.parquet"
+    pq.write_table(table, path)
+
+    BaseMeta(meta_dir=ctx.meta_dir, stage="feature", output_slot="sh_trade").commit(
+        MetaOutput(
+            input_file=path,
+            output_file=path,
+            rows=table.num_rows,
+            index={"A": (0, 2), "B": (2, 2), "C": (4, 2)},
+        )
+    )
+    return table
+
+
+def test_cross_sectional_step_writes_row_aligned_sliceable_stage(data_ctx: DataContext):
+    base = _write_feature(data_ctx)
+
+    step = CrossSectionalStep(engine=CrossSectionalFeatureEngine(ops=("rank",)))
+    step.run(data_ctx)
+
+    out = pq.read_table(data_ctx.feature_dir / "xs.sh_trade.parquet")
+    assert out["symbol"].equals(base["symbol"])
+    assert out["ts"].equals(base["ts"])
+    # ts=0: 1,2,3 → 1/3,2/3,1；ts=60: 5,4,6 → 2/3,1/3,1
+    assert out["xs_rank_l0_x"].to_pylist() == [1 / 3, 2 / 3, 2 / 3, 1 / 3, 1.0, 1.0]
+
+    source = SliceSource(meta_dir=data_ctx.meta_dir, stage="xs", output_slot="sh_trade")
+    assert source.get("B")["xs_rank_l0_x"].to_pylist() == [2 / 3, 1 / 3]
+
+    # 上游未变 → skip
+    mtime = (data_ctx.feature_dir / "xs.sh_trade.parquet").stat().st_mtime_ns
+    step.run(data_ctx)
+    assert (data_ctx.feature_dir / "xs.sh_trade.parquet").stat().st_mtime_ns == mtime
+
+
+def test_cross_sectional_step_rebuilds_on_spec_change(data_ctx: DataContext):
+    _write_feature(data_ctx)
+    out_path = data_ctx.feature_dir / "xs.sh_trade.parquet"
+
+    CrossSectionalStep(engine=CrossSectionalFeatureEngine(ops=("rank",))).run(data_ctx)
+    assert "xs_z_l0_x" not in pq.read_table(out_path).column_names
+
+    # 上游未变，ops 变化 → 重建
+    CrossSectionalStep(engine=CrossSectionalFeatureEngine(ops=("rank", "zscore"))).run(data_ctx)
+    assert "xs_z_l0_x" in pq.read_table(out_path).column_names
+
+    # 行业映射变化 → 重建
+    neutral = CrossSectionalFeatureEngine(ops=("neutral",), industry={"A": "x", "B": "x", "C": "y"})
+    CrossSectionalStep(engine=neutral).run(data_ctx)
+    first = pq.read_table(out_path)["xs_neu_l0_x"].to_pylist()
+
+    regrouped = CrossSectionalFeatureEngine(ops=("neutral",), industry={"A": "x", "B": "y", "C": "y"})
+    CrossSectionalStep(engine=regrouped).run(data_ctx)
+    assert pq.read_table(out_path)["xs_neu_l0_x"].to_pylist() != first
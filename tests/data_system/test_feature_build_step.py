@@ -343,3 +343,170 @@ def test_feature_build_meta_hit_skips_second_run(data_ctx: DataContext):
     mtime2 = out_path.stat().st_mtime_ns
 
     assert mtime1 == mtime2
+
+
+# =============================================================================
+# batched（整表一次执行）== per-symbol
+# =============================================================================
+
+def _write_min_bars(data_ctx: DataContext) -> None:
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    parts = []
+    index = {}
+    start = 0
+    for sym, n in (("AAA", 40), ("BBB", 3), ("CCC", 25)):
+        close = 10.0 + rng.standard_normal(n).cumsum()
+        parts.append(
+            pa.table(
+                {
+                    "symbol": [sym] * n,
+                    "ts": list(range(n)),
+                    "open": close,
+                    "high": close + rng.uniform(0.1, 1.0, n),
+                    "low": close - rng.uniform(0.1, 1.0, n),
+                    "close": close,
+                    "volume": rng.integers(1, 1000, n),
+                    "trade_count": rng.integers(1, 50, n),
+                }
+            )
+        )
+        index[sym] = (start, n)
+        start += n
+
+    table = pa.concat_tables(parts)
+    pq.write_table(table, data_ctx.fact_dir / "min.sh_trade.parquet")
+    BaseMeta(meta_dir=data_ctx.meta_dir, stage="min", output_slot="sh_trade").commit(
+        MetaOutput(
+            input_file=data_ctx.fact_dir / "dummy_input.parquet",
+            output_file=data_ctx.fact_dir / "min.sh_trade.parquet",
+            rows=table.num_rows,
+            index=index,
+        )
+    )
+
+
+def _real_step(batched: bool) -> FeatureBuildStep:
+    from src.data_system.engines.feature_l0_engine import FeatureL0Engine
+    from src.data_system.engines.feature_l1_norm_engine import FeatureL1NormEngine
+    from src.data_system.engines.feature_l1_stat_engine import FeatureL1StatEngine
+
+    return FeatureBuildStep(
+        l0_engine=FeatureL0Engine(),
+        l1_engines=[FeatureL1StatEngine(window=5), FeatureL1NormEngine(window=5)],
+        only_feature_columns=True,
+        batched=batched,
+    )
+
+
+def test_feature_build_batched_matches_per_symbol(data_ctx: DataContext):
+    import numpy as np
+
+    _write_min_bars(data_ctx)
+    out_path = data_ctx.feature_dir / "feature.sh_trade.parquet"
+
+    _real_step(batched=False).run(data_ctx)
+    ref = pq.read_table(out_path)
+
+    out_path.unlink()
+    BaseMeta(meta_dir=data_ctx.meta_dir, stage="feature", output_slot="sh_trade").path.unlink()
+
+    _real_step(batched=True).run(data_ctx)
+    out = pq.read_table(out_path)
+
+    assert out.column_names == ref.column_names
+    assert out["symbol"].to_pylist() == ref["symbol"].to_pylist()
+    for name in ref.column_names:
+        if name.startswith(("l0_", "l1_")):
+            np.testing.assert_allclose(
+                out[name].to_numpy(), ref[name].to_numpy(), rtol=1e-7, atol=1e-9
+            )
+
+    source = SliceSource(
+        meta_dir=data_ctx.meta_dir, stage="feature", output_slot="sh_trade"
+    )
+    assert [(s, n) for s, _, n in source.segments()] == [("AAA", 40), ("BBB", 3), ("CCC", 25)]
+
+
+def test_feature_build_batched_rejects_non_segment_aware_engine():
+    with pytest.raises(ValueError):
+        FeatureBuildStep(
+            l0_engine=DummyL0Engine(),
+            l1_engines=[DummyL1Engine()],
+            batched=True,
+        )
+
+
+# =============================================================================
+# feature spec / column cache
+# =============================================================================
+
+def test_feature_build_spec_change_triggers_rebuild(data_ctx: DataContext):
+    from src.data_system.engines.feature_l0_engine import FeatureL0Engine
+    from src.data_system.engines.feature_l1_stat_engine import FeatureL1StatEngine
+
+    _write_min_bars(data_ctx)
+    out_path = data_ctx.feature_dir / "feature.sh_trade.parquet"
+
+    FeatureBuildStep(
+        l0_engine=FeatureL0Engine(),
+        l1_engines=[FeatureL1StatEngine(window=5)],
+        only_feature_columns=True,
+    ).run(data_ctx)
+    assert "l1_std_w7_abs_move" not in pq.read_table(out_path).column_names
+
+    FeatureBuildStep(
+        l0_engine=FeatureL0Engine(),
+        l1_engines=[FeatureL1StatEngine(window=5), FeatureL1StatEngine(window=7)],
+        only_feature_columns=True,
+    ).run(data_ctx)
+    assert "l1_std_w7_abs_move" in pq.read_table(out_path).column_names
+
+
+def test_feature_build_column_cache_computes_only_new_engine(data_ctx: DataContext, monkeypatch):
+    import numpy as np
+
+    from src.data_system.engines.feature_l0_engine import FeatureL0Engine
+    from src.data_system.engines.feature_l1_stat_engine import FeatureL1StatEngine
+
+    _write_min_bars(data_ctx)
+    out_path = data_ctx.feature_dir / "feature.sh_trade.parquet"
+
+    def step(*windows, cache=True):
+        return FeatureBuildStep(
+            l0_engine=FeatureL0Engine(),
+            l1_engines=[FeatureL1StatEngine(window=w) for w in windows],
+            only_feature_columns=True,
+            cache_columns=cache,
+        )
+
+    step(5).run(data_ctx)
+    assert list((data_ctx.feature_dir / "_columns" / "sh_trade").iterdir())
+
+    # 既有 engine 必须命中缓存：再执行即失败
+    def boom(self, table, **kwargs):
+        raise AssertionError(f"{type(self).__name__}(window={getattr(self, 'window', None)}) recomputed")
+
+    real_stat = FeatureL1StatEngine.execute
+    monkeypatch.setattr(FeatureL0Engine, "execute", boom)
+    monkeypatch.setattr(
+        FeatureL1StatEngine,
+        "execute",
+        lambda self, table, **kw: boom(self, table) if self.window == 5 else real_stat(self, table, **kw),
+    )
+
+    step(5, 7).run(data_ctx)
+    cached = pq.read_table(out_path)
+    monkeypatch.undo()
+
+    out_path.unlink()
+    BaseMeta(meta_dir=data_ctx.meta_dir, stage="feature", output_slot="sh_trade").path.unlink()
+    step(5, 7, cache=False).run(data_ctx)
+    ref = pq.read_table(out_path)
+
+    assert cached.column_names == ref.column_names
+    assert "l1_std_w7_abs_move" in cached.column_names
+    for name in ref.column_names:
+        if name.startswith(("l0_", "l1_")):
+            np.testing.assert_array_equal(cached[name].to_numpy(), ref[name].to_numpy())
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.data_system.context import DataContext
+from src.data_system.engines.labels.forward_return_label_engine import ForwardReturnLabelEngine
+from src.data_system.engines.labels.triple_barrier_label_engine import (
+    TripleBarrierLabelConfig,
+    TripleBarrierLabelEngine,
+)
+from src.data_system.steps.label_build_step import LabelBuildStep
+from src.meta.base import BaseMeta, MetaOutput
+
+
+def _write_min(data_ctx: DataContext) -> None:
+    rng = np.random.default_rng(3)
+    parts, index, start = [], {}, 0
+    for sym, n in (("AAA", 50), ("BBB", 4), ("CCC", 30)):
+        parts.append(
+            pa.table(
+                {
+                    "symbol": [sym] * n,
+                    "ts": pa.array(np.arange(n) * 60, pa.int64()),
+                    "close": 10.0 * np.exp(np.cumsum(rng.normal(0, 0.005, n))),
+                }
+            )
+        )
+        index[sym] = (start, n)
+        start += n
+
+    table = pa.concat_tables(parts)
+    path = data_ctx.fact_dir / "min.sh_trade.parquet"
+    pq.write_table(table, path)
+    BaseMeta(meta_dir=data_ctx.meta_dir, stage="min", output_slot="sh_trade").commit(
+        MetaOutput(input_file=path, output_file=path, rows=table.num_rows, index=index)
+    )
+
+
+@pytest.mark.parametrize(
+    "make_engine",
+    [
+        lambda: ForwardReturnLabelEngine(steps=5),
+        lambda: TripleBarrierLabelEngine(TripleBarrierLabelConfig(max_holding=8, pt=0.01, sl=0.008)),
+    ],
+)
+def test_label_build_batched_matches_per_symbol(data_ctx: DataContext, make_engine):
+    _write_min(data_ctx)
+    out_path = data_ctx.label_dir / "label.sh_trade.parquet"
+
+    LabelBuildStep(engine=make_engine()).run(data_ctx)
+    ref = pq.read_table(out_path)
+
+    out_path.unlink()
+    BaseMeta(meta_dir=data_ctx.meta_dir, stage="label", output_slot="sh_trade").path.unlink()
+
+    LabelBuildStep(engine=make_engine(), batched=True).run(data_ctx)
+    out = pq.read_table(out_path)
+
+    assert out.column_names == ref.column_names
+    for name in ref.column_names:
+        assert out[name].to_pylist() == pytest.approx(ref[name].to_pylist(), nan_ok=True), name
+
+
+def test_label_build_batched_rejects_non_segment_aware_engine():
+    class _Plain:
+        def execute(self, table):
+            return table
+
+    with pytest.raises(ValueError, match="segment-aware"):
+        LabelBuildStep(engine=_Plain(), batched=True)
+
+
+def test_label_build_accumulates_label_schema(data_ctx: DataContext):
+    from src.data_system.engines.labels.multi_horizon_label_engine import MultiHorizonLabelEngine
+
+    _write_min(data_ctx)
+    out_path = data_ctx.label_dir / "label.sh_trade.parquet"
+    meta = BaseMeta(meta_dir=data_ctx.meta_dir, stage="label", output_slot="sh_trade")
+
+    LabelBuildStep(engine=MultiHorizonLabelEngine(horizons=[1, 5])).run(data_ctx)
+    first = pq.read_table(out_path)
+    assert meta.attrs()["label_schema"] == ["label_fwd_ret_s1", "label_fwd_ret_s5"]
+
+    # 新 horizon → 只追加新列，既有列保留
+    LabelBuildStep(engine=MultiHorizonLabelEngine(horizons=[30], label_sets=["rvol"])).run(data_ctx)
+    second = pq.read_table(out_path)
+    assert meta.attrs()["label_schema"] == [
+        "label_fwd_ret_s1", "label_fwd_ret_s5", "label_rvol_s30",
+    ]
+    assert second["label_fwd_ret_s5"].equals(first["label_fwd_ret_s5"])
+
+    # 已在 schema 中 → skip
+    mtime = out_path.stat().st_mtime_ns
+    LabelBuildStep(engine=MultiHorizonLabelEngine(horizons=[5])).run(data_ctx)
+    assert out_path.stat().st_mtime_ns == mtime
+
+
+def _day_ctx(tmp_path, date: str) -> DataContext:
+    dirs = {k: tmp_path / k / date for k in ("raw", "fact", "meta", "feature", "label")}
+    for d in dirs.values():
+        d.mkdir(parents=True, exist_ok=True)
+    return DataContext(
+        today=date,
+        raw_dir=dirs["raw"],
+        normalized_dir=dirs["raw"],
+        fact_dir=dirs["fact"],
+        meta_dir=dirs["meta"],
+        feature_dir=dirs["feature"],
+        label_dir=dirs["label"],
+    )
+
+
+def _write_day(ctx: DataContext, close: dict) -> None:
+    parts, index, start = [], {}, 0
+    for sym, values in close.items():
+        n = len(values)
+        parts.append(
+            pa.table(
+                {
+                    "symbol": [sym] * n,
+                    "ts": pa.array(np.arange(n) * 60, pa.int64()),
+                    "open": [v - 0.5 for v in values],
+                    "close": values,
+                }
+            )
+        )
+        index[sym] = (start, n)
+        start += n
+    table = pa.concat_tables(parts)
+    path = ctx.fact_dir / "min.sh_trade.parquet"
+    pq.write_table(table, path)
+    BaseMeta(meta_dir=ctx.meta_dir, stage="min", output_slot="sh_trade").commit(
+        MetaOutput(input_file=path, output_file=path, rows=table.num_rows, index=index)
+    )
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_label_build_cross_day_fills_tail_when_next_day_lands(tmp_path, batched: bool):
+    day1 = _day_ctx(tmp_path, "2025-01-02")
+    _write_day(day1, {"A": [10.0, 11.0, 12.0], "B": [5.0, 6.0]})
+
+    step = LabelBuildStep(engine=ForwardReturnLabelEngine(steps=2, cross_day=True), batched=batched)
+    out_path = day1.label_dir / "label.sh_trade.parquet"
+    meta = BaseMeta(meta_dir=day1.meta_dir, stage="label", output_slot="sh_trade")
+
+    step.run(day1)
+    assert pq.read_table(out_path)["label_fwd_ret_s2_xday"].to_pylist()[1:] == [None, None, None, None]
+    assert meta.attrs()["next_session"] is None
+
+    # 次日落地（B 停牌）→ 重建，A 的尾部用次日前两行补齐
+    day2 = _day_ctx(tmp_path, "2025-01-03")
+    _write_day(day2, {"A": [13.0, 14.0, 99.0], "C": [1.0]})
+    step.run(day1)
+
+    labels = pq.read_table(out_path)["label_fwd_ret_s2_xday"].to_pylist()
+    assert labels == pytest.approx([0.2, 13.0 / 11 - 1, 14.0 / 12 - 1, None, None])
+    assert meta.attrs()["next_session"]["date"] == "2025-01-03"
+
+    # 次日不变 → skip
+    mtime = out_path.stat().st_mtime_ns
+    step.run(day1)
+    assert out_path.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_label_build_cross_day_reads_next_session_once(tmp_path, monkeypatch, batched: bool):
+    from src.meta.slice_accessor import SliceAccessor
+
+    day1 = _day_ctx(tmp_path, "2025-01-02")
+    _write_day(day1, {"A": [10.0, 11.0, 12.0], "B": [5.0, 6.0], "C": [1.0, 1.1]})
+    day2 = _day_ctx(tmp_path, "2025-01-03")
+    _write_day(day2, {"A": [13.0, 14.0, 99.0], "C": [1.2]})
+
+    ranged = []
+    monkeypatch.setattr(SliceAccessor, "_read_range", lambda self, *a: ranged.append(a))
+    LabelBuildStep(engine=ForwardReturnLabelEngine(steps=2, cross_day=True), batched=batched).run(day1)
+
+    # 次日只投影读一次整表，逐 symbol 不再按 row group 读取
+    assert ranged == []
+    labels = pq.read_table(day1.label_dir / "label.sh_trade.parquet")["label_fwd_ret_s2_xday"].to_pylist()
+    # C 次日只有 1 行：首行可补齐，次行仍为 null
+    assert labels == pytest.approx([0.2, 13.0 / 11 - 1, 14.0 / 12 - 1, None, None, 0.2, None])
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.data_system.context import DataContext
+from src.data_system.engines.orderbook_feature_engine import OrderBookFeatureEngine
+from src.data_system.steps.feature_build_step import FeatureBuildStep
+from src.data_system.steps.orderbook_feature_step import OrderBookFeatureStep
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+
+S = 1_000_000
+LOCAL = 8 * 3600 * S
+M0, M1, M2 = (LOCAL + i * 60 * S for i in range(3))
+
+EVENT_SCHEMA = pa.schema(
+    [
+        ("symbol", pa.string()),
+        ("ts", pa.int64()),
+        ("event", pa.string()),
+        ("order_id", pa.int64()),
+        ("side", pa.string()),
+        ("price", pa.float64()),
+        ("volume", pa.int64()),
+        ("buy_no", pa.int64()),
+        ("sell_no", pa.int64()),
+    ]
+)
+
+
+def _commit(ctx: DataContext, stage: str, slot: str, path: Path, table: pa.Table, index: dict) -> None:
+    pq.write_table(table, path)
+    BaseMeta(meta_dir=ctx.meta_dir, stage=stage, output_slot=slot).commit(
+        MetaOutput(input_file=path, output_file=path, rows=table.num_rows, index=index)
+    )
+
+
+def _write_inputs(ctx: DataContext) -> pa.Table:
+    minutes = pa.table(
+        {
+            "symbol": ["A", "A", "A", "B", "B"],
+            "ts": pa.array([M0, M1, M2, M0, M1], pa.int64()),
+            "close": [10.0, 10.1, 10.2, 5.0, 5.1],
+        }
+    )
+    _commit(ctx, "min", "sh_trade", ctx.fact_dir / "min.sh_trade.parquet", minutes,
+            {"A": (0, 3), "B": (3, 2)})
+
+    orders = pa.Table.from_pylist(
+        [
+            dict(symbol="A", ts=1 * S, event="ADD", order_id=1, side="B", price=10.0, volume=100),
+            dict(symbol="A", ts=2 * S, event="ADD", order_id=2, side="S", price=10.1, volume=50),
+            dict(symbol="A", ts=121 * S, event="CANCEL", order_id=2, side="S", price=10.1, volume=50),
+        ],
+        schema=EVENT_SCHEMA,
+    )
+    _commit(ctx, "convert", "sh_order", ctx.normalized_dir / "convert.sh_order.parquet", orders,
+            {"A": (0, 3)})
+
+    trades = pa.Table.from_pylist(
+        [dict(symbol="A", ts=61 * S, event="TRADE", order_id=9, price=10.0, volume=40, buy_no=1, sell_no=7)],
+        schema=EVENT_SCHEMA,
+    )
+    _commit(ctx, "convert", "sh_trade", ctx.normalized_dir / "convert.sh_trade.parquet", trades,
+            {"A": (0, 1)})
+    return minutes
+
+
+def test_orderbook_feature_step_row_aligned_with_min(data_ctx: DataContext):
+    minutes = _write_inputs(data_ctx)
+
+    OrderBookFeatureStep(engine=OrderBookFeatureEngine()).run(data_ctx)
+
+    out = pq.read_table(data_ctx.fact_dir / "ob.sh_trade.parquet")
+    assert out["symbol"].equals(minutes["symbol"])
+    assert out["ts"].equals(minutes["ts"])
+
+    # A：M0 初始盘口，M1 成交后 bid1 剩 60，M2 卖盘撤空；B 无事件 → null
+    assert out["ob_spread"].to_pylist()[:2] == pytest.approx([0.1, 0.1])
+    assert out["ob_depth_imb_1"].to_pylist() == pytest.approx([50 / 150, 10 / 110, 1.0, None, None])
+
+    source = SliceSource(meta_dir=data_ctx.meta_dir, stage="ob", output_slot="sh_trade")
+    assert source.segments() == [("A", 0, 3), ("B", 3, 2)]
+
+
+def test_orderbook_feature_step_reads_event_files_once(data_ctx: DataContext, monkeypatch):
+    from src.meta.slice_accessor import SliceAccessor
+
+    _write_inputs(data_ctx)
+    ranged = []
+    monkeypatch.setattr(SliceAccessor, "_read_range", lambda self, *a: ranged.append(a))
+
+    OrderBookFeatureStep(engine=OrderBookFeatureEngine()).run(data_ctx)
+
+    # 投影列整表预读 → 逐 symbol 不再走 row-group 读取
+    assert ranged == []
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_feature_build_joins_orderbook_columns(data_ctx: DataContext, batched: bool):
+    _write_inputs(data_ctx)
+    OrderBookFeatureStep(engine=OrderBookFeatureEngine()).run(data_ctx)
+    ob = pq.read_table(data_ctx.fact_dir / "ob.sh_trade.parquet")
+
+    FeatureBuildStep(join_stages=["ob"], batched=batched).run(data_ctx)
+
+    out = pq.read_table(data_ctx.feature_dir / "feature.sh_trade.parquet")
+    for name in ob.column_names:
+        assert out[name].equals(ob[name])
+    assert "close" in out.column_names
+
+
+def test_feature_build_rejects_misaligned_join(data_ctx: DataContext):
+    _write_inputs(data_ctx)
+    bad = pa.table({"symbol": ["A", "A", "A"], "ts": pa.array([M0, M1, M2], pa.int64()), "ob_x": [1.0, 2.0, 3.0]})
+    _commit(data_ctx, "ob", "sh_trade", data_ctx.fact_dir / "ob.sh_trade.parquet", bad, {"A": (0, 3)})
+
+    with pytest.raises(RuntimeError, match="slice index differs"):
+        FeatureBuildStep(join_stages=["ob"]).run(data_ctx)
@@ -162,3 +162,79 @@ def test_upstream_changed_when_output_deleted(tmp_path: Path):
 
     # 必须触发重跑
     assert meta.upstream_changed() is True
+
+
+def test_upstream_changed_on_empty_or_corrupt_manifest(tmp_path: Path):
+    """
+    不变式：
+      - 掉电残留的 0 字节 / 半截 manifest 绝不能被当作 hit
+    """
+    meta_dir = tmp_path / "meta"
+    meta_dir.mkdir()
+
+    meta = BaseMeta(meta_dir=meta_dir, stage="min", output_slot="x")
+
+    meta.path.write_bytes(b"")
+    assert meta.upstream_changed() is True
+
+    meta.path.write_text('{"version": 1.2, "upstream": {', encoding="utf-8")
+    assert meta.upstream_changed() is True
+
+    meta.path.write_text("{}", encoding="utf-8")
+    assert meta.upstream_changed() is True
+
+
+def test_commit_appends_journal(tmp_path: Path):
+    import json
+
+    meta_dir = tmp_path / "meta"
+    meta_dir.mkdir()
+
+    input_file = tmp_path / "in.parquet"
+    output_file = tmp_path / "out.parquet"
+    input_file.write_text("in", encoding="utf-8")
+    output_file.write_text("out", encoding="utf-8")
+
+    for slot in ("a", "b"):
+        BaseMeta(meta_dir=meta_dir, stage="min", output_slot=slot).commit(
+            MetaOutput(input_file=input_file, output_file=output_file, rows=3)
+        )
+
+    lines = (meta_dir / BaseMeta.JOURNAL_NAME).read_text().splitlines()
+    records = [json.loads(x) for x in lines]
+
+    assert [r["manifest"] for r in records] == [
+        "min.a.manifest.json",
+        "min.b.manifest.json",
+    ]
+    assert all(r["rows"] == 3 for r in records)
+    # journal 不影响 manifest 目录语义
+    assert sorted(p.name for p in meta_dir.glob("*.manifest.json")) == [
+        "min.a.manifest.json",
+        "min.b.manifest.json",
+    ]
+
+
+def test_commit_persists_attrs(tmp_path: Path):
+    meta_dir = tmp_path / "meta"
+    meta_dir.mkdir()
+
+    input_file = tmp_path / "in.parquet"
+    output_file = tmp_path / "out.parquet"
+    input_file.write_text("in", encoding="utf-8")
+    output_file.write_text("out", encoding="utf-8")
+
+    meta = BaseMeta(meta_dir=meta_dir, stage="feature", output_slot="a")
+    assert meta.attrs() == {}
+
+    meta.commit(
+        MetaOutput(
+            input_file=input_file,
+            output_file=output_file,
+            rows=1,
+            attrs={"feature_spec": "abc"},
+        )
+    )
+
+    assert meta.attrs() == {"feature_spec": "abc"}
+    assert meta.upstream_changed() is False
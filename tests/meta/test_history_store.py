@@ -0,0 +1,129 @@
+# tests/meta/test_history_store.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.meta.history_store import HistoryStore
+
+
+# -----------------------------------------------------------------------------
+# helpers
+# -----------------------------------------------------------------------------
+def write_min(path: Path, rows: dict[str, list[int]]) -> Path:
+    symbols: list[str] = []
+    ts: list[int] = []
+    for symbol in sorted(rows):
+        symbols.extend([symbol] * len(rows[symbol]))
+        ts.extend(rows[symbol])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(
+        pa.table(
+            {
+                "symbol": symbols,
+                "ts": pa.array(ts, pa.int64()),
+                "close": [float(t) for t in ts],
+            }
+        ),
+        path,
+    )
+    return path
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> HistoryStore:
+    s = HistoryStore(tmp_path / "history", row_group_size=2)
+    days = {
+        "2025-01-30": {"A": [1, 2, 3], "B": [1, 2]},
+        "2025-02-03": {"A": [10, 11], "B": [10]},
+        "2025-02-04": {"B": [20, 21]},
+    }
+    for date, rows in days.items():
+        src = write_min(tmp_path / "fact" / date / "min.sh_trade.parquet", rows)
+        s.compact_day(stage="min", slot="sh_trade", date=date, parquet_file=src)
+    return s
+
+
+# -----------------------------------------------------------------------------
+# tests
+# -----------------------------------------------------------------------------
+def test_compact_day_hive_layout(store: HistoryStore):
+    files = store.files("min", "sh_trade", start="2025-02-01")
+    assert [f.relative_to(store.root).as_posix() for f in files] == [
+        "stage=min/slot=sh_trade/ym=202502/part-00000.parquet"
+    ]
+
+    # 整月折叠成一个文件，按 (symbol, date, ts) 排序
+    t = pq.read_table(files[0])
+    assert t["symbol"].to_pylist() == ["A", "A", "B", "B", "B"]
+    assert t["date"].to_pylist() == [
+        "2025-02-03", "2025-02-03", "2025-02-03", "2025-02-04", "2025-02-04",
+    ]
+    assert pq.ParquetFile(files[0]).metadata.num_row_groups == 3
+
+
+def test_compact_splits_month_at_symbol_boundaries(tmp_path: Path):
+    s = HistoryStore(tmp_path / "history", file_rows=3)
+    for date, rows in {
+        "2025-03-03": {"A": [1, 2], "B": [1, 2], "C": [1]},
+        "2025-03-04": {"A": [3], "C": [2, 3]},
+    }.items():
+        src = write_min(tmp_path / "fact" / date / "min.sh_trade.parquet", rows)
+        s.compact_day(stage="min", slot="sh_trade", date=date, parquet_file=src)
+
+    parts = [pq.read_table(f)["symbol"].to_pylist() for f in s.files("min", "sh_trade")]
+    assert parts == [["A", "A", "A"], ["B", "B", "C", "C", "C"]]
+
+
+def test_compact_day_is_idempotent(store: HistoryStore, tmp_path: Path):
+    src = tmp_path / "fact" / "2025-02-04" / "min.sh_trade.parquet"
+    _, rows = store.compact_day(
+        stage="min", slot="sh_trade", date="2025-02-04", parquet_file=src,
+    )
+    assert rows == 2
+    assert store.scan("min", "sh_trade").num_rows == 10
+
+
+def test_files_prune_by_month(store: HistoryStore):
+    files = store.files("min", "sh_trade", end="2025-01-31")
+    assert [f.parent.name for f in files] == ["ym=202501"]
+
+
+def test_scan_prunes_by_date_within_month(store: HistoryStore):
+    t = store.scan("min", "sh_trade", start="2025-02-01", end="2025-02-03")
+    assert t["date"].to_pylist() == ["2025-02-03"] * 3
+    assert t["ts"].to_pylist() == [10, 11, 10]
+
+
+def test_scan_symbol_over_range(store: HistoryStore):
+    t = store.scan("min", "sh_trade", symbols=["B"])
+    assert t["ts"].to_pylist() == [1, 2, 10, 20, 21]
+
+
+def test_scan_projection_and_ts_range(store: HistoryStore):
+    t = store.scan(
+        "min",
+        "sh_trade",
+        symbols=["A"],
+        start="2025-01-30",
+        columns=["ts", "close"],
+        ts_range=(2, 10),
+    )
+    assert t.column_names == ["ts", "close"]
+    assert t["ts"].to_pylist() == [2, 3, 10]
+
+
+def test_dataset_exposes_ym_partition(store: HistoryStore):
+    t = store.dataset("min", "sh_trade").to_table()
+    assert sorted(set(t["ym"].to_pylist())) == [202501, 202502]
+
+
+def test_scan_missing_raises(store: HistoryStore):
+    with pytest.raises(FileNotFoundError):
+        store.scan("min", "sh_trade", start="2026-01-01")
+    with pytest.raises(FileNotFoundError):
+        store.scan("label", "sh_trade")
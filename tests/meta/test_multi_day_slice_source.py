@@ -0,0 +1,135 @@
+# tests/meta/test_multi_day_slice_source.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.multi_day_slice_source import MultiDaySliceSource
+
+
+# -----------------------------------------------------------------------------
+# helpers
+# -----------------------------------------------------------------------------
+def write_day(root: Path, date: str, rows: dict[str, list[int]]) -> Path:
+    """
+    写一个 day 的 min.sh_trade.parquet + manifest（symbol 已排序）
+    """
+    meta_dir = root / "meta" / date
+    fact_dir = root / "fact" / date
+    meta_dir.mkdir(parents=True)
+    fact_dir.mkdir(parents=True)
+
+    symbols: list[str] = []
+    ts: list[int] = []
+    index: dict[str, tuple[int, int]] = {}
+
+    for symbol in sorted(rows):
+        index[symbol] = (len(symbols), len(rows[symbol]))
+        symbols.extend([symbol] * len(rows[symbol]))
+        ts.extend(rows[symbol])
+
+    table = pa.table(
+        {
+            "symbol": symbols,
+            "ts": pa.array(ts, pa.int64()),
+            "close": [float(t) for t in ts],
+        }
+    )
+    parquet_file = fact_dir / "min.sh_trade.parquet"
+    pq.write_table(table, parquet_file)
+
+    BaseMeta(meta_dir=meta_dir, stage="min", output_slot="sh_trade").commit(
+        MetaOutput(
+            input_file=parquet_file,
+            output_file=parquet_file,
+            rows=table.num_rows,
+            index=index,
+        )
+    )
+    return meta_dir
+
+
+@pytest.fixture
+def three_days(tmp_path: Path) -> dict[str, Path]:
+    return {
+        "2025-01-02": write_day(tmp_path, "2025-01-02", {"A": [1, 2], "B": [1]}),
+        # A 停牌
+        "2025-01-03": write_day(tmp_path, "2025-01-03", {"B": [3, 4]}),
+        "2025-01-06": write_day(tmp_path, "2025-01-06", {"A": [5], "B": [5]}),
+        # 无数据日（目录存在但无 manifest）
+        "2025-01-07": tmp_path / "meta" / "2025-01-07",
+    }
+
+
+# -----------------------------------------------------------------------------
+# tests
+# -----------------------------------------------------------------------------
+def test_multi_day_stitches_days_in_order(three_days):
+    with MultiDaySliceSource(
+            day_meta_dirs=three_days,
+            stage="min",
+            output_slot="sh_trade",
+    ) as source:
+        a = source.get("A")
+        b = source.get("B")
+
+    assert a["ts"].to_pylist() == [1, 2, 5]
+    assert b["ts"].to_pylist() == [1, 3, 4, 5]
+
+    # 0-copy：每个 day 保持独立 chunk
+    assert b["ts"].num_chunks == 3
+
+
+def test_multi_day_date_range_and_projection(three_days):
+    source = MultiDaySliceSource(
+        day_meta_dirs=three_days,
+        stage="min",
+        output_slot="sh_trade",
+        prefetch_days=0,
+    )
+
+    b = source.get("B", start="2025-01-03", end="2025-01-06", columns=["ts"])
+
+    assert b.column_names == ["ts"]
+    assert b["ts"].to_pylist() == [3, 4, 5]
+
+    days = [d for d, _ in source.iter_days("A")]
+    assert days == ["2025-01-02", "2025-01-06"]
+
+
+def test_multi_day_symbols_union(three_days):
+    source = MultiDaySliceSource(
+        day_meta_dirs=three_days,
+        stage="min",
+        output_slot="sh_trade",
+    )
+    assert sorted(source.symbols()) == ["A", "B"]
+    source.close()
+
+
+def test_multi_day_missing_symbol_raises(three_days):
+    source = MultiDaySliceSource(
+        day_meta_dirs=three_days,
+        stage="min",
+        output_slot="sh_trade",
+    )
+    with pytest.raises(KeyError):
+        source.get("C")
+    source.close()
+
+
+def test_multi_day_cache_is_bounded(three_days):
+    source = MultiDaySliceSource(
+        day_meta_dirs=three_days,
+        stage="min",
+        output_slot="sh_trade",
+        prefetch_days=1,
+        max_cached_days=2,
+    )
+    source.get("B")
+    assert len(source._cache) <= 2
+    source.close()
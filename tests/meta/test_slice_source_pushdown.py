@@ -0,0 +1,111 @@
+# tests/meta/test_slice_source_pushdown.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.meta.base import BaseMeta, MetaOutput
+from src.meta.slice_source import SliceSource
+
+
+# -----------------------------------------------------------------------------
+# helpers
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def source(tmp_path: Path) -> SliceSource:
+    """
+    A: ts 0..9, B: ts 0..9
+    row_group_size=4 → slice 跨多个 row group
+    """
+    table = pa.table(
+        {
+            "symbol": ["A"] * 10 + ["B"] * 10,
+            "ts": pa.array(list(range(10)) * 2, pa.int64()),
+            "close": [float(i) for i in range(20)],
+            "volume": list(range(20)),
+        }
+    )
+    parquet_file = tmp_path / "min.sh_trade.parquet"
+    pq.write_table(table, parquet_file, row_group_size=4)
+
+    BaseMeta(meta_dir=tmp_path, stage="min", output_slot="sh_trade").commit(
+        MetaOutput(
+            input_file=parquet_file,
+            output_file=parquet_file,
+            rows=20,
+            index={"A": (0, 10), "B": (10, 10)},
+        )
+    )
+    return SliceSource(meta_dir=tmp_path, stage="min", output_slot="sh_trade")
+
+
+# -----------------------------------------------------------------------------
+# tests
+# -----------------------------------------------------------------------------
+def test_get_with_columns_projects(source: SliceSource):
+    b = source.get("B", columns=["ts", "close"])
+
+    assert b.column_names == ["ts", "close"]
+    assert b["close"].to_pylist() == [float(i) for i in range(10, 20)]
+
+
+def test_get_with_ts_range_clips_inclusive(source: SliceSource):
+    b = source.get("B", columns=["close"], ts_range=(3, 5))
+
+    # ts 未投影时仍可过滤，且不出现在结果中
+    assert b.column_names == ["close"]
+    assert b["close"].to_pylist() == [13.0, 14.0, 15.0]
+
+
+def test_get_with_open_ended_ts_range(source: SliceSource):
+    a = source.get("A", ts_range=(None, 1))
+    assert a["ts"].to_pylist() == [0, 1]
+
+    a = source.get("A", ts_range=(8, None))
+    assert a["ts"].to_pylist() == [8, 9]
+
+
+def test_get_ts_range_out_of_bounds_is_empty(source: SliceSource):
+    a = source.get("A", columns=["ts"], ts_range=(100, 200))
+    assert a.num_rows == 0
+    assert a.column_names == ["ts"]
+
+
+def test_pushdown_matches_full_read(source: SliceSource):
+    full = source.get("B")
+    pushed = source.get("B", columns=list(full.column_names))
+    assert pushed.equals(full)
+
+
+def test_iter_tables_with_columns(source: SliceSource):
+    out = dict(source.iter_tables(columns=["volume"]))
+
+    assert list(out) == ["A", "B"]
+    assert out["A"].column_names == ["volume"]
+    assert out["B"]["volume"].to_pylist() == list(range(10, 20))
+
+
+def test_get_missing_symbol_with_pushdown_raises(source: SliceSource):
+    with pytest.raises(KeyError):
+        source.get("C", columns=["ts"])
+
+
+def test_projected_gets_decode_each_row_group_once(source: SliceSource, monkeypatch):
+    pf = source._accessor._parquet()
+    calls = []
+    read = pf.read_row_group
+    monkeypatch.setattr(pf, "read_row_group", lambda i, columns=None: calls.append(i) or read(i, columns=columns))
+
+    a = source.get("A", columns=["close"])
+    b = source.get("B", columns=["close"])
+    source.get("B", columns=["close"], ts_range=(0, 3))
+
+    assert a["close"].to_pylist() == [float(i) for i in range(10)]
+    assert b["close"].to_pylist() == [float(i) for i in range(10, 20)]
+    # 5 个 row group，A / B 共享边界 row group（rows 8..11）只解码一次；
+    # ts_range 的读取多投影 ts 列 → 另一组缓存键
+    assert sorted(calls[:5]) == [0, 1, 2, 3, 4]
+    assert len(calls) == 5 + 2
@@ -77,3 +77,13 @@ def test_session_resolver_cross_day_mapping():
     key = resolver.trading_day_of(minute2)
 
     assert key.trading_date == date(2025, 1, 2)
+
+
+def test_session_minutes_cover_continuous_sessions():
+    minutes = ASharesSessionResolver.session_minutes()
+
+    assert len(minutes) == 240
+    assert minutes[0] == 9 * 60 + 30
+    assert minutes[119] == 11 * 60 + 29
+    assert minutes[120] == 13 * 60
+    assert minutes[-1] == 14 * 60 + 59
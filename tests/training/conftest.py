@@ -14,6 +14,7 @@ def training_ctx(tmp_dirs) -> TrainingContext:
     Minimal TrainingContext for training pipeline tests.
     """
     return TrainingContext(
+        run_id="test_run",
         cfg=None,  # tests inject if needed
         inst=Instrumentation(enabled=False),
         model_dir=tmp_dirs["model"],
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+
+from src.training.engines.cross_sectional_ic_engine import CrossSectionalRankICEngine, grouped_rank
+
+
+def _reference(p, y, ts, min_count):
+    """逐 minute scipy.spearmanr（联合有效集）"""
+    out = []
+    for m in np.unique(ts):
+        sel = (ts == m) & np.isfinite(p) & np.isfinite(y)
+        if sel.sum() < min_count or np.ptp(p[sel]) == 0 or np.ptp(y[sel]) == 0:
+            out.append(np.nan)
+        else:
+            out.append(spearmanr(p[sel], y[sel])[0])
+    return np.array(out)
+
+
+def test_grouped_rank_averages_ties_within_group():
+    values = np.array([3.0, 1.0, 3.0, 5.0, 2.0, 2.0, np.nan])
+    group = np.array([0, 0, 0, 1, 1, 1, 1])
+    ranks = grouped_rank(values, group, np.isfinite(values))
+    np.testing.assert_array_equal(ranks[:6], [2.5, 1.0, 2.5, 3.0, 1.5, 1.5])
+    assert np.isnan(ranks[6])
+
+
+def test_cross_sectional_ic_matches_per_minute_spearman():
+    rng = np.random.default_rng(5)
+    n = 3000
+    ts = rng.integers(0, 240, n) * 60
+    y = np.round(rng.normal(size=n), 1)  # 大量并列
+    y[rng.random(n) < 0.05] = np.nan
+    p1 = y + rng.normal(scale=2.0, size=n)
+    p2 = rng.normal(size=n)
+    p2[rng.random(n) < 0.1] = np.nan  # 与 label 不同的缺失模式
+    p3 = np.full(n, 1.0)              # 无方差 → NaN
+
+    engine = CrossSectionalRankICEngine(min_count=3)
+    res = engine.evaluate(preds=np.column_stack([p1, p2, p3]), y_true=y, ts=ts)
+
+    np.testing.assert_array_equal(res.minutes, np.unique(ts))
+    for j, p in enumerate((p1, p2)):
+        np.testing.assert_allclose(res.ic[:, j], _reference(p, y, ts, 3), rtol=1e-9, atol=1e-12, equal_nan=True)
+    assert np.isnan(res.ic[:, 2]).all() and res.n[2] == 0
+
+    ic1 = res.ic[:, 0][np.isfinite(res.ic[:, 0])]
+    assert res.mean[0] == pytest.approx(ic1.mean())
+    assert res.std[0] == pytest.approx(ic1.std(ddof=1))
+    assert res.t_stat[0] == pytest.approx(ic1.mean() / ic1.std(ddof=1) * np.sqrt(len(ic1)))
+
+
+def test_pooled_ic_without_ts():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=500)
+    p = y + rng.normal(size=500)
+    ic = CrossSectionalRankICEngine().mean_ic(preds=p, y_true=y)
+    assert ic == pytest.approx(spearmanr(p, y)[0])
+
+
+def test_evaluate_matrix_matches_per_pair_evaluate():
+    rng = np.random.default_rng(9)
+    n = 2000
+    ts = rng.integers(0, 60, n) * 60
+    Y = np.column_stack([rng.normal(size=n), np.round(rng.normal(size=n), 1)])
+    F = np.column_stack([Y[:, 0] + rng.normal(size=n), rng.normal(size=n), np.full(n, 2.0)])
+    missing = rng.random(n) < 0.05  # 同一缺失模式 → 精确 Spearman
+    F[missing] = np.nan
+    Y[missing] = np.nan
+
+    engine = CrossSectionalRankICEngine(min_count=3)
+    minutes, ic = engine.evaluate_matrix(features=F, labels=Y, ts=ts, feature_chunk=2)
+
+    assert ic.shape == (len(np.unique(ts)), 3, 2)
+    for k in range(2):
+        for l in range(2):
+            ref = engine.evaluate(preds=F[:, k], y_true=Y[:, l], ts=ts)
+            np.testing.assert_array_equal(minutes, ref.minutes)
+            np.testing.assert_allclose(ic[:, k, l], ref.ic[:, 0], rtol=1e-9, atol=1e-12, equal_nan=True)
+    assert np.isnan(ic[:, 2, :]).all()
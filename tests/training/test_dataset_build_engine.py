@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.training.engines.dataset_build_engine import DatasetBuildEngine
+
+
+def _engine(tmp_path) -> DatasetBuildEngine:
+    pm = SimpleNamespace(
+        feature_dir=lambda date: tmp_path / "feature" / date,
+        label_dir=lambda date: tmp_path / "label" / date,
+    )
+    return DatasetBuildEngine(pm)
+
+
+def _write(tmp_path, date: str, slot: str, features: pa.Table, labels: pa.Table) -> None:
+    for kind, table in (("feature", features), ("label", labels)):
+        d = tmp_path / kind / date
+        d.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, d / f"{kind}.{slot}.parquet")
+
+
+def test_dataset_build_aligns_on_keys_and_sanitizes(tmp_path):
+    features = pa.table({
+        "symbol": ["A", "A", "B", "B"],
+        "ts": pa.array([0, 60, 0, 60], pa.int64()),
+        "f1": [1.0, np.inf, 3.0, 4.0],
+        "f2": pa.array([10, 20, 30, None], pa.int64()),
+        "unused": ["x"] * 4,
+    })
+    # label 行序不同且缺 (B, 0) → 按 (symbol, ts) 对齐
+    labels = pa.table({
+        "symbol": ["B", "A", "A"],
+        "ts": pa.array([60, 60, 0], pa.int64()),
+        "y": [0.4, 0.2, 0.1],
+    })
+    _write(tmp_path, "2025-01-02", "sh_trade", features, labels)
+    engine = _engine(tmp_path)
+
+    X, y, eval_X, eval_y = engine.build(
+        update_day="2025-01-02", eval_day=None, feature_columns=["f1", "f2"],
+        label_column="y", drop_na=False, evaluation_enabled=False,
+    )
+    assert X.dtype == np.float32 and X.flags.c_contiguous and X.shape == (4, 2)
+    assert eval_X is None and eval_y is None
+    np.testing.assert_array_equal(X, np.array([[1, 10], [np.nan, 20], [3, 30], [4, np.nan]], np.float32))
+    np.testing.assert_allclose(y, [0.1, 0.2, np.nan, 0.4], rtol=1e-6)
+
+    X, y, _, _ = engine.build(
+        update_day="2025-01-02", eval_day=None, feature_columns=None,
+        label_column="y", drop_na=True, evaluation_enabled=False,
+    )
+    np.testing.assert_array_equal(X, np.array([[1, 10]], np.float32))
+    np.testing.assert_allclose(y, [0.1], rtol=1e-6)
+
+
+def test_dataset_build_casts_large_int64_features(tmp_path):
+    keys = {"symbol": ["A", "A", "B"], "ts": pa.array([0, 60, 0], pa.int64())}
+    volume = [30_000_001, 2 ** 40 + 1, None]  # > 2^24：float32 无法精确表示
+    _write(
+        tmp_path, "2025-01-02", "sh_trade",
+        pa.table({**keys, "volume": pa.array(volume, pa.int64())}),
+        pa.table({**keys, "y": [0.1, 0.2, 0.3]}),
+    )
+
+    X, _, _, _ = _engine(tmp_path).build(
+        update_day="2025-01-02", eval_day=None, feature_columns=None,
+        label_column="y", drop_na=False, evaluation_enabled=False,
+    )
+    expected = np.array([30_000_001, 2 ** 40 + 1, np.nan], dtype=np.float64).astype(np.float32)
+    np.testing.assert_array_equal(X[:, 0], expected)
+
+
+def test_dataset_build_concatenates_slots_and_rejects_duplicate_keys(tmp_path):
+    keys = {"symbol": ["A", "A"], "ts": pa.array([0, 60], pa.int64())}
+    for slot, base in (("sh_trade", 1.0), ("sz_trade", 5.0)):
+        _write(
+            tmp_path, "2025-01-02", slot,
+            pa.table({**keys, "f": [base, base + 1]}),
+            pa.table({**keys, "y": [base * 10, base * 10 + 1]}),
+        )
+    engine = _engine(tmp_path)
+
+    X, y, _, _ = engine.build(
+        update_day="2025-01-02", eval_day=None, feature_columns=["f"],
+        label_column="y", drop_na=True, evaluation_enabled=False,
+    )
+    np.testing.assert_array_equal(X[:, 0], [1, 2, 5, 6])
+    np.testing.assert_array_equal(y, [10, 11, 50, 51])
+
+    _write(
+        tmp_path, "2025-01-03", "sh_trade",
+        pa.table({**keys, "f": [1.0, 2.0]}),
+        pa.table({"symbol": ["A", "A", "A"], "ts": pa.array([0, 0, 60], pa.int64()), "y": [1.0, 2.0, 3.0]}),
+    )
+    with pytest.raises(RuntimeError, match="duplicate"):
+        engine.build(
+            update_day="2025-01-03", eval_day=None, feature_columns=["f"],
+            label_column="y", drop_na=True, evaluation_enabled=False,
+        )
+
+
+def test_dataset_build_cache_reuses_memmap_and_invalidates_on_source_change(tmp_path):
+    from src.training.dataset_cache import DatasetCache
+
+    keys = {"symbol": ["A", "B"], "ts": pa.array([0, 0], pa.int64())}
+    _write(
+        tmp_path, "2025-01-02", "sh_trade",
+        pa.table({**keys, "f": [1.0, 2.0]}),
+        pa.table({**keys, "y": [0.1, 0.2]}),
+    )
+    cache = DatasetCache(tmp_path / "cache")
+    kwargs = dict(date="2025-01-02", feature_columns=["f"], label_column="y", drop_na=True)
+
+    first = DatasetBuildEngine(_engine(tmp_path).pm, cache=cache).load_day(**kwargs)
+    assert len(list(cache.root.iterdir())) == 1
+
+    # 新 engine（新 run）→ 直接读 memmap，不再读 parquet
+    second = DatasetBuildEngine(_engine(tmp_path).pm, cache=cache).load_day(**kwargs)
+    assert isinstance(second.X, np.memmap)
+    np.testing.assert_array_equal(second.X, first.X)
+    assert second.symbol.tolist() == ["A", "B"] and second.ts.tolist() == [0, 0]
+
+    # label 重建 → 源文件身份变化 → miss
+    _write(
+        tmp_path, "2025-01-02", "sh_trade",
+        pa.table({**keys, "f": [1.0, 2.0]}),
+        pa.table({**keys, "y": [0.5, 0.6]}),
+    )
+    third = DatasetBuildEngine(_engine(tmp_path).pm, cache=cache).load_day(**kwargs)
+    np.testing.assert_allclose(third.y, [0.5, 0.6], rtol=1e-6)
+
+
+def test_dataset_cache_lru_evicts_oldest(tmp_path):
+    import os
+    from src.training.dataset_cache import DatasetCache
+
+    arrays = {
+        "X": np.zeros((100, 4), np.float32),
+        "y": np.zeros(100, np.float32),
+        "symbol": np.array(["A"] * 100),
+        "ts": np.zeros(100, np.int64),
+    }
+    cache = DatasetCache(tmp_path / "cache")
+    cache.put("old", arrays)
+    cache.put("mid", arrays)
+    os.utime(cache.path("old"), ns=(1, 1))
+    os.utime(cache.path("mid"), ns=(2, 2))
+    cache.get("old")  # 命中 → 刷新为最近使用
+
+    entry = sum(f.stat().st_size for f in cache.path("mid").iterdir())
+    cache.max_bytes = int(entry * 2.5)
+    cache.put("new", arrays)
+
+    assert sorted(d.name for d in cache.root.iterdir()) == ["new", "old"]
+
+
+def test_dataset_cache_pinned_entries_survive_prune(tmp_path):
+    import os
+    from src.training.dataset_cache import DatasetCache
+
+    arrays = {
+        "X": np.zeros((100, 4), np.float32),
+        "y": np.zeros(100, np.float32),
+        "symbol": np.array(["A"] * 100),
+        "ts": np.zeros(100, np.int64),
+    }
+    cache = DatasetCache(tmp_path / "cache")
+    cache.put("stale", arrays)
+    entry = sum(f.stat().st_size for f in cache.path("stale").iterdir())
+    cache.max_bytes = int(entry * 1.5)
+
+    with cache.pinned():
+        cache.put("d1", arrays)
+        cache.put("d2", arrays)  # 超出上限：只淘汰未固定条目
+        assert sorted(d.name for d in cache.root.iterdir()) == ["d1", "d2"]
+        assert cache.get("d1") is not None
+        os.utime(cache.path("d2"), ns=(1, 1))
+
+    # 退出作用域 → 解除固定并按 LRU prune
+    assert [d.name for d in cache.root.iterdir()] == ["d1"]
+
+
+def test_dataset_build_prefetch_builds_next_day_in_background(tmp_path):
+    keys = {"symbol": ["A"], "ts": pa.array([0], pa.int64())}
+    days = ["2025-01-02", "2025-01-03", "2025-01-06"]
+    for i, day in enumerate(days):
+        _write(tmp_path, day, "sh_trade", pa.table({**keys, "f": [float(i)]}), pa.table({**keys, "y": [i * 0.1]}))
+
+    engine = DatasetBuildEngine(_engine(tmp_path).pm, prefetch_days=1)
+    kwargs = dict(feature_columns=["f"], label_column="y", drop_na=True)
+    try:
+        engine.build(update_day=days[0], eval_day=days[1], evaluation_enabled=True, **kwargs)
+        engine.prefetch(days[2:], **kwargs)
+
+        X, _, eval_X, _ = engine.build(update_day=days[1], eval_day=days[2], evaluation_enabled=True, **kwargs)
+        assert X[0, 0] == 1.0 and eval_X[0, 0] == 2.0
+        assert engine.stats["prefetched"] == 1 and engine.stats["prefetch_hits"] == 1
+        assert engine.overlap_s() >= 0.0
+        assert len(engine._memo) <= engine.memo_days
+    finally:
+        engine.close()
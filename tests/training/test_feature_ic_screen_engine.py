@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.training.engines.feature_ic_screen_engine import FeatureICScreenEngine
+
+
+def _write_day(tmp_path, date: str, slot: str, rng, symbols) -> None:
+    n_min = 20
+    sym = np.repeat(symbols, n_min)
+    ts = np.tile(np.arange(n_min) * 60, len(symbols)).astype(np.int64)
+    y = rng.normal(size=len(sym))
+
+    features = pa.table({
+        "symbol": sym, "ts": ts,
+        "l0_good": y + rng.normal(scale=0.5, size=len(sym)),
+        "l0_noise": rng.normal(size=len(sym)),
+        "other": rng.normal(size=len(sym)),  # 前缀不匹配 → 不参与
+    })
+    # label 行序打乱 → 按 (symbol, ts) 对齐
+    order = rng.permutation(len(sym))
+    labels = pa.table({
+        "symbol": sym[order], "ts": ts[order],
+        "label_fwd_ret_s5": y[order],
+        "label_tb_touch_ts": ts[order],
+    })
+    for kind, table in (("feature", features), ("label", labels)):
+        d = tmp_path / kind / date
+        d.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, d / f"{kind}.{slot}.parquet")
+
+
+def test_screen_day_ranks_informative_feature(tmp_path):
+    rng = np.random.default_rng(1)
+    _write_day(tmp_path, "2025-01-02", "sh_trade", rng, [f"S{i}" for i in range(12)])
+    _write_day(tmp_path, "2025-01-02", "sz_trade", rng, [f"Z{i}" for i in range(12)])
+    pm = SimpleNamespace(
+        feature_dir=lambda date: tmp_path / "feature" / date,
+        label_dir=lambda date: tmp_path / "label" / date,
+    )
+
+    engine = FeatureICScreenEngine(pm, feature_prefixes=["l0_"])
+    daily = engine.screen_day("2025-01-02")
+
+    assert set(daily["feature"]) == {"l0_good", "l0_noise"}
+    assert set(daily["label"]) == {"label_fwd_ret_s5"}
+    assert (daily["n_minutes"] == 20).all()
+
+    ic = daily.set_index("feature")["ic"]
+    assert ic["l0_good"] > 0.6
+    assert abs(ic["l0_noise"]) < 0.3
+
+
+def test_summarize_orders_by_abs_ir():
+    daily = pd.DataFrame({
+        "date": ["d1", "d2", "d3"] * 2,
+        "feature": ["a"] * 3 + ["b"] * 3,
+        "label": ["y"] * 6,
+        "ic": [0.01, 0.02, -0.01, -0.10, -0.12, -0.11],
+        "n_minutes": [10] * 6,
+    })
+    summary = FeatureICScreenEngine.summarize(daily)
+
+    assert list(summary["feature"]) == ["b", "a"]
+    b = summary.iloc[0]
+    assert b["n_days"] == 3 and b["hit_rate"] == 1.0
+    assert b["ic_mean"] == pytest.approx(-0.11)
+    assert b["t_stat"] == pytest.approx(b["ic_ir"] * np.sqrt(3))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.training.engines.dataset_build_engine import DatasetBuildEngine
+from src.training.engines.minibatch_stream import MiniBatchStream
+
+DATE = "2025-01-02"
+
+
+def _pm(tmp_path):
+    return SimpleNamespace(
+        feature_dir=lambda date: tmp_path / "feature" / date,
+        label_dir=lambda date: tmp_path / "label" / date,
+    )
+
+
+def _write(tmp_path, n=53, shift_label=False):
+    rng = np.random.default_rng(1)
+    keys = {"symbol": [f"S{i // 10}" for i in range(n)], "ts": pa.array(np.arange(n) % 10 * 60, pa.int64())}
+    f = rng.normal(size=n)
+    f[[3, 30]] = np.nan
+    feats = pa.table({**keys, "f": f, "g": np.arange(n, dtype=np.float64)})
+    labels = pa.table({**keys, "y": np.arange(n) * 0.5})
+    if shift_label:
+        labels = labels.slice(1)
+    for kind, table, rg in (("feature", feats, 11), ("label", labels, 17)):
+        d = tmp_path / kind / DATE
+        d.mkdir(parents=True, exist_ok=True)
+        # 两侧 row group 边界不同 → 验证重切块
+        pq.write_table(table, d / f"{kind}.sh_trade.parquet", row_group_size=rg)
+
+
+def _collect(stream, epoch=0):
+    return list(stream.iter_day(DATE, epoch=epoch))
+
+
+def test_stream_matches_full_day_build(tmp_path):
+    _write(tmp_path)
+    stream = MiniBatchStream(_pm(tmp_path), feature_columns=["f", "g"], label_column="y", batch_size=7, read_rows=5)
+    batches = _collect(stream)
+
+    assert [len(b) for b in batches[:-1]] == [7] * (len(batches) - 1)
+    full = DatasetBuildEngine(_pm(tmp_path)).load_day(
+        date=DATE, feature_columns=["f", "g"], label_column="y", drop_na=True,
+    )
+    np.testing.assert_array_equal(np.concatenate([b.X for b in batches]), full.X)
+    np.testing.assert_array_equal(np.concatenate([b.y for b in batches]), full.y)
+
+
+def test_stream_shuffle_is_bounded_permutation_per_epoch(tmp_path):
+    _write(tmp_path)
+    stream = MiniBatchStream(
+        _pm(tmp_path), feature_columns=["g"], label_column="y", batch_size=4, shuffle_buffer=12, seed=7,
+    )
+    e0 = np.concatenate([b.X[:, 0] for b in _collect(stream, epoch=0)])
+    e1 = np.concatenate([b.X[:, 0] for b in _collect(stream, epoch=1)])
+
+    assert sorted(e0) == list(np.arange(53, dtype=np.float32))
+    assert not np.array_equal(e0, np.sort(e0)) and not np.array_equal(e0, e1)
+    np.testing.assert_array_equal(e0, np.concatenate([b.X[:, 0] for b in _collect(stream, epoch=0)]))
+
+    # 有界：第一个缓冲（前 12 行）之外的行不会出现在前 3 个 batch
+    assert e0[:12].max() < 12
+
+
+def test_stream_rejects_misaligned_label(tmp_path):
+    _write(tmp_path, shift_label=True)
+    stream = MiniBatchStream(_pm(tmp_path), feature_columns=["g"], label_column="y", batch_size=8)
+    with pytest.raises(RuntimeError, match="not aligned"):
+        _collect(stream)
+
+
+def test_streaming_train_step_partial_fits_every_batch(tmp_path, training_ctx):
+    from src.config.training_config import FeatureLabelConfig, StreamConfig, TrainingConfig
+    from src.training.steps.streaming_model_train_step import StreamingModelTrainStep
+
+    _write(tmp_path)
+    cfg = TrainingConfig(
+        name="stream_test", start_date=DATE, end_date=DATE, warmup_days=1,
+        dataset=FeatureLabelConfig(feature_columns=["g"], label_column="y"),
+        model_name="sgd", model_version="v1", task_type="regression",
+        model_params={"random_state": 0},
+        stream=StreamConfig(enabled=True, batch_size=10, epochs=2),
+    )
+    training_ctx.update_day = DATE
+
+    ctx = StreamingModelTrainStep(cfg, pm=_pm(tmp_path)).run(training_ctx)
+    # 53 行 × 2 epochs，逐样本计数（NaN 只在未选中的 f 列）
+    assert ctx.model_state.model.t_ == 1 + 2 * 53
+    assert ctx.model_state.asof_day == DATE
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+from src.observability.instrumentation import Instrumentation
+from src.training.checkpoint_store import CheckpointStore
+from src.training.context import ModelState, TrainingContext
+from src.training.pipeline import TrainingPipeline
+
+DAYS = ["2025-01-02", "2025-01-03", "2025-01-06", "2025-01-07", "2025-01-08", "2025-01-09"]
+
+
+class _SeenModel:
+    """可 pickle 的“模型”：记录 partial_fit 过的 update_day"""
+
+    def __init__(self, seen=()):
+        self.seen = list(seen)
+
+
+class _TrainStep:
+    def __init__(self):
+        self.trained = []
+
+    def run(self, ctx: TrainingContext) -> TrainingContext:
+        prev = ctx.model_state.model.seen if ctx.model_state else []
+        ctx.model_state = ModelState(model=_SeenModel([*prev, ctx.update_day]), asof_day=ctx.update_day)
+        ctx.metrics[f"ic@{ctx.eval_day}"] = 0.1
+        self.trained.append(ctx.update_day)
+        return ctx
+
+
+def _run(
+        tmp_path, store, *, end: str, start: str = DAYS[0], resume: bool = False, every: int = 1,
+        final_steps=(),
+):
+    pm = SimpleNamespace(
+        feature_dir=lambda d: tmp_path / "feature" / d,
+        train_run_dir=lambda run_id: tmp_path / "runs" / run_id,
+    )
+    cfg = SimpleNamespace(
+        start_date=date.fromisoformat(start),
+        end_date=date.fromisoformat(end),
+        resume=resume,
+        snapshot_enabled=True,
+        snapshot_every_n_steps=every,
+    )
+    step = _TrainStep()
+    pipeline = TrainingPipeline(
+        daily_steps=[step], final_steps=list(final_steps), pm=pm,
+        inst=Instrumentation(enabled=False), cfg=cfg, checkpoints=store,
+    )
+    return pipeline.run("r"), step.trained
+
+
+def test_snapshot_every_n_steps_and_resume_from_latest_before_start(tmp_path):
+    for d in DAYS:
+        (tmp_path / "feature" / d).mkdir(parents=True)
+    store = CheckpointStore(tmp_path / "ckpt", fingerprint="fp")
+
+    # update days 0..3（第 4 天只做 eval）；每 2 步 + 最后一步
+    _, trained = _run(tmp_path, store, end=DAYS[4], every=2)
+    assert trained == DAYS[:4]
+    assert store.days() == [DAYS[1], DAYS[3]]
+
+    # 延长一天：start ≥ 最新快照 → 只训练新 update_day
+    ctx, trained = _run(tmp_path, store, start=DAYS[4], end=DAYS[5], resume=True, every=2)
+    assert trained == [DAYS[4]]
+    assert ctx.model_state.model.seen == DAYS[:5]
+    assert [r["update_day"] for r in ctx.ic_series] == DAYS[:5]
+
+    # start 落在快照之间 → 从之前的快照继续，补训中间交易日
+    (tmp_path / "ckpt" / "fp" / DAYS[3]).rename(tmp_path / "ckpt" / "fp" / ".gone")
+    ctx, trained = _run(tmp_path, store, start=DAYS[3], end=DAYS[5], resume=True)
+    assert trained == DAYS[2:5]
+    assert ctx.model_state.model.seen == DAYS[:5]
+
+
+def test_resume_without_checkpoint_starts_fresh(tmp_path):
+    for d in DAYS[:3]:
+        (tmp_path / "feature" / d).mkdir(parents=True)
+    store = CheckpointStore(tmp_path / "ckpt", fingerprint="fp")
+
+    ctx, trained = _run(tmp_path, store, end=DAYS[2], resume=True)
+    assert trained == DAYS[:2]
+    state, meta = store.load(DAYS[1])
+    assert state.model.seen == DAYS[:2] and meta["step"] == 2
+
+
+def test_resume_with_no_new_update_day_runs_final_steps(tmp_path):
+    from src.training.engines.rank_ic_evaluate_engine import RankICEvaluateEngine
+    from src.training.steps.rank_ic_step import RankICStep
+
+    for d in DAYS[:4]:
+        (tmp_path / "feature" / d).mkdir(parents=True)
+    store = CheckpointStore(tmp_path / "ckpt", fingerprint="fp")
+    _run(tmp_path, store, end=DAYS[3])
+    assert store.days()[-1] == DAYS[2]
+
+    # end_date = 快照次日：只剩一个（仅 eval）交易日 → 日循环不执行
+    ctx, trained = _run(
+        tmp_path, store, start=DAYS[3], end=DAYS[3], resume=True,
+        final_steps=[RankICStep(RankICEvaluateEngine())],
+    )
+    assert trained == []
+    assert ctx.eval_pred is None
+    assert ctx.model_state.model.seen == DAYS[:3]